@@ -565,6 +565,9 @@ def _run_to_public_result(run_row: Dict[str, Any]) -> Dict[str, Any]:
         "academic_assessment": preferences_response.get("academic_score"),
         "schools": preferences_response.get("schools") or [],
         "llm_reasoning_status": run_row.get("llm_reasoning_status") or "skipped",
+        # Per-school results published by the research task as they finish
+        # (versioned; ``final`` once the cross-school rerank is applied).
+        "research_progress": run_row.get("research_progress"),
     }
 
 
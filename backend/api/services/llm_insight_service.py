@@ -2,15 +2,26 @@
 LLM insight helpers for the finalize pipeline.
 
 Hands off deep roster research to the Celery worker via
-``enqueue_deep_school_research``.
+``enqueue_deep_school_research``. The full consideration pool is stored
+on the run row and the message only references it (see
+``backend.llm.research_payload``).
 """
 
 from __future__ import annotations
 
 import logging
 import os
+import time
 from typing import Any, Dict, List, Optional, Tuple
 
+from backend.llm.research_payload import (
+    build_legacy_payload,
+    build_slim_payload,
+    message_bytes,
+    slim_payload_enabled,
+    store_research_input,
+)
+
 from ..clients.supabase import require_supabase_admin_client
 
 logger = logging.getLogger(__name__)
@@ -54,6 +65,15 @@ def attach_roster_urls(schools: List[Dict[str, Any]]) -> None:
         logger.warning("Failed to look up roster URLs: %s", exc)
 
 
+def _store_pool(run_id: str, schools: List[Dict[str, Any]]) -> bool:
+    try:
+        supabase = require_supabase_admin_client()
+    except Exception as exc:
+        logger.warning("Cannot store research_input for run %s: %s", run_id, exc)
+        return False
+    return store_research_input(supabase, run_id, schools)
+
+
 def enqueue_deep_school_research(
     *,
     run_id: str,
@@ -69,19 +89,33 @@ def enqueue_deep_school_research(
 
     attach_roster_urls(schools)
 
+    t_start = time.monotonic()
+    message_format = "legacy"
+    build_payload = build_legacy_payload
+    # Only reference the pool if it's safely on the run row; otherwise the
+    # worker still accepts the legacy full-dict message.
+    if slim_payload_enabled() and _store_pool(run_id, schools):
+        message_format = "slim"
+        build_payload = build_slim_payload
+    t_stored = time.monotonic()
+
     try:
-        payload: Dict[str, Any] = {
-            "run_id": run_id,
-            "schools": schools,
-            "player_stats": player_stats,
-            "baseball_assessment": baseball_assessment,
-            "academic_score": academic_score,
-        }
-        if final_limit is not None:
-            payload["final_limit"] = final_limit
-        if ranking_priority is not None:
-            payload["ranking_priority"] = ranking_priority
+        payload = build_payload(
+            run_id=run_id,
+            schools=schools,
+            player_stats=player_stats,
+            baseball_assessment=baseball_assessment,
+            academic_score=academic_score,
+            final_limit=final_limit,
+            ranking_priority=ranking_priority,
+        )
         job = generate_deep_school_research.delay(payload)
+        logger.info(
+            "[TIMING] enqueue_deep_school_research run_id=%s format=%s schools=%d "
+            "message_bytes=%d store=%.3fs publish=%.3fs",
+            run_id, message_format, len(schools), message_bytes(payload),
+            t_stored - t_start, time.monotonic() - t_stored,
+        )
         return "processing", getattr(job, "id", None)
     except Exception as exc:
         logger.warning("Failed to enqueue deep school research for run %s: %s", run_id, exc)
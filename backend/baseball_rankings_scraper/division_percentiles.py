@@ -0,0 +1,196 @@
+"""
+Division Percentile Tables
+In-memory (year, division) rating tables built from baseball_rankings_data
+
+Loads every rankings row once, keeps a sorted overall_rating array per
+(year, division) for O(log n) percentile lookups, and indexes rows by
+team_name so strength profiles, trends and comparisons for any batch of
+schools need no further queries. A new scrape is detected through the
+latest scraped_at value and triggers a reload.
+"""
+
+import logging
+import time
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class DivisionPercentileTables:
+    """Sorted per-division rating arrays plus a team_name → rows index"""
+
+    def __init__(
+        self,
+        client: Any,
+        table_name: str = "baseball_rankings_data",
+        page_size: int = 1000,
+        key_columns: Tuple[str, ...] = ("team_name", "year", "division"),
+        staleness_check_interval_s: float = 300.0,
+    ):
+        self.client = client
+        self.table_name = table_name
+        self.page_size = page_size
+        # The table's unique key; a total order keeps pages from overlapping.
+        self.key_columns = key_columns
+        self.staleness_check_interval_s = staleness_check_interval_s
+
+        self._sorted_ratings: Dict[Tuple[int, int], List[float]] = {}
+        self._rows_by_team: Dict[str, List[Dict[str, Any]]] = {}
+        self._version: Optional[str] = None
+        self._loaded = False
+        self._last_staleness_check = 0.0
+        self.query_count = 0
+
+    @staticmethod
+    def _coerce_int(value: Any) -> Optional[int]:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    def _fetch_all_rows(self) -> List[Dict[str, Any]]:
+        """Page through the whole table (PostgREST caps responses at 1000 rows)."""
+        rows: List[Dict[str, Any]] = []
+        start = 0
+        while True:
+            query = self.client.table(self.table_name).select("*")
+            for column in self.key_columns:
+                query = query.order(column)
+            response = query.range(start, start + self.page_size - 1).execute()
+            self.query_count += 1
+            page = response.data or []
+            rows.extend(page)
+            if len(page) < self.page_size:
+                return rows
+            start += self.page_size
+
+    def load(self) -> None:
+        """(Re)build every table from a full read of the rankings table"""
+        rows = self._fetch_all_rows()
+
+        ratings: Dict[Tuple[int, int], List[float]] = {}
+        by_team: Dict[str, List[Dict[str, Any]]] = {}
+        version: Optional[str] = None
+
+        for row in rows:
+            team_name = row.get("team_name")
+            year = self._coerce_int(row.get("year"))
+            division = self._coerce_int(row.get("division"))
+            if not team_name or year is None:
+                continue
+
+            by_team.setdefault(team_name, []).append(row)
+
+            scraped_at = row.get("scraped_at")
+            if scraped_at and (version is None or str(scraped_at) > version):
+                version = str(scraped_at)
+
+            overall_rating = row.get("overall_rating")
+            if overall_rating is None or division is None:
+                continue
+            ratings.setdefault((year, division), []).append(float(overall_rating))
+
+        for values in ratings.values():
+            values.sort()
+        for team_rows in by_team.values():
+            team_rows.sort(key=lambda r: self._coerce_int(r.get("year")) or 0, reverse=True)
+
+        self._sorted_ratings = ratings
+        self._rows_by_team = by_team
+        self._version = version
+        self._loaded = True
+        self._last_staleness_check = time.monotonic()
+        logger.info(
+            f"Loaded {len(rows)} rankings rows into {len(ratings)} division percentile tables"
+        )
+
+    def invalidate(self) -> None:
+        """Drop the tables; the next lookup reloads them"""
+        self._loaded = False
+
+    def _latest_scraped_at(self) -> Optional[str]:
+        response = self.client.table(self.table_name)\
+            .select("scraped_at")\
+            .not_.is_("scraped_at", "null")\
+            .order("scraped_at", desc=True)\
+            .limit(1)\
+            .execute()
+        self.query_count += 1
+        if not response.data:
+            return None
+        latest = response.data[0].get("scraped_at")
+        return str(latest) if latest else None
+
+    def is_stale(self) -> bool:
+        """True when a scrape newer than the loaded tables has landed"""
+        if not self._loaded:
+            return True
+        try:
+            latest = self._latest_scraped_at()
+        except Exception as e:
+            logger.warning(f"Could not check rankings freshness: {e}")
+            return False
+        return latest is not None and (self._version is None or latest > self._version)
+
+    def ensure_fresh(self) -> None:
+        """Load on first use; re-check for a new scrape at most once per interval"""
+        if not self._loaded:
+            self.load()
+            return
+        now = time.monotonic()
+        if now - self._last_staleness_check < self.staleness_check_interval_s:
+            return
+        self._last_staleness_check = now
+        if self.is_stale():
+            logger.info("New rankings scrape detected, reloading division percentile tables")
+            self.load()
+
+    def percentile(self, overall_rating: Optional[float], year: Any, division: Any) -> Optional[float]:
+        """
+        Percentile within (year, division), higher = better
+
+        Massey ratings use LOWER = BETTER, so the percentile is the share of
+        teams with a higher (worse) rating — identical to the old per-call query.
+        """
+        self.ensure_fresh()
+        if overall_rating is None:
+            return None
+        key = (self._coerce_int(year), self._coerce_int(division))
+        ratings = self._sorted_ratings.get(key)
+        if not ratings:
+            return None
+        worse = len(ratings) - bisect_right(ratings, float(overall_rating))
+        return round((worse / len(ratings)) * 100, 1)
+
+    def rows_for_team(self, team_name: str, years: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        """Rankings rows for a team, most recent year first"""
+        self.ensure_fresh()
+        rows = self._rows_by_team.get(team_name, [])
+        if years is None:
+            return list(rows)
+        wanted = {int(y) for y in years}
+        return [r for r in rows if self._coerce_int(r.get("year")) in wanted]
+
+    def division_rankings(self, year: int, division: int, limit: int = 50) -> List[Dict[str, Any]]:
+        """Best teams first (lowest overall_rating) for one (year, division)"""
+        self.ensure_fresh()
+        rows = [
+            r
+            for team_rows in self._rows_by_team.values()
+            for r in team_rows
+            if self._coerce_int(r.get("year")) == year
+            and self._coerce_int(r.get("division")) == division
+            and r.get("overall_rating") is not None
+        ]
+        rows.sort(key=lambda r: float(r["overall_rating"]))
+        return rows[:limit]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "loaded": self._loaded,
+            "version": self._version,
+            "tables": len(self._sorted_ratings),
+            "teams": len(self._rows_by_team),
+            "queries": self.query_count,
+        }
@@ -18,6 +18,7 @@ if project_root not in sys.path:
 
 # Import name resolver
 from backend.database.name_matching import get_resolver
+from backend.baseball_rankings_scraper.division_percentiles import DivisionPercentileTables
 
 load_dotenv()
 
@@ -41,6 +42,10 @@ class BaseballRankingsIntegration:
         # Initialize name resolver for school_name <-> team_name mapping
         self.name_resolver = get_resolver()
 
+        # All rankings rows loaded once; profiles, percentiles and comparisons
+        # are answered from memory and reloaded when a new scrape lands
+        self.percentile_tables = DivisionPercentileTables(self.supabase, self.rankings_table)
+
     def get_school_strength_profile(self, school_name: str, years: List[int] = None) -> Dict:
         """
         Get strength profile for a school across multiple years
@@ -67,15 +72,10 @@ class BaseballRankingsIntegration:
                     "message": "No baseball rankings mapping found for this school"
                 }
 
-            # Query rankings data for the school using team_name
-            response = self.supabase.table(self.rankings_table)\
-                .select("*")\
-                .eq("team_name", team_name)\
-                .in_("year", years)\
-                .order("year", desc=True)\
-                .execute()
+            # Rankings rows for the team, most recent year first
+            rankings_data = self.percentile_tables.rows_for_team(team_name, years)
 
-            if not response.data:
+            if not rankings_data:
                 return {
                     "school_name": school_name,
                     "team_name": team_name,
@@ -83,8 +83,6 @@ class BaseballRankingsIntegration:
                     "message": "No rankings data found for this team"
                 }
 
-            rankings_data = response.data
-
             # Calculate aggregate metrics
             recent_data = rankings_data[0] if rankings_data else None
             all_years_data = {year: None for year in years}
@@ -231,26 +229,7 @@ class BaseballRankingsIntegration:
         Percentile returned is standard (higher = better), where 100th percentile = best team
         """
         try:
-            response = self.supabase.table(self.rankings_table)\
-                .select("overall_rating")\
-                .eq("year", year)\
-                .eq("division", division)\
-                .not_.is_("overall_rating", "null")\
-                .execute()
-
-            if not response.data:
-                return None
-
-            ratings = [r['overall_rating'] for r in response.data]
-            ratings.sort()
-
-            # Find percentile (count teams with HIGHER/WORSE ratings)
-            # Lower Massey rating = better team, so we count teams with higher ratings
-            position = sum(1 for r in ratings if r > overall_rating)
-            percentile = (position / len(ratings)) * 100
-
-            return round(percentile, 1)
-
+            return self.percentile_tables.percentile(overall_rating, year, division)
         except Exception as e:
             logger.error(f"Error calculating percentile: {e}")
             return None
@@ -278,15 +257,7 @@ class BaseballRankingsIntegration:
         Note: Massey ratings use LOWER = BETTER, so we order ASC to get best teams
         """
         try:
-            response = self.supabase.table(self.rankings_table)\
-                .select("*")\
-                .eq("year", year)\
-                .eq("division", division)\
-                .order("overall_rating", desc=False)\
-                .limit(limit)\
-                .execute()
-
-            return response.data if response.data else []
+            return self.percentile_tables.division_rankings(year, division, limit)
 
         except Exception as e:
             logger.error(f"Error getting division rankings: {e}")
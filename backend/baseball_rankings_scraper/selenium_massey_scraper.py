@@ -24,6 +24,7 @@ if project_root not in sys.path:
 # Import existing selenium driver
 from backend.school_info_scraper.selenium_driver import SeleniumDriverManager
 from backend.baseball_rankings_scraper.utils.massey_rankings_xpaths import get_massey_link
+from backend.scripts.refresh_school_enriched_dataset import refresh as refresh_school_enriched_dataset
 
 load_dotenv()
 logger = logging.getLogger(__name__)
@@ -405,6 +406,14 @@ def main():
         total = sum(len(teams) for teams in results.values())
         print(f"\nTotal: {total} teams")
 
+        # Rankings changed — rebuild the materialized school enrichment so
+        # the API stops serving last scrape's SCI.
+        if total:
+            try:
+                refresh_school_enriched_dataset()
+            except Exception as e:
+                logger.error(f"❌ Enriched dataset refresh failed: {e}")
+
         return results
 
     except Exception as e:
@@ -0,0 +1,243 @@
+"""
+Batched Supabase Upsert Writer
+Chunked upserts with per-chunk retry, optional diff against current rows
+
+Scripts that used to write one row per request (name mapping uploads) or
+upsert fixed batches and drop failed ones (roster scrapers, enriched
+dataset refresh) share this writer:
+
+- rows are sent in chunks of `chunk_size` via upsert(on_conflict=...), or
+  via insert for callers that must not overwrite existing rows
+- a chunk failing with a transient error (network, timeout, 5xx, deadlock)
+  is retried with exponential backoff; a chunk rejected by the database
+  (constraint, type, permission errors) is bisected until the bad rows are
+  isolated, so the rest of the chunk is still written. Rows that still fail
+  are reported with their keys instead of aborting the run
+- with `only_changed=True` the current rows are read first (in `.in_`
+  batches on the first conflict column) and unchanged rows are skipped
+- `dry_run=True` computes the same diff but writes nothing
+- every run returns a BatchWriteResult with rows written per second
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_MAX_RETRIES = 3
+
+WRITE_MODES = ("upsert", "insert")
+
+# SQLSTATE classes worth retrying: connection exception, transaction rollback
+# (deadlock, serialization failure), insufficient resources, operator
+# intervention (statement timeout, admin shutdown)
+_TRANSIENT_SQLSTATE_CLASSES = ("08", "40", "53", "57")
+_TRANSIENT_HTTP_STATUSES = {408, 425, 429}
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    Whether a failed write may succeed if sent again unchanged
+
+    postgrest raises APIError with `code` set to the SQLSTATE / PGRST code
+    from the response body, or to the HTTP status when the body is not JSON
+    (gateway errors).
+    """
+    if isinstance(error, (httpx.TransportError, ConnectionError, TimeoutError)):
+        return True
+    code = getattr(error, "code", None)
+    if code is None:
+        response = getattr(error, "response", None)
+        code = getattr(response, "status_code", None)
+    if code is None:
+        return False
+    code = str(code)
+    if len(code) == 3 and code.isdigit():
+        status = int(code)
+        return status >= 500 or status in _TRANSIENT_HTTP_STATUSES
+    if code.startswith("PGRST"):
+        # PGRST000-PGRST003: database unreachable or connection pool timeout
+        return code[5:8] in ("000", "001", "002", "003")
+    return len(code) == 5 and code[:2] in _TRANSIENT_SQLSTATE_CLASSES
+
+
+@dataclass
+class BatchWriteResult:
+    """Outcome of one BatchUpsertWriter.write call"""
+    table: str
+    rows_total: int = 0
+    rows_unchanged: int = 0
+    rows_missing: int = 0
+    rows_written: int = 0
+    rows_failed: int = 0
+    chunks: int = 0
+    retries: int = 0
+    splits: int = 0
+    elapsed_s: float = 0.0
+    dry_run: bool = False
+    changed_keys: List[Tuple] = field(default_factory=list)
+    failed_keys: List[Tuple] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_written / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    def summary(self) -> str:
+        mode = "DRY RUN " if self.dry_run else ""
+        return (
+            f"{mode}{self.table}: {self.rows_total} rows, {len(self.changed_keys)} changed, "
+            f"{self.rows_unchanged} unchanged, {self.rows_missing} missing, "
+            f"{self.rows_written} written, {self.rows_failed} failed "
+            f"({self.chunks} chunks, {self.retries} retries, {self.splits} splits) in {self.elapsed_s:.2f}s "
+            f"→ {self.rows_per_second:.0f} rows/s"
+        )
+
+
+class BatchUpsertWriter:
+    """Chunked upsert (or insert) into one table keyed by its on_conflict columns"""
+
+    def __init__(
+        self,
+        client: Any,
+        table: str,
+        on_conflict: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_s: float = 1.0,
+        sleep: Callable[[float], None] = time.sleep,
+        mode: str = "upsert",
+    ):
+        if mode not in WRITE_MODES:
+            raise ValueError(f"mode must be one of {WRITE_MODES}, got {mode!r}")
+        self.client = client
+        self.table = table
+        self.on_conflict = on_conflict
+        self.mode = mode
+        self.key_columns = [c.strip() for c in on_conflict.split(",") if c.strip()]
+        self.chunk_size = max(1, chunk_size)
+        self.max_retries = max(0, max_retries)
+        self.backoff_s = backoff_s
+        self._sleep = sleep
+
+    def row_key(self, row: Dict[str, Any]) -> Tuple:
+        return tuple(row.get(c) for c in self.key_columns)
+
+    def fetch_existing(self, rows: Sequence[Dict[str, Any]], columns: Iterable[str]) -> Dict[Tuple, Dict[str, Any]]:
+        """Current rows for the keys in `rows`, keyed by row_key"""
+        select_columns = list(dict.fromkeys([*self.key_columns, *columns]))
+        lead = self.key_columns[0]
+        lead_values = list(dict.fromkeys(r.get(lead) for r in rows if r.get(lead) is not None))
+
+        existing: Dict[Tuple, Dict[str, Any]] = {}
+        for start in range(0, len(lead_values), self.chunk_size):
+            response = self.client.table(self.table)\
+                .select(", ".join(select_columns))\
+                .in_(lead, lead_values[start:start + self.chunk_size])\
+                .execute()
+            for row in response.data or []:
+                existing[self.row_key(row)] = row
+        return existing
+
+    def _send(self, rows: List[Dict[str, Any]]):
+        table = self.client.table(self.table)
+        if self.mode == "insert":
+            return table.insert(rows).execute()
+        return table.upsert(rows, on_conflict=self.on_conflict).execute()
+
+    def _send_with_retry(self, rows: List[Dict[str, Any]], result: BatchWriteResult) -> Optional[Exception]:
+        """Send rows, retrying transient errors; returns the final error or None"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._send(rows)
+                return None
+            except Exception as e:
+                if not is_transient_error(e):
+                    return e
+                if attempt == self.max_retries:
+                    logger.error(f"❌ {self.table}: {len(rows)} rows failed after {attempt + 1} attempts: {e}")
+                    return e
+                delay = self.backoff_s * (2 ** attempt)
+                logger.warning(
+                    f"⚠️ {self.table}: {len(rows)} rows failed ({e}), retrying in {delay:.1f}s"
+                )
+                result.retries += 1
+                self._sleep(delay)
+        return None
+
+    def _write_chunk(self, chunk: List[Dict[str, Any]], result: BatchWriteResult) -> List[Dict[str, Any]]:
+        """Write one chunk; returns the rows that could not be written"""
+        error = self._send_with_retry(chunk, result)
+        if error is None:
+            return []
+        if is_transient_error(error):
+            return chunk
+        if len(chunk) == 1:
+            logger.error(f"❌ {self.table}: row {self.row_key(chunk[0])} rejected: {error}")
+            return chunk
+        # Rejected by the database: split to find the offending rows
+        result.splits += 1
+        middle = len(chunk) // 2
+        return self._write_chunk(chunk[:middle], result) + self._write_chunk(chunk[middle:], result)
+
+    def write(
+        self,
+        rows: Sequence[Dict[str, Any]],
+        *,
+        dry_run: bool = False,
+        only_changed: bool = False,
+        update_only: bool = False,
+        ignore_columns: Iterable[str] = (),
+    ) -> BatchWriteResult:
+        """
+        Upsert (or insert) rows in chunks
+
+        Args:
+            rows: Row dicts, each containing the on_conflict columns
+            dry_run: Compute what would be written, write nothing
+            only_changed: Skip rows identical to the current table row
+                (columns in `ignore_columns` are not compared)
+            update_only: Skip rows whose key is not already in the table,
+                matching the old UPDATE ... WHERE school_name = ... behaviour
+            ignore_columns: Columns such as updated_at left out of the diff
+        """
+        start = time.perf_counter()
+        result = BatchWriteResult(table=self.table, rows_total=len(rows), dry_run=dry_run)
+
+        pending = list(rows)
+        if only_changed or update_only:
+            ignored = set(ignore_columns)
+            compare = sorted({c for r in pending for c in r} - ignored - set(self.key_columns))
+            existing = self.fetch_existing(pending, compare)
+
+            kept = []
+            for row in pending:
+                current = existing.get(self.row_key(row))
+                if current is None:
+                    if update_only:
+                        result.rows_missing += 1
+                        continue
+                elif only_changed and all(current.get(c) == row.get(c) for c in compare if c in row):
+                    result.rows_unchanged += 1
+                    continue
+                kept.append(row)
+            pending = kept
+
+        result.changed_keys = [self.row_key(r) for r in pending]
+
+        if not dry_run:
+            for offset in range(0, len(pending), self.chunk_size):
+                chunk = pending[offset:offset + self.chunk_size]
+                result.chunks += 1
+                failed = self._write_chunk(chunk, result)
+                result.rows_written += len(chunk) - len(failed)
+                result.rows_failed += len(failed)
+                result.failed_keys.extend(self.row_key(r) for r in failed)
+
+        result.elapsed_s = time.perf_counter() - start
+        logger.info(result.summary())
+        return result
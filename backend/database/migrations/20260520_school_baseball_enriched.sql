@@ -0,0 +1,47 @@
+-- Materialized per-school baseball enrichment.
+-- One row per school_data_general.school_name that resolves to a ranked
+-- team: resolved team name, latest-year rankings, per-year ranking rows,
+-- and the precomputed hitter/pitcher SCI from compute_school_sci_from_rankings.
+-- Rebuilt by backend/scripts/refresh_school_enriched_dataset.py after every
+-- Massey scrape. Read by AsyncSchoolDataQueries in lieu of the
+-- mapping + rankings join; the live join remains the fallback when empty.
+-- backend/database/school_enriched_dataset.py holds the SQLite mirror.
+
+CREATE TABLE IF NOT EXISTS school_baseball_enriched (
+    school_name                      TEXT PRIMARY KEY,
+    normalized_name                  TEXT NOT NULL,
+    division_group                   TEXT NOT NULL,
+    baseball_team_name               TEXT NOT NULL,
+    baseball_rankings_year           INTEGER,
+    baseball_division                INTEGER,
+    baseball_record                  TEXT,
+    baseball_wins                    INTEGER,
+    baseball_losses                  INTEGER,
+    baseball_overall_rating          DOUBLE PRECISION,
+    baseball_offensive_rating        DOUBLE PRECISION,
+    baseball_defensive_rating        DOUBLE PRECISION,
+    baseball_power_rating            DOUBLE PRECISION,
+    baseball_strength_of_schedule    DOUBLE PRECISION,
+    baseball_division_percentile     DOUBLE PRECISION,
+    baseball_sci_hitter              DOUBLE PRECISION,
+    baseball_sci_pitcher             DOUBLE PRECISION,
+    baseball_trend_bonus             DOUBLE PRECISION NOT NULL DEFAULT 0,
+    baseball_sci_overall_weighted    DOUBLE PRECISION,
+    baseball_sci_offensive_weighted  DOUBLE PRECISION,
+    baseball_sci_defensive_weighted  DOUBLE PRECISION,
+    baseball_sci_power_weighted      DOUBLE PRECISION,
+    baseball_sci_yearly_overall      JSONB NOT NULL DEFAULT '{}'::jsonb,
+    baseball_rankings_by_year        JSONB NOT NULL DEFAULT '{}'::jsonb,
+    refreshed_at                     TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_school_baseball_enriched_normalized_name
+    ON school_baseball_enriched(normalized_name);
+
+CREATE INDEX IF NOT EXISTS idx_school_baseball_enriched_team_name
+    ON school_baseball_enriched(baseball_team_name);
+
+ALTER TABLE school_baseball_enriched ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Enable all operations for service role" ON school_baseball_enriched
+    FOR ALL USING (auth.role() = 'service_role');
@@ -0,0 +1,9 @@
+-- Unique school_name on the name-mapping table.
+-- SchoolNameMatcher.upload_to_database now writes through
+-- backend/database/batch_writer.py with upsert(on_conflict='school_name'),
+-- which needs a unique index on the conflict column. The resolver already
+-- assumes one mapping row per school.
+-- Remove duplicate school_name rows before running this.
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_school_baseball_ranking_name_mapping_school_name
+    ON school_baseball_ranking_name_mapping (school_name);
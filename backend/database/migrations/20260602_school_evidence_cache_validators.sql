@@ -0,0 +1,11 @@
+-- Conditional re-fetch support for school_evidence_cache.
+-- page_validators holds the HTTP validators and a sha256 of the body for
+-- each page: {"roster": {url, etag, last_modified, content_hash},
+-- "stats": {...}}. parsed_players / parsed_stats keep the ParsedPlayer /
+-- ParsedStatLine lists those pages produced, so a 304 or an unchanged
+-- body can reuse them without re-parsing.
+-- Written by backend/scripts/refresh_school_evidence_cache.py.
+
+ALTER TABLE school_evidence_cache ADD COLUMN IF NOT EXISTS page_validators JSONB;
+ALTER TABLE school_evidence_cache ADD COLUMN IF NOT EXISTS parsed_players JSONB;
+ALTER TABLE school_evidence_cache ADD COLUMN IF NOT EXISTS parsed_stats JSONB;
@@ -0,0 +1,7 @@
+-- Incremental deep-research results on prediction_runs.
+-- generate_deep_school_research writes a compact, versioned snapshot
+-- here after every finished school and once more after the final
+-- cross-school rerank (see backend/llm/deep_school_insights/progress.py).
+-- /evaluations/result returns it while llm_reasoning_status='processing'.
+
+ALTER TABLE prediction_runs ADD COLUMN IF NOT EXISTS research_progress JSONB;
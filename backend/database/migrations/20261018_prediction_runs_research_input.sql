@@ -0,0 +1,7 @@
+-- Consideration pool for deep research, stored on the run row.
+-- enqueue_deep_school_research writes the full ranked school dicts here
+-- and sends a slim Celery message (run id + school refs); the worker
+-- rehydrates from this column (see backend/llm/research_payload.py).
+-- Without the column enqueue falls back to the legacy full-dict message.
+
+ALTER TABLE prediction_runs ADD COLUMN IF NOT EXISTS research_input JSONB;
@@ -0,0 +1,17 @@
+-- Research demand for school_evidence_cache.
+-- One row per research cache lookup (DeepSchoolInsightService.research_schools):
+-- the schools looked up and the ones served from the cache. Read by
+-- backend/scripts/refresh_school_evidence_cache.py to refresh the most
+-- researched schools before their cache entries pass the 14-day TTL, and
+-- to report the measured research cache hit ratio
+-- (see backend/database/school_evidence_demand.py).
+
+CREATE TABLE IF NOT EXISTS school_evidence_demand (
+    id BIGSERIAL PRIMARY KEY,
+    looked_up_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    schools JSONB NOT NULL,
+    hits JSONB NOT NULL DEFAULT '[]'::jsonb
+);
+
+CREATE INDEX IF NOT EXISTS school_evidence_demand_looked_up_at_idx
+    ON school_evidence_demand (looked_up_at);
@@ -0,0 +1,178 @@
+"""
+Candidate Index for Fuzzy School Name Matching
+Token + character-trigram blocking over pre-normalized name keys
+
+Fuzzy matchers used to score a query against every known name. This index
+normalizes each name once, keeps posting lists for word tokens and padded
+character trigrams, and returns only the short list of names that share
+enough of them with the query.
+
+``candidates`` ranks names by overlap and keeps the best few; it is a
+heuristic shortlist. ``ratio_candidate_ids`` is exact for rapidfuzz's
+``fuzz.ratio``: it keeps every name whose ratio against the query can
+reach a threshold, using a length window and the q-gram count bound (a
+name within Indel distance d of the query shares at least
+``len(query) + 1 - 3 * d`` of its padded trigrams), so scoring only those
+names gives the same best match as scoring all of them.
+
+Candidates are always returned in the original name order so tie-breaking
+in the downstream scorers is unchanged.
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import Dict, List, Optional, Sequence
+
+_TOKEN_RE = re.compile(r"[a-z0-9&']+")
+
+# Words too common in school names to say anything about a match
+STOPWORDS = frozenset({'university', 'college', 'of', 'the', 'at', 'in', 'and'})
+
+# A matching token is worth this many shared trigrams when ranking candidates
+TOKEN_WEIGHT = 3
+
+# Default number of candidates handed to the scorer
+DEFAULT_CANDIDATE_LIMIT = 25
+
+
+def normalize_key(name: str) -> str:
+    """Lowercase and collapse whitespace"""
+    return ' '.join((name or '').lower().split())
+
+
+def name_tokens(key: str) -> set:
+    """Word tokens of a normalized key, without stopwords"""
+    return set(_TOKEN_RE.findall(key)) - STOPWORDS
+
+
+def name_trigrams(key: str) -> set:
+    """Padded character trigrams of a normalized key"""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameCandidateIndex:
+    """Blocking index over a fixed list of names"""
+
+    def __init__(self, names: Sequence[str], max_posting_fraction: float = 0.05):
+        self.names: List[str] = list(names)
+        self.keys: List[str] = [normalize_key(name) for name in self.names]
+
+        # name.lower() → first position, mirrors the linear exact-match scans
+        self._exact: Dict[str, int] = {}
+        self._token_postings: Dict[str, List[int]] = defaultdict(list)
+        self._trigram_postings: Dict[str, List[int]] = defaultdict(list)
+        # For ratio_candidate_ids: names whose key is their lowercased
+        # form, by length; the rest are always candidates
+        self._by_length: Dict[int, List[int]] = defaultdict(list)
+        self._irregular: List[int] = []
+
+        for i, (name, key) in enumerate(zip(self.names, self.keys)):
+            self._exact.setdefault(name.lower(), i)
+            if key == name.lower() and len(key) == len(name):
+                self._by_length[len(key)].append(i)
+            else:
+                self._irregular.append(i)
+            for token in name_tokens(key):
+                self._token_postings[token].append(i)
+            for gram in name_trigrams(key):
+                self._trigram_postings[gram].append(i)
+        self._irregular_set = frozenset(self._irregular)
+
+        # Trigrams such as " st" appear in a large share of names; walking
+        # their postings costs more than it tells us, so skip them when ranking
+        self._max_posting = max(50, int(len(self.names) * max_posting_fraction))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def exact_id(self, query: str) -> Optional[int]:
+        """Position of the first name equal to the query ignoring case"""
+        return self._exact.get((query or '').lower())
+
+    def exact(self, query: str) -> Optional[str]:
+        """First name equal to the query ignoring case, like the old linear scan"""
+        position = self.exact_id(query)
+        return self.names[position] if position is not None else None
+
+    def candidate_ids(self, query: str, limit: Optional[int] = DEFAULT_CANDIDATE_LIMIT) -> List[int]:
+        """
+        Positions of plausible matches, in original order
+
+        Args:
+            query: Raw query name (normalized internally)
+            limit: Keep only the best-overlapping `limit` names; None keeps every
+                name sharing at least one token or trigram
+        """
+        key = normalize_key(query)
+        max_posting = self._max_posting if limit is not None else None
+
+        # Counter over chained postings keeps the counting loop in C
+        scores = Counter(chain.from_iterable(
+            postings
+            for postings in map(self._trigram_postings.get, name_trigrams(key))
+            if postings and (max_posting is None or len(postings) <= max_posting)
+        ))
+        for token in name_tokens(key):
+            for i in self._token_postings.get(token, ()):
+                scores[i] += TOKEN_WEIGHT
+
+        if not scores:
+            return []
+        if limit is None or len(scores) <= limit:
+            return sorted(scores)
+        # Keep every name tied with the limit-th best overlap rather than
+        # breaking ties arbitrarily
+        cutoff = sorted(scores.values(), reverse=True)[limit - 1]
+        return sorted(i for i, score in scores.items() if score >= cutoff)
+
+    def ratio_candidate_ids(self, query: str, threshold: float) -> Optional[List[int]]:
+        """
+        Positions of every name whose ``fuzz.ratio`` with the query can be
+        at least ``threshold`` (0-100), in original order; None when the
+        bound rules nothing out (short query, low threshold) and every
+        name has to be scored
+
+        Lowercasing never lowers the ratio, so the bound is computed on
+        lowercased strings and holds for the case-sensitive score too. A
+        name that must share k of the query's distinct trigrams contains
+        one of its ``distinct - k + 1`` rarest, so only those postings are
+        read (prefix filtering); the scorer then verifies the shortlist.
+        """
+        lowered = (query or '').lower()
+        if threshold <= 0 or len(lowered) != len(query or ''):
+            return None
+        t = threshold / 100.0
+        la = len(lowered)
+        lengths = [
+            length for length in range(
+                max(0, math.ceil(la * t / (2 - t) - 1e-9)),
+                math.floor(la * (2 - t) / t + 1e-9) + 1,
+            )
+            if length in self._by_length
+        ]
+
+        grams = Counter(f"  {lowered} "[i:i + 3] for i in range(la + 1))
+        # Shared grams are counted once per distinct gram, so divide the
+        # (multiset) bound by the query's most repeated gram
+        repeat = max(grams.values())
+        needed = min((
+            math.ceil((la + 1 - 3 * math.floor((1 - t) * (la + length) + 1e-9)) / repeat)
+            for length in lengths
+        ), default=0)
+
+        if needed <= 0 and lengths:
+            return None
+        window = set(lengths)
+        postings = sorted((self._trigram_postings.get(gram, ()) for gram in grams), key=len)
+        ids = (
+            i for i in set(chain.from_iterable(postings[:len(grams) - needed + 1]))
+            if i not in self._irregular_set and len(self.keys[i]) in window
+        )
+        return sorted(chain(ids, self._irregular))
+
+    def candidates(self, query: str, limit: Optional[int] = DEFAULT_CANDIDATE_LIMIT) -> List[str]:
+        """Candidate names for the query, in original order"""
+        return [self.names[i] for i in self.candidate_ids(query, limit)]
@@ -0,0 +1,218 @@
+"""
+School Name Mapping Snapshot
+Compact, versioned SQLite copy of school_baseball_ranking_name_mapping
+
+Written by backend/scripts/refresh_name_mapping_snapshot.py and loaded by
+SchoolNameResolver (web workers, Celery workers, scripts) instead of the
+mapping query fallback chain on every process start.
+
+The file stores every row with a non-null team_name, its verified flag and
+the normalized lookup key, plus a meta table with the format version and a
+fingerprint of the mapping rows (the "database version") so callers can
+tell when the snapshot no longer matches Supabase.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+MAPPING_TABLE = "school_baseball_ranking_name_mapping"
+
+DEFAULT_SNAPSHOT_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "../../data/name_mapping_snapshot.sqlite3")
+)
+
+_SCHEMA = """
+CREATE TABLE meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE mappings (
+    school_name     TEXT PRIMARY KEY,
+    normalized_name TEXT NOT NULL,
+    team_name       TEXT NOT NULL,
+    verified        INTEGER
+);
+"""
+
+
+def snapshot_path() -> str:
+    """Snapshot location, overridable with NAME_MAPPING_SNAPSHOT_PATH"""
+    return os.environ.get("NAME_MAPPING_SNAPSHOT_PATH") or DEFAULT_SNAPSHOT_PATH
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """Same normalization SchoolNameResolver uses for its lookup keys"""
+    if not isinstance(name, str):
+        return ""
+    return " ".join(name.strip().lower().split())
+
+
+def mapping_fingerprint(rows: Iterable[Dict[str, Any]]) -> str:
+    """Order-independent hash of (school_name, team_name, verified) rows"""
+    canonical = sorted(
+        (row.get("school_name") or "", row.get("team_name") or "", str(row.get("verified")))
+        for row in rows
+        if row.get("school_name") and row.get("team_name")
+    )
+    payload = json.dumps(canonical, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def fetch_mapping_rows(client: Any) -> List[Dict[str, Any]]:
+    """All non-null team_name mappings with their verified flag, in one query"""
+    response = client.table(MAPPING_TABLE)\
+        .select("school_name, team_name, verified")\
+        .not_.is_("team_name", "null")\
+        .execute()
+    return response.data or []
+
+
+def select_resolver_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Apply SchoolNameResolver's fallback chain locally:
+    verified rows if any exist, else non-false rows, else every row
+    """
+    usable = [r for r in rows if r.get("school_name") and r.get("team_name")]
+    verified = [r for r in usable if r.get("verified") is True]
+    if verified:
+        return verified
+    non_false = [r for r in usable if r.get("verified") is not False]
+    if non_false:
+        return non_false
+    return usable
+
+
+class MappingSnapshot:
+    """In-memory view of a loaded snapshot file"""
+
+    def __init__(self, rows: List[Dict[str, Any]], meta: Dict[str, str]):
+        self.rows = rows
+        self.meta = meta
+
+    @property
+    def db_version(self) -> Optional[str]:
+        return self.meta.get("db_version")
+
+    @property
+    def created_at(self) -> Optional[str]:
+        return self.meta.get("created_at")
+
+    def build_caches(self):
+        """Return (school→team incl. normalized keys, team→school) dicts"""
+        mapping: Dict[str, str] = {}
+        reverse: Dict[str, str] = {}
+        for row in select_resolver_rows(self.rows):
+            school_name = row["school_name"]
+            team_name = row["team_name"]
+            mapping[school_name] = team_name
+            normalized = row.get("normalized_name") or normalize_name(school_name)
+            if normalized:
+                mapping[normalized] = team_name
+            reverse[team_name] = school_name
+        return mapping, reverse
+
+
+def write_snapshot(rows: List[Dict[str, Any]], path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Atomically write rows to the snapshot file
+
+    The file is built next to the target and renamed into place, so a
+    worker reading the old snapshot never sees a half-written file.
+    """
+    path = path or snapshot_path()
+    usable = [r for r in rows if r.get("school_name") and r.get("team_name")]
+    meta = {
+        "format_version": str(FORMAT_VERSION),
+        "db_version": mapping_fingerprint(usable),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "row_count": str(len(usable)),
+    }
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.executescript(_SCHEMA)
+            conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", meta.items())
+            conn.executemany(
+                "INSERT OR REPLACE INTO mappings (school_name, normalized_name, team_name, verified) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        r["school_name"],
+                        normalize_name(r["school_name"]),
+                        r["team_name"],
+                        None if r.get("verified") is None else int(bool(r["verified"])),
+                    )
+                    for r in usable
+                ],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    logger.info(f"✅ Wrote {len(usable)} mappings to snapshot {path} (db_version {meta['db_version']})")
+    return meta
+
+
+def load_snapshot(path: Optional[str] = None) -> Optional[MappingSnapshot]:
+    """Load a snapshot, or None when missing, unreadable or an old format"""
+    path = path or snapshot_path()
+    if not os.path.exists(path):
+        return None
+
+    start = time.perf_counter()
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+            if meta.get("format_version") != str(FORMAT_VERSION):
+                logger.warning(f"Ignoring name mapping snapshot with format {meta.get('format_version')}")
+                return None
+            rows = [
+                {
+                    "school_name": school_name,
+                    "normalized_name": normalized_name,
+                    "team_name": team_name,
+                    "verified": None if verified is None else bool(verified),
+                }
+                for school_name, normalized_name, team_name, verified in conn.execute(
+                    "SELECT school_name, normalized_name, team_name, verified FROM mappings"
+                )
+            ]
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning(f"Could not read name mapping snapshot {path}: {e}")
+        return None
+
+    logger.info(
+        f"Loaded {len(rows)} mappings from snapshot in {(time.perf_counter() - start) * 1000:.1f} ms"
+    )
+    return MappingSnapshot(rows, meta)
+
+
+def is_snapshot_stale(client: Any, snapshot: Optional[MappingSnapshot]) -> bool:
+    """Compare the snapshot's db_version with a fingerprint of the live table"""
+    if snapshot is None:
+        return True
+    return snapshot.db_version != mapping_fingerprint(fetch_mapping_rows(client))
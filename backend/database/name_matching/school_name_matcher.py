@@ -22,10 +22,18 @@ from dotenv import load_dotenv
 from rapidfuzz import fuzz, process
 FUZZY_LIB = 'rapidfuzz'
 
+from backend.database.batch_writer import BatchUpsertWriter, BatchWriteResult
+from backend.database.name_matching.candidate_index import NameCandidateIndex
+
 load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Columns written when updating existing mapping rows
+MAPPING_UPLOAD_COLUMNS = (
+    'school_name', 'team_name', 'match_type', 'confidence_score', 'normalized_school_name', 'verified'
+)
+
 
 class SchoolNameMatcher:
     """Matches school names to baseball rankings team names using exact and fuzzy matching"""
@@ -41,6 +49,8 @@ class SchoolNameMatcher:
         self.supabase: Client = create_client(url, key)
         self.school_names = []
         self.team_names = []
+        self._team_index: Optional[NameCandidateIndex] = None
+        self._team_index_source: Optional[List[str]] = None
 
         logger.info(f"Using fuzzy matching library: {FUZZY_LIB}")
 
@@ -166,6 +176,13 @@ class SchoolNameMatcher:
             logger.error(f"❌ Error fetching team names: {e}")
             raise
 
+    def _get_team_index(self, team_names: List[str]) -> NameCandidateIndex:
+        """Blocking index over team_names, rebuilt only when a different list is passed"""
+        if self._team_index is None or self._team_index_source is not team_names:
+            self._team_index = NameCandidateIndex(team_names)
+            self._team_index_source = team_names
+        return self._team_index
+
     def find_exact_match(self, normalized_name: str, team_names: List[str]) -> Optional[str]:
         """
         Look for exact match (case-insensitive) in team names
@@ -177,13 +194,7 @@ class SchoolNameMatcher:
         Returns:
             Matched team name if found, None otherwise
         """
-        normalized_lower = normalized_name.lower()
-
-        for team_name in team_names:
-            if team_name.lower() == normalized_lower:
-                return team_name
-
-        return None
+        return self._get_team_index(team_names).exact(normalized_name)
 
     def find_fuzzy_match(self, normalized_name: str, team_names: List[str],
                         threshold: float = 90.0) -> Optional[Tuple[str, float]]:
@@ -191,6 +202,12 @@ class SchoolNameMatcher:
         Find fuzzy match using ratio-based fuzzy string matching
         Only returns match if confidence is above threshold (90%)
 
+        Only the team names the blocking index cannot rule out are scored
+        (``NameCandidateIndex.ratio_candidate_ids``); the index keeps every
+        name that could reach the threshold, so the result is the same as
+        an exhaustive extractOne over team_names. When the bound rules
+        nothing out, team_names is scored once, as before the index.
+
         Args:
             normalized_name: The normalized school name
             team_names: List of team names to search
@@ -199,12 +216,16 @@ class SchoolNameMatcher:
         Returns:
             Tuple of (matched_team_name, confidence_score) if above threshold, None otherwise
         """
+        candidate_ids = self._get_team_index(team_names).ratio_candidate_ids(normalized_name, threshold)
+        choices = team_names if candidate_ids is None else [team_names[i] for i in candidate_ids]
+
         # Use extractOne to find best match
         result = process.extractOne(
             normalized_name,
-            team_names,
-            scorer=fuzz.ratio
-        )
+            choices,
+            scorer=fuzz.ratio,
+            score_cutoff=threshold
+        ) if choices else None
 
         if result is None:
             return None
@@ -360,67 +381,64 @@ class SchoolNameMatcher:
         logger.info(f"Needs manual review: {fuzzy_matches + no_matches} ({(fuzzy_matches + no_matches)/total*100:.1f}%)")
         logger.info("=" * 80)
 
-    def upload_to_database(self, results: List[Dict], use_update: bool = True):
+    def upload_to_database(self, results: List[Dict], use_update: bool = True,
+                           dry_run: bool = False, only_changed: bool = True) -> Optional[BatchWriteResult]:
         """
         Upload matching results to school_baseball_ranking_name_mapping table
 
+        Rows are sent in chunks through BatchUpsertWriter instead of one
+        request per school; transient failures are retried and rejected
+        chunks are split to isolate the bad rows.
+
         Args:
             results: List of match result dictionaries
-            use_update: If True, UPDATE existing records. If False, INSERT new records
+            use_update: If True, only touch schools already in the table
+                (upsert on school_name, UPDATE semantics). If False, INSERT new
+                records; schools already in the table are rejected and reported
+            dry_run: Report which rows would change without writing
+            only_changed: Skip rows identical to what is already stored
         """
         logger.info("\n" + "=" * 80)
-        logger.info("Uploading results to database...")
+        logger.info("Uploading results to database..." if not dry_run else "Dry run: diffing results against database...")
         logger.info("=" * 80)
 
         if not results:
             logger.warning("No results to upload!")
-            return
+            return None
 
-        total_results = len(results)
-        successful_updates = 0
-        failed_updates = 0
+        if use_update:
+            rows = [{column: record[column] for column in MAPPING_UPLOAD_COLUMNS} for record in results]
+        else:
+            rows = list(results)
 
-        logger.info(f"Processing {total_results} records...")
+        logger.info(f"Processing {len(rows)} records...")
         logger.info(f"Mode: {'UPDATE existing records' if use_update else 'INSERT new records'}")
         logger.info("-" * 80)
 
-        # Process each record individually for UPDATE operations
-        for i, record in enumerate(results, 1):
-            if i % 50 == 0:
-                logger.info(f"Progress: {i}/{total_results} records processed...")
-
-            try:
-                if use_update:
-                    # UPDATE existing record by school_name
-                    response = self.supabase.table('school_baseball_ranking_name_mapping')\
-                        .update({
-                            'team_name': record['team_name'],
-                            'match_type': record['match_type'],
-                            'confidence_score': record['confidence_score'],
-                            'normalized_school_name': record['normalized_school_name'],
-                            'verified': record['verified']
-                        })\
-                        .eq('school_name', record['school_name'])\
-                        .execute()
-                else:
-                    # INSERT new record
-                    response = self.supabase.table('school_baseball_ranking_name_mapping')\
-                        .insert(record)\
-                        .execute()
-
-                successful_updates += 1
-
-            except Exception as e:
-                failed_updates += 1
-                logger.error(f"❌ Error processing '{record['school_name']}': {e}")
+        writer = BatchUpsertWriter(
+            self.supabase, 'school_baseball_ranking_name_mapping', on_conflict='school_name',
+            mode='upsert' if use_update else 'insert',
+        )
+        result = writer.write(rows, dry_run=dry_run, only_changed=only_changed, update_only=use_update)
 
         logger.info("\n" + "=" * 80)
-        logger.info("UPLOAD SUMMARY")
+        logger.info("UPLOAD SUMMARY" if not dry_run else "DRY RUN SUMMARY")
         logger.info("=" * 80)
-        logger.info(f"Total records: {total_results}")
-        logger.info(f"Successfully updated: {successful_updates}")
-        logger.info(f"Failed updates: {failed_updates}")
+        logger.info(f"Total records: {result.rows_total}")
+        logger.info(f"Changed: {len(result.changed_keys)}")
+        logger.info(f"Unchanged (skipped): {result.rows_unchanged}")
+        if use_update:
+            logger.info(f"Not in mapping table (skipped): {result.rows_missing}")
+        if dry_run:
+            for (school_name,) in result.changed_keys[:20]:
+                logger.info(f"  would write: '{school_name}'")
+        else:
+            logger.info(f"Successfully written: {result.rows_written} ({result.rows_per_second:.0f} rows/s)")
+            logger.info(f"Failed: {result.rows_failed}")
+            for (school_name,) in result.failed_keys[:20]:
+                logger.error(f"  ❌ not written: '{school_name}'")
         logger.info("=" * 80)
+        return result
 
     def print_sample_matches(self, results: List[Dict], sample_size: int = 10):
         """Print sample matches for review"""
@@ -484,6 +502,11 @@ def main():
         # Print sample matches for review
         matcher.print_sample_matches(results, sample_size=20)
 
+        # --dry-run: show which mapping rows would change, write nothing
+        if '--dry-run' in sys.argv[1:]:
+            matcher.upload_to_database(results, use_update=True, dry_run=True)
+            return
+
         # Ask for confirmation before uploading
         logger.info("\n" + "=" * 80)
         response = input("\nDo you want to UPDATE these results in the database? (yes/no): ").strip().lower()
@@ -495,6 +518,7 @@ def main():
             logger.info("1. Review the updated matches in Supabase")
             logger.info("2. Manually verify fuzzy matches and no_matches")
             logger.info("3. Update the 'verified' column (true/false) for each record")
+            logger.info("4. Refresh the resolver snapshot: python -m backend.scripts.refresh_name_mapping_snapshot")
         else:
             logger.info("\nUpdate cancelled. Results not saved to database.")
 
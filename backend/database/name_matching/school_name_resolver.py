@@ -6,7 +6,8 @@ Resolves names between school_data_general and baseball_rankings_data using the
 import os
 import sys
 import logging
-from typing import Optional, Dict
+from datetime import datetime, timezone
+from typing import Optional, Dict, Iterable
 from functools import lru_cache
 
 # Add project root to path
@@ -17,6 +18,14 @@ if project_root not in sys.path:
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
+from backend.database.name_matching.mapping_snapshot import (
+    MappingSnapshot,
+    fetch_mapping_rows,
+    is_snapshot_stale,
+    load_snapshot,
+    mapping_fingerprint,
+)
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
@@ -27,8 +36,13 @@ class SchoolNameResolver:
     Uses caching to minimize database queries
     """
 
-    def __init__(self):
-        """Initialize Supabase client and load mappings"""
+    def __init__(self, use_snapshot: bool = True):
+        """Initialize Supabase client and load mappings
+
+        Args:
+            use_snapshot: Load mappings from the on-disk snapshot when one exists
+                (see mapping_snapshot.py) instead of querying the mapping table
+        """
         url = os.environ.get("SUPABASE_URL")
         key = os.environ.get("SUPABASE_SERVICE_KEY")
 
@@ -38,7 +52,14 @@ class SchoolNameResolver:
         self.supabase: Client = create_client(url, key)
         self._mapping_cache = {}  # Cache for school_name -> team_name
         self._reverse_cache = {}  # Cache for team_name -> school_name
+        # Every non-null mapping, verified or not, when the full row set is
+        # loaded (snapshot or reload_cache); serves verified_only=False misses
+        self._any_mapping: Optional[Dict[str, str]] = None
+        self._any_reverse: Optional[Dict[str, str]] = None
         self._cache_loaded = False
+        self.use_snapshot = use_snapshot
+        self._snapshot = None
+        self.cache_source = None
 
     @staticmethod
     def _normalize_name(name: Optional[str]) -> str:
@@ -51,6 +72,12 @@ class SchoolNameResolver:
         if self._cache_loaded:
             return
 
+        if self.use_snapshot:
+            snapshot = load_snapshot()
+            if snapshot is not None:
+                self._use_snapshot(snapshot, "snapshot")
+                return
+
         try:
             logger.info("Loading school name mappings into cache...")
 
@@ -92,12 +119,22 @@ class SchoolNameResolver:
             else:
                 logger.warning("No school/team mappings found in database")
 
+            self.cache_source = "database"
             self._cache_loaded = True
 
         except Exception as e:
             logger.error(f"❌ Error loading mappings cache: {e}")
             self._cache_loaded = True  # Mark as loaded to prevent repeated failures
 
+    def _use_snapshot(self, snapshot: MappingSnapshot, source: str):
+        """Serve every lookup from a full set of mapping rows"""
+        self._mapping_cache, self._reverse_cache = snapshot.build_caches()
+        self._any_mapping = {r["school_name"]: r["team_name"] for r in snapshot.rows}
+        self._any_reverse = {r["team_name"]: r["school_name"] for r in snapshot.rows}
+        self._snapshot = snapshot
+        self.cache_source = source
+        self._cache_loaded = True
+
     def get_team_name(self, school_name: str, verified_only: bool = True) -> Optional[str]:
         """
         Get team name from school name
@@ -124,6 +161,8 @@ class SchoolNameResolver:
         # If not in cache and we want verified only, return None
         if verified_only:
             return None
+        if self._any_mapping is not None:
+            return self._any_mapping.get(school_name)
 
         # Otherwise, query database for unverified mappings
         try:
@@ -144,6 +183,53 @@ class SchoolNameResolver:
 
         return None
 
+    def resolve_many(self, school_names: Iterable[str], verified_only: bool = True) -> Dict[str, Optional[str]]:
+        """
+        Resolve many school names to team names at once
+
+        Args:
+            school_names: School names from school_data_general
+            verified_only: If False, names missing from the cache are looked up
+                in one batched query instead of one query per name
+
+        Returns:
+            Dictionary mapping each input school name to its team name or None
+        """
+        if not self._cache_loaded:
+            self._load_cache()
+
+        resolved: Dict[str, Optional[str]] = {}
+        misses = []
+        for school_name in school_names:
+            team_name = self._mapping_cache.get(school_name)
+            if team_name is None:
+                team_name = self._mapping_cache.get(self._normalize_name(school_name))
+            resolved[school_name] = team_name
+            if team_name is None:
+                misses.append(school_name)
+
+        if verified_only or not misses:
+            return resolved
+        if self._any_mapping is not None:
+            for school_name in misses:
+                resolved[school_name] = self._any_mapping.get(school_name)
+            return resolved
+
+        try:
+            for start in range(0, len(misses), 500):
+                response = self.supabase.table('school_baseball_ranking_name_mapping')\
+                    .select('school_name, team_name')\
+                    .in_('school_name', misses[start:start + 500])\
+                    .not_.is_('team_name', 'null')\
+                    .execute()
+                for row in response.data or []:
+                    if resolved.get(row['school_name']) is None:
+                        resolved[row['school_name']] = row['team_name']
+        except Exception as e:
+            logger.error(f"Error batch-resolving {len(misses)} school names: {e}")
+
+        return resolved
+
     def get_school_name(self, team_name: str, verified_only: bool = True) -> Optional[str]:
         """
         Get school name from team name (reverse lookup)
@@ -166,6 +252,8 @@ class SchoolNameResolver:
         # If not in cache and we want verified only, return None
         if verified_only:
             return None
+        if self._any_reverse is not None:
+            return self._any_reverse.get(team_name)
 
         # Otherwise, query database for unverified mappings
         try:
@@ -224,11 +312,37 @@ class SchoolNameResolver:
         return team_name is not None
 
     def reload_cache(self):
-        """Force reload of the cache (useful after updates)"""
+        """Force reload of the cache from the mapping table (useful after updates)
+
+        Bypasses the on-disk snapshot, which only changes when
+        refresh_name_mapping_snapshot.py runs
+        """
         self._mapping_cache = {}
         self._reverse_cache = {}
+        self._any_mapping = None
+        self._any_reverse = None
+        self._snapshot = None
         self._cache_loaded = False
-        self._load_cache()
+        try:
+            rows = fetch_mapping_rows(self.supabase)
+        except Exception as e:
+            logger.error(f"❌ Error reloading mappings from database: {e}")
+            self._load_cache()
+            return
+        meta = {
+            "db_version": mapping_fingerprint(rows),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self._use_snapshot(MappingSnapshot(rows, meta), "database")
+        logger.info(f"✅ Reloaded {len(rows)} mappings from database")
+
+    def is_snapshot_stale(self) -> bool:
+        """True when the loaded snapshot no longer matches the mapping table"""
+        if not self._cache_loaded:
+            self._load_cache()
+        if self.cache_source != "snapshot":
+            return False
+        return is_snapshot_stale(self.supabase, self._snapshot)
 
     def get_cache_stats(self) -> Dict:
         """Get cache statistics"""
@@ -237,7 +351,10 @@ class SchoolNameResolver:
 
         return {
             'verified_mappings': len(self._mapping_cache),
-            'cache_loaded': self._cache_loaded
+            'cache_loaded': self._cache_loaded,
+            'cache_source': self.cache_source,
+            'snapshot_db_version': self._snapshot.db_version if self._snapshot else None,
+            'snapshot_created_at': self._snapshot.created_at if self._snapshot else None,
         }
 
 
@@ -0,0 +1,247 @@
+"""Read/write helpers for the ``school_baseball_enriched`` table.
+
+One row per school holding the result of the
+``school_data_general`` → ``school_baseball_ranking_name_mapping`` →
+``baseball_rankings_data`` join, plus the precomputed SCI numbers from
+``compute_school_sci_from_rankings``. Populated by
+``backend/scripts/refresh_school_enriched_dataset.py`` after every
+rankings scrape; read by ``AsyncSchoolDataQueries`` so API processes
+load one narrow table instead of rebuilding the join at startup.
+
+Column names match the enrichment payload keys the API already puts on
+each school dict, so a row converts to a payload without renaming.
+
+``SQLITE_SCHEMA`` mirrors the Postgres migration for hermetic tests and
+local experiments: JSONB columns become TEXT holding JSON.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from backend.database.batch_writer import BatchUpsertWriter
+
+logger = logging.getLogger(__name__)
+
+TABLE = "school_baseball_enriched"
+
+# Keys copied onto each school dict by
+# AsyncSchoolDataQueries._enrich_schools_with_division_group.
+PAYLOAD_COLUMNS: tuple[str, ...] = (
+    "division_group",
+    "baseball_team_name",
+    "baseball_rankings_year",
+    "baseball_division",
+    "baseball_record",
+    "baseball_wins",
+    "baseball_losses",
+    "baseball_overall_rating",
+    "baseball_offensive_rating",
+    "baseball_defensive_rating",
+    "baseball_power_rating",
+    "baseball_strength_of_schedule",
+    "baseball_division_percentile",
+    "baseball_sci_hitter",
+    "baseball_sci_pitcher",
+    "baseball_trend_bonus",
+    "baseball_sci_overall_weighted",
+    "baseball_sci_offensive_weighted",
+    "baseball_sci_defensive_weighted",
+    "baseball_sci_power_weighted",
+    "baseball_sci_yearly_overall",
+)
+
+# Stored for offline consumers (rankings integration, audits) but not
+# loaded by the API — it would otherwise leak onto every school dict.
+YEARLY_RANKINGS_COLUMN = "baseball_rankings_by_year"
+
+# PostgREST caps each response at 1000 rows; full-table reads page.
+_PAGE_SIZE = 1000
+
+_JSON_COLUMNS = frozenset({"baseball_sci_yearly_overall", YEARLY_RANKINGS_COLUMN})
+
+SQLITE_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS {TABLE} (
+    school_name                      TEXT PRIMARY KEY,
+    normalized_name                  TEXT NOT NULL,
+    division_group                   TEXT NOT NULL,
+    baseball_team_name               TEXT NOT NULL,
+    baseball_rankings_year           INTEGER,
+    baseball_division                INTEGER,
+    baseball_record                  TEXT,
+    baseball_wins                    INTEGER,
+    baseball_losses                  INTEGER,
+    baseball_overall_rating          REAL,
+    baseball_offensive_rating        REAL,
+    baseball_defensive_rating        REAL,
+    baseball_power_rating            REAL,
+    baseball_strength_of_schedule    REAL,
+    baseball_division_percentile     REAL,
+    baseball_sci_hitter              REAL,
+    baseball_sci_pitcher             REAL,
+    baseball_trend_bonus             REAL NOT NULL DEFAULT 0,
+    baseball_sci_overall_weighted    REAL,
+    baseball_sci_offensive_weighted  REAL,
+    baseball_sci_defensive_weighted  REAL,
+    baseball_sci_power_weighted      REAL,
+    baseball_sci_yearly_overall      TEXT NOT NULL DEFAULT '{{}}',
+    baseball_rankings_by_year        TEXT NOT NULL DEFAULT '{{}}',
+    refreshed_at                     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_{TABLE}_normalized_name
+    ON {TABLE}(normalized_name);
+"""
+
+
+def normalize_school_name(name: Any) -> str:
+    """Same normalization ``AsyncSchoolDataQueries`` uses for cache keys."""
+    if not isinstance(name, str):
+        return ""
+    return " ".join(name.strip().lower().split())
+
+
+def rows_from_payloads(
+    payloads: Dict[str, Dict[str, Any]],
+    refreshed_at: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Turn ``{school_name: enrichment_payload}`` into table rows.
+
+    Payloads that carry ``baseball_rankings_by_year`` keep it; missing
+    payload keys are stored as NULL so the row shape is always complete.
+    """
+    stamp = refreshed_at or datetime.now(timezone.utc).isoformat()
+    rows: List[Dict[str, Any]] = []
+    for school_name in sorted(payloads):
+        payload = payloads[school_name]
+        row: Dict[str, Any] = {
+            "school_name": school_name,
+            "normalized_name": normalize_school_name(school_name),
+        }
+        for column in PAYLOAD_COLUMNS:
+            row[column] = payload.get(column)
+        row["baseball_sci_yearly_overall"] = payload.get("baseball_sci_yearly_overall") or {}
+        row["baseball_trend_bonus"] = payload.get("baseball_trend_bonus") or 0.0
+        row[YEARLY_RANKINGS_COLUMN] = payload.get(YEARLY_RANKINGS_COLUMN) or {}
+        row["refreshed_at"] = stamp
+        rows.append(row)
+    return rows
+
+
+def payload_from_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Inverse of ``rows_from_payloads`` for the API-facing columns only."""
+    payload = {column: row.get(column) for column in PAYLOAD_COLUMNS}
+    yearly = payload.get("baseball_sci_yearly_overall")
+    if isinstance(yearly, str):
+        try:
+            yearly = json.loads(yearly)
+        except ValueError:
+            yearly = {}
+    payload["baseball_sci_yearly_overall"] = yearly or {}
+    return payload
+
+
+def _select_all(client: Any, columns: str) -> List[Dict[str, Any]]:
+    """Every row of the table, paged in school_name order."""
+    rows: List[Dict[str, Any]] = []
+    start = 0
+    while True:
+        response = (
+            client.table(TABLE)
+            .select(columns)
+            .order("school_name")
+            .range(start, start + _PAGE_SIZE - 1)
+            .execute()
+        )
+        page = response.data or []
+        rows.extend(page)
+        if len(page) < _PAGE_SIZE:
+            return rows
+        start += _PAGE_SIZE
+
+
+def load_enriched_rows(client: Any) -> List[Dict[str, Any]]:
+    """Read every materialized row's API-facing columns, a page at a time.
+
+    Returns ``[]`` when the table is missing, empty, or any page fails
+    — callers treat that as "not materialized yet" and rebuild the join.
+    """
+    try:
+        rows = _select_all(client, ", ".join(("school_name",) + PAYLOAD_COLUMNS))
+    except Exception as exc:
+        logger.warning("%s lookup failed, falling back to live join: %s", TABLE, exc)
+        return []
+    return [
+        row for row in rows
+        if row.get("school_name") and row.get("baseball_team_name")
+    ]
+
+
+def upsert_enriched_rows(client: Any, rows: List[Dict[str, Any]], chunk_size: int = 200) -> int:
+    """Upsert rows in chunks (failed chunks retried); returns the number of rows written."""
+    writer = BatchUpsertWriter(client, TABLE, on_conflict="school_name", chunk_size=chunk_size)
+    return writer.write(rows).rows_written
+
+
+def delete_rows_except(client: Any, keep_school_names: List[str]) -> int:
+    """Remove rows for schools that no longer resolve to a ranked team."""
+    keep = set(keep_school_names)
+    stale = [
+        row["school_name"] for row in _select_all(client, "school_name")
+        if row.get("school_name") and row["school_name"] not in keep
+    ]
+    for start in range(0, len(stale), 200):
+        client.table(TABLE).delete().in_("school_name", stale[start:start + 200]).execute()
+    return len(stale)
+
+
+# ---------------------------------------------------------------------------
+# SQLite variant
+# ---------------------------------------------------------------------------
+
+
+def create_sqlite_schema(conn: sqlite3.Connection) -> None:
+    conn.executescript(SQLITE_SCHEMA)
+
+
+def write_sqlite(conn: sqlite3.Connection, rows: List[Dict[str, Any]]) -> int:
+    """Replace the SQLite table's contents with ``rows``."""
+    create_sqlite_schema(conn)
+    columns = ("school_name", "normalized_name") + PAYLOAD_COLUMNS + (
+        YEARLY_RANKINGS_COLUMN,
+        "refreshed_at",
+    )
+    placeholders = ", ".join("?" for _ in columns)
+    encoded = [
+        tuple(
+            json.dumps(row.get(column) or {}, sort_keys=True)
+            if column in _JSON_COLUMNS
+            else row.get(column)
+            for column in columns
+        )
+        for row in rows
+    ]
+    with conn:
+        conn.execute(f"DELETE FROM {TABLE}")
+        conn.executemany(
+            f"INSERT INTO {TABLE} ({', '.join(columns)}) VALUES ({placeholders})",
+            encoded,
+        )
+    return len(encoded)
+
+
+def read_sqlite(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+    """Read rows back with JSON columns decoded."""
+    cursor = conn.execute(f"SELECT * FROM {TABLE} ORDER BY school_name")
+    names = [d[0] for d in cursor.description]
+    rows: List[Dict[str, Any]] = []
+    for values in cursor.fetchall():
+        row = dict(zip(names, values))
+        for column in _JSON_COLUMNS:
+            if isinstance(row.get(column), str):
+                row[column] = json.loads(row[column])
+        rows.append(row)
+    return rows
@@ -8,18 +8,43 @@ Anything older than ``TTL_DAYS`` or marked ``source_status='failed'`` is
 treated as a miss; the worker then falls through to its existing
 live-fetch path. This module is intentionally read-only — the cron
 script handles writes.
+
+Each row also keeps the HTTP validators (ETag, Last-Modified) and a
+content hash for the roster and stats pages, plus the ParsedPlayer /
+ParsedStatLine lists they parsed into. ``load_previous_pages`` hands
+those back — regardless of age — so the next fetch can be conditional
+and skip parsing when the page hasn't changed.
+
+The validators also carry the parser strategy learned for the page's
+host (parse_strategy.py): ``serialize_pages`` stamps it from
+``PARSER_STRATEGIES`` and ``load_previous_pages`` seeds the registry
+with it, which is how that memory survives across processes.
+
+Players and stat lines are stored as flat objects without the fields
+that still hold their defaults (``None`` / ``False`` / ``0``); reading
+fills them back in, so rows written either way decode the same.
 """
 
 from __future__ import annotations
 
 import logging
-from dataclasses import asdict
+from dataclasses import MISSING, asdict, fields, replace
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
 from backend.api.clients.supabase import get_supabase_admin_client
+from backend.llm.deep_school_insights.html_stream import PARSER_VERSION
+from backend.llm.deep_school_insights.parse_strategy import (
+    PARSER_STRATEGIES,
+    ParserStrategy,
+    parser_memory_enabled,
+)
+from backend.llm.deep_school_insights.retry import host_of
 from backend.llm.deep_school_insights.types import (
+    CachedPage,
     MatchedPlayer,
+    PageFetch,
+    PageValidators,
     ParsedPlayer,
     ParsedStatLine,
 )
@@ -32,6 +57,19 @@ TTL_DAYS = 14
 
 TABLE = "school_evidence_cache"
 
+# Page kinds stored in page_validators, and the item type each parses into.
+PAGE_ITEM_TYPES = {"roster": ParsedPlayer, "stats": ParsedStatLine}
+_PAGE_ITEM_COLUMNS = {"roster": "parsed_players", "stats": "parsed_stats"}
+
+_LOOKUP_CHUNK = 200
+
+# (field name, default) per stored dataclass; required fields never match.
+_FIELD_DEFAULTS = {
+    cls: tuple((f.name, f.default) for f in fields(cls))
+    for cls in (ParsedPlayer, ParsedStatLine, PageValidators)
+}
+_FIELD_NAMES = {cls: frozenset(name for name, _ in spec) for cls, spec in _FIELD_DEFAULTS.items()}
+
 
 def _parse_dt(value: Any) -> Optional[datetime]:
     """Tolerant ISO-8601 parser for the timestamp Supabase returns."""
@@ -89,13 +127,111 @@ def load_cache_batch(school_names: List[str]) -> Dict[str, Dict[str, Any]]:
     return fresh
 
 
+def load_previous_pages(school_names: List[str]) -> Dict[str, Dict[str, CachedPage]]:
+    """Stored validators + parsed items per school, for conditional re-fetch.
+
+    Unlike ``load_cache_batch`` this ignores TTL and source_status: an old
+    or partially failed row still tells us whether a page has changed.
+    Returns ``{school_name: {"roster": CachedPage, "stats": CachedPage}}``
+    with only the pages that have validators; silent ``{}`` on any error.
+    """
+    if not school_names:
+        return {}
+
+    client = get_supabase_admin_client()
+    if client is None:
+        return {}
+
+    out: Dict[str, Dict[str, CachedPage]] = {}
+    try:
+        for start in range(0, len(school_names), _LOOKUP_CHUNK):
+            resp = (
+                client.table(TABLE)
+                .select("school_name, page_validators, parsed_players, parsed_stats")
+                .in_("school_name", school_names[start:start + _LOOKUP_CHUNK])
+                .execute()
+            )
+            for row in resp.data or []:
+                pages = previous_pages_from_row(row)
+                if pages:
+                    out[row["school_name"]] = pages
+                    seed_parser_strategies(pages)
+    except Exception as exc:
+        logger.warning("school_evidence_cache validator lookup failed: %s", exc)
+        return {}
+    return out
+
+
+def previous_pages_from_row(row: Dict[str, Any]) -> Dict[str, CachedPage]:
+    """Rehydrate the page_validators / parsed_* columns of one row."""
+    validators = row.get("page_validators") or {}
+    if not isinstance(validators, dict):
+        return {}
+    pages: Dict[str, CachedPage] = {}
+    for kind, item_cls in PAGE_ITEM_TYPES.items():
+        stored = validators.get(kind)
+        if not isinstance(stored, dict) or not stored.get("url"):
+            continue
+        items = row.get(_PAGE_ITEM_COLUMNS[kind]) or []
+        pages[kind] = CachedPage(
+            validators=_dict_to_dataclass(stored, PageValidators),
+            items=[_dict_to_dataclass(item, item_cls) for item in items if isinstance(item, dict)],
+        )
+    return pages
+
+
+def seed_parser_strategies(pages: Dict[str, CachedPage]) -> int:
+    """Seed ``PARSER_STRATEGIES`` from the strategies stored with ``pages``.
+
+    Strategies recorded under another parser version are skipped: the
+    parsers they name may have changed. Returns how many were adopted.
+    """
+    if not parser_memory_enabled():
+        return 0
+    seeded = 0
+    for kind, page in pages.items():
+        v = page.validators
+        host = host_of(v.url)
+        if not host or not v.parser or not v.layout or v.parser_version != PARSER_VERSION:
+            continue
+        strategy = ParserStrategy(parser=v.parser, variant=v.parser_variant, fingerprint=v.layout)
+        seeded += PARSER_STRATEGIES.seed(host, kind, strategy)
+    return seeded
+
+
+def _with_parser_strategy(validators: PageValidators, kind: str) -> PageValidators:
+    strategy = PARSER_STRATEGIES.get(host_of(validators.url), kind)
+    if strategy is None:
+        return validators
+    return replace(
+        validators, parser=strategy.parser, parser_variant=strategy.variant, layout=strategy.fingerprint,
+    )
+
+
+def serialize_pages(roster: PageFetch, stats: PageFetch) -> Dict[str, Any]:
+    """Upsert columns for the pages just fetched. Used by the cron writer.
+
+    Pages without validators (failed / unavailable) are left out so a
+    transient failure doesn't poison the next conditional request. Each
+    page's validators carry the parser strategy known for its host.
+    """
+    validators: Dict[str, Any] = {}
+    for kind, page in (("roster", roster), ("stats", stats)):
+        if page.validators is not None:
+            validators[kind] = asdict(_with_parser_strategy(page.validators, kind))
+    return {
+        "page_validators": validators,
+        "parsed_players": [_encode(p) for p in roster.items] if "roster" in validators else [],
+        "parsed_stats": [_encode(s) for s in stats.items] if "stats" in validators else [],
+    }
+
+
 def deserialize_matched_players(blob: Any) -> List[MatchedPlayer]:
     """Rehydrate JSON list (as stored in matched_players JSONB) into dataclasses.
 
-    The cron writes ``[asdict(MatchedPlayer), ...]``; this is the inverse.
-    Extra/missing fields are tolerated so a schema drift in either
-    direction degrades gracefully (extra fields ignored; missing fields
-    fall back to dataclass defaults).
+    The inverse of ``serialize_matched_players``. Extra/missing fields are
+    tolerated so a schema drift in either direction degrades gracefully
+    (extra fields ignored; missing fields fall back to dataclass defaults).
     """
     if not blob:
         return []
@@ -104,10 +240,9 @@ def deserialize_matched_players(blob: Any) -> List[MatchedPlayer]:
     for entry in blob:
         if not isinstance(entry, dict):
             continue
-        player_d = entry.get("player") or {}
         out.append(
             MatchedPlayer(
-                player=_dict_to_dataclass(player_d, ParsedPlayer),
+                player=_dict_to_dataclass(entry.get("player") or {}, ParsedPlayer),
                 batting_stats=_dict_to_dataclass_or_none(
                     entry.get("batting_stats"), ParsedStatLine
                 ),
@@ -121,7 +256,24 @@ def deserialize_matched_players(blob: Any) -> List[MatchedPlayer]:
 
 def serialize_matched_players(matched: List[MatchedPlayer]) -> List[Dict[str, Any]]:
     """Inverse of deserialize_matched_players. Used by the cron writer."""
-    return [asdict(m) for m in matched]
+    out: List[Dict[str, Any]] = []
+    for m in matched:
+        entry: Dict[str, Any] = {"player": _encode(m.player)}
+        if m.batting_stats is not None:
+            entry["batting_stats"] = _encode(m.batting_stats)
+        if m.pitching_stats is not None:
+            entry["pitching_stats"] = _encode(m.pitching_stats)
+        out.append(entry)
+    return out
+
+
+def _encode(obj: Any) -> Dict[str, Any]:
+    """Fields of a stored dataclass that differ from their defaults."""
+    return {
+        name: value
+        for name, default in _FIELD_DEFAULTS[type(obj)]
+        if (value := getattr(obj, name)) != default or default is MISSING
+    }
 
 
 def _dict_to_dataclass(data: Dict[str, Any], cls):
@@ -131,8 +283,12 @@ def _dict_to_dataclass(data: Dict[str, Any], cls):
     cache row was written gets the dataclass default; a field removed
     from the dataclass is silently dropped.
     """
-    fields = {f for f in cls.__dataclass_fields__}
-    return cls(**{k: v for k, v in data.items() if k in fields})
+    names = _FIELD_NAMES.get(cls)
+    if names is None:
+        names = frozenset(cls.__dataclass_fields__)
+    if names.issuperset(data):
+        return cls(**data)
+    return cls(**{k: v for k, v in data.items() if k in names})
 
 
 def _dict_to_dataclass_or_none(data: Optional[Dict[str, Any]], cls):
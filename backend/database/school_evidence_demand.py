@@ -0,0 +1,247 @@
+"""Research demand for ``school_evidence_cache`` and cache-warming priority.
+
+Every research batch looks up its schools in the evidence cache
+(``load_cache_batch``). ``record_lookup`` appends one
+``school_evidence_demand`` row per lookup — the schools asked for and
+the ones that hit — so we know which schools paid evaluations actually
+research and how often the cache served them.
+
+``plan_warming`` turns that into a refresh order for
+``refresh_school_evidence_cache.py``. A school's priority is the
+research misses a refresh now avoids before the next cron run: its
+lookup rate times the days in that interval its entry would spend past
+``TTL_DAYS`` (or missing / failed). Schools that won't expire in time
+follow, oldest entry first. Under a time budget the cron works down
+that list, so hot schools are refreshed before they expire instead of
+wherever they fall alphabetically.
+
+The same numbers give the expected research hit ratio for the next
+interval, with and without the planned refreshes; ``load_demand``
+gives the measured ratio over the recorded window. Rows older than the
+window are never read again; the cron deletes them (``prune_demand``).
+
+Writes are best-effort and never fail a research run.
+``EVIDENCE_DEMAND_TRACKING=0`` stops recording.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from backend.api.clients.supabase import get_supabase_admin_client
+from backend.database.school_evidence_cache import TABLE as CACHE_TABLE
+from backend.database.school_evidence_cache import TTL_DAYS, _LOOKUP_CHUNK, _parse_dt
+
+logger = logging.getLogger(__name__)
+
+TABLE = "school_evidence_demand"
+
+# How far back demand is read, and the cron interval it is planned for.
+DEMAND_WINDOW_DAYS = 28
+REFRESH_INTERVAL_DAYS = 7
+
+_PAGE_SIZE = 1000
+
+
+def demand_tracking_enabled() -> bool:
+    return os.getenv("EVIDENCE_DEMAND_TRACKING", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def record_lookup(school_names: Sequence[str], hits: Sequence[str]) -> bool:
+    """Append one demand row for a research cache lookup; False if not written."""
+    if not school_names or not demand_tracking_enabled():
+        return False
+    client = get_supabase_admin_client()
+    if client is None:
+        return False
+    looked_up = set(school_names)
+    try:
+        client.table(TABLE).insert({
+            "schools": list(school_names),
+            "hits": [name for name in hits if name in looked_up],
+        }).execute()
+        return True
+    except Exception as exc:
+        logger.warning("school_evidence_demand insert failed: %s", exc)
+        return False
+
+
+@dataclass
+class DemandSummary:
+    """Lookups per school over a window, and how many of them hit."""
+
+    window_days: float
+    lookups: Counter = field(default_factory=Counter)
+    hits: Counter = field(default_factory=Counter)
+
+    def add(self, schools: Sequence[str], hits: Sequence[str]) -> None:
+        self.lookups.update(schools)
+        self.hits.update(h for h in hits if h in self.lookups)
+
+    @property
+    def total_lookups(self) -> int:
+        return sum(self.lookups.values())
+
+    @property
+    def measured_hit_ratio(self) -> Optional[float]:
+        total = self.total_lookups
+        return sum(self.hits.values()) / total if total else None
+
+    def rate_per_day(self, school_name: str) -> float:
+        return self.lookups.get(school_name, 0) / self.window_days if self.window_days else 0.0
+
+
+def load_demand(window_days: float = DEMAND_WINDOW_DAYS, now: Optional[datetime] = None) -> DemandSummary:
+    """Demand rows from the last ``window_days``; empty on any error."""
+    summary = DemandSummary(window_days=window_days)
+    client = get_supabase_admin_client()
+    if client is None:
+        return summary
+    since = (now or datetime.now(timezone.utc)) - timedelta(days=window_days)
+    try:
+        start = 0
+        while True:
+            resp = (
+                client.table(TABLE)
+                .select("schools, hits")
+                .gte("looked_up_at", since.isoformat())
+                .order("id")
+                .range(start, start + _PAGE_SIZE - 1)
+                .execute()
+            )
+            rows = resp.data or []
+            for row in rows:
+                summary.add(row.get("schools") or [], row.get("hits") or [])
+            if len(rows) < _PAGE_SIZE:
+                break
+            start += _PAGE_SIZE
+    except Exception as exc:
+        logger.warning("school_evidence_demand lookup failed: %s", exc)
+        return DemandSummary(window_days=window_days)
+    return summary
+
+
+def prune_demand(window_days: float = DEMAND_WINDOW_DAYS, now: Optional[datetime] = None) -> Optional[int]:
+    """Delete demand rows older than ``window_days``; rows deleted, None on error."""
+    client = get_supabase_admin_client()
+    if client is None:
+        return None
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=window_days)
+    try:
+        resp = client.table(TABLE).delete().lt("looked_up_at", cutoff.isoformat()).execute()
+    except Exception as exc:
+        logger.warning("school_evidence_demand prune failed: %s", exc)
+        return None
+    return len(resp.data or [])
+
+
+@dataclass
+class WarmingCandidate:
+    school: Dict[str, Any]
+    rate_per_day: float
+    age_days: Optional[float]  # None: no usable cache row
+    days_at_risk: float  # of the next interval, spent expired if not refreshed
+
+    @property
+    def priority(self) -> float:
+        """Expected research misses a refresh now avoids."""
+        return self.rate_per_day * self.days_at_risk
+
+
+@dataclass
+class WarmingPlan:
+    candidates: List[WarmingCandidate]
+    interval_days: float
+
+    def schools(self) -> List[Dict[str, Any]]:
+        return [c.school for c in self.candidates]
+
+    def head(self, count: int) -> List[str]:
+        """Names of the first ``count`` schools in priority order."""
+        return [c.school["school_name"] for c in self.candidates[:count]]
+
+    def expected_hit_ratio(self, refreshed: Iterable[str] = ()) -> Optional[float]:
+        """Demand-weighted share of next-interval lookups served from cache.
+
+        Schools in ``refreshed`` get a fresh entry, which outlives the
+        interval (TTL_DAYS is longer than it); the rest keep their
+        current expiry.
+        """
+        refreshed = set(refreshed)
+        total = sum(c.rate_per_day for c in self.candidates)
+        if not total:
+            return None
+        served = 0.0
+        for c in self.candidates:
+            at_risk = 0.0 if c.school["school_name"] in refreshed else c.days_at_risk
+            served += c.rate_per_day * (1.0 - at_risk / self.interval_days)
+        return served / total
+
+
+def plan_warming(
+    schools: Sequence[Dict[str, Any]],
+    demand: DemandSummary,
+    freshness: Dict[str, Tuple[Optional[datetime], Optional[str]]],
+    now: Optional[datetime] = None,
+    interval_days: float = REFRESH_INTERVAL_DAYS,
+    ttl_days: float = TTL_DAYS,
+) -> WarmingPlan:
+    """Every school in ``schools``, highest refresh priority first.
+
+    ``freshness`` maps school_name to the cache row's ``(fetched_at,
+    source_status)``; schools absent from it have no row.
+    """
+    now = now or datetime.now(timezone.utc)
+    candidates: List[WarmingCandidate] = []
+    for school in schools:
+        name = school["school_name"]
+        fetched_at, status = freshness.get(name, (None, None))
+        if fetched_at is None or status == "failed":
+            age = None
+            days_at_risk = float(interval_days)
+        else:
+            age = (now - fetched_at).total_seconds() / 86400.0
+            remaining = ttl_days - age
+            days_at_risk = min(float(interval_days), max(0.0, interval_days - remaining))
+        candidates.append(WarmingCandidate(
+            school=school,
+            rate_per_day=demand.rate_per_day(name),
+            age_days=age,
+            days_at_risk=days_at_risk,
+        ))
+    # Priority first; then missing rows, then oldest entries; name keeps it stable.
+    candidates.sort(key=lambda c: (
+        -c.priority,
+        -(c.age_days if c.age_days is not None else float("inf")),
+        c.school["school_name"],
+    ))
+    return WarmingPlan(candidates=candidates, interval_days=float(interval_days))
+
+
+def load_cache_freshness(school_names: List[str]) -> Dict[str, Tuple[Optional[datetime], Optional[str]]]:
+    """``{school_name: (fetched_at, source_status)}`` for existing cache rows."""
+    if not school_names:
+        return {}
+    client = get_supabase_admin_client()
+    if client is None:
+        return {}
+    out: Dict[str, Tuple[Optional[datetime], Optional[str]]] = {}
+    try:
+        for start in range(0, len(school_names), _LOOKUP_CHUNK):
+            resp = (
+                client.table(CACHE_TABLE)
+                .select("school_name, fetched_at, source_status")
+                .in_("school_name", school_names[start:start + _LOOKUP_CHUNK])
+                .execute()
+            )
+            for row in resp.data or []:
+                out[row["school_name"]] = (_parse_dt(row.get("fetched_at")), row.get("source_status"))
+    except Exception as exc:
+        logger.warning("school_evidence_cache freshness lookup failed: %s", exc)
+        return {}
+    return out
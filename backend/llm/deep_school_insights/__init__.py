@@ -11,6 +11,19 @@ continue to work unchanged.
 
 from __future__ import annotations
 
+from .admission import (
+    AdmissionController,
+    AdmissionStats,
+    estimate_tokens,
+    get_admission_controller,
+)
+from .concurrency import (
+    AdaptiveLimiter,
+    LimiterMetrics,
+    current_rss_bytes,
+    fetch_limiter_from_env,
+    note_document,
+)
 from .evidence import (
     _empty_evidence,
     _estimate_competition,
@@ -23,21 +36,64 @@ from .evidence import (
     compute_evidence,
 )
 from .fetch import (
+    content_hash,
     fetch_and_parse_roster,
     fetch_and_parse_stats,
+    fetch_matched_roster,
+    fetch_roster_page,
+    fetch_stats_page,
     gather_evidence,
     make_httpx_client,
 )
+from .hedging import (
+    LATENCY,
+    HedgedCaller,
+    HedgePolicy,
+    HedgeStats,
+    LatencyTracker,
+)
 from .llm_review import (
+    ReviewPrompt,
+    build_review_prompt,
     review_input,
     review_instructions,
+    review_payload,
     review_school,
 )
+from .prompt_budget import PromptBreakdown, count_tokens, fit_payload
+from .progress import ResearchProgress, compact_school
+from .review_cache import (
+    ReviewCache,
+    ReviewCacheStats,
+    get_review_cache,
+    review_fingerprint,
+)
+from .shared_evidence import (
+    SharedEvidence,
+    SharedEvidenceStats,
+    get_shared_evidence,
+    roster_key,
+)
+from .tracing import Tracer, current_span, span, trace_run, traced
 from .talking_points import (
     TalkingPoint,
     compute_talking_points,
     format_division_label,
 )
+from .html_stream import (
+    ExtractedPage,
+    extract_page,
+    html_engine,
+    parse_roster_html,
+    parse_stats_html,
+)
+from .nuxt_payload import NuxtPayload
+from .parse_strategy import (
+    PARSER_STRATEGIES,
+    ParserStrategy,
+    ParserStrategyRegistry,
+    layout_fingerprint,
+)
 from .parsers import (
     DEFAULT_TRUSTED_DOMAINS,
     OFFICIAL_SOURCE_TYPES,
@@ -100,11 +156,16 @@ from .types import (
     HIGH_USAGE_GS_THRESHOLD,
     PITCHER_HIGH_USAGE_GP_THRESHOLD,
     PITCHER_HIGH_USAGE_GS_THRESHOLD,
+    CachedPage,
     DeepSchoolInsight,
     DeepSchoolReview,
     GatheredEvidence,
     MatchedPlayer,
+    MatchedRoster,
     OpportunityContext,
+    PageFetch,
+    PageFetchStats,
+    PageValidators,
     ParsedPlayer,
     ParsedStatLine,
     RecruitingContext,
@@ -121,11 +182,16 @@ __all__ = [
     "compute_ranking_score",
     "compute_roster_label",
     # Types
+    "CachedPage",
     "DeepSchoolInsight",
     "DeepSchoolReview",
     "GatheredEvidence",
     "MatchedPlayer",
+    "MatchedRoster",
     "OpportunityContext",
+    "PageFetch",
+    "PageFetchStats",
+    "PageValidators",
     "ParsedPlayer",
     "ParsedStatLine",
     "RecruitingContext",
@@ -165,15 +231,72 @@ __all__ = [
     "parse_nuxt_stats_records",
     "parse_roster_players",
     "parse_stats_records",
+    "NuxtPayload",
+    "PARSER_STRATEGIES",
+    "ParserStrategy",
+    "ParserStrategyRegistry",
+    "layout_fingerprint",
+    # Streaming extraction
+    "ExtractedPage",
+    "extract_page",
+    "html_engine",
+    "parse_roster_html",
+    "parse_stats_html",
     # Fetch
+    "content_hash",
     "fetch_and_parse_roster",
     "fetch_and_parse_stats",
+    "fetch_matched_roster",
+    "fetch_roster_page",
+    "fetch_stats_page",
     "gather_evidence",
     "make_httpx_client",
     # LLM review
+    "ReviewPrompt",
+    "build_review_prompt",
+    "PromptBreakdown",
+    "count_tokens",
+    "fit_payload",
     "review_input",
     "review_instructions",
+    "review_payload",
     "review_school",
+    # Incremental progress
+    "ResearchProgress",
+    "compact_school",
+    # OpenAI budget admission
+    "AdmissionController",
+    "AdmissionStats",
+    "estimate_tokens",
+    "get_admission_controller",
+    # Adaptive LLM deadlines and hedging
+    "LATENCY",
+    "HedgedCaller",
+    "HedgePolicy",
+    "HedgeStats",
+    "LatencyTracker",
+    # Adaptive fetch concurrency
+    "AdaptiveLimiter",
+    "LimiterMetrics",
+    "current_rss_bytes",
+    "fetch_limiter_from_env",
+    "note_document",
+    # Review cache
+    "ReviewCache",
+    "ReviewCacheStats",
+    "get_review_cache",
+    "review_fingerprint",
+    # Shared roster evidence
+    "SharedEvidence",
+    "SharedEvidenceStats",
+    "get_shared_evidence",
+    "roster_key",
+    # Span tracing
+    "Tracer",
+    "current_span",
+    "span",
+    "trace_run",
+    "traced",
     # Talking-points extractor
     "TalkingPoint",
     "compute_talking_points",
@@ -0,0 +1,295 @@
+"""Token/request budget admission for OpenAI calls.
+
+The task-level ``rate_limit`` (12/m) and ``RESEARCH_LLM_CONCURRENCY`` say
+nothing about the account's tokens-per-minute / requests-per-minute
+budget, so runs either leave capacity unused or burst into 429s that burn
+retries. ``AdmissionController`` sits in front of
+``DeepSchoolInsightService._responses_parse``:
+
+* each request's cost is estimated up front from the prompt size and
+  ``max_output_tokens`` (``estimate_tokens``);
+* a request *reserves* its cost in two token buckets (tokens, requests)
+  and sleeps until the reservation is covered — buckets may go into debt,
+  so callers queue in arrival order instead of failing;
+* with Redis configured, admitted cost is also counted in per-minute
+  windows shared by every worker, and a request that would overflow the
+  window waits for the next one. The check-and-count is one Lua script
+  (``WINDOW_SCRIPT``), so concurrent workers never over-admit and a
+  rejected request leaves the counters untouched;
+* ``observe`` adapts the buckets to the ``x-ratelimit-*`` response headers
+  (limit, remaining) and credits back unused estimate from ``usage``;
+* ``rate_limited`` (a 429) pauses all admissions for ``retry-after``; the
+  service then re-queues the request rather than surfacing the error.
+
+Configuration (the controller is off unless a limit is set):
+- ``OPENAI_TPM_LIMIT`` / ``OPENAI_RPM_LIMIT`` — starting budgets; headers
+  refine them.
+- ``OPENAI_ADMISSION_URL`` (falls back to ``REDIS_URL``) — shared windows.
+
+No asyncio primitives are held across calls, and Redis is reached through
+the loop-local ``redis_client.async_redis``, so one process-wide
+controller is safe to share between event loops. ``stats`` are cumulative
+for the process; callers reporting on one run take ``stats.copy()`` at the
+start and log ``stats.since(start)``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, fields, replace
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+from .redis_client import async_redis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "openai_budget:v1:"
+# English prose + JSON averages ~4 characters per token; 3.5 errs toward
+# waiting rather than 429s. Unused estimate is refunded from ``usage``.
+CHARS_PER_TOKEN = 3.5
+# Seconds a per-minute window's counters outlive the window.
+WINDOW_TTL_S = 120
+
+# KEYS: tokens, requests counters of the current window.
+# ARGV: cost, token capacity, request capacity, TTL.
+# Admits (returns 1) and counts the request when it fits, or when the
+# window is still empty so an oversized request can't wait forever.
+WINDOW_SCRIPT = """
+local cost = tonumber(ARGV[1])
+local tokens = tonumber(redis.call('GET', KEYS[1]) or '0')
+local requests = tonumber(redis.call('GET', KEYS[2]) or '0')
+if tokens > 0 and (tokens + cost > tonumber(ARGV[2]) or requests + 1 > tonumber(ARGV[3])) then
+    return 0
+end
+redis.call('INCRBY', KEYS[1], cost)
+redis.call('INCR', KEYS[2])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+return 1
+"""
+
+
+def estimate_tokens(*texts: Optional[str], max_output_tokens: int = 0) -> int:
+    """Prompt tokens (from character count) plus the output allowance."""
+    chars = sum(len(t) for t in texts if t)
+    return int(chars / CHARS_PER_TOKEN) + 1 + max(0, int(max_output_tokens or 0))
+
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """``x-ratelimit-reset-*`` / ``retry-after`` → seconds ("1m30s", "20ms", "2")."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    scale = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+    return sum(float(n) * scale[unit] for n, unit in parts)
+
+
+class TokenBucket:
+    """Refills ``capacity`` per minute; ``reserve`` may push it into debt."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self._updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / 60.0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take ``amount``; return seconds until the bucket is out of debt."""
+        self._refill(now)
+        self.tokens -= min(amount, self.capacity)
+        return max(0.0, -self.tokens / self.rate) if self.rate > 0 else 0.0
+
+    def credit(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def resize(self, per_minute: float, now: float) -> None:
+        self._refill(now)
+        self.capacity = float(per_minute)
+        self.tokens = min(self.tokens, self.capacity)
+
+    def cap_remaining(self, remaining: float, now: float) -> None:
+        self._refill(now)
+        self.tokens = min(self.tokens, float(remaining))
+
+
+@dataclass
+class AdmissionStats:
+    admitted: int = 0
+    queued: int = 0
+    wait_s: float = 0.0
+    rate_limited: int = 0
+    window_waits: int = 0
+    estimated_tokens: int = 0
+    used_tokens: int = 0
+
+    def copy(self) -> "AdmissionStats":
+        return replace(self)
+
+    def since(self, start: "AdmissionStats") -> "AdmissionStats":
+        """What was counted after ``start`` (a ``copy()`` taken earlier)."""
+        return AdmissionStats(**{
+            f.name: getattr(self, f.name) - getattr(start, f.name) for f in fields(self)
+        })
+
+
+class AdmissionController:
+    """Shared token + request buckets in front of the Responses API."""
+
+    def __init__(
+        self,
+        tokens_per_minute: int,
+        requests_per_minute: int,
+        redis_client: Any = None,
+        max_requeues: int = 3,
+    ):
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.requests = TokenBucket(requests_per_minute)
+        self.redis = redis_client
+        self.max_requeues = max_requeues
+        self.stats = AdmissionStats()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    async def acquire(self, cost: int) -> float:
+        """Wait until ``cost`` tokens and one request fit; returns seconds waited."""
+        t0 = time.monotonic()
+        with self._lock:
+            now = time.monotonic()
+            wait = max(
+                self.tokens.reserve(cost, now),
+                self.requests.reserve(1, now),
+                self._paused_until - now,
+            )
+            self.stats.admitted += 1
+            self.stats.estimated_tokens += cost
+            if wait > 0:
+                self.stats.queued += 1
+        if wait > 0:
+            await asyncio.sleep(wait)
+        if self.redis is not None:
+            await self._acquire_window(cost)
+        waited = time.monotonic() - t0
+        self.stats.wait_s += waited
+        return waited
+
+    async def _acquire_window(self, cost: int) -> None:
+        """Count the request in the shared per-minute window, waiting for the
+        next window if this one is full. Redis errors admit the request."""
+        while True:
+            now = time.time()
+            window = int(now // 60)
+            tok_key, req_key = f"{KEY_PREFIX}{window}:tokens", f"{KEY_PREFIX}{window}:requests"
+            try:
+                admitted = await self.redis.eval(
+                    WINDOW_SCRIPT, 2, tok_key, req_key,
+                    cost, int(self.tokens.capacity), int(self.requests.capacity), WINDOW_TTL_S,
+                )
+            except Exception as exc:
+                logger.warning("[ADMISSION] shared window unavailable: %s", exc)
+                return
+            if int(admitted):
+                return
+            self.stats.window_waits += 1
+            await asyncio.sleep((window + 1) * 60 - now + 0.05)
+
+    def observe(self, headers: Optional[Mapping[str, str]], estimated: int, used: Optional[int]) -> None:
+        """Adapt to rate-limit headers and refund over-estimated tokens."""
+        with self._lock:
+            now = time.monotonic()
+            if headers:
+                limit_tokens = _header_float(headers, "x-ratelimit-limit-tokens")
+                limit_requests = _header_float(headers, "x-ratelimit-limit-requests")
+                if limit_tokens and limit_tokens != self.tokens.capacity:
+                    logger.info("[ADMISSION] tokens/min %d -> %d (headers)", self.tokens.capacity, limit_tokens)
+                    self.tokens.resize(limit_tokens, now)
+                if limit_requests and limit_requests != self.requests.capacity:
+                    logger.info("[ADMISSION] requests/min %d -> %d (headers)", self.requests.capacity, limit_requests)
+                    self.requests.resize(limit_requests, now)
+                remaining_tokens = _header_float(headers, "x-ratelimit-remaining-tokens")
+                remaining_requests = _header_float(headers, "x-ratelimit-remaining-requests")
+                if remaining_tokens is not None:
+                    self.tokens.cap_remaining(remaining_tokens, now)
+                if remaining_requests is not None:
+                    self.requests.cap_remaining(remaining_requests, now)
+            if used is not None:
+                self.stats.used_tokens += used
+                if used < estimated:
+                    self.tokens.credit(estimated - used, now)
+
+    def rate_limited(self, headers: Optional[Mapping[str, str]]) -> float:
+        """Record a 429: pause admissions; returns the pause in seconds."""
+        retry_after = None
+        if headers:
+            retry_after = parse_reset(headers.get("retry-after")) or max(
+                parse_reset(headers.get("x-ratelimit-reset-tokens")) or 0.0,
+                parse_reset(headers.get("x-ratelimit-reset-requests")) or 0.0,
+            ) or None
+        pause = retry_after if retry_after is not None else 1.0
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + pause)
+            self.tokens.cap_remaining(0, now)
+            self.stats.rate_limited += 1
+        logger.warning("[ADMISSION] 429 from provider; pausing admissions %.2fs", pause)
+        return pause
+
+
+def _header_float(headers: Mapping[str, str], name: str) -> Optional[float]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    return getattr(exc, "status_code", None) == 429
+
+
+def error_headers(exc: BaseException) -> Optional[Mapping[str, str]]:
+    response = getattr(exc, "response", None)
+    return getattr(response, "headers", None)
+
+
+def get_admission_controller() -> Optional[AdmissionController]:
+    """Process-wide controller from the environment; None when no limit is set."""
+    tpm = os.getenv("OPENAI_TPM_LIMIT")
+    rpm = os.getenv("OPENAI_RPM_LIMIT")
+    if not (tpm or rpm):
+        return None
+    url = os.getenv("OPENAI_ADMISSION_URL") or os.getenv("REDIS_URL") or ""
+    return _controller_for(int(tpm or 200_000), int(rpm or 500), url)
+
+
+@lru_cache(maxsize=4)
+def _controller_for(tpm: int, rpm: int, url: str) -> AdmissionController:
+    redis_client = async_redis(url) if url else None
+    if url and redis_client is None:
+        logger.warning("[ADMISSION] redis package not installed; per-process buckets only")
+    return AdmissionController(tpm, rpm, redis_client=redis_client)
@@ -0,0 +1,265 @@
+"""Memory-adaptive permits for the fetch + parse stage.
+
+``RESEARCH_FETCH_CONCURRENCY=3`` was tuned for the worst case on a 512 MB
+worker: with small pages the worker idles, with very large ones three
+permits can still push it over. ``AdaptiveLimiter`` is a drop-in for the
+fetch semaphore (``async with limiter:``) that resizes itself to hold
+process RSS under ``memory_budget_bytes``:
+
+* before granting a permit it checks that current RSS plus one more
+  document's worth of parse memory still fits the budget (the minimum
+  number of permits is always granted, so the run can't stall);
+* on every release it re-samples RSS and grows the limit by one while
+  there is headroom and callers are waiting, or halves it when RSS is
+  over the high-water mark.
+
+The per-permit cost is an EWMA of document sizes reported by the fetch
+layer through ``note_document`` times ``parse_amplification`` (parsed
+trees are several times larger than the raw body). RSS comes from
+``/proc/self/statm``; where that isn't available the limiter never grows
+past its starting limit.
+
+Decisions are counted on ``limiter.metrics`` and each resize is logged
+with a ``[CONCURRENCY]`` prefix.
+
+Document bytes are charged to a ``_Permit``. ``async with limiter:`` keeps
+one in a context variable for the holding task; ``retry.Slot``, which lends
+its hold out during backoff and may take it back from a child task, carries
+its permit explicitly through ``acquire_permit`` / ``release_permit`` so a
+release always subtracts exactly what the hold was charged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_MB = 1024 * 1024
+
+# Permit held by the current task, so note_document can attribute bytes.
+_current_permit: contextvars.ContextVar[Optional["_Permit"]] = contextvars.ContextVar(
+    "research_fetch_permit", default=None,
+)
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process, or None if it can't be read."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def note_document(nbytes: int) -> None:
+    """Report a fetched document body to the limiter whose permit is held."""
+    permit = _current_permit.get()
+    if permit is not None:
+        permit.limiter._note_document(permit, nbytes)
+
+
+def bind_permit(permit: Optional["_Permit"]) -> contextvars.Token:
+    """Charge ``note_document`` in this context (and tasks it spawns) to ``permit``."""
+    return _current_permit.set(permit)
+
+
+def unbind_permit(token: contextvars.Token) -> None:
+    _current_permit.reset(token)
+
+
+@dataclass
+class LimiterMetrics:
+    acquired: int = 0
+    grows: int = 0
+    shrinks: int = 0
+    memory_waits: int = 0
+    wait_s: float = 0.0
+    documents: int = 0
+    peak_rss: int = 0
+    peak_limit: int = 0
+    peak_in_flight: int = 0
+
+    def as_dict(self) -> dict:
+        return dict(self.__dict__)
+
+
+class _Permit:
+    __slots__ = ("limiter", "doc_bytes", "held")
+
+    def __init__(self, limiter: "AdaptiveLimiter"):
+        self.limiter = limiter
+        self.doc_bytes = 0
+        self.held = False
+
+
+class AdaptiveLimiter:
+    """Async context manager whose permit count tracks a memory budget."""
+
+    def __init__(
+        self,
+        *,
+        min_permits: int,
+        max_permits: int,
+        memory_budget_bytes: int,
+        initial: Optional[int] = None,
+        parse_amplification: float = 8.0,
+        default_doc_bytes: int = 512 * 1024,
+        high_water: float = 0.9,
+        rss_sampler: Callable[[], Optional[int]] = current_rss_bytes,
+        name: str = "fetch",
+    ):
+        self.min_permits = max(1, min_permits)
+        self.max_permits = max(self.min_permits, max_permits)
+        self.limit = min(self.max_permits, max(self.min_permits, initial or self.min_permits))
+        self.memory_budget_bytes = memory_budget_bytes
+        self.parse_amplification = parse_amplification
+        self.high_water = high_water
+        self.name = name
+        self._sample = rss_sampler
+        self._doc_ewma = float(default_doc_bytes)
+        self._in_flight = 0
+        self._in_flight_doc_bytes = 0
+        self._waiting = 0
+        self._cond = asyncio.Condition()
+        self.metrics = LimiterMetrics(peak_limit=self.limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def in_flight_doc_bytes(self) -> int:
+        """Raw bytes of documents held by current permit holders."""
+        return self._in_flight_doc_bytes
+
+    @property
+    def per_permit_bytes(self) -> int:
+        """Estimated extra RSS one more in-flight document costs."""
+        return int(self._doc_ewma * self.parse_amplification)
+
+    def _rss(self) -> Optional[int]:
+        rss = self._sample()
+        if rss is not None and rss > self.metrics.peak_rss:
+            self.metrics.peak_rss = rss
+        return rss
+
+    def _can_admit(self) -> bool:
+        if self._in_flight >= self.limit:
+            return False
+        if self._in_flight < self.min_permits:
+            return True
+        rss = self._rss()
+        if rss is None:
+            return True
+        if rss + self.per_permit_bytes > self.memory_budget_bytes:
+            self.metrics.memory_waits += 1
+            return False
+        return True
+
+    async def acquire_permit(self, permit: Optional[_Permit] = None) -> _Permit:
+        """Wait for a permit; pass a released one back in to hold it again."""
+        t0 = time.monotonic()
+        async with self._cond:
+            self._waiting += 1
+            try:
+                while not self._can_admit():
+                    # Memory-blocked with nothing in flight to wake us
+                    # would deadlock; _can_admit admits min_permits
+                    # unconditionally, so in_flight > 0 here.
+                    await self._cond.wait()
+            finally:
+                self._waiting -= 1
+            self._in_flight += 1
+            self.metrics.acquired += 1
+            self.metrics.peak_in_flight = max(self.metrics.peak_in_flight, self._in_flight)
+        self.metrics.wait_s += time.monotonic() - t0
+        if permit is None:
+            permit = _Permit(self)
+        permit.held = True
+        return permit
+
+    async def release_permit(self, permit: _Permit) -> None:
+        async with self._cond:
+            self._in_flight -= 1
+            self._in_flight_doc_bytes -= permit.doc_bytes
+            permit.doc_bytes = 0
+            permit.held = False
+            self._adjust()
+            self._cond.notify_all()
+
+    async def __aenter__(self) -> "AdaptiveLimiter":
+        _current_permit.set(await self.acquire_permit())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        # Each task runs in its own context copy, so this only clears the
+        # caller's permit.
+        permit = _current_permit.get()
+        _current_permit.set(None)
+        if permit is None or permit.limiter is not self or not permit.held:
+            permit = _Permit(self)
+        await self.release_permit(permit)
+
+    def _note_document(self, permit: _Permit, nbytes: int) -> None:
+        if permit.held:
+            permit.doc_bytes += nbytes
+            self._in_flight_doc_bytes += nbytes
+        self.metrics.documents += 1
+        self._doc_ewma = 0.7 * self._doc_ewma + 0.3 * nbytes
+
+    def _adjust(self) -> None:
+        rss = self._rss()
+        if rss is None:
+            return
+        old = self.limit
+        if rss > self.memory_budget_bytes * self.high_water:
+            self.limit = max(self.min_permits, self.limit // 2)
+        elif (
+            self._waiting
+            and self.limit < self.max_permits
+            and rss + self.per_permit_bytes * (self.limit + 1 - self._in_flight)
+            <= self.memory_budget_bytes * self.high_water
+        ):
+            self.limit += 1
+        if self.limit == old:
+            return
+        if self.limit > old:
+            self.metrics.grows += 1
+            self.metrics.peak_limit = max(self.metrics.peak_limit, self.limit)
+        else:
+            self.metrics.shrinks += 1
+        logger.info(
+            "[CONCURRENCY] %s limit %d->%d rss=%.0fMB budget=%.0fMB per_permit=%.1fMB "
+            "in_flight=%d in_flight_docs=%.1fMB",
+            self.name, old, self.limit, rss / _MB, self.memory_budget_bytes / _MB,
+            self.per_permit_bytes / _MB, self._in_flight, self._in_flight_doc_bytes / _MB,
+        )
+
+
+def fetch_limiter_from_env(initial: int) -> Optional[AdaptiveLimiter]:
+    """Adaptive fetch limiter when RESEARCH_MEMORY_BUDGET_MB is set, else None.
+
+    RESEARCH_FETCH_CONCURRENCY_MIN / _MAX bound the permits (defaults 1 and
+    4× the static setting); ``initial`` is the static RESEARCH_FETCH_CONCURRENCY.
+    """
+    try:
+        budget_mb = int(os.getenv("RESEARCH_MEMORY_BUDGET_MB", "0"))
+    except ValueError:
+        budget_mb = 0
+    if budget_mb <= 0:
+        return None
+    return AdaptiveLimiter(
+        min_permits=int(os.getenv("RESEARCH_FETCH_CONCURRENCY_MIN", "1")),
+        max_permits=int(os.getenv("RESEARCH_FETCH_CONCURRENCY_MAX", str(initial * 4))),
+        memory_budget_bytes=budget_mb * 1024 * 1024,
+        initial=initial,
+        parse_amplification=float(os.getenv("RESEARCH_PARSE_AMPLIFICATION", "8")),
+    )
@@ -1,6 +1,9 @@
 """HTTP fetch + orchestration for roster/stats pages.
 
-Each fetch helper manages its own httpx client lifecycle via ``make_httpx_client``.
+Each fetch helper gets its httpx client from ``http_client()``: the
+worker-lifetime pooled client when one is installed for the running loop
+(see backend/llm/worker_runtime.py), otherwise a fresh ``make_httpx_client``
+closed after use.
 ``gather_evidence`` is the top-level helper that runs roster+stats fetches
 concurrently and feeds the results into ``compute_evidence``.
 """
@@ -8,29 +11,46 @@ concurrently and feeds the results into ``compute_evidence``.
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import hashlib
 import logging
 import time
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Dict, List, Optional, Sequence, Tuple
 
 import httpx
 
+from .concurrency import note_document
 from .evidence import _empty_evidence, compute_evidence
-from .parsers import (
-    clean_soup,
-    match_players_to_stats,
-    parse_nuxt_roster_players,
-    parse_nuxt_stats_records,
-    parse_roster_players,
-    parse_stats_records,
+from .html_stream import PARSER_VERSION, parse_roster_html, parse_stats_html
+from .parsers import match_players_to_stats
+from .retry import HOST_HEALTH, STATS_RETRY_POLICY, backoff, gather_in_slot, host_of
+from .tracing import current_span, span, traced
+from .types import (
+    CachedPage,
+    GatheredEvidence,
+    MatchedPlayer,
+    MatchedRoster,
+    PageFetch,
+    PageFetchStats,
+    PageValidators,
+    ParsedPlayer,
+    ParsedStatLine,
 )
-from .types import GatheredEvidence, MatchedPlayer, ParsedPlayer, ParsedStatLine
+
+if TYPE_CHECKING:
+    from .shared_evidence import SharedEvidence, SharedEvidenceStats
 
 
 logger = logging.getLogger(__name__)
 
 
-def make_httpx_client() -> httpx.AsyncClient:
+# (loop, client) installed by the worker runtime; only valid on that loop.
+_pooled_client: Optional[Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = None
+
+
+def make_httpx_client(limits: Optional[httpx.Limits] = None) -> httpx.AsyncClient:
     return httpx.AsyncClient(
+        limits=limits or httpx.Limits(),
         timeout=httpx.Timeout(20.0, connect=10.0),
         follow_redirects=True,
         max_redirects=5,
@@ -44,12 +64,97 @@ def make_httpx_client() -> httpx.AsyncClient:
     )
 
 
-async def fetch_and_parse_roster(
+def set_pooled_http_client(client: Optional[httpx.AsyncClient]) -> None:
+    """Install (or clear, with None) the pooled client for the running loop."""
+    global _pooled_client
+    _pooled_client = (asyncio.get_running_loop(), client) if client is not None else None
+
+
+@contextlib.asynccontextmanager
+async def http_client() -> AsyncIterator[httpx.AsyncClient]:
+    """Pooled client if one is installed for this loop, else a one-off."""
+    pooled = _pooled_client
+    if pooled is not None and pooled[0] is asyncio.get_running_loop():
+        yield pooled[1]
+        return
+    async with make_httpx_client() as client:
+        yield client
+
+
+def content_hash(body: bytes) -> str:
+    """Stable hash of a page body, stored next to the HTTP validators."""
+    return hashlib.sha256(body).hexdigest()
+
+
+def _reusable(previous: Optional[CachedPage], url: str) -> bool:
+    """``previous`` is the same URL, parsed by the current parser version."""
+    return (
+        previous is not None
+        and previous.validators.url == url
+        and previous.validators.parser_version == PARSER_VERSION
+    )
+
+
+def _conditional_headers(previous: Optional[CachedPage], url: str) -> Dict[str, str]:
+    """If-None-Match / If-Modified-Since from the last fetch of the same URL.
+
+    None when the stored items came from another parser version: the page
+    has to be downloaded and parsed again even if it did not change.
+    """
+    if not _reusable(previous, url):
+        return {}
+    headers: Dict[str, str] = {}
+    if previous.validators.etag:
+        headers["If-None-Match"] = previous.validators.etag
+    if previous.validators.last_modified:
+        headers["If-Modified-Since"] = previous.validators.last_modified
+    return headers
+
+
+def _validators_from_response(url: str, resp: httpx.Response) -> PageValidators:
+    return PageValidators(
+        url=url,
+        etag=resp.headers.get("etag"),
+        last_modified=resp.headers.get("last-modified"),
+        content_hash=content_hash(resp.content),
+        parser_version=PARSER_VERSION,
+    )
+
+
+def _reuse_on_304(url: str, resp: httpx.Response, previous: CachedPage) -> PageFetch:
+    """304: keep the stored items; refresh validators the server re-sent."""
+    validators = PageValidators(
+        url=url,
+        etag=resp.headers.get("etag") or previous.validators.etag,
+        last_modified=resp.headers.get("last-modified") or previous.validators.last_modified,
+        content_hash=previous.validators.content_hash,
+        parser_version=previous.validators.parser_version,
+    )
+    return PageFetch(items=list(previous.items), url=url, status="not_modified", validators=validators)
+
+
+def _unchanged(previous: Optional[CachedPage], validators: PageValidators) -> bool:
+    return (
+        _reusable(previous, validators.url)
+        and previous.validators.content_hash is not None
+        and previous.validators.content_hash == validators.content_hash
+    )
+
+
+def _page_attributes(page: PageFetch) -> Dict[str, Any]:
+    return {"status": page.status, "records": len(page.items)}
+
+
+@traced("fetch.roster", _page_attributes)
+async def fetch_roster_page(
     school: Dict[str, Any],
-) -> Tuple[List[ParsedPlayer], Optional[str]]:
-    """Fetch roster page and parse into structured player records.
+    previous: Optional[CachedPage] = None,
+) -> PageFetch:
+    """Conditionally fetch the roster page and parse it into ParsedPlayer records.
 
-    Returns (players, roster_url).  On failure returns ([], roster_url).
+    With ``previous`` (validators + players from the last fetch of the same
+    URL) the request carries If-None-Match / If-Modified-Since; a 304 or a
+    body with the same content hash reuses the stored players without parsing.
     Raises ValueError if roster_url is missing.
     """
     roster_url = school.get("roster_url")
@@ -60,116 +165,175 @@ async def fetch_and_parse_roster(
         )
 
     school_name = school.get("display_school_name") or school.get("school_name") or "Unknown"
+    current_span().set(school=school_name, url=roster_url, conditional=previous is not None)
     t_start = time.monotonic()
     try:
-        async with make_httpx_client() as client:
-            resp = await client.get(roster_url)
+        async with http_client() as client:
+            resp = await client.get(roster_url, headers=_conditional_headers(previous, roster_url))
+            current_span().set(http_status=resp.status_code)
+            if resp.status_code == 304 and _reusable(previous, roster_url):
+                logger.info(
+                    "[TIMING] roster_fetch school=%r status=not_modified players=%d elapsed=%.2fs",
+                    school_name, len(previous.items), time.monotonic() - t_start,
+                )
+                return _reuse_on_304(roster_url, resp, previous)
             resp.raise_for_status()
     except Exception as exc:
         logger.info(
             "[TIMING] roster_fetch school=%r status=failed elapsed=%.2fs err=%s",
             school_name, time.monotonic() - t_start, exc,
         )
-        return [], roster_url
+        return PageFetch(items=[], url=roster_url, status="failed")
     t_fetched = time.monotonic()
+    note_document(len(resp.content))
+    current_span().set(bytes=len(resp.content))
+
+    validators = _validators_from_response(roster_url, resp)
+    if _unchanged(previous, validators):
+        logger.info(
+            "[TIMING] roster_fetch school=%r status=unchanged players=%d http=%.2fs",
+            school_name, len(previous.items), t_fetched - t_start,
+        )
+        return PageFetch(items=list(previous.items), url=roster_url, status="unchanged", validators=validators)
 
-    soup = clean_soup(resp.text)
-    players = parse_roster_players(soup)
-    source = "html"
     # Nextgen roster pages render client-side, so the legacy parser finds
-    # nothing. Fall back to the Nuxt hydration island for name + jersey;
-    # downstream stats matching backfills pitcher position_family.
-    if not players:
-        nuxt_players = parse_nuxt_roster_players(resp.text)
-        if nuxt_players:
-            players = nuxt_players
-            source = "nuxt"
+    # nothing; parse_roster_html then falls back to the Nuxt hydration island
+    # for name + jersey. Downstream stats matching backfills pitcher
+    # position_family.
+    with span("parse.roster", school=school_name, bytes=len(resp.content)) as parse_span:
+        players, source = parse_roster_html(resp.text, url=roster_url)
+        parse_span.set(records=len(players), source=source)
     t_parsed = time.monotonic()
     logger.info(
         "[TIMING] roster_fetch school=%r status=ok players=%d source=%s http=%.2fs parse=%.2fs total=%.2fs",
         school_name, len(players), source,
         t_fetched - t_start, t_parsed - t_fetched, t_parsed - t_start,
     )
-    return players, roster_url
+    return PageFetch(items=players, url=roster_url, status="parsed", validators=validators)
 
 
-async def fetch_and_parse_stats(school: Dict[str, Any]) -> List[ParsedStatLine]:
-    """Fetch stats page and parse into structured stat records.
+async def fetch_and_parse_roster(
+    school: Dict[str, Any],
+) -> Tuple[List[ParsedPlayer], Optional[str]]:
+    """Fetch roster page and parse into structured player records.
 
-    Derives stats URL by replacing /roster with /stats.
-    Returns empty list if stats are unavailable.
-    Retries once after a delay for JS-heavy sites.
+    Returns (players, roster_url).  On failure returns ([], roster_url).
+    Raises ValueError if roster_url is missing.
+    """
+    page = await fetch_roster_page(school)
+    return page.items, page.url
+
+
+@traced("fetch.stats", _page_attributes)
+async def fetch_stats_page(
+    school: Dict[str, Any],
+    previous: Optional[CachedPage] = None,
+) -> PageFetch:
+    """Conditionally fetch the stats page and parse it into ParsedStatLine records.
+
+    Derives stats URL by replacing /roster with /stats. Retries once after
+    a jittered delay for JS-heavy sites (``retry.backoff``, which hands the
+    caller's fetch slot back while waiting). A 304 or unchanged content hash against
+    ``previous`` reuses the stored stat lines without parsing.
     """
     roster_url = school.get("roster_url", "")
     if not roster_url or "/roster" not in roster_url.lower():
-        return []
+        return PageFetch(items=[], url=None, status="unavailable")
 
     stats_url = roster_url.replace("/roster", "/stats")
     school_name = school.get("display_school_name") or school.get("school_name") or "Unknown"
+    headers = _conditional_headers(previous, stats_url)
+    host = host_of(stats_url)
+    current_span().set(school=school_name, url=stats_url, conditional=previous is not None)
 
     t_start = time.monotonic()
-    async with make_httpx_client() as client:
+    async with http_client() as client:
         for attempt in range(2):
+            current_span().set(attempts=attempt + 1)
             try:
-                resp = await client.get(stats_url)
+                resp = await client.get(stats_url, headers=headers)
+                current_span().set(http_status=resp.status_code)
                 if resp.status_code == 404:
                     logger.info(
                         "[TIMING] stats_fetch school=%r status=404 elapsed=%.2fs",
                         school_name, time.monotonic() - t_start,
                     )
-                    return []
+                    return PageFetch(items=[], url=stats_url, status="unavailable")
+                if resp.status_code == 304 and _reusable(previous, stats_url):
+                    logger.info(
+                        "[TIMING] stats_fetch school=%r status=not_modified records=%d elapsed=%.2fs",
+                        school_name, len(previous.items), time.monotonic() - t_start,
+                    )
+                    return _reuse_on_304(stats_url, resp, previous)
                 resp.raise_for_status()
             except Exception as exc:
+                HOST_HEALTH.record_failure(host)
                 if attempt == 0:
+                    delay = STATS_RETRY_POLICY.delay(attempt, host)
                     logger.info(
-                        "[TIMING] stats_fetch school=%r attempt=1 status=err elapsed=%.2fs err=%s — sleeping 4s",
-                        school_name, time.monotonic() - t_start, exc,
+                        "[TIMING] stats_fetch school=%r attempt=1 status=err elapsed=%.2fs err=%s — backing off %.1fs",
+                        school_name, time.monotonic() - t_start, exc, delay,
                     )
-                    await asyncio.sleep(4.0)
+                    await backoff(delay)
                     continue
                 logger.info(
                     "[TIMING] stats_fetch school=%r status=failed elapsed=%.2fs err=%s",
                     school_name, time.monotonic() - t_start, exc,
                 )
-                return []
+                return PageFetch(items=[], url=stats_url, status="failed")
 
-            # Sidearm Nextgen sites render stats client-side; their HTML
-            # contains no <table> data but ships a Nuxt 3 hydration island.
-            # Try that first — falls back to HTML-table parsing for legacy
-            # Sidearm sites.
-            records = parse_nuxt_stats_records(resp.text)
-            if records:
+            HOST_HEALTH.record_success(host)
+            note_document(len(resp.content))
+            current_span().set(bytes=len(resp.content))
+            validators = _validators_from_response(stats_url, resp)
+            if _unchanged(previous, validators):
                 logger.info(
-                    "[TIMING] stats_fetch school=%r status=ok records=%d source=nuxt elapsed=%.2fs",
-                    school_name, len(records), time.monotonic() - t_start,
+                    "[TIMING] stats_fetch school=%r status=unchanged records=%d elapsed=%.2fs",
+                    school_name, len(previous.items), time.monotonic() - t_start,
                 )
-                return records
+                return PageFetch(items=list(previous.items), url=stats_url, status="unchanged", validators=validators)
 
-            soup = clean_soup(resp.text)
-            records = parse_stats_records(soup)
+            # Sidearm Nextgen sites render stats client-side; their HTML
+            # contains no <table> data but ships a Nuxt 3 hydration island.
+            # parse_stats_html tries that first and falls back to HTML-table
+            # parsing for legacy Sidearm sites.
+            with span("parse.stats", school=school_name, bytes=len(resp.content)) as parse_span:
+                records, source = parse_stats_html(resp.text, url=stats_url)
+                parse_span.set(records=len(records), source=source)
 
             if records:
                 logger.info(
-                    "[TIMING] stats_fetch school=%r status=ok records=%d source=html elapsed=%.2fs",
-                    school_name, len(records), time.monotonic() - t_start,
+                    "[TIMING] stats_fetch school=%r status=ok records=%d source=%s elapsed=%.2fs",
+                    school_name, len(records), source, time.monotonic() - t_start,
                 )
-                return records
+                return PageFetch(items=records, url=stats_url, status="parsed", validators=validators)
 
             if attempt == 0:
+                delay = STATS_RETRY_POLICY.delay(attempt, host)
                 logger.info(
-                    "[TIMING] stats_fetch school=%r attempt=1 status=empty_tables elapsed=%.2fs — sleeping 4s",
-                    school_name, time.monotonic() - t_start,
+                    "[TIMING] stats_fetch school=%r attempt=1 status=empty_tables elapsed=%.2fs — backing off %.1fs",
+                    school_name, time.monotonic() - t_start, delay,
                 )
-                await asyncio.sleep(4.0)
+                await backoff(delay)
                 continue
 
             logger.info(
                 "[TIMING] stats_fetch school=%r status=no_tables elapsed=%.2fs",
                 school_name, time.monotonic() - t_start,
             )
-            return []
+            return PageFetch(items=[], url=stats_url, status="parsed", validators=validators)
+
+    return PageFetch(items=[], url=stats_url, status="failed")
 
-    return []
+
+async def fetch_and_parse_stats(school: Dict[str, Any]) -> List[ParsedStatLine]:
+    """Fetch stats page and parse into structured stat records.
+
+    Derives stats URL by replacing /roster with /stats.
+    Returns empty list if stats are unavailable.
+    Retries once after a delay for JS-heavy sites.
+    """
+    return (await fetch_stats_page(school)).items
 
 
 def evidence_from_matched(
@@ -190,12 +354,13 @@ def evidence_from_matched(
     if not matched_players:
         return _empty_evidence(f"Could not parse roster for {school_name}.")
 
-    evidence = compute_evidence(
-        matched_players=matched_players,
-        player_stats=player_stats,
-        roster_url=roster_url or "",
-        stats_available=stats_available,
-    )
+    with span("evidence", school=school_name, matched_players=len(matched_players)):
+        evidence = compute_evidence(
+            matched_players=matched_players,
+            player_stats=player_stats,
+            roster_url=roster_url or "",
+            stats_available=stats_available,
+        )
 
     logger.info(
         "Computed evidence for %s: %d players, %d same-family, %d departures, stats=%s",
@@ -208,38 +373,83 @@ def evidence_from_matched(
     return evidence
 
 
+async def fetch_matched_roster(
+    school: Dict[str, Any],
+    previous_pages: Optional[Dict[str, CachedPage]] = None,
+    page_stats: Optional[PageFetchStats] = None,
+) -> MatchedRoster:
+    """Fetch roster + stats pages and match them; no per-user work.
+
+    ``previous_pages`` (``{"roster": CachedPage, "stats": CachedPage}`` from
+    a stale cache row) turns the fetches into conditional requests;
+    ``page_stats`` accumulates fetched/skipped counts for the run.
+    """
+    school_name = school.get("display_school_name") or school.get("school_name") or "Unknown School"
+    previous_pages = previous_pages or {}
+
+    t_gather_start = time.monotonic()
+    # Both pages run under the school's fetch slot; gather_in_slot keeps
+    # the permit held while either of them is still fetching.
+    roster_page, stats_page = await gather_in_slot(
+        fetch_roster_page(school, previous_pages.get("roster")),
+        fetch_stats_page(school, previous_pages.get("stats")),
+    )
+    players, roster_url, stats = roster_page.items, roster_page.url, stats_page.items
+    if page_stats is not None:
+        for page in (roster_page, stats_page):
+            if page.validators is not None:
+                page_stats.record(page.status)
+    t_gather_done = time.monotonic()
+    logger.info(
+        "[TIMING] gather_evidence_io school=%r roster=%s stats=%s elapsed=%.2fs",
+        school_name, roster_page.status, stats_page.status, t_gather_done - t_gather_start,
+    )
+
+    if not players:
+        return MatchedRoster(matched_players=[], roster_url=roster_url or "")
+    with span("match", school=school_name, players=len(players), stat_lines=len(stats)):
+        matched = match_players_to_stats(players, stats)
+    return MatchedRoster(
+        matched_players=matched,
+        roster_url=roster_url or "",
+        stats_available=bool(stats),
+    )
+
+
 async def gather_evidence(
     school: Dict[str, Any],
     player_stats: Dict[str, Any],
     trusted_domains: Sequence[str],
+    previous_pages: Optional[Dict[str, CachedPage]] = None,
+    page_stats: Optional[PageFetchStats] = None,
+    shared: Optional["SharedEvidence"] = None,
+    shared_stats: Optional["SharedEvidenceStats"] = None,
 ) -> GatheredEvidence:
     """Gather evidence deterministically: fetch, parse, match, compute.
 
     Live-fetch entrypoint. Cache-hit callers should bypass this and call
     ``evidence_from_matched`` directly with the cached MatchedPlayer list.
+    With ``shared`` (see shared_evidence.py), concurrent fetches of the
+    same roster URL — in this worker or any other — collapse into one.
     """
     school_name = school.get("display_school_name") or school.get("school_name") or "Unknown School"
 
-    t_gather_start = time.monotonic()
-    roster_coro = fetch_and_parse_roster(school)
-    stats_coro = fetch_and_parse_stats(school)
-    (players, roster_url), stats = await asyncio.gather(roster_coro, stats_coro)
-    t_gather_done = time.monotonic()
-    logger.info(
-        "[TIMING] gather_evidence_io school=%r elapsed=%.2fs",
-        school_name, t_gather_done - t_gather_start,
-    )
+    def _fetch() -> Awaitable[MatchedRoster]:
+        return fetch_matched_roster(school, previous_pages, page_stats)
 
-    if not players:
+    if shared is not None and school.get("roster_url"):
+        roster = await shared.get_or_fetch(school["roster_url"], _fetch, shared_stats)
+    else:
+        roster = await _fetch()
+
+    if not roster.matched_players:
         logger.info("No players parsed for %s — returning empty evidence", school_name)
         return _empty_evidence(f"Could not parse roster for {school_name}.")
 
-    matched = match_players_to_stats(players, stats)
-
     return evidence_from_matched(
-        matched_players=matched,
+        matched_players=roster.matched_players,
         player_stats=player_stats,
-        roster_url=roster_url or "",
-        stats_available=bool(stats),
+        roster_url=roster.roster_url,
+        stats_available=roster.stats_available,
         school_name=school_name,
     )
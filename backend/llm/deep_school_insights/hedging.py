@@ -0,0 +1,232 @@
+"""Latency-aware deadlines and hedged duplicates for OpenAI calls.
+
+``_review_school`` used to wait a flat ``llm_timeout_s`` (90 s) per
+Responses call, and the client runs with ``max_retries=0``, so one
+stalled completion set the tail latency of the whole run. ``HedgedCaller``
+sits inside ``DeepSchoolInsightService._responses_parse``:
+
+* ``LATENCY`` keeps a rolling window of completed call latencies per
+  model, process-wide like ``HOST_HEALTH``;
+* once a model has ``min_samples`` of them, each call's deadline is
+  ``timeout_multiplier`` x the ``timeout_percentile`` latency, clamped to
+  ``[min_timeout_s, llm_timeout_s]`` — a call that is clearly stuck fails
+  into the review retry loop instead of holding the run for 90 s;
+* with a hedge budget set, a call still running past the
+  ``hedge_percentile`` latency gets one duplicate request; whichever
+  answers first wins and the other is cancelled. Duplicates are capped at
+  ``hedge_budget`` x the calls made so far (review prompts are close in
+  size, so request count tracks token spend).
+
+Configuration:
+- ``OPENAI_ADAPTIVE_TIMEOUT`` — ``0`` keeps the flat ``llm_timeout_s``.
+- ``OPENAI_TIMEOUT_PERCENTILE`` / ``OPENAI_TIMEOUT_MULTIPLIER`` /
+  ``OPENAI_MIN_TIMEOUT_S`` — the adaptive deadline (0.99, 2.0, 20 s).
+- ``OPENAI_HEDGE_BUDGET`` — extra requests as a share of calls, e.g.
+  ``0.05``; hedging is off at the default ``0``.
+- ``OPENAI_HEDGE_PERCENTILE`` — when a call is hedged (0.95).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from .tracing import current_span
+
+
+class LatencyTracker:
+    """Rolling window of call latencies per key (model), process-wide."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, key: str, latency_s: float) -> None:
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(latency_s)
+
+    def count(self, key: str) -> int:
+        with self._lock:
+            return len(self._samples.get(key, ()))
+
+    def quantile(self, key: str, q: float) -> Optional[float]:
+        """Nearest-rank ``q`` quantile of the window; None when empty."""
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if not samples:
+            return None
+        rank = min(len(samples) - 1, max(0, int(round(q * len(samples) + 0.5)) - 1))
+        return samples[rank]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+LATENCY = LatencyTracker()
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+@dataclass
+class HedgePolicy:
+    timeout_s: float
+    adaptive: bool = True
+    timeout_percentile: float = 0.99
+    timeout_multiplier: float = 2.0
+    min_timeout_s: float = 20.0
+    hedge_budget: float = 0.0
+    hedge_percentile: float = 0.95
+    min_samples: int = 20
+
+    @classmethod
+    def from_env(cls, timeout_s: float) -> "HedgePolicy":
+        return cls(
+            timeout_s=timeout_s,
+            adaptive=os.getenv("OPENAI_ADAPTIVE_TIMEOUT", "1").strip().lower() not in ("0", "false", "no", "off"),
+            timeout_percentile=_env_float("OPENAI_TIMEOUT_PERCENTILE", 0.99),
+            timeout_multiplier=_env_float("OPENAI_TIMEOUT_MULTIPLIER", 2.0),
+            min_timeout_s=_env_float("OPENAI_MIN_TIMEOUT_S", 20.0),
+            hedge_budget=max(0.0, _env_float("OPENAI_HEDGE_BUDGET", 0.0)),
+            hedge_percentile=_env_float("OPENAI_HEDGE_PERCENTILE", 0.95),
+        )
+
+
+@dataclass
+class HedgeStats:
+    calls: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    over_budget: int = 0
+    timeouts: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "over_budget": self.over_budget,
+            "timeouts": self.timeouts,
+        }
+
+
+class HedgedCaller:
+    """Runs calls under an adaptive deadline, hedging slow ones within budget.
+
+    One per service (i.e. per research run), so the hedge budget is a
+    per-run cap; the latency window is shared through ``tracker``.
+    """
+
+    def __init__(self, policy: HedgePolicy, tracker: Optional[LatencyTracker] = None):
+        self.policy = policy
+        self.tracker = tracker if tracker is not None else LATENCY
+        self.stats = HedgeStats()
+        self._lock = threading.Lock()
+
+    def deadline(self, key: str) -> float:
+        p = self.policy
+        if not p.adaptive or self.tracker.count(key) < p.min_samples:
+            return p.timeout_s
+        tail = self.tracker.quantile(key, p.timeout_percentile)
+        return min(p.timeout_s, max(p.min_timeout_s, tail * p.timeout_multiplier))
+
+    def hedge_delay(self, key: str) -> Optional[float]:
+        """Seconds before a call gets its duplicate; None: don't hedge."""
+        p = self.policy
+        if p.hedge_budget <= 0 or self.tracker.count(key) < p.min_samples:
+            return None
+        return self.tracker.quantile(key, p.hedge_percentile)
+
+    def _take_hedge(self) -> bool:
+        with self._lock:
+            if self.stats.hedged + 1 > self.policy.hedge_budget * self.stats.calls:
+                self.stats.over_budget += 1
+                return False
+            self.stats.hedged += 1
+            return True
+
+    async def call(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+        hedge_factory: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> Any:
+        """Await ``factory()``; ``hedge_factory()`` (default: ``factory``) is the duplicate.
+
+        Raises ``asyncio.TimeoutError`` past the deadline, or the last
+        error when every request failed.
+        """
+        deadline = self.deadline(key)
+        hedge_after = self.hedge_delay(key)
+        with self._lock:
+            self.stats.calls += 1
+        t0 = time.monotonic()
+        primary = asyncio.ensure_future(factory())
+        started = {primary: t0}
+        current_span().set(llm_deadline_s=round(deadline, 2))
+        try:
+            pending = {primary}
+            if hedge_after is not None and hedge_after < deadline:
+                done, pending = await asyncio.wait(pending, timeout=hedge_after)
+                if not done and self._take_hedge():
+                    hedge = asyncio.ensure_future((hedge_factory or factory)())
+                    started[hedge] = time.monotonic()
+                    pending.add(hedge)
+                    current_span().set(hedged=True)
+            error: Optional[BaseException] = None
+            while True:
+                for task in [t for t in started if t.done() and t not in pending]:
+                    if task.cancelled():
+                        continue
+                    if task.exception() is None:
+                        self.tracker.observe(key, time.monotonic() - started[task])
+                        if task is not primary:
+                            with self._lock:
+                                self.stats.hedge_wins += 1
+                            current_span().set(hedge_won=True)
+                        return task.result()
+                    error = task.exception()
+                    del started[task]
+                if not pending:
+                    raise error if error is not None else asyncio.CancelledError()
+                remaining = t0 + deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                _, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED,
+                )
+            # Counted at the deadline so the window keeps the stalled tail.
+            self.tracker.observe(key, time.monotonic() - t0)
+            with self._lock:
+                self.stats.timeouts += 1
+            raise asyncio.TimeoutError(f"no response within {deadline:.1f}s")
+        finally:
+            losers = [t for t in started if not t.done()]
+            for task in losers:
+                task.cancel()
+            if losers:
+                await asyncio.gather(*losers, return_exceptions=True)
+
+    def summary(self, key: str) -> str:
+        s = self.stats
+        p50 = self.tracker.quantile(key, 0.5)
+        p95 = self.tracker.quantile(key, 0.95)
+        return (
+            f"calls={s.calls} hedged={s.hedged} hedge_wins={s.hedge_wins} over_budget={s.over_budget} "
+            f"timeouts={s.timeouts} deadline={self.deadline(key):.1f}s "
+            f"p50={p50 or 0.0:.1f}s p95={p95 or 0.0:.1f}s samples={self.tracker.count(key)}"
+        )
@@ -0,0 +1,271 @@
+"""Low-memory streaming extraction for roster and stats pages.
+
+``clean_soup`` builds a BeautifulSoup tree for the whole page — navigation,
+footers, inline scripts and multi-MB Nuxt payloads included — and the
+parsers then look at a handful of tables or roster cards. This module feeds
+the page through lxml's incremental HTML parser instead and keeps only:
+
+- ``<table>`` elements and Sidearm roster containers (``.s-person-card``,
+  ``.sidearm-roster-player-container``, ``.sidearm-table``), outermost only;
+- the text of the ``<script id="__NUXT_DATA__">`` hydration island.
+
+Every other element is cleared as soon as its end tag is seen, so the
+parse never holds the full document tree. The kept fragments go through
+the same cleanup as ``clean_soup`` and are handed to the existing parsers
+as a small soup, so ``parse_roster_html`` / ``parse_stats_html`` return the
+same ``ParsedPlayer`` / ``ParsedStatLine`` lists as the full-soup path.
+
+Engine selection: ``DEEP_RESEARCH_HTML_ENGINE=stream|soup``. ``stream`` is
+the default when lxml is installed; without lxml everything falls back to
+the full-soup path.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from .nuxt_payload import NuxtPayload
+from .parse_strategy import PARSER_STRATEGIES, ParserStrategy, layout_fingerprint, parser_memory_enabled
+from .parsers import (
+    ROSTER_LAYOUTS,
+    clean_soup,
+    nuxt_roster_players_from_payload,
+    nuxt_stats_records_from_payload,
+    parse_nuxt_roster_players,
+    parse_nuxt_stats_records,
+    parse_roster_layout,
+    parse_stats_records,
+)
+from .retry import host_of
+from .types import ParsedPlayer, ParsedStatLine
+
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover - lxml is in requirements, soup path still works
+    etree = None
+
+
+# Version of what parse_roster_html / parse_stats_html extract. Stored in
+# every page's validators; cached items parsed by another version are never
+# reused, even on a 304 or an identical body. Bump it whenever a parser
+# change alters the ParsedPlayer / ParsedStatLine output.
+PARSER_VERSION = 1
+
+# Same tags clean_soup decomposes; nothing inside them is ever parsed.
+_DROPPED_TAGS = frozenset({"script", "style", "nav", "footer", "header", "iframe"})
+_KEPT_CLASSES = frozenset({"s-person-card", "sidearm-roster-player-container", "sidearm-table"})
+_FEED_CHUNK_CHARS = 64 * 1024
+
+
+def lxml_available() -> bool:
+    return etree is not None
+
+
+def html_engine() -> str:
+    """Configured engine, ``stream`` or ``soup``."""
+    engine = os.getenv("DEEP_RESEARCH_HTML_ENGINE", "").strip().lower()
+    if engine == "soup" or not lxml_available():
+        return "soup"
+    return "stream"
+
+
+def _is_kept(elem: Any) -> bool:
+    if elem.tag == "table":
+        return True
+    classes = elem.get("class")
+    return bool(classes) and not _KEPT_CLASSES.isdisjoint(classes.split())
+
+
+@dataclass
+class ExtractedPage:
+    """What the streaming pass keeps from one page."""
+
+    fragments: List[str] = field(default_factory=list)
+    nuxt_payload: Optional[str] = None
+    elements_seen: int = 0
+
+    def soup(self) -> BeautifulSoup:
+        """Soup over the kept fragments only, in document order."""
+        return BeautifulSoup("".join(self.fragments), "html.parser")
+
+    def nuxt(self) -> Optional[NuxtPayload]:
+        if self.nuxt_payload is None:
+            return None
+        return NuxtPayload.parse(self.nuxt_payload)
+
+
+def extract_page(html: str, chunk_chars: int = _FEED_CHUNK_CHARS) -> ExtractedPage:
+    """Stream ``html`` through lxml, keeping only tables, roster cards and the Nuxt island."""
+    if etree is None:
+        raise RuntimeError("lxml is required for the streaming HTML engine")
+
+    page = ExtractedPage()
+    parser = etree.HTMLPullParser(events=("start", "end"), remove_comments=True)
+    kept_root = None
+    dropped_depth = 0
+
+    def drain() -> None:
+        nonlocal kept_root, dropped_depth
+        for event, elem in parser.read_events():
+            tag = elem.tag if isinstance(elem.tag, str) else ""
+            if event == "start":
+                page.elements_seen += 1
+                if kept_root is not None:
+                    continue
+                if tag in _DROPPED_TAGS:
+                    dropped_depth += 1
+                elif dropped_depth == 0 and _is_kept(elem):
+                    kept_root = elem
+                continue
+
+            if (
+                tag == "script"
+                and page.nuxt_payload is None
+                and elem.get("id") == "__NUXT_DATA__"
+            ):
+                page.nuxt_payload = elem.text or ""
+
+            if kept_root is not None and elem is not kept_root:
+                continue
+            if elem is kept_root:
+                etree.strip_elements(elem, *_DROPPED_TAGS, with_tail=False)
+                page.fragments.append(
+                    etree.tostring(elem, method="html", encoding="unicode", with_tail=False)
+                )
+                kept_root = None
+            elif tag in _DROPPED_TAGS:
+                dropped_depth -= 1
+
+            # Done with this subtree: free it and any finished siblings.
+            elem.clear(keep_tail=False)
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+    for start in range(0, len(html), chunk_chars):
+        parser.feed(html[start:start + chunk_chars])
+        drain()
+    parser.close()
+    drain()
+    return page
+
+
+def _roster_default(html: str, engine: str) -> Tuple[List[ParsedPlayer], str, Optional[str]]:
+    """HTML layouts first, then the Nuxt island; plus the source and layout used."""
+    if engine == "soup":
+        players, layout = parse_roster_layout(clean_soup(html))
+        if players:
+            return players, "html", layout
+        nuxt_players = parse_nuxt_roster_players(html)
+        return (nuxt_players, "nuxt", None) if nuxt_players else ([], "html", None)
+
+    page = extract_page(html)
+    players, layout = parse_roster_layout(page.soup()) if page.fragments else ([], None)
+    if players:
+        return players, "html", layout
+    payload = page.nuxt()
+    nuxt_players = nuxt_roster_players_from_payload(payload) if payload is not None else []
+    return (nuxt_players, "nuxt", None) if nuxt_players else ([], "html", None)
+
+
+def _roster_with(strategy: ParserStrategy, html: str, engine: str) -> List[ParsedPlayer]:
+    if strategy.parser == "nuxt":
+        # The island is found with str.find: no soup, no lxml pass.
+        return parse_nuxt_roster_players(html)
+    layouts = (strategy.variant,) if strategy.variant else ROSTER_LAYOUTS
+    if engine == "soup":
+        return parse_roster_layout(clean_soup(html), layouts)[0]
+    page = extract_page(html)
+    return parse_roster_layout(page.soup(), layouts)[0] if page.fragments else []
+
+
+def _stats_default(html: str, engine: str) -> Tuple[List[ParsedStatLine], str, Optional[str]]:
+    """Nuxt island first, then tables; plus the source used."""
+    if engine == "soup":
+        records = parse_nuxt_stats_records(html)
+        if records:
+            return records, "nuxt", None
+        return parse_stats_records(clean_soup(html)), "html", None
+
+    page = extract_page(html)
+    payload = page.nuxt()
+    records = nuxt_stats_records_from_payload(payload) if payload is not None else []
+    if records:
+        return records, "nuxt", None
+    return (parse_stats_records(page.soup()) if page.fragments else []), "html", None
+
+
+def _stats_with(strategy: ParserStrategy, html: str, engine: str) -> List[ParsedStatLine]:
+    if strategy.parser == "nuxt":
+        return parse_nuxt_stats_records(html)
+    if engine == "soup":
+        return parse_stats_records(clean_soup(html))
+    page = extract_page(html)
+    return parse_stats_records(page.soup()) if page.fragments else []
+
+
+def _parse_remembered(
+    page_type: str,
+    html: str,
+    engine: str,
+    url: Optional[str],
+    parse_default: Callable[[str, str], Tuple[List[Any], str, Optional[str]]],
+    parse_with: Callable[[ParserStrategy, str, str], List[Any]],
+    skips_first_parser: Callable[[ParserStrategy], bool],
+) -> Tuple[List[Any], str]:
+    """Remembered strategy for ``url``'s host first, then the default order."""
+    host = host_of(url) if url and parser_memory_enabled() else ""
+    if not host:
+        items, source, _ = parse_default(html, engine)
+        return items, source
+
+    fingerprint = layout_fingerprint(html)
+    strategy = PARSER_STRATEGIES.lookup(host, page_type, fingerprint)
+    if strategy is not None:
+        items = parse_with(strategy, html, engine)
+        if items:
+            PARSER_STRATEGIES.record_hit(host, page_type, strategy, skips_first_parser(strategy))
+            return items, strategy.parser
+        PARSER_STRATEGIES.invalidate(host, page_type)
+
+    items, source, variant = parse_default(html, engine)
+    if items:
+        PARSER_STRATEGIES.remember(host, page_type, source, variant, fingerprint)
+    return items, source
+
+
+def parse_roster_html(
+    html: str, engine: Optional[str] = None, url: Optional[str] = None,
+) -> Tuple[List[ParsedPlayer], str]:
+    """Roster players from a page plus the source (``html`` or ``nuxt``).
+
+    HTML layouts first, then the Nuxt hydration island — same order as
+    ``fetch_and_parse_roster`` always used. With ``url``, the parser that
+    last worked for its host is tried alone first (parse_strategy.py).
+    """
+    return _parse_remembered(
+        "roster", html, engine or html_engine(), url,
+        _roster_default, _roster_with,
+        lambda strategy: strategy.parser == "nuxt",
+    )
+
+
+def parse_stats_html(
+    html: str, engine: Optional[str] = None, url: Optional[str] = None,
+) -> Tuple[List[ParsedStatLine], str]:
+    """Stat lines from a page plus the source (``nuxt`` or ``html``).
+
+    Nuxt island first (Nextgen sites have no static tables), then tables.
+    With ``url``, the parser that last worked for its host is tried alone
+    first (parse_strategy.py).
+    """
+    return _parse_remembered(
+        "stats", html, engine or html_engine(), url,
+        _stats_default, _stats_with,
+        lambda strategy: strategy.parser == "html" and strategy.fingerprint.startswith("nuxt"),
+    )
@@ -22,12 +22,15 @@ import json
 import logging
 import re
 import time
+from dataclasses import dataclass
 from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from backend.utils.position_tracks import is_pitcher_primary_position
 
 from .evidence import _has_meaningful_evidence, _safe_int, _school_position_family
+from .prompt_budget import PromptBreakdown, breakdown_for, fit_payload, input_budget
 from .talking_points import TalkingPoint, format_division_label
+from .tracing import current_span, traced
 from .types import DeepSchoolReview, GatheredEvidence
 
 
@@ -73,6 +76,9 @@ _REGION_STATES = {
 
 
 def review_instructions() -> str:
+    # Sent as ``instructions`` ahead of the per-school input and kept
+    # byte-identical across schools and runs so the provider's prefix
+    # cache applies: never interpolate school/player/run data here.
     return (
         "You are writing a school recommendation for a high school baseball "
         "player and their family who are deciding which college programs to "
@@ -536,6 +542,36 @@ def _build_school_context(school: Dict[str, Any]) -> Dict[str, Any]:
     return {k: v for k, v in school_context.items() if v}
 
 
+# Decimal places the writeup quotes each metric at; everything else is 1.
+# Profile values are canonicalized to this precision before they reach the
+# prompt, so "91", 91 and 91.04 produce the same payload (and the same
+# review-cache fingerprint) without changing a number the model quotes.
+_METRIC_DECIMALS = {
+    "sixty_time": 2,
+    "pop_time": 2,
+    "fastball_spin": 0,
+    "changeup_spin": 0,
+    "curveball_spin": 0,
+    "slider_spin": 0,
+    "weight": 0,
+}
+
+
+def _canonical_metric(key: str, value: Any) -> Any:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            value = float(text)
+        except ValueError:
+            return text
+    if isinstance(value, (int, float)):
+        rounded = round(float(value), _METRIC_DECIMALS.get(key, 1))
+        return int(rounded) if rounded.is_integer() else rounded
+    return value
+
+
 def _build_player_profile(player_stats: Dict[str, Any]) -> Dict[str, Any]:
     primary_position = player_stats.get("primary_position", "")
     is_pitcher = is_pitcher_primary_position(primary_position)
@@ -578,7 +614,11 @@ def _build_player_profile(player_stats: Dict[str, Any]) -> Dict[str, Any]:
                 if val is not None:
                     profile[key] = val
 
-    return {k: v for k, v in profile.items() if v is not None}
+    return {
+        k: (v if k in ("primary_position", "player_type") else _canonical_metric(k, v))
+        for k, v in profile.items()
+        if v is not None
+    }
 
 
 def _build_roster_facts(evidence: Optional[GatheredEvidence]) -> Dict[str, Any]:
@@ -621,14 +661,14 @@ def _school_in_player_region(school: Dict[str, Any], player_region: Optional[str
     return str(state).strip().upper() in _REGION_STATES.get(player_region, set())
 
 
-def review_input(
+def review_payload(
     school: Dict[str, Any],
     player_stats: Dict[str, Any],
     baseball_assessment: Dict[str, Any],
     academic_score: Dict[str, Any],
     evidence: Optional[GatheredEvidence],
     talking_points: List[TalkingPoint],
-) -> str:
+) -> Dict[str, Any]:
     """Build the unified LLM payload.
 
     A single ``roster_data_unavailable`` flag tells the model whether to
@@ -645,7 +685,7 @@ def review_input(
         for tp in talking_points
     ]
 
-    payload = {
+    return {
         "player": _build_player_profile(player_stats),
         "school": _build_school_context(school),
         "talking_points": talking_points_payload,
@@ -655,12 +695,84 @@ def review_input(
             school, player_stats.get("player_region"),
         ),
     }
-    return (
-        "Write a school fit review for this player using only the provided data.\n"
-        f"{json.dumps(payload)}"
+
+
+REVIEW_INPUT_PREAMBLE = "Write a school fit review for this player using only the provided data.\n"
+
+
+def _render_input(payload: Dict[str, Any]) -> str:
+    return REVIEW_INPUT_PREAMBLE + json.dumps(payload)
+
+
+@dataclass
+class ReviewPrompt:
+    """One reviewer request: static instructions + budgeted per-school input."""
+    instructions: str
+    input_text: str
+    payload: Dict[str, Any]
+    breakdown: PromptBreakdown
+
+
+def build_review_prompt(
+    school: Dict[str, Any],
+    player_stats: Dict[str, Any],
+    baseball_assessment: Dict[str, Any],
+    academic_score: Dict[str, Any],
+    evidence: Optional[GatheredEvidence],
+    talking_points: List[TalkingPoint],
+    budget: Optional[int] = None,
+) -> ReviewPrompt:
+    """Assemble the prompt, trimming the payload to the input token budget.
+
+    The player profile leads the payload (identical for every school in a
+    run), the school-specific sections follow. ``payload`` is what was
+    actually sent, so callers fingerprint the trimmed version.
+    """
+    budget = budget if budget is not None else input_budget()
+    payload, trimmed = fit_payload(
+        review_payload(
+            school, player_stats, baseball_assessment, academic_score, evidence, talking_points,
+        ),
+        _render_input,
+        budget,
+    )
+    instructions = review_instructions()
+    input_text = _render_input(payload)
+    return ReviewPrompt(
+        instructions=instructions,
+        input_text=input_text,
+        payload=payload,
+        breakdown=breakdown_for(instructions, payload, input_text, budget, trimmed),
     )
 
 
+def review_input(
+    school: Dict[str, Any],
+    player_stats: Dict[str, Any],
+    baseball_assessment: Dict[str, Any],
+    academic_score: Dict[str, Any],
+    evidence: Optional[GatheredEvidence],
+    talking_points: List[TalkingPoint],
+) -> str:
+    """The user message sent to the reviewer: instruction line + JSON payload."""
+    return build_review_prompt(
+        school, player_stats, baseball_assessment, academic_score, evidence, talking_points,
+    ).input_text
+
+
+def _usage_attributes(response: Any) -> Dict[str, Any]:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return {}
+    details = getattr(usage, "input_tokens_details", None)
+    return {
+        "usage.input_tokens": getattr(usage, "input_tokens", None),
+        "usage.output_tokens": getattr(usage, "output_tokens", None),
+        "usage.cached_tokens": getattr(details, "cached_tokens", None),
+    }
+
+
+@traced("llm_review")
 async def review_school(
     school: Dict[str, Any],
     player_stats: Dict[str, Any],
@@ -671,6 +783,7 @@ async def review_school(
     *,
     responses_parse: Callable[..., Awaitable[Any]],
     review_model: str,
+    prompt: Optional[ReviewPrompt] = None,
 ) -> Optional[DeepSchoolReview]:
     """Run the unified LLM reviewer.
 
@@ -679,21 +792,29 @@ async def review_school(
     ``roster_data_unavailable`` rule applies and the caller should also
     force ``confidence='low'`` and ``adjustment_from_base='none'`` to keep
     the rerank logic from rewarding non-existent roster signal.
+
+    ``prompt`` is a ``build_review_prompt`` result the caller already
+    holds (e.g. to fingerprint it); built here when omitted.
     """
     school_name = school.get("display_school_name") or school.get("school_name") or "Unknown School"
+    if prompt is None:
+        prompt = build_review_prompt(
+            school, player_stats, baseball_assessment, academic_score, evidence, talking_points,
+        )
+    logger.info("[PROMPT] school=%r %s", school_name, prompt.breakdown.as_log())
+    current_span().set(
+        school=school_name,
+        model=review_model,
+        instruction_tokens=prompt.breakdown.instructions,
+        input_tokens=prompt.breakdown.input,
+        trimmed=len(prompt.breakdown.trimmed),
+    )
     t_start = time.monotonic()
     try:
         response = await responses_parse(
             model=review_model,
-            input_text=review_input(
-                school,
-                player_stats,
-                baseball_assessment,
-                academic_score,
-                evidence,
-                talking_points,
-            ),
-            instructions=review_instructions(),
+            input_text=prompt.input_text,
+            instructions=prompt.instructions,
             text_format=DeepSchoolReview,
             max_output_tokens=2500,
         )
@@ -707,6 +828,7 @@ async def review_school(
         "[TIMING] llm_review school=%r status=ok elapsed=%.2fs",
         school_name, time.monotonic() - t_start,
     )
+    current_span().set(**_usage_attributes(response))
     review = getattr(response, "output_parsed", None)
     if review is not None and review.why_this_school:
         review.why_this_school = humanize_dashes(review.why_this_school)
@@ -0,0 +1,162 @@
+"""Lazy decoder for Nuxt 3 ``__NUXT_DATA__`` hydration payloads.
+
+The island is one flat JSON array in devalue format: every container
+value is an integer index into the same array. A Sidearm Nextgen stats
+page ships ~18k elements (1.6 MB) of which the parsers read a few
+hundred — the stat-row dicts and the scalars they point at.
+
+``NuxtPayload`` replaces ``json.loads`` of the whole array with one
+regex pass that records where each top-level element ends (an
+``array('l')``, no Python object per element) and decodes nothing.
+``records(key)`` finds the dicts that carry ``key`` by substring search
+— and skips the pass entirely when no element does — and ``element(i)``
+decodes a single element on first use and memoizes it, so shared
+references (the same ``"0"`` string behind every empty stat cell) are
+decoded once.
+
+Payloads the indexer does not handle — whitespace between elements, a
+dict nested in a dict or a list in a list (devalue never emits either)
+— fall back to ``json.loads`` of the whole array with the same API.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, Iterator, List, Optional
+
+# Possessive quantifiers (3.11+): the walk never backtracks into a string.
+_STRING = r'"[^"\\]*+(?:\\.[^"\\]*+)*+"'
+# One top-level element plus its trailing separator. Dicts and lists may
+# hold strings and the other bracket kind (devalue's ["Reactive",3]
+# wrappers, {"a":[...]}), but not their own kind.
+_ELEMENT_RE = re.compile(
+    r"(?:"
+    + _STRING
+    + r"|\{[^{}\"]*+(?:" + _STRING + r"[^{}\"]*+)*+\}"
+    + r"|\[[^\[\]\"]*+(?:" + _STRING + r"[^\[\]\"]*+)*+\]"
+    + r"|-?\d[\d.eE+-]*+|true|false|null"
+    + r")[,\]]"
+)
+_DECODER = json.JSONDecoder()
+
+
+def index_elements(text: str) -> Optional[array]:
+    """End offset (past the separator) of each top-level element, or None.
+
+    None means ``text`` is not a compact array the regex can walk
+    element by element; the caller falls back to a full decode.
+    """
+    if not text.startswith("["):
+        return None
+    if text == "[]":
+        return array("l")
+    ends = array("l")
+    append = ends.append
+    pos = 1
+    for m in _ELEMENT_RE.finditer(text, 1):
+        start, end = m.span()
+        if start != pos:
+            return None
+        append(end)
+        pos = end
+    return ends if pos == len(text) else None
+
+
+class NuxtPayload:
+    """Lazily indexed, lazily decoded view of a ``__NUXT_DATA__`` array.
+
+    Nothing is scanned until the first lookup, so a page whose island
+    lacks the keys a parser asks for costs one substring search.
+    """
+
+    __slots__ = ("_text", "_ends", "_data", "_cache")
+
+    def __init__(self, text: Optional[str] = None, data: Optional[List[Any]] = None):
+        self._text = text
+        self._ends: Optional[array] = None
+        self._data = data
+        self._cache: Dict[int, Any] = {}
+
+    @classmethod
+    def parse(cls, payload: str) -> Optional["NuxtPayload"]:
+        """Wrap the text of a ``__NUXT_DATA__`` script, or None if it can't be a JSON array."""
+        text = payload.strip()
+        if not text.startswith("["):
+            return None
+        return cls(text=text)
+
+    @classmethod
+    def from_list(cls, data: List[Any]) -> "NuxtPayload":
+        """Wrap an already-decoded array."""
+        return cls(data=data)
+
+    def _index(self) -> None:
+        if self._ends is not None or self._data is not None:
+            return
+        ends = index_elements(self._text)
+        if ends is not None:
+            self._ends = ends
+            return
+        try:
+            data = json.loads(self._text)
+        except (json.JSONDecodeError, ValueError):
+            data = None
+        self._data = data if isinstance(data, list) else []
+
+    @property
+    def indexed(self) -> bool:
+        """True when lookups go through the element index, not a full decode."""
+        self._index()
+        return self._ends is not None
+
+    def __len__(self) -> int:
+        self._index()
+        return len(self._ends) if self._ends is not None else len(self._data)
+
+    def element(self, index: int) -> Any:
+        """Top-level element ``index``, decoded once."""
+        self._index()
+        if self._data is not None:
+            return self._data[index]
+        try:
+            return self._cache[index]
+        except KeyError:
+            pass
+        ends = self._ends
+        if not 0 <= index < len(ends):
+            raise IndexError(index)
+        value, _ = _DECODER.raw_decode(self._text, ends[index - 1] if index else 1)
+        self._cache[index] = value
+        return value
+
+    def resolve(self, value: Any) -> Any:
+        """Follow one reference: an in-range int is an index, anything else is itself."""
+        if isinstance(value, int) and 0 <= value < len(self):
+            return self.element(value)
+        return value
+
+    def records(self, key: str) -> Iterator[Dict[str, Any]]:
+        """Top-level dicts that have ``key``, in array order.
+
+        Only elements whose text contains ``"key"`` are decoded.
+        """
+        needle = json.dumps(key)
+        if self._text is not None and needle not in self._text:
+            return
+        self._index()
+        if self._data is not None:
+            for item in self._data:
+                if isinstance(item, dict) and key in item:
+                    yield item
+            return
+        text, ends = self._text, self._ends
+        pos = text.find(needle)
+        while pos != -1:
+            index = bisect_right(ends, pos)
+            item = self.element(index)
+            if isinstance(item, dict) and key in item:
+                yield item
+            pos = text.find(needle, ends[index])
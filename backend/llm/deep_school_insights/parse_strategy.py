@@ -0,0 +1,163 @@
+"""Per-site memory of which parser handles a roster or stats page.
+
+Without it every page runs the default order: roster pages build the
+HTML soup and only then fall back to the Nuxt hydration island, stats
+pages decode the island and only then parse the tables. A given
+athletics site renders the same way on every visit, so a Nextgen roster
+page pays for an HTML parse that never finds anything, run after run.
+
+``PARSER_STRATEGIES`` remembers, per ``(host, page_type)``, the parser
+that last produced rows (``html`` / ``nuxt``), its selector variant (the
+roster layout that won: ``card`` / ``table`` / ``generic``) and the
+page's layout fingerprint. ``parse_roster_html`` / ``parse_stats_html``
+(html_stream.py) try that strategy alone first. It is dropped, and the
+default order runs, when it yields no rows or the fingerprint changes
+(a site redesign).
+
+The registry is process-wide, like ``HOST_HEALTH``: a research worker
+and the refresh / audit scripts all parse through fetch.py and share
+it for the life of the process. Across processes it is persisted next
+to the page validators in ``school_evidence_cache``: the weekly refresh
+writes each page's strategy with its validators, and
+``load_previous_pages`` seeds the registry from them, so a fresh worker
+starts with what the last refresh learned. ``DEEP_RESEARCH_PARSER_MEMORY=0``
+turns it off.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+# Cheap substring markers, in fingerprint order. Which of them a page
+# carries is what decides the parser that works on it.
+_LAYOUT_MARKERS = (
+    ("nuxt", 'id="__NUXT_DATA__"'),
+    ("cards", "s-person-card"),
+    ("sidearm_players", "sidearm-roster-player-container"),
+    ("sidearm_table", "sidearm-table"),
+    ("table", "<table"),
+)
+
+
+def parser_memory_enabled() -> bool:
+    return os.getenv("DEEP_RESEARCH_PARSER_MEMORY", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def layout_fingerprint(html: str) -> str:
+    """``+``-joined names of the layout markers present in ``html``."""
+    return "+".join(name for name, marker in _LAYOUT_MARKERS if marker in html) or "bare"
+
+
+@dataclass
+class ParserStrategy:
+    parser: str
+    variant: Optional[str]
+    fingerprint: str
+    hits: int = 0
+    updated_at: float = 0.0
+
+
+@dataclass
+class ParserStrategyStats:
+    hits: int = 0
+    misses: int = 0
+    learned: int = 0
+    invalidated: int = 0
+    double_parses_avoided: int = 0
+    seeded: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "learned": self.learned,
+            "invalidated": self.invalidated,
+            "double_parses_avoided": self.double_parses_avoided,
+            "seeded": self.seeded,
+        }
+
+    def since(self, before: Dict[str, int]) -> Dict[str, int]:
+        """Counter increments since an earlier ``as_dict()`` snapshot."""
+        return {k: v - before.get(k, 0) for k, v in self.as_dict().items()}
+
+
+class ParserStrategyRegistry:
+    """Remembered parser per ``(host, page_type)``, process-wide."""
+
+    def __init__(self) -> None:
+        self._strategies: Dict[Tuple[str, str], ParserStrategy] = {}
+        self.stats = ParserStrategyStats()
+        self._lock = threading.Lock()
+
+    def lookup(self, host: str, page_type: str, fingerprint: str) -> Optional[ParserStrategy]:
+        """The remembered strategy, unless the page's layout changed since."""
+        with self._lock:
+            strategy = self._strategies.get((host, page_type))
+            if strategy is None:
+                self.stats.misses += 1
+                return None
+            if strategy.fingerprint != fingerprint:
+                del self._strategies[(host, page_type)]
+                self.stats.invalidated += 1
+                self.stats.misses += 1
+                return None
+            return strategy
+
+    def record_hit(self, host: str, page_type: str, strategy: ParserStrategy, double_parse_avoided: bool) -> None:
+        with self._lock:
+            strategy.hits += 1
+            strategy.updated_at = time.time()
+            self.stats.hits += 1
+            if double_parse_avoided:
+                self.stats.double_parses_avoided += 1
+
+    def invalidate(self, host: str, page_type: str) -> None:
+        """The remembered strategy stopped yielding rows; forget it."""
+        with self._lock:
+            if self._strategies.pop((host, page_type), None) is not None:
+                self.stats.invalidated += 1
+
+    def remember(
+        self, host: str, page_type: str, parser: str, variant: Optional[str], fingerprint: str,
+    ) -> None:
+        with self._lock:
+            self._strategies[(host, page_type)] = ParserStrategy(
+                parser=parser, variant=variant, fingerprint=fingerprint, updated_at=time.time(),
+            )
+            self.stats.learned += 1
+
+    def seed(self, host: str, page_type: str, strategy: ParserStrategy) -> bool:
+        """Adopt a persisted strategy unless this process already knows one."""
+        with self._lock:
+            if (host, page_type) in self._strategies:
+                return False
+            self._strategies[(host, page_type)] = strategy
+            self.stats.seeded += 1
+            return True
+
+    def get(self, host: str, page_type: str) -> Optional[ParserStrategy]:
+        with self._lock:
+            return self._strategies.get((host, page_type))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._strategies)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._strategies.clear()
+            self.stats = ParserStrategyStats()
+
+    def summary(self) -> str:
+        s = self.stats
+        return (
+            f"sites={len(self)} hits={s.hits} misses={s.misses} learned={s.learned} "
+            f"invalidated={s.invalidated} double_parses_avoided={s.double_parses_avoided} seeded={s.seeded}"
+        )
+
+
+PARSER_STRATEGIES = ParserStrategyRegistry()
@@ -6,7 +6,6 @@ already-parsed lists and return dataclasses from ``types``.
 
 from __future__ import annotations
 
-import json
 import re
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 from urllib.parse import urlparse
@@ -16,6 +15,7 @@ from bs4 import BeautifulSoup, Comment
 from backend.roster_scraper.roster_parser import normalize_class_year, normalize_position
 from backend.roster_scraper.sidearm_scraper import SidearmRosterScraper
 
+from .nuxt_payload import NuxtPayload
 from .types import MatchedPlayer, ParsedPlayer, ParsedStatLine
 
 
@@ -224,27 +224,38 @@ def _dedupe_parsed_players(players: Sequence[ParsedPlayer]) -> List[ParsedPlayer
     return list(deduped.values())
 
 
+ROSTER_LAYOUTS = ("card", "table", "generic")
+
+
 def parse_roster_players(soup: BeautifulSoup) -> List[ParsedPlayer]:
     """Parse roster HTML into structured player records using the best available layout."""
+    return parse_roster_layout(soup)[0]
+
+
+def parse_roster_layout(
+    soup: BeautifulSoup, layouts: Sequence[str] = ROSTER_LAYOUTS,
+) -> Tuple[List[ParsedPlayer], Optional[str]]:
+    """``parse_roster_players`` restricted to ``layouts``, plus the layout that won."""
     scraper = SidearmRosterScraper.__new__(SidearmRosterScraper)
-    candidates: List[List[ParsedPlayer]] = []
-    for parse_fn in (
-        scraper._parse_card_layout,
-        scraper._parse_table_layout,
-        scraper._parse_generic_table,
-    ):
-        raw_players = parse_fn(soup)
+    parse_fns = {
+        "card": scraper._parse_card_layout,
+        "table": scraper._parse_table_layout,
+        "generic": scraper._parse_generic_table,
+    }
+    candidates: List[Tuple[List[ParsedPlayer], str]] = []
+    for layout in layouts:
+        raw_players = parse_fns[layout](soup)
         if not raw_players:
             continue
         parsed_players = _build_parsed_players(raw_players)
         deduped = _dedupe_parsed_players(parsed_players)
         if deduped:
-            candidates.append(deduped)
+            candidates.append((deduped, layout))
 
     if not candidates:
-        return []
+        return [], None
 
-    return max(candidates, key=lambda players: (_parsed_roster_quality(players), len(players)))
+    return max(candidates, key=lambda c: (_parsed_roster_quality(c[0]), len(c[0])))
 
 
 # ---------------------------------------------------------------------------
@@ -252,24 +263,34 @@ def parse_roster_players(soup: BeautifulSoup) -> List[ParsedPlayer]:
 # ---------------------------------------------------------------------------
 
 
-_NUXT_DATA_RE = re.compile(
-    r'<script[^>]*id="__NUXT_DATA__"[^>]*>(.*?)</script>',
-    re.DOTALL,
-)
+_NUXT_DATA_ID = 'id="__NUXT_DATA__"'
 
 
-def _load_nuxt_data(html: str) -> Optional[List[Any]]:
-    """Extract and parse the Nuxt 3 hydration island, returning None if absent."""
-    m = _NUXT_DATA_RE.search(html)
-    if not m:
-        return None
-    try:
-        data = json.loads(m.group(1))
-    except (json.JSONDecodeError, ValueError):
-        return None
-    if not isinstance(data, list):
+def nuxt_island_text(html: str) -> Optional[str]:
+    """Text of the ``<script id="__NUXT_DATA__">`` element, or None if absent.
+
+    Plain ``str.find`` calls: a lazy ``.*?`` regex across a multi-MB
+    page cost as much as decoding the island itself.
+    """
+    at = html.find(_NUXT_DATA_ID)
+    while at != -1:
+        open_at = html.rfind("<script", 0, at)
+        body_at = html.find(">", at)
+        if open_at != -1 and body_at != -1 and html.find(">", open_at, at) == -1:
+            close_at = html.find("</script>", body_at)
+            if close_at == -1:
+                return None
+            return html[body_at + 1:close_at]
+        at = html.find(_NUXT_DATA_ID, at + len(_NUXT_DATA_ID))
+    return None
+
+
+def _load_nuxt_payload(html: str) -> Optional[NuxtPayload]:
+    """Extract the Nuxt 3 hydration island, returning None if absent."""
+    text = nuxt_island_text(html)
+    if text is None:
         return None
-    return data
+    return NuxtPayload.parse(text)
 
 
 def parse_nuxt_roster_players(html: str) -> List[ParsedPlayer]:
@@ -290,14 +311,20 @@ def parse_nuxt_roster_players(html: str) -> List[ParsedPlayer]:
 
     Returns ``[]`` when no Nuxt data island is present.
     """
-    data = _load_nuxt_data(html)
-    if data is None:
+    payload = _load_nuxt_payload(html)
+    if payload is None:
         return []
+    return nuxt_roster_players_from_payload(payload)
 
-    def resolve(value: Any) -> Any:
-        if isinstance(value, int) and 0 <= value < len(data):
-            return data[value]
-        return value
+
+def nuxt_roster_players_from_data(data: List[Any]) -> List[ParsedPlayer]:
+    """``parse_nuxt_roster_players`` over an already-decoded Nuxt payload."""
+    return nuxt_roster_players_from_payload(NuxtPayload.from_list(data))
+
+
+def nuxt_roster_players_from_payload(payload: NuxtPayload) -> List[ParsedPlayer]:
+    """``parse_nuxt_roster_players`` over an indexed Nuxt payload."""
+    resolve = payload.resolve
 
     # Player records have last_name + (first_name OR full_name) AND at least
     # one player-only attribute. Coaches/staff lack these — gate on player
@@ -314,11 +341,9 @@ def parse_nuxt_roster_players(html: str) -> List[ParsedPlayer]:
 
     seen: set = set()
     players: List[ParsedPlayer] = []
-    for item in data:
-        if not isinstance(item, dict):
-            continue
+    for item in payload.records("last_name"):
         keys = set(item.keys())
-        if "last_name" not in keys or not keys & {"first_name", "full_name"}:
+        if not keys & {"first_name", "full_name"}:
             continue
         if keys & _STAFF_MARKER_KEYS:
             continue
@@ -391,20 +416,27 @@ def parse_nuxt_stats_records(html: str) -> List[ParsedStatLine]:
     Returns ``[]`` when no Nuxt data island is present, so callers can
     cleanly fall back to the HTML-table parser.
     """
-    data = _load_nuxt_data(html)
-    if data is None:
+    payload = _load_nuxt_payload(html)
+    if payload is None:
         return []
+    return nuxt_stats_records_from_payload(payload)
 
-    def resolve(value: Any) -> Any:
-        if isinstance(value, int) and 0 <= value < len(data):
-            return data[value]
-        return value
 
+def nuxt_stats_records_from_data(data: List[Any]) -> List[ParsedStatLine]:
+    """``parse_nuxt_stats_records`` over an already-decoded Nuxt payload."""
+    return nuxt_stats_records_from_payload(NuxtPayload.from_list(data))
+
+
+def nuxt_stats_records_from_payload(payload: NuxtPayload) -> List[ParsedStatLine]:
+    """``parse_nuxt_stats_records`` over an indexed Nuxt payload.
+
+    Only the ``playerName`` rows and the values they reference are
+    decoded; the rest of the island stays text.
+    """
+    resolve = payload.resolve
     records: List[ParsedStatLine] = []
     seen: set = set()
-    for item in data:
-        if not isinstance(item, dict) or "playerName" not in item:
-            continue
+    for item in payload.records("playerName"):
         is_pitching = "inningsPitched" in item
         is_batting = ("atBats" in item) and not is_pitching
         if not (is_pitching or is_batting):
@@ -534,12 +566,49 @@ def parse_stats_records(soup: BeautifulSoup) -> List[ParsedStatLine]:
 # ---------------------------------------------------------------------------
 
 
+class _StatLineIndex:
+    """Hash indexes over one stat table (batting or pitching).
+
+    Each stat line's name is normalized once. A stat line matches a player
+    when the last names agree and either the jersey numbers are equal
+    (both present) or the first initials are equal (both first names
+    present); the earliest matching line in page order wins. Both rules
+    need the last name, so two maps keyed on it give the same answer as
+    scanning the table: ``(last, jersey)`` and ``(last, first initial)``,
+    each holding the first line index for that key.
+    """
+
+    def __init__(self, stat_lines: List[ParsedStatLine]):
+        self.stat_lines = stat_lines
+        self.by_jersey: Dict[Tuple[str, str], int] = {}
+        self.by_initial: Dict[Tuple[str, str], int] = {}
+        for idx, stat in enumerate(stat_lines):
+            s_first, s_last = _normalize_name_parts(stat.player_name)
+            if stat.jersey_number:
+                self.by_jersey.setdefault((s_last, stat.jersey_number), idx)
+            if s_first:
+                self.by_initial.setdefault((s_last, s_first[0]), idx)
+
+    def find(self, jersey_number: Optional[str], first: str, last: str) -> Optional[ParsedStatLine]:
+        best: Optional[int] = None
+        if jersey_number:
+            best = self.by_jersey.get((last, jersey_number))
+        if first:
+            idx = self.by_initial.get((last, first[0]))
+            if idx is not None and (best is None or idx < best):
+                best = idx
+        return self.stat_lines[best] if best is not None else None
+
+
 def match_players_to_stats(
     players: List[ParsedPlayer],
     stats: List[ParsedStatLine],
 ) -> List[MatchedPlayer]:
     """Cross-reference roster players with stat lines by jersey + last name.
 
+    Lookups go through ``_StatLineIndex``: every name is normalized once
+    and each player resolves in O(1) instead of scanning every stat line.
+
     When the roster page itself doesn't expose a player's position (some older
     Sidearm Classic .aspx sites surface only names + jerseys), the stats page
     becomes the only signal for whether a player is a pitcher. After matching,
@@ -550,24 +619,14 @@ def match_players_to_stats(
     """
     import dataclasses
 
-    batting = [s for s in stats if s.stat_type == "batting"]
-    pitching = [s for s in stats if s.stat_type == "pitching"]
-
-    def _find_match(player: ParsedPlayer, stat_lines: List[ParsedStatLine]) -> Optional[ParsedStatLine]:
-        p_first, p_last = _normalize_name_parts(player.name)
-        for stat in stat_lines:
-            s_first, s_last = _normalize_name_parts(stat.player_name)
-            if player.jersey_number and stat.jersey_number:
-                if player.jersey_number == stat.jersey_number and p_last == s_last:
-                    return stat
-            if p_last == s_last and p_first and s_first and p_first[0] == s_first[0]:
-                return stat
-        return None
+    batting = _StatLineIndex([s for s in stats if s.stat_type == "batting"])
+    pitching = _StatLineIndex([s for s in stats if s.stat_type == "pitching"])
 
     matched: List[MatchedPlayer] = []
     for player in players:
-        bat = _find_match(player, batting)
-        pitch = _find_match(player, pitching)
+        p_first, p_last = _normalize_name_parts(player.name)
+        bat = batting.find(player.jersey_number, p_first, p_last)
+        pitch = pitching.find(player.jersey_number, p_first, p_last)
         if (
             pitch is not None
             and bat is None
@@ -0,0 +1,306 @@
+"""Research budget planner for the finalized (``final_limit``) fan-out.
+
+With ``final_limit`` set, enrich_and_rerank researches the whole
+consideration pool and then keeps the top ``final_limit`` schools after
+the cross-school rerank. Research can only move a school's
+``cross_school_composite`` by a bounded amount:
+
+* ``ranking_score`` shifts by the ranking adjustment, at most
+  ``±MAX_RERANK_ADJUSTMENT`` (weighted by the priority's ``ranking_score``
+  weight) — and once the school's evidence is in hand, by exactly one of
+  the few values ``compute_ranking_adjustment`` can return for it;
+* the relative opportunity bonus is clamped to
+  ``±CROSS_SCHOOL_Z_CLAMP * CROSS_SCHOOL_OPPORTUNITY_WEIGHT``.
+
+Everything else in the composite (fit family, academic penalty and
+quality bonus) is known before any research. ``ResearchPlanner`` keeps a
+``[lower, upper]`` composite interval per school and tightens it as
+evidence and reviews land. A school is skipped when at least
+``final_limit`` others that are not subject to category caps have a
+lower bound above its upper bound: it cannot reach the final list
+whether researched or not. Schools that could be injected by the
+priority guarantees (top academic / top SCI pools) are never skipped.
+
+Checks run before the fetch and again before the LLM review. Research is
+ordered by upper bound so the schools most likely to make the list
+finish first and tighten everyone else's bounds.
+
+Modes (``DEEP_RESEARCH_PLANNER``):
+- ``off`` (default) — research everything.
+- ``safe`` — skips only provably unreachable schools: no skipped school
+  could have made the final list. The list can still differ at the
+  cut-off, because relative opportunity z-scores are normalized over the
+  schools actually researched.
+- ``statistical`` — before a school's evidence is known, assumes its
+  adjustment stays within ``±DEEP_RESEARCH_PLANNER_ADJ_RANGE`` (default
+  6) instead of the hard ``±14``. Skips more; can rarely change the list.
+  ``backend/scripts/replay_research_planner.py`` measures the trade-off
+  on recorded runs (``DEEP_RESEARCH_RECORD_DIR``).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from .evidence import _has_meaningful_evidence
+from .ranking import (
+    ADJUSTMENT_POINTS,
+    CONFIDENCE_MULTIPLIER,
+    CROSS_SCHOOL_OPPORTUNITY_WEIGHT,
+    CROSS_SCHOOL_Z_CLAMP,
+    FINAL_CAPPED_FIT_LABELS,
+    FINAL_GUARANTEED_POOL,
+    MAX_RERANK_ADJUSTMENT,
+    PRIORITY_WEIGHTS,
+    RESEARCH_QUALITY_BONUS,
+    _apply_cross_school_reranking,
+    compute_ranking_adjustment,
+    compute_ranking_score,
+)
+from .types import DeepSchoolReview, GatheredEvidence
+
+logger = logging.getLogger(__name__)
+
+PLANNER_MODES = ("off", "safe", "statistical")
+OPPORTUNITY_BONUS_RANGE = CROSS_SCHOOL_Z_CLAMP * CROSS_SCHOOL_OPPORTUNITY_WEIGHT
+DEFAULT_STATISTICAL_ADJ_RANGE = 6.0
+# Composite and ranking_score are each rounded to 2 decimals.
+_EPS = 0.02
+# Statuses whose research packet feeds the relative opportunity bonus.
+_OPPORTUNITY_STATUSES = ("completed", "partial")
+
+
+@dataclass
+class _Bounds:
+    base: float          # composite at ranking_adjustment=0, no opportunity bonus
+    adj_low: float
+    adj_high: float
+    opportunity: bool    # may still receive a relative opportunity bonus
+    capped: bool         # subject to a finalize_ranking category cap
+    protected: bool      # may be injected by a priority guarantee
+
+
+@dataclass
+class PlannerStats:
+    candidates: int = 0
+    skipped_before_fetch: int = 0
+    skipped_before_review: int = 0
+
+    @property
+    def llm_calls_saved(self) -> int:
+        return self.skipped_before_fetch + self.skipped_before_review
+
+
+def _adjustment_outcomes(evidence: GatheredEvidence) -> List[float]:
+    """Every ranking_adjustment _enrich_single_school can assign for ``evidence``."""
+    if not _has_meaningful_evidence(evidence):
+        return [0.0]  # metadata_only / insufficient_evidence
+    outcomes = []
+    for adjustment in ADJUSTMENT_POINTS:
+        for confidence in CONFIDENCE_MULTIPLIER:
+            review = DeepSchoolReview(adjustment_from_base=adjustment, confidence=confidence)
+            outcomes.append(round(min(
+                compute_ranking_adjustment(evidence, review) + RESEARCH_QUALITY_BONUS,
+                MAX_RERANK_ADJUSTMENT,
+            ), 2))
+    # Reviewer failure: placeholder review, half the quality bonus.
+    outcomes.append(round(min(
+        compute_ranking_adjustment(evidence, DeepSchoolReview()) + RESEARCH_QUALITY_BONUS * 0.5,
+        MAX_RERANK_ADJUSTMENT,
+    ), 2))
+    return outcomes
+
+
+def _protected_ids(schools: Sequence[Dict[str, Any]], ranking_priority: Optional[str]) -> set:
+    field = {"academics": "academic_selectivity_score", "baseball_fit": "sci"}.get(ranking_priority or "")
+    if field is None:
+        return set()
+    values = sorted((float(s.get(field) or 0) for s in schools), reverse=True)
+    if not values:
+        return set()
+    # Ties at the cut-off are all protected: which of them finalize picks
+    # depends on the post-research order.
+    cutoff = values[min(FINAL_GUARANTEED_POOL, len(values)) - 1]
+    return {int(s["_research_id"]) for s in schools if float(s.get(field) or 0) >= cutoff}
+
+
+class ResearchPlanner:
+    """Composite bounds for one run's pool; decides which schools to skip."""
+
+    def __init__(
+        self,
+        schools: Sequence[Dict[str, Any]],
+        final_limit: int,
+        ranking_priority: Optional[str] = None,
+        player_academic_score: Optional[float] = None,
+        adjustment_range: float = MAX_RERANK_ADJUSTMENT,
+    ):
+        self.final_limit = final_limit
+        self.stats = PlannerStats(candidates=len(schools))
+        self.skipped: set = set()
+        weights = PRIORITY_WEIGHTS.get(ranking_priority, PRIORITY_WEIGHTS[None])
+        self._w_score = weights["ranking_score"]
+        self._w_opportunity = weights["opportunity_bonus"]
+        self.active = len(schools) > final_limit
+
+        # Research-independent part of the composite: rerank copies with
+        # no research results at all.
+        copies = []
+        for school in schools:
+            copy = {k: v for k, v in school.items() if k != "research_packet"}
+            copy["research_status"] = "queued"
+            copy["ranking_score"] = compute_ranking_score(
+                float(school.get("delta") or 0.0), 0.0, ranking_priority,
+            )
+            copies.append(copy)
+        _apply_cross_school_reranking(
+            copies, ranking_priority=ranking_priority, player_academic_score=player_academic_score,
+        )
+        protected = _protected_ids(schools, ranking_priority)
+        adj = min(abs(adjustment_range), MAX_RERANK_ADJUSTMENT)
+        self._bounds: Dict[int, _Bounds] = {}
+        for copy in copies:
+            rid = int(copy["_research_id"])
+            self._bounds[rid] = _Bounds(
+                base=float(copy.get("cross_school_composite") or 0.0),
+                adj_low=-adj,
+                adj_high=adj,
+                opportunity=True,
+                capped=(
+                    copy.get("fit_label") in FINAL_CAPPED_FIT_LABELS
+                    or (copy.get("academic_fit") or "").strip() == "Strong Safety"
+                ),
+                protected=rid in protected,
+            )
+
+    def _lower(self, b: _Bounds) -> float:
+        return (
+            b.base + self._w_score * b.adj_low
+            - (self._w_opportunity * OPPORTUNITY_BONUS_RANGE if b.opportunity else 0.0)
+        )
+
+    def _upper(self, b: _Bounds) -> float:
+        return (
+            b.base + self._w_score * b.adj_high
+            + (self._w_opportunity * OPPORTUNITY_BONUS_RANGE if b.opportunity else 0.0)
+        )
+
+    def upper_bound(self, school: Dict[str, Any]) -> float:
+        return self._upper(self._bounds[int(school["_research_id"])])
+
+    def order(self, schools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Most promising first; stable for equal bounds."""
+        return sorted(schools, key=self.upper_bound, reverse=True)
+
+    def note_evidence(self, school: Dict[str, Any], evidence: GatheredEvidence) -> None:
+        b = self._bounds[int(school["_research_id"])]
+        outcomes = _adjustment_outcomes(evidence)
+        # A failed review still lands at 0 for roster-less schools, and
+        # a crash anywhere leaves the school unresearched (0) too.
+        b.adj_low, b.adj_high = min(outcomes + [0.0]), max(outcomes + [0.0])
+        b.opportunity = _has_meaningful_evidence(evidence)
+
+    def note_result(self, school: Dict[str, Any], ranking_adjustment: float, research_status: str) -> None:
+        b = self._bounds[int(school["_research_id"])]
+        b.adj_low = b.adj_high = float(ranking_adjustment or 0.0)
+        b.opportunity = research_status in _OPPORTUNITY_STATUSES
+
+    def should_research(self, school: Dict[str, Any], stage: str = "fetch") -> bool:
+        """False (and the school is marked skipped) when it cannot make the list."""
+        rid = int(school["_research_id"])
+        if rid in self.skipped:
+            return False
+        b = self._bounds[rid]
+        if not self.active or b.protected:
+            return True
+        upper = self._upper(b)
+        dominators = 0
+        for other_id, other in self._bounds.items():
+            if other_id == rid or other.capped:
+                continue
+            if self._lower(other) > upper + _EPS:
+                dominators += 1
+                if dominators >= self.final_limit:
+                    break
+        if dominators < self.final_limit:
+            return True
+        self.skipped.add(rid)
+        b.adj_low = b.adj_high = 0.0
+        b.opportunity = False
+        if stage == "review":
+            self.stats.skipped_before_review += 1
+        else:
+            self.stats.skipped_before_fetch += 1
+        school["research_status"] = "skipped"
+        logger.info(
+            "[PLANNER] skip school=%r stage=%s upper=%.2f dominated_by>=%d",
+            school.get("school_name"), stage, upper, self.final_limit,
+        )
+        return False
+
+    def was_skipped(self, school: Dict[str, Any]) -> bool:
+        return int(school.get("_research_id", -1)) in self.skipped
+
+
+def planner_mode() -> str:
+    mode = os.getenv("DEEP_RESEARCH_PLANNER", "off").strip().lower()
+    return mode if mode in PLANNER_MODES else "off"
+
+
+def planner_from_env(
+    schools: Sequence[Dict[str, Any]],
+    final_limit: Optional[int],
+    ranking_priority: Optional[str] = None,
+    player_academic_score: Optional[float] = None,
+) -> Optional[ResearchPlanner]:
+    mode = planner_mode()
+    if mode == "off" or final_limit is None or len(schools) <= final_limit:
+        return None
+    adjustment_range = MAX_RERANK_ADJUSTMENT
+    if mode == "statistical":
+        try:
+            adjustment_range = float(
+                os.getenv("DEEP_RESEARCH_PLANNER_ADJ_RANGE", "") or DEFAULT_STATISTICAL_ADJ_RANGE
+            )
+        except ValueError:
+            adjustment_range = DEFAULT_STATISTICAL_ADJ_RANGE
+    return ResearchPlanner(
+        schools, final_limit, ranking_priority, player_academic_score, adjustment_range,
+    )
+
+
+# Keys dropped from recorded schools: narrative and sources don't affect
+# the rerank.
+_UNRECORDED_KEYS = ("research_sources", "why_this_school", "fit_summary", "research_data_gaps")
+
+
+def record_run(
+    directory: str,
+    schools: Sequence[Dict[str, Any]],
+    final_limit: Optional[int],
+    ranking_priority: Optional[str],
+    academic_score: Dict[str, Any],
+) -> Optional[str]:
+    """Write the researched pool (pre-rerank) for the replay harness."""
+    try:
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"research_run_{time.time_ns()}.json")
+        record = {
+            "final_limit": final_limit,
+            "ranking_priority": ranking_priority,
+            "academic_score": academic_score,
+            "schools": [
+                {k: v for k, v in s.items() if k not in _UNRECORDED_KEYS} for s in schools
+            ],
+        }
+        with open(path, "w") as f:
+            json.dump(record, f, default=str)
+        return path
+    except Exception as exc:
+        logger.warning("[PLANNER] could not record run: %s", exc)
+        return None
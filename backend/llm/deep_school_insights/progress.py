@@ -0,0 +1,109 @@
+"""Incremental publishing of per-school research results.
+
+``enrich_and_rerank`` used to hand back everything at the end of the run,
+so the results page showed a spinner for the full 4–6 minutes even though
+the first schools finish within one school's latency. With an
+``on_progress`` callback the service now publishes a compact snapshot as
+each school completes, and a last one (``final=True``) after the
+cross-school rerank:
+
+    {
+        "version": 7,           # strictly increasing per run, across retries
+        "total": 25,            # schools being researched
+        "completed": 6,
+        "final": False,
+        "schools": [ {school_name, research_status, ranking_score, ...}, ... ],
+    }
+
+Before the final update ``schools`` is in completion order; afterwards it
+is the reranked, trimmed list with ``rank``. Entries carry only the fields
+the results page renders — no research packets or sources.
+
+Publishes are serialized, so ``version`` order equals write order. A
+retried task passes the version already stored for the run as
+``start_version``, so its snapshots never go back to 1 and a reader that
+keeps the highest version never prefers the previous attempt's. The
+callback is synchronous (a Supabase update) and runs in a worker thread
+so it never stalls in-flight fetches or LLM calls; its errors are logged
+and swallowed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Fields copied from an enriched school dict into the progress snapshot.
+PROGRESS_FIELDS = (
+    "school_name",
+    "display_school_name",
+    "fit_label",
+    "research_status",
+    "ranking_score",
+    "ranking_adjustment",
+    "research_confidence",
+    "roster_label",
+    "opportunity_fit",
+    "overall_school_view",
+    "why_this_school",
+    "rank",
+)
+
+
+def compact_school(school: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: school[k] for k in PROGRESS_FIELDS if school.get(k) is not None}
+
+
+class ResearchProgress:
+    """Versioned per-school progress for one enrich_and_rerank run."""
+
+    def __init__(self, total: int, callback: Callable[[Dict[str, Any]], Any], start_version: int = 0):
+        self.total = total
+        self.version = max(0, int(start_version or 0))
+        self.completed = 0
+        self.final = False
+        self._callback = callback
+        self._schools: Dict[str, Dict[str, Any]] = {}
+        self._lock = asyncio.Lock()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "total": self.total,
+            "completed": self.completed,
+            "final": self.final,
+            "schools": list(self._schools.values()),
+        }
+
+    async def school_done(self, school: Dict[str, Any]) -> None:
+        """Publish one finished school (its enriched dict, success or failure)."""
+        async with self._lock:
+            entry = compact_school(school)
+            self.completed += 1
+            self._schools[entry.get("school_name") or str(len(self._schools))] = entry
+            await self._publish()
+
+    async def school_skipped(self) -> None:
+        """A school the research planner dropped: one fewer to wait for."""
+        async with self._lock:
+            self.total = max(self.completed, self.total - 1)
+
+    async def finished(self, ranked: List[Dict[str, Any]]) -> None:
+        """Publish the reranked final list as the last update."""
+        async with self._lock:
+            self._schools = {
+                s.get("school_name") or str(i): compact_school(s) for i, s in enumerate(ranked)
+            }
+            self.final = True
+            await self._publish()
+
+    async def _publish(self) -> None:
+        self.version += 1
+        snapshot = self.snapshot()
+        try:
+            await asyncio.to_thread(self._callback, snapshot)
+        except Exception as exc:
+            logger.warning("[PROGRESS] publish v%d failed: %s", self.version, exc)
@@ -0,0 +1,215 @@
+"""Token accounting and per-school input budget for the reviewer prompt.
+
+The reviewer prompt has two parts with very different cost profiles:
+
+* ``review_instructions()`` — several thousand tokens, identical for
+  every school and every run. It is sent first (``instructions``) and
+  must stay byte-stable so the provider's prefix cache applies; nothing
+  school- or run-specific may be interpolated into it.
+* ``review_input`` — the per-school JSON payload. Its size depends on
+  the evidence (talking-point text, optional school fields), so it is
+  measured and, when over ``REVIEW_INPUT_TOKEN_BUDGET``, trimmed
+  deterministically, lowest-value content first (``fit_payload``).
+
+Token counts use ``tiktoken`` (``o200k_base``, the GPT-4o/4.1 family
+encoding; listed in backend/requirements.txt). If the package or its
+encoding file cannot be loaded — e.g. an offline worker without a warm
+``TIKTOKEN_CACHE_DIR`` — counts fall back to a character estimate that
+errs high (``admission.CHARS_PER_TOKEN``), so budgets stay conservative;
+``tokenizer_name()`` reports which one is in use.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import math
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .admission import CHARS_PER_TOKEN
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INPUT_BUDGET = 1000
+# Never trim below this: the core payload (player profile, school
+# identity, roster counts, flags) always fits.
+MIN_INPUT_BUDGET = 400
+MIN_TALKING_POINTS = 2
+
+# Optional school-context fields, dropped first-to-last under pressure.
+# Identity and fit fields (school_name, baseball_fit, academic_fit,
+# division_label, state, baseball_record) are never dropped.
+_SCHOOL_TRIM_ORDER = (
+    "student_life_grade",
+    "campus_life_grade",
+    "overall_niche_grade",
+    "trend",
+    "undergrad_enrollment",
+    "city",
+)
+
+
+@lru_cache(maxsize=1)
+def _encoding() -> Any:
+    try:
+        import tiktoken  # type: ignore
+
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+def tokenizer_name() -> str:
+    enc = _encoding()
+    return getattr(enc, "name", "tiktoken") if enc is not None else "chars"
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    enc = _encoding()
+    if enc is not None:
+        return len(enc.encode(text))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def input_budget() -> int:
+    try:
+        budget = int(os.getenv("REVIEW_INPUT_TOKEN_BUDGET", "") or DEFAULT_INPUT_BUDGET)
+    except ValueError:
+        budget = DEFAULT_INPUT_BUDGET
+    return max(MIN_INPUT_BUDGET, budget)
+
+
+@dataclass
+class PromptBreakdown:
+    """Token counts for one review prompt."""
+    sections: Dict[str, int] = field(default_factory=dict)
+    instructions: int = 0
+    input: int = 0
+    budget: int = 0
+    trimmed: List[str] = field(default_factory=list)
+
+    def as_log(self) -> str:
+        parts = " ".join(f"{k}={v}" for k, v in self.sections.items())
+        return (
+            f"instructions={self.instructions} input={self.input}/{self.budget} "
+            f"({parts}) trimmed={','.join(self.trimmed) or '-'} tokenizer={tokenizer_name()}"
+        )
+
+
+def _trim_steps(payload: Dict[str, Any]) -> List[Tuple[str, Callable[[Dict[str, Any]], None]]]:
+    """Trims in the order they are tried, cheapest information loss first."""
+    steps: List[Tuple[str, Callable[[Dict[str, Any]], None]]] = []
+    school = payload.get("school") or {}
+
+    if school.get("baseball_record"):
+        def _drop_split(p: Dict[str, Any]) -> None:
+            p["school"].pop("baseball_wins", None)
+            p["school"].pop("baseball_losses", None)
+        if "baseball_wins" in school or "baseball_losses" in school:
+            steps.append(("school.baseball_wins_losses", _drop_split))
+
+    points = payload.get("talking_points") or []
+    # Talking points arrive ranked; the tail is the least distinctive.
+    for tp in reversed(points[MIN_TALKING_POINTS:]):
+        steps.append((f"talking_point:{tp.get('kind')}", lambda p: p["talking_points"].pop()))
+
+    for key in _SCHOOL_TRIM_ORDER:
+        if key in school:
+            steps.append((f"school.{key}", lambda p, key=key: p["school"].pop(key, None)))
+
+    for tp in reversed(points[1:MIN_TALKING_POINTS]):
+        steps.append((f"talking_point:{tp.get('kind')}", lambda p: p["talking_points"].pop()))
+    return steps
+
+
+def _truncate_strings(value: Any, limit: int) -> Any:
+    if isinstance(value, str):
+        return value[:limit]
+    if isinstance(value, dict):
+        return {k: _truncate_strings(v, limit) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_truncate_strings(v, limit) for v in value]
+    return value
+
+
+def fit_payload(
+    payload: Dict[str, Any],
+    render: Callable[[Dict[str, Any]], str],
+    budget: int,
+) -> Tuple[Dict[str, Any], List[str]]:
+    """Return ``payload`` (or a trimmed copy) whose rendering fits ``budget``.
+
+    Trims are applied one at a time in ``_trim_steps`` order and stop as
+    soon as the rendered input fits, so the same payload and budget
+    always yield the same prompt. As a last resort every string value is
+    shortened (halving) and then the talking points are dropped.
+    """
+    if count_tokens(render(payload)) <= budget:
+        return payload, []
+    fitted = copy.deepcopy(payload)
+    trimmed: List[str] = []
+    for label, step in _trim_steps(fitted):
+        step(fitted)
+        trimmed.append(label)
+        if count_tokens(render(fitted)) <= budget:
+            return fitted, trimmed
+
+    limit = max((len(s) for s in _strings(fitted)), default=0)
+    while limit > 8:
+        limit //= 2
+        fitted = _truncate_strings(fitted, limit)
+        if count_tokens(render(fitted)) <= budget:
+            return fitted, trimmed + [f"strings<={limit}"]
+    fitted["talking_points"] = []
+    trimmed.append("talking_points")
+    if count_tokens(render(fitted)) > budget:
+        logger.warning("[PROMPT] payload still over budget=%d after every trim", budget)
+    return fitted, trimmed
+
+
+def _strings(value: Any):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for v in value.values():
+            yield from _strings(v)
+    elif isinstance(value, list):
+        for v in value:
+            yield from _strings(v)
+
+
+def section_tokens(payload: Dict[str, Any]) -> Dict[str, int]:
+    """Approximate per-section token counts of the rendered payload."""
+    return {
+        key: count_tokens(json.dumps(value))
+        for key, value in payload.items()
+        if isinstance(value, (dict, list))
+    }
+
+
+@lru_cache(maxsize=4)
+def instruction_tokens(instructions: str) -> int:
+    """Counted once per process: the instructions never change."""
+    return count_tokens(instructions)
+
+
+def breakdown_for(
+    instructions: str,
+    payload: Dict[str, Any],
+    input_text: str,
+    budget: int,
+    trimmed: Optional[List[str]] = None,
+) -> PromptBreakdown:
+    return PromptBreakdown(
+        sections=section_tokens(payload),
+        instructions=instruction_tokens(instructions),
+        input=count_tokens(input_text),
+        budget=budget,
+        trimmed=list(trimmed or []),
+    )
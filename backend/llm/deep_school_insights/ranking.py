@@ -36,6 +36,10 @@ RESEARCH_QUALITY_BONUS = 1.5
 # Cross-school reranking constants.
 CROSS_SCHOOL_OPPORTUNITY_WEIGHT = 2.5
 CROSS_SCHOOL_Z_CLAMP = 2.5
+# finalize_ranking selection: labels subject to category caps, and the
+# size of the top-academic / top-SCI pools guaranteed slots are drawn from.
+FINAL_CAPPED_FIT_LABELS = ("Strong Safety", "Strong Reach")
+FINAL_GUARANTEED_POOL = 10
 # Academic-fit penalties (label fallback when no academic_delta is available).
 # Philosophy: the real academic cliff is the Strong Safety side (school way
 # below student). Safety/Reach/Strong Reach get lighter penalties so the
@@ -0,0 +1,59 @@
+"""Async Redis client shared by the review cache, shared evidence and admission.
+
+The three Redis-backed layers run on the research event loop, so they talk
+to Redis through ``redis.asyncio``: a slow or unreachable Redis then costs
+the awaiting school up to ``SOCKET_TIMEOUT_S`` instead of stalling every
+fetch and LLM call on the loop.
+
+``redis.asyncio`` connections belong to the event loop that opened them,
+while the layers are process-wide and each Celery task runs on a fresh
+loop. ``async_redis(url)`` therefore returns one ``LoopLocalRedis`` per URL
+which opens a client per running loop and forwards every command to it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+
+# Short timeouts: every caller degrades to its Redis-less behavior on
+# error, and a slow Redis must cost less than the work it saves.
+SOCKET_TIMEOUT_S = 1.0
+
+
+class LoopLocalRedis:
+    """Forwards commands to a client opened for the running event loop."""
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def client(self) -> Any:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None:
+                client = self._clients[loop] = self._factory()
+        return client
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client(), name)
+
+
+@lru_cache(maxsize=4)
+def async_redis(url: str) -> Optional[LoopLocalRedis]:
+    """Shared async client for ``url``; None when the redis package is missing."""
+    try:
+        import redis.asyncio as aioredis  # type: ignore
+    except ImportError:
+        return None
+    return LoopLocalRedis(
+        lambda: aioredis.Redis.from_url(
+            url, socket_connect_timeout=SOCKET_TIMEOUT_S, socket_timeout=SOCKET_TIMEOUT_S,
+        )
+    )
@@ -0,0 +1,228 @@
+"""Retry backoff that hands the concurrency permit back while waiting.
+
+The stats fetch retry (4 s) and the LLM review retries used to sleep
+inside ``async with fetch_sem`` / ``llm_sem``, so one flaky athletics host
+idled a third of the worker's fetch capacity. Now:
+
+* the fan-out wraps its semaphore (or adaptive limiter) in a ``Slot``;
+* retry sites call ``await backoff(delay)``, which releases the current
+  task's slot, sleeps, and re-acquires it only for the next attempt;
+* ``RetryPolicy`` computes jittered exponential delays, stretched by
+  ``HostHealth``'s count of recent consecutive failures for the host, so
+  a host that keeps failing is retried less eagerly across schools and
+  runs while healthy hosts are unaffected.
+
+Outside a slot (the batched path, scripts, tests) ``backoff`` is a plain
+sleep. Sibling fetches that share one slot (roster + stats, gathered with
+``gather_in_slot``) are counted as active holders: the permit is only
+handed back once every sibling is backing off or done, so siblings never
+run without it and the fan-out stays within its concurrency limit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from .concurrency import bind_permit, unbind_permit
+
+logger = logging.getLogger(__name__)
+
+_current_slot: contextvars.ContextVar[Optional["Slot"]] = contextvars.ContextVar(
+    "research_slot", default=None,
+)
+
+
+class Slot:
+    """``async with Slot(sem):`` holds ``sem``; ``backoff`` may lend it out.
+
+    ``sem`` is anything usable as ``async with`` — asyncio.Semaphore or
+    concurrency.AdaptiveLimiter. ``active`` counts the tasks currently
+    working under the slot (the entering task, or its ``gather_in_slot``
+    siblings); ``paused`` those sleeping in ``backoff``.
+
+    The hold may be released and re-acquired from a sibling task, so an
+    adaptive limiter's permit lives on the slot rather than in the
+    entering task's context: every release hands back the same permit,
+    and the documents it was charged with, whichever task releases it.
+    """
+
+    def __init__(self, sem: Any):
+        self.sem = sem
+        self.held = False
+        self.active = 0
+        self.paused = 0
+        self.released_s = 0.0
+        self._released_at: Optional[float] = None
+        self._reacquire: Optional[asyncio.Lock] = None
+        self._permit = None
+
+    async def _acquire(self) -> None:
+        acquire_permit = getattr(self.sem, "acquire_permit", None)
+        if acquire_permit is None:
+            await self.sem.__aenter__()
+        else:
+            self._permit = await acquire_permit(self._permit)
+        self.held = True
+
+    async def _release(self) -> None:
+        self.held = False
+        if self._permit is None:
+            await self.sem.__aexit__(None, None, None)
+        else:
+            await self.sem.release_permit(self._permit)
+
+    async def __aenter__(self) -> "Slot":
+        await self._acquire()
+        self.active = 1
+        self._token = _current_slot.set(self)
+        self._permit_token = bind_permit(self._permit) if self._permit is not None else None
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._permit_token is not None:
+            unbind_permit(self._permit_token)
+        _current_slot.reset(self._token)
+        if self.held:
+            await self._release()
+
+    async def _release_if_idle(self) -> None:
+        if self.held and self.active == 0:
+            self._released_at = time.monotonic()
+            await self._release()
+
+    async def _resume(self) -> None:
+        self.active += 1
+        if self.held:
+            return
+        if self._reacquire is None:
+            self._reacquire = asyncio.Lock()
+        async with self._reacquire:
+            if not self.held:
+                await self._acquire()
+                if self._released_at is not None:
+                    self.released_s += time.monotonic() - self._released_at
+                    self._released_at = None
+
+    async def pause(self, delay_s: float) -> None:
+        """Sleep; the permit is lent out meanwhile unless a sibling is still working."""
+        if not self.held and self.active == 0:
+            await asyncio.sleep(delay_s)
+            return
+        self.active -= 1
+        self.paused += 1
+        try:
+            await self._release_if_idle()
+            await asyncio.sleep(delay_s)
+        except BaseException:
+            # Unwinding as a running task: whoever counted it in takes it out.
+            self.active += 1
+            raise
+        finally:
+            self.paused -= 1
+        await self._resume()
+
+    async def gather(self, *aws: Awaitable[Any]) -> List[Any]:
+        """``asyncio.gather`` with each awaitable counted as an active holder."""
+        async def _sibling(aw: Awaitable[Any]) -> Any:
+            self.active += 1
+            try:
+                return await aw
+            finally:
+                self.active -= 1
+                if self.paused:
+                    await self._release_if_idle()
+
+        # The gathering task only waits; its share moves to the siblings.
+        self.active -= 1
+        try:
+            return await asyncio.gather(*(_sibling(aw) for aw in aws))
+        finally:
+            await self._resume()
+
+
+async def backoff(delay_s: float) -> None:
+    """Sleep before a retry without holding the caller's concurrency slot."""
+    slot = _current_slot.get()
+    if slot is None:
+        await asyncio.sleep(delay_s)
+    else:
+        await slot.pause(delay_s)
+
+
+async def gather_in_slot(*aws: Awaitable[Any]) -> List[Any]:
+    """Gather fetches that share the current task's slot (plain gather outside one)."""
+    slot = _current_slot.get()
+    if slot is None:
+        return await asyncio.gather(*aws)
+    return await slot.gather(*aws)
+
+
+def host_of(url: Optional[str]) -> str:
+    return (urlparse(url or "").hostname or "").lower()
+
+
+class HostHealth:
+    """Consecutive-failure counts per host, process-wide.
+
+    A failure streak older than ``forget_s`` is forgotten, so a host that
+    had a bad afternoon isn't penalized next week.
+    """
+
+    def __init__(self, forget_s: float = 900.0):
+        self.forget_s = forget_s
+        self._failures: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def failures(self, host: str) -> int:
+        with self._lock:
+            count, last = self._failures.get(host, (0, 0.0))
+            if count and time.monotonic() - last > self.forget_s:
+                del self._failures[host]
+                return 0
+            return count
+
+    def record_failure(self, host: str) -> int:
+        with self._lock:
+            count, _ = self._failures.get(host, (0, 0.0))
+            self._failures[host] = (count + 1, time.monotonic())
+            return count + 1
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            self._failures.pop(host, None)
+
+
+HOST_HEALTH = HostHealth()
+
+
+@dataclass
+class RetryPolicy:
+    """Equal-jitter exponential backoff: half the step fixed, half random."""
+    base_s: float
+    max_s: float
+    multiplier: float = 2.0
+
+    def delay(self, attempt: int, host: str = "", health: Optional[HostHealth] = None) -> float:
+        """Delay before retry number ``attempt + 1`` (``attempt`` is 0-based).
+
+        Earlier failures of the same host count as extra attempts.
+        """
+        health = health if health is not None else HOST_HEALTH
+        exponent = attempt + (max(0, health.failures(host) - 1) if host else 0)
+        step = min(self.max_s, self.base_s * self.multiplier ** exponent)
+        return step / 2 + random.uniform(0, step / 2)
+
+
+# Stats pages: the first retry mostly waits out JS-heavy sites that serve
+# empty tables on a cold cache, hence the 4 s base.
+STATS_RETRY_POLICY = RetryPolicy(base_s=4.0, max_s=20.0)
+# LLM review: transient 429/5xx from the provider.
+REVIEW_RETRY_POLICY = RetryPolicy(base_s=2.0, max_s=16.0)
@@ -0,0 +1,128 @@
+"""Cache of LLM school reviews keyed by a prompt fingerprint.
+
+A review is a pure function of the model, the reviewer instructions and
+the ``review_payload`` (school context, roster facts, talking points and
+the canonicalized player profile). Celery retries, re-finalized
+evaluations and players with the same profile looking at the same school
+all send byte-identical prompts, so the parsed ``DeepSchoolReview`` is
+stored in Redis under
+
+    sha256(model, sha256(review_instructions()), canonical JSON payload)
+
+with a TTL matching ``school_evidence_cache.TTL_DAYS``. Editing the
+instructions changes their hash and naturally invalidates old entries.
+
+Configuration:
+- ``REVIEW_CACHE_URL`` (falls back to ``REDIS_URL``); unset → no cache.
+- ``DEEP_RESEARCH_REVIEW_CACHE=0`` disables the cache.
+- ``DEEP_RESEARCH_REVIEW_CACHE_TTL_S`` overrides the TTL.
+
+Every Redis error is logged and treated as a miss — the cache can only
+ever save an LLM call, never fail a review.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from .llm_review import review_instructions
+from .redis_client import async_redis
+from .types import DeepSchoolReview
+
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "deep_review:v1:"
+# Same freshness window as school_evidence_cache.TTL_DAYS (14 days): a
+# review never outlives the roster evidence it was written from.
+DEFAULT_TTL_S = 14 * 24 * 3600
+
+
+@lru_cache(maxsize=1)
+def instructions_version() -> str:
+    """Short hash of the reviewer instructions."""
+    return hashlib.sha256(review_instructions().encode("utf-8")).hexdigest()[:16]
+
+
+def review_fingerprint(model: str, payload: Dict[str, Any]) -> str:
+    """Cache key for one review prompt."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    digest = hashlib.sha256(
+        f"{model}\n{instructions_version()}\n{canonical}".encode("utf-8")
+    ).hexdigest()
+    return KEY_PREFIX + digest
+
+
+@dataclass
+class ReviewCacheStats:
+    """Hit/miss counts for one enrich_and_rerank run."""
+    hits: int = 0
+    misses: int = 0
+    errors: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+class ReviewCache:
+    """Redis-backed store of parsed reviews. ``redis_client`` may be any
+    object with async ``get`` / ``set(name, value, ex=...)``."""
+
+    def __init__(self, redis_client: Any, ttl_s: int = DEFAULT_TTL_S):
+        self.redis = redis_client
+        self.ttl_s = ttl_s
+
+    async def get(self, key: str, stats: Optional[ReviewCacheStats] = None) -> Optional[DeepSchoolReview]:
+        try:
+            raw = await self.redis.get(key)
+            review = DeepSchoolReview.model_validate_json(raw) if raw else None
+        except Exception as exc:
+            logger.warning("[REVIEW_CACHE] get failed key=%s: %s", key[-12:], exc)
+            if stats is not None:
+                stats.errors += 1
+                stats.misses += 1
+            return None
+        if stats is not None:
+            if review is None:
+                stats.misses += 1
+            else:
+                stats.hits += 1
+        return review
+
+    async def set(self, key: str, review: DeepSchoolReview, stats: Optional[ReviewCacheStats] = None) -> None:
+        try:
+            await self.redis.set(key, review.model_dump_json(), ex=self.ttl_s)
+        except Exception as exc:
+            logger.warning("[REVIEW_CACHE] set failed key=%s: %s", key[-12:], exc)
+            if stats is not None:
+                stats.errors += 1
+
+
+def get_review_cache() -> Optional[ReviewCache]:
+    """Process-wide cache from the environment, or None when not configured."""
+    if os.getenv("DEEP_RESEARCH_REVIEW_CACHE", "1").strip().lower() in ("0", "false", "off"):
+        return None
+    url = os.getenv("REVIEW_CACHE_URL") or os.getenv("REDIS_URL")
+    if not url:
+        return None
+    return _cache_for_url(url, int(os.getenv("DEEP_RESEARCH_REVIEW_CACHE_TTL_S", str(DEFAULT_TTL_S))))
+
+
+@lru_cache(maxsize=4)
+def _cache_for_url(url: str, ttl_s: int) -> Optional[ReviewCache]:
+    client = async_redis(url)
+    if client is None:
+        logger.warning("[REVIEW_CACHE] redis package not installed; review cache disabled")
+        return None
+    return ReviewCache(client, ttl_s=ttl_s)
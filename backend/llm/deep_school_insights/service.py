@@ -14,7 +14,7 @@ import contextlib
 import logging
 import os
 import time
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import httpx
 from bs4 import BeautifulSoup
@@ -22,6 +22,14 @@ from openai import AsyncOpenAI
 
 from backend.utils.position_tracks import is_pitcher_primary_position
 
+from .admission import (
+    AdmissionController,
+    error_headers,
+    estimate_tokens,
+    get_admission_controller,
+    is_rate_limit_error,
+)
+from .concurrency import AdaptiveLimiter, LimiterMetrics, fetch_limiter_from_env
 from .evidence import (
     _empty_evidence,
     _has_meaningful_evidence,
@@ -34,12 +42,26 @@ from .fetch import (
     gather_evidence,
     make_httpx_client,
 )
+from .hedging import HedgedCaller, HedgePolicy
 from .llm_review import (
+    build_review_prompt,
     review_input,
     review_instructions,
     review_school,
 )
+from .planner import PlannerStats, ResearchPlanner, planner_from_env, record_run
+from .parse_strategy import PARSER_STRATEGIES
+from .progress import ResearchProgress
+from .retry import HOST_HEALTH, REVIEW_RETRY_POLICY, Slot, backoff
+from .review_cache import (
+    ReviewCache,
+    ReviewCacheStats,
+    get_review_cache,
+    review_fingerprint,
+)
+from .shared_evidence import SharedEvidence, SharedEvidenceStats, get_shared_evidence
 from .talking_points import compute_talking_points
+from .tracing import current_span, span, trace_run, traced
 from .parsers import (
     _trusted_domains_for_school,
     clean_soup,
@@ -48,6 +70,7 @@ from .parsers import (
     parse_stats_records,
 )
 from .ranking import (
+    FINAL_GUARANTEED_POOL,
     MAX_RERANK_ADJUSTMENT,
     RESEARCH_QUALITY_BONUS,
     _apply_cross_school_reranking,
@@ -57,10 +80,12 @@ from .ranking import (
     compute_roster_label,
 )
 from .types import (
+    CachedPage,
     DeepSchoolInsight,
     DeepSchoolReview,
     GatheredEvidence,
     MatchedPlayer,
+    PageFetchStats,
     ParsedPlayer,
     ParsedStatLine,
 )
@@ -84,6 +109,9 @@ class DeepSchoolInsightService:
         batch_size: int = 3,
         max_schools: Optional[int] = None,
         llm_timeout_s: float = 90.0,
+        review_cache: Optional[ReviewCache] = None,
+        shared_evidence: Optional[SharedEvidence] = None,
+        admission: Optional[AdmissionController] = None,
     ):
         api_key = os.getenv("OPENAI_API_KEY")
         self.enabled = bool(api_key or client)
@@ -113,11 +141,31 @@ class DeepSchoolInsightService:
             else (max(1, int(max_schools)) if max_schools is not None else None)
         )
         self.llm_timeout_s = float(os.getenv("OPENAI_RESEARCH_TIMEOUT_S", str(llm_timeout_s)))
+        # Per-call deadlines from the model's rolling latency (capped at
+        # llm_timeout_s), plus budgeted hedged duplicates for slow calls.
+        self.llm_calls = HedgedCaller(HedgePolicy.from_env(self.llm_timeout_s))
         # Decouple I/O concurrency from LLM concurrency in the fan-out path:
         # HTML fetches are RAM-heavy (BS4 buffers), so cap them tight; LLM
         # calls hold trivial local RAM, so let them fan out wider for speed.
         self.fetch_concurrency = max(1, int(os.getenv("RESEARCH_FETCH_CONCURRENCY", "3")))
         self.llm_concurrency = max(1, int(os.getenv("RESEARCH_LLM_CONCURRENCY", "10")))
+        # Parsed reviews keyed by prompt fingerprint (Redis). None when no
+        # REDIS_URL / REVIEW_CACHE_URL is configured.
+        self.review_cache = review_cache if review_cache is not None else get_review_cache()
+        self.review_cache_stats = ReviewCacheStats()
+        # Token/request budget in front of every Responses call; None
+        # unless OPENAI_TPM_LIMIT / OPENAI_RPM_LIMIT is set.
+        self.admission = admission if admission is not None else get_admission_controller()
+        # Live roster fetches coalesced by URL across runs (in-process
+        # always, across workers via Redis). None when disabled.
+        self.shared_evidence = (
+            shared_evidence if shared_evidence is not None else get_shared_evidence()
+        )
+        self.shared_evidence_stats = SharedEvidenceStats()
+        # Decisions of the last run's adaptive fetch limiter, if enabled.
+        self.fetch_limiter_metrics: Optional[LimiterMetrics] = None
+        # Set per fan-out run when DEEP_RESEARCH_PLANNER is on.
+        self.planner_stats: Optional[PlannerStats] = None
 
     async def _responses_parse(
         self,
@@ -140,10 +188,49 @@ class DeepSchoolInsightService:
         if tools is not None:
             request_kwargs["tools"] = tools
 
-        return await asyncio.wait_for(
-            self.client.responses.parse(**request_kwargs),
-            timeout=self.llm_timeout_s,
-        )
+        llm_calls = getattr(self, "llm_calls", None)
+        admission = getattr(self, "admission", None)
+        if admission is None:
+            if llm_calls is not None:
+                return await llm_calls.call(model, lambda: self.client.responses.parse(**request_kwargs))
+            return await asyncio.wait_for(
+                self.client.responses.parse(**request_kwargs),
+                timeout=self.llm_timeout_s,
+            )
+
+        # Budgeted path: queue for token/request budget (the wait doesn't
+        # count against llm_timeout_s), read rate-limit headers off the raw
+        # response, and re-queue on 429 instead of failing the attempt.
+        cost = estimate_tokens(input_text, instructions, max_output_tokens=max_output_tokens)
+        raw_api = getattr(self.client.responses, "with_raw_response", None)
+        parse = raw_api.parse if raw_api is not None else self.client.responses.parse
+
+        async def _admitted_parse() -> Any:
+            # A hedged duplicate is admitted like any other request.
+            await admission.acquire(cost)
+            return await parse(**request_kwargs)
+
+        for requeue in range(admission.max_requeues + 1):
+            await admission.acquire(cost)
+            try:
+                if llm_calls is not None:
+                    response = await llm_calls.call(
+                        model, lambda: parse(**request_kwargs), hedge_factory=_admitted_parse,
+                    )
+                else:
+                    response = await asyncio.wait_for(parse(**request_kwargs), timeout=self.llm_timeout_s)
+                if raw_api is not None:
+                    headers, result = response.headers, response.parse()
+                else:
+                    headers, result = None, response
+            except Exception as exc:
+                if is_rate_limit_error(exc) and requeue < admission.max_requeues:
+                    admission.rate_limited(error_headers(exc))
+                    continue
+                raise
+            usage = getattr(result, "usage", None)
+            admission.observe(headers, cost, getattr(usage, "total_tokens", None))
+            return result
 
     async def enrich_and_rerank(
         self,
@@ -153,33 +240,51 @@ class DeepSchoolInsightService:
         academic_score: Dict[str, Any],
         final_limit: Optional[int] = None,
         ranking_priority: Optional[str] = None,
+        on_progress: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        progress_version: int = 0,
     ) -> List[Dict[str, Any]]:
+        # on_progress, if given, receives a versioned compact snapshot
+        # (see progress.py) after every finished school and once more
+        # after the final cross-school rerank. Versions continue from
+        # progress_version, the last one already published for the run.
         if not self.enabled or self.client is None or not schools:
             return schools
+        with trace_run(
+            "research_run", schools=len(schools), final_limit=final_limit,
+            ranking_priority=ranking_priority,
+        ):
+            return await self._enrich_and_rerank(
+                schools, player_stats, baseball_assessment, academic_score,
+                final_limit, ranking_priority, on_progress, progress_version,
+            )
 
+    async def _enrich_and_rerank(
+        self,
+        schools: List[Dict[str, Any]],
+        player_stats: Dict[str, Any],
+        baseball_assessment: Dict[str, Any],
+        academic_score: Dict[str, Any],
+        final_limit: Optional[int],
+        ranking_priority: Optional[str],
+        on_progress: Optional[Callable[[Dict[str, Any]], Any]],
+        progress_version: int = 0,
+    ) -> List[Dict[str, Any]]:
         t_enrich_start = time.monotonic()
         logger.info(
             "[TIMING] enrich_and_rerank start schools=%d initial_batch=%d batch=%d",
             len(schools), self.initial_batch_size, self.batch_size,
         )
-        schools_copy = [dict(s) for s in schools]
-        research_limit = len(schools_copy)
-        # Finalized runs should research the entire consideration pool before
-        # trimming back to the user-visible limit. Otherwise a school can make
-        # the final 15 without ever receiving roster research.
-        if final_limit is None and self.max_schools is not None:
-            research_limit = min(research_limit, self.max_schools)
-
-        for idx, school in enumerate(schools_copy):
-            base_score = float(school.get("delta") or 0.0)
-            school["ranking_score"] = compute_ranking_score(base_score, 0.0, ranking_priority)
-            school["ranking_adjustment"] = 0.0
-            school["research_status"] = "queued" if idx < research_limit else "not_requested"
-            school["_research_id"] = idx
-            school["_research_eligible"] = idx < research_limit
+        self.review_cache_stats = ReviewCacheStats()
+        self.shared_evidence_stats = SharedEvidenceStats()
+        schools_copy, research_limit = self.prepare_schools(schools, final_limit, ranking_priority)
 
         researched_ids: set[int] = set()
         batch_index = 0
+        progress = (
+            ResearchProgress(total=research_limit, callback=on_progress, start_version=progress_version)
+            if on_progress is not None
+            else None
+        )
 
         # Two execution paths:
         #
@@ -230,7 +335,7 @@ class DeepSchoolInsightService:
                     [s.get("school_name") for s in next_batch],
                 )
                 tasks = [
-                    self._enrich_single_school(
+                    self._research_school(
                         school=school,
                         player_stats=player_stats,
                         baseball_assessment=baseball_assessment,
@@ -257,21 +362,138 @@ class DeepSchoolInsightService:
                         )
                     school["research_status"] = "failed"
 
+                if progress is not None:
+                    for school in next_batch:
+                        await progress.school_done(school)
+
                 batch_size = self.batch_size
 
         else:
-            fetch_sem = asyncio.Semaphore(self.fetch_concurrency)
-            llm_sem = asyncio.Semaphore(self.llm_concurrency)
             eligible = [s for s in schools_copy if s.get("_research_eligible")]
-            for school in eligible:
-                school["research_status"] = "attempted"
-
-            # ---- school_evidence_cache lookup (one round-trip for the whole
-            # batch). Misses / stale / failed rows are silently absent from
-            # the dict, in which case the per-school task falls through to
-            # its existing live-fetch path. Lazy import keeps test envs that
-            # don't have backend.database installed loadable. ----
-            cache_lookup: Dict[str, Dict[str, Any]] = {}
+            # DEEP_RESEARCH_PLANNER: skip schools whose composite can't
+            # reach the final list (planner.py); off by default.
+            planner = planner_from_env(
+                schools_copy, final_limit, ranking_priority, _player_academic_score(academic_score),
+            )
+            self.planner_stats = planner.stats if planner is not None else None
+            if planner is not None:
+                eligible = planner.order(eligible)
+            await self.research_schools(
+                eligible,
+                player_stats=player_stats,
+                baseball_assessment=baseball_assessment,
+                academic_score=academic_score,
+                ranking_priority=ranking_priority,
+                progress=progress,
+                planner=planner,
+            )
+            researched_ids.update(
+                int(s["_research_id"]) for s in eligible
+                if planner is None or not planner.was_skipped(s)
+            )
+            batch_index = 1
+            if planner is not None:
+                logger.info(
+                    "[PLANNER] candidates=%d skipped_before_fetch=%d skipped_before_review=%d llm_calls_saved=%d",
+                    planner.stats.candidates, planner.stats.skipped_before_fetch,
+                    planner.stats.skipped_before_review, planner.stats.llm_calls_saved,
+                )
+            record_dir = os.getenv("DEEP_RESEARCH_RECORD_DIR")
+            if record_dir:
+                record_run(record_dir, schools_copy, final_limit, ranking_priority, academic_score)
+
+        schools_copy = self.finalize_ranking(
+            schools_copy,
+            academic_score=academic_score,
+            final_limit=final_limit,
+            ranking_priority=ranking_priority,
+        )
+
+        status_counts: Dict[str, int] = {}
+        for school in schools_copy:
+            st = school.get("research_status", "unknown")
+            status_counts[st] = status_counts.get(st, 0) + 1
+        logger.info(
+            "Deep school research complete: %d researched, %d final; status breakdown: %s",
+            len(researched_ids),
+            len(schools_copy),
+            status_counts,
+        )
+        logger.info(
+            "[TIMING] enrich_and_rerank done researched=%d final=%d batches=%d total=%.2fs",
+            len(researched_ids),
+            len(schools_copy),
+            batch_index,
+            time.monotonic() - t_enrich_start,
+        )
+        if self.review_cache is not None:
+            stats = self.review_cache_stats
+            logger.info(
+                "[REVIEW_CACHE] lookups=%d hits=%d misses=%d errors=%d hit_ratio=%.2f",
+                stats.lookups, stats.hits, stats.misses, stats.errors, stats.hit_ratio,
+            )
+        if progress is not None:
+            await progress.finished(schools_copy)
+        return schools_copy
+
+    def prepare_schools(
+        self,
+        schools: List[Dict[str, Any]],
+        final_limit: Optional[int] = None,
+        ranking_priority: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Copy the pool and seed base scores / research bookkeeping.
+
+        Returns ``(schools_copy, research_limit)``; the first
+        ``research_limit`` schools are marked ``_research_eligible``.
+        """
+        schools_copy = [dict(s) for s in schools]
+        research_limit = len(schools_copy)
+        # Finalized runs should research the entire consideration pool before
+        # trimming back to the user-visible limit. Otherwise a school can make
+        # the final 15 without ever receiving roster research.
+        if final_limit is None and self.max_schools is not None:
+            research_limit = min(research_limit, self.max_schools)
+
+        for idx, school in enumerate(schools_copy):
+            base_score = float(school.get("delta") or 0.0)
+            school["ranking_score"] = compute_ranking_score(base_score, 0.0, ranking_priority)
+            school["ranking_adjustment"] = 0.0
+            school["research_status"] = "queued" if idx < research_limit else "not_requested"
+            school["_research_id"] = idx
+            school["_research_eligible"] = idx < research_limit
+        return schools_copy, research_limit
+
+    async def research_schools(
+        self,
+        eligible: List[Dict[str, Any]],
+        player_stats: Dict[str, Any],
+        baseball_assessment: Dict[str, Any],
+        academic_score: Dict[str, Any],
+        ranking_priority: Optional[str] = None,
+        progress: Optional[ResearchProgress] = None,
+        planner: Optional[ResearchPlanner] = None,
+    ) -> None:
+        """Two-semaphore fan-out over ``eligible``; applies each insight in place.
+
+        Used by enrich_and_rerank's fan-out path and, for one group of
+        schools at a time, by the distributed Celery subtasks.
+        """
+        # With RESEARCH_MEMORY_BUDGET_MB set, fetch/parse permits follow
+        # process RSS (concurrency.py) instead of the static setting.
+        fetch_limiter = fetch_limiter_from_env(self.fetch_concurrency)
+        fetch_sem = fetch_limiter or asyncio.Semaphore(self.fetch_concurrency)
+        llm_sem = asyncio.Semaphore(self.llm_concurrency)
+        for school in eligible:
+            school["research_status"] = "attempted"
+
+        # ---- school_evidence_cache lookup (one round-trip for the whole
+        # batch). Misses / stale / failed rows are silently absent from
+        # the dict, in which case the per-school task falls through to
+        # its existing live-fetch path. Lazy import keeps test envs that
+        # don't have backend.database installed loadable. ----
+        cache_lookup: Dict[str, Dict[str, Any]] = {}
+        with span("cache_load", schools=len(eligible)) as cache_span:
             try:
                 from backend.database.school_evidence_cache import load_cache_batch
                 school_names = [
@@ -287,59 +509,134 @@ class DeepSchoolInsightService:
                     "[CACHE] school_evidence_cache lookup failed (degrading "
                     "to live-fetch for all): %s", exc,
                 )
+            cache_span.set(hits=len(cache_lookup))
+
+        # Demand history for the cron's warming order; best-effort and
+        # fire-and-forget on the default executor. Nothing awaits it: under
+        # the persistent worker loop (run_async) the insert can outlive
+        # this run, and only a one-off asyncio.run joins it on exit.
+        asyncio.get_running_loop().run_in_executor(
+            None,
+            _record_demand,
+            [s.get("school_name") for s in eligible if s.get("school_name")],
+            list(cache_lookup),
+        )
 
-            batch_index = 1
-            t_fanout_start = time.monotonic()
+        # Stale / failed rows still carry the page validators from the
+        # last cron run, so misses re-fetch conditionally and skip
+        # parsing when the roster/stats pages haven't changed.
+        previous_pages: Dict[str, Dict[str, Any]] = {}
+        page_stats = PageFetchStats()
+        misses = [
+            s.get("school_name") for s in eligible
+            if s.get("school_name") and s.get("school_name") not in cache_lookup
+        ]
+        if misses:
+            try:
+                from backend.database.school_evidence_cache import load_previous_pages
+                previous_pages = load_previous_pages(misses)
+            except Exception as exc:
+                logger.warning("[CACHE] page validator lookup failed: %s", exc)
+
+        t_fanout_start = time.monotonic()
+        parser_stats_before = PARSER_STRATEGIES.stats.as_dict()
+        # The admission controller is process-wide; log only this run's share.
+        admission = getattr(self, "admission", None)
+        admission_before = admission.stats.copy() if admission is not None else None
+        logger.info(
+            "[TIMING] fan-out start eligible=%d fetch_concurrency=%d llm_concurrency=%d",
+            len(eligible), self.fetch_concurrency, self.llm_concurrency,
+        )
+        tasks = [
+            self._enrich_and_publish(
+                progress,
+                school=school,
+                player_stats=player_stats,
+                baseball_assessment=baseball_assessment,
+                academic_score=academic_score,
+                ranking_priority=ranking_priority,
+                fetch_sem=fetch_sem,
+                llm_sem=llm_sem,
+                cached_row=cache_lookup.get(school.get("school_name", "")),
+                previous_pages=previous_pages.get(school.get("school_name", "")),
+                page_stats=page_stats,
+                planner=planner,
+            )
+            for school in eligible
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info(
+            "[TIMING] fan-out done eligible=%d elapsed=%.2fs",
+            len(eligible), time.monotonic() - t_fanout_start,
+        )
+        if fetch_limiter is not None:
+            self.fetch_limiter_metrics = fetch_limiter.metrics
+            logger.info("[CONCURRENCY] fetch limiter %s", fetch_limiter.metrics.as_dict())
+        parser_stats = PARSER_STRATEGIES.stats.since(parser_stats_before)
+        if parser_stats["hits"] or parser_stats["learned"]:
             logger.info(
-                "[TIMING] fan-out start eligible=%d fetch_concurrency=%d llm_concurrency=%d",
-                len(eligible), self.fetch_concurrency, self.llm_concurrency,
+                "[PARSER_MEMORY] hits=%d misses=%d learned=%d invalidated=%d double_parses_avoided=%d sites=%d",
+                parser_stats["hits"], parser_stats["misses"], parser_stats["learned"],
+                parser_stats["invalidated"], parser_stats["double_parses_avoided"], len(PARSER_STRATEGIES),
             )
-            tasks = [
-                self._enrich_single_school(
-                    school=school,
-                    player_stats=player_stats,
-                    baseball_assessment=baseball_assessment,
-                    academic_score=academic_score,
-                    ranking_priority=ranking_priority,
-                    fetch_sem=fetch_sem,
-                    llm_sem=llm_sem,
-                    cached_row=cache_lookup.get(school.get("school_name", "")),
+        shared_stats = getattr(self, "shared_evidence_stats", None)
+        if shared_stats is not None and (shared_stats.fetched or shared_stats.deduplicated):
+            logger.info(
+                "[SHARED_EVIDENCE] fetched=%d deduplicated=%d (local=%d remote=%d redis=%d) errors=%d",
+                shared_stats.fetched, shared_stats.deduplicated, shared_stats.local_waits,
+                shared_stats.remote_waits, shared_stats.redis_hits, shared_stats.errors,
+            )
+        llm_calls = getattr(self, "llm_calls", None)
+        if llm_calls is not None and llm_calls.stats.calls:
+            logger.info("[LLM_CALLS] %s", llm_calls.summary(self.review_model))
+        if admission is not None:
+            run_admission = admission.stats.since(admission_before)
+            if run_admission.admitted:
+                logger.info(
+                    "[ADMISSION] admitted=%d queued=%d wait=%.1fs rate_limited=%d window_waits=%d "
+                    "tokens est=%d used=%d",
+                    run_admission.admitted, run_admission.queued, run_admission.wait_s,
+                    run_admission.rate_limited, run_admission.window_waits,
+                    run_admission.estimated_tokens, run_admission.used_tokens,
                 )
-                for school in eligible
-            ]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+        if page_stats.fetched:
             logger.info(
-                "[TIMING] fan-out done eligible=%d elapsed=%.2fs",
-                len(eligible), time.monotonic() - t_fanout_start,
+                "[CACHE] conditional fetch pages=%d skipped=%d (%.1f%%) not_modified=%d unchanged=%d",
+                page_stats.fetched, page_stats.skipped, page_stats.skipped_pct,
+                page_stats.not_modified, page_stats.unchanged,
             )
-            for school, result in zip(eligible, results):
-                researched_ids.add(int(school["_research_id"]))
-                if isinstance(result, DeepSchoolInsight):
-                    self._apply_insight(school, result)
-                    continue
-                if isinstance(result, Exception):
-                    logger.warning(
-                        "Deep school insight generation failed for %s: %s",
-                        school.get("school_name"),
-                        result,
-                    )
-                school["research_status"] = "failed"
-
-        player_academic_score: Optional[float] = None
-        if isinstance(academic_score, dict):
-            raw_score = academic_score.get("effective")
-            if raw_score is None:
-                raw_score = academic_score.get("composite")
-            if raw_score is not None:
-                try:
-                    player_academic_score = float(raw_score)
-                except (TypeError, ValueError):
-                    player_academic_score = None
+        for school, result in zip(eligible, results):
+            if isinstance(result, DeepSchoolInsight):
+                self._apply_insight(school, result)
+                continue
+            if planner is not None and planner.was_skipped(school):
+                continue
+            if isinstance(result, Exception):
+                logger.warning(
+                    "Deep school insight generation failed for %s: %s",
+                    school.get("school_name"),
+                    result,
+                )
+            school["research_status"] = "failed"
+
+    @traced("rerank")
+    def finalize_ranking(
+        self,
+        schools_copy: List[Dict[str, Any]],
+        academic_score: Dict[str, Any],
+        final_limit: Optional[int] = None,
+        ranking_priority: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Cross-school rerank, category caps / final_limit trim, ranks.
 
+        Runs once every school has its research result — at the end of
+        enrich_and_rerank, or in the Celery aggregation task.
+        """
+        current_span().set(schools=len(schools_copy), final_limit=final_limit)
         _apply_cross_school_reranking(
             schools_copy,
             ranking_priority=ranking_priority,
-            player_academic_score=player_academic_score,
+            player_academic_score=_player_academic_score(academic_score),
         )
         schools_copy.sort(
             key=_cross_school_sort_key,
@@ -383,7 +680,7 @@ class DeepSchoolInsightService:
             # "academics" → inject top academic schools (by selectivity score)
             # "baseball_fit" → inject top baseball schools (by SCI)
             GUARANTEED_SLOTS = 3
-            TOP_POOL = 10
+            TOP_POOL = FINAL_GUARANTEED_POOL
 
             if ranking_priority == "academics":
                 top_academic = sorted(
@@ -419,26 +716,66 @@ class DeepSchoolInsightService:
             school.pop("_research_id", None)
             school.pop("_research_eligible", None)
             school["rank"] = idx
-
-        status_counts: Dict[str, int] = {}
-        for school in schools_copy:
-            st = school.get("research_status", "unknown")
-            status_counts[st] = status_counts.get(st, 0) + 1
-        logger.info(
-            "Deep school research complete: %d researched, %d final; status breakdown: %s",
-            len(researched_ids),
-            len(schools_copy),
-            status_counts,
-        )
-        logger.info(
-            "[TIMING] enrich_and_rerank done researched=%d final=%d batches=%d total=%.2fs",
-            len(researched_ids),
-            len(schools_copy),
-            batch_index,
-            time.monotonic() - t_enrich_start,
-        )
         return schools_copy
 
+    async def _enrich_and_publish(
+        self,
+        progress: Optional[ResearchProgress],
+        *,
+        school: Dict[str, Any],
+        planner: Optional[ResearchPlanner] = None,
+        **kwargs: Any,
+    ) -> Optional[DeepSchoolInsight]:
+        """Fan-out task: enrich one school, then publish it to ``progress``.
+
+        The insight is applied to a copy for the snapshot; the caller still
+        applies it to ``school`` once every task has finished. Schools the
+        planner skips are not published; they only shrink ``progress.total``.
+        """
+        if planner is not None:
+            kwargs["planner"] = planner
+        try:
+            result = await self._research_school(school=school, **kwargs)
+        except Exception:
+            if planner is not None:
+                planner.note_result(school, 0.0, "failed")
+            if progress is not None:
+                await progress.school_done({**school, "research_status": "failed"})
+            raise
+        if planner is not None:
+            if planner.was_skipped(school):
+                if progress is not None:
+                    await progress.school_skipped()
+                return None
+            if isinstance(result, DeepSchoolInsight):
+                planner.note_result(school, result.ranking_adjustment, result.research_status)
+            else:
+                planner.note_result(school, 0.0, "failed")
+        if progress is not None:
+            preview = dict(school)
+            if isinstance(result, DeepSchoolInsight):
+                self._apply_insight(preview, result)
+            else:
+                preview["research_status"] = "failed"
+            await progress.school_done(preview)
+        return result
+
+    async def _research_school(self, school: Dict[str, Any], **kwargs: Any) -> Optional[DeepSchoolInsight]:
+        """``_enrich_single_school`` inside the school's ``research_school`` span."""
+        with span(
+            "research_school",
+            school=school.get("display_school_name") or school.get("school_name"),
+            school_id=school.get("_research_id"),
+        ) as school_span:
+            result = await self._enrich_single_school(school=school, **kwargs)
+            school_span.set(
+                research_status=(
+                    result.research_status if isinstance(result, DeepSchoolInsight)
+                    else school.get("research_status")
+                ),
+            )
+            return result
+
     def _apply_insight(self, school: Dict[str, Any], insight: DeepSchoolInsight) -> None:
         school["research_status"] = insight.research_status
         school["ranking_adjustment"] = insight.ranking_adjustment
@@ -471,15 +808,21 @@ class DeepSchoolInsightService:
         baseball_assessment: Dict[str, Any],
         academic_score: Dict[str, Any],
         ranking_priority: Optional[str] = None,
-        fetch_sem: Optional[asyncio.Semaphore] = None,
+        fetch_sem: Optional[Union[asyncio.Semaphore, AdaptiveLimiter]] = None,
         llm_sem: Optional[asyncio.Semaphore] = None,
         cached_row: Optional[Dict[str, Any]] = None,
+        previous_pages: Optional[Dict[str, CachedPage]] = None,
+        page_stats: Optional[PageFetchStats] = None,
+        planner: Optional[ResearchPlanner] = None,
     ) -> Optional[DeepSchoolInsight]:
         # fetch_sem / llm_sem are only passed by the fan-out path in
         # enrich_and_rerank; the rank-aware batched path leaves them None
-        # because batch_size already throttles concurrency there.
+        # because batch_size already throttles concurrency there. planner,
+        # if given, may skip the school before the fetch or the review.
         # cached_row, if present, is a school_evidence_cache row — its
         # matched_players replace the live fetch + parse for this school.
+        # previous_pages (validators from a stale row) make a miss's live
+        # fetch conditional; page_stats counts those pages for the run.
         if self.client is None:
             return None
         if not self.has_responses_parse:
@@ -525,11 +868,21 @@ class DeepSchoolInsightService:
                 "[CACHE] hit school=%r matched_players=%d stats_available=%s",
                 school_name, len(matched), bool(cached_row.get("stats_available")),
             )
+            current_span().set(cache_hit=True)
         else:
             logger.info("[CACHE] miss school=%r — falling through to live fetch", school_name)
-            fetch_ctx = fetch_sem if fetch_sem is not None else contextlib.nullcontext()
+            current_span().set(cache_hit=False)
+            # Slot lets retry backoff inside the fetch hand the permit back.
+            fetch_ctx = Slot(fetch_sem) if fetch_sem is not None else contextlib.nullcontext()
             async with fetch_ctx:
-                evidence = await self._gather_evidence(school, player_stats, trusted_domains)
+                # Checked once the permit is ours, so results that finished
+                # while this school queued count.
+                if planner is not None and not planner.should_research(school, "fetch"):
+                    return None
+                evidence = await self._gather_evidence(
+                    school, player_stats, trusted_domains,
+                    previous_pages=previous_pages, page_stats=page_stats,
+                )
         t_evidence_done = time.monotonic()
         logger.info(
             "[TIMING] enrich_single evidence school=%r elapsed=%.2fs",
@@ -539,13 +892,21 @@ class DeepSchoolInsightService:
         # Compute the deterministic talking points once. The same list feeds
         # both the with-roster and no-roster paths — for no-roster, the
         # roster_opportunity tier simply contributes nothing.
+        if planner is not None:
+            # Evidence narrows the possible adjustment to a handful of values.
+            planner.note_evidence(school, evidence)
+
         is_pitcher = is_pitcher_primary_position(player_stats.get("primary_position", ""))
-        talking_points = compute_talking_points(school, evidence, player_stats, is_pitcher)
+        with span("talking_points", school=school_name) as tp_span:
+            talking_points = compute_talking_points(school, evidence, player_stats, is_pitcher)
+            tp_span.set(count=len(talking_points))
         roster_unavailable = not _has_meaningful_evidence(evidence)
 
         t_review_start = time.monotonic()
-        llm_ctx = llm_sem if llm_sem is not None else contextlib.nullcontext()
+        llm_ctx = Slot(llm_sem) if llm_sem is not None else contextlib.nullcontext()
         async with llm_ctx:
+            if planner is not None and not planner.should_research(school, "review"):
+                return None
             review = await self._review_school(
                 school, player_stats, baseball_assessment, academic_score,
                 evidence, talking_points,
@@ -684,8 +1045,15 @@ class DeepSchoolInsightService:
         school: Dict[str, Any],
         player_stats: Dict[str, Any],
         trusted_domains: Sequence[str],
+        previous_pages: Optional[Dict[str, CachedPage]] = None,
+        page_stats: Optional[PageFetchStats] = None,
     ) -> GatheredEvidence:
-        return await gather_evidence(school, player_stats, trusted_domains)
+        return await gather_evidence(
+            school, player_stats, trusted_domains,
+            previous_pages=previous_pages, page_stats=page_stats,
+            shared=getattr(self, "shared_evidence", None),
+            shared_stats=getattr(self, "shared_evidence_stats", None),
+        )
 
     async def _review_school(
         self,
@@ -703,6 +1071,25 @@ class DeepSchoolInsightService:
         # tighter so a missing-roster school can't pin the user-facing
         # finalize on extra LLM round-trips.
         max_retries = 1 if roster_unavailable else _max_retries
+
+        # Built once: fingerprinted for the cache and sent on every attempt.
+        prompt = build_review_prompt(
+            school, player_stats, baseball_assessment, academic_score,
+            evidence, talking_points,
+        )
+
+        # Identical prompt (model + instructions + payload) → identical
+        # review; looked up once, before any retries.
+        cache_key: Optional[str] = None
+        if self.review_cache is not None:
+            # Fingerprint what is actually sent: the budget-trimmed payload.
+            cache_key = review_fingerprint(self.review_model, prompt.payload)
+            cached = await self.review_cache.get(cache_key, self.review_cache_stats)
+            current_span().set(review_cache_hit=cached is not None)
+            if cached is not None:
+                logger.info("[REVIEW_CACHE] hit school=%r", school_name)
+                return cached
+
         for attempt in range(max_retries + 1):
             result = await review_school(
                 school,
@@ -713,16 +1100,23 @@ class DeepSchoolInsightService:
                 talking_points,
                 responses_parse=self._responses_parse,
                 review_model=self.review_model,
+                prompt=prompt,
             )
+            llm_host = "llm:" + self.review_model
             if result is not None:
+                HOST_HEALTH.record_success(llm_host)
+                if cache_key is not None:
+                    await self.review_cache.set(cache_key, result, self.review_cache_stats)
                 return result
+            HOST_HEALTH.record_failure(llm_host)
             if attempt < max_retries:
-                wait = 2.0 * (attempt + 1)
+                wait = REVIEW_RETRY_POLICY.delay(attempt, llm_host)
                 logger.warning(
-                    "LLM review failed for %r (attempt %d/%d), retrying in %.0fs",
+                    "LLM review failed for %r (attempt %d/%d), retrying in %.1fs",
                     school_name, attempt + 1, max_retries + 1, wait,
                 )
-                await asyncio.sleep(wait)
+                # Hands the llm_sem slot back while waiting.
+                await backoff(wait)
         return None
 
     def _review_instructions(self) -> str:
@@ -743,6 +1137,30 @@ class DeepSchoolInsightService:
         )
 
 
+def _player_academic_score(academic_score: Dict[str, Any]) -> Optional[float]:
+    """The player's effective (else composite) academic score, if usable."""
+    if not isinstance(academic_score, dict):
+        return None
+    raw_score = academic_score.get("effective")
+    if raw_score is None:
+        raw_score = academic_score.get("composite")
+    if raw_score is None:
+        return None
+    try:
+        return float(raw_score)
+    except (TypeError, ValueError):
+        return None
+
+
+def _record_demand(school_names: List[str], hits: List[str]) -> None:
+    """Record a cache lookup for the warming plan; failures are only logged."""
+    try:
+        from backend.database.school_evidence_demand import record_lookup
+        record_lookup(school_names, hits)
+    except Exception as exc:
+        logger.warning("[CACHE] school_evidence_demand record failed: %s", exc)
+
+
 def _research_error_message(prefix: str, exc: Exception) -> str:
     message = " ".join(str(exc).split())
     if len(message) > 200:
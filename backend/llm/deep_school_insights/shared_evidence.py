@@ -0,0 +1,278 @@
+"""Single-flight roster fetches shared across research runs.
+
+When several evaluations are finalized in the same hour their
+consideration pools overlap, and every run whose ``school_evidence_cache``
+row is stale or missing used to fetch and parse the same popular rosters
+on its own. ``SharedEvidence`` keys the live-fetch result
+(``MatchedRoster``: matched players, roster URL, stats availability — all
+position-agnostic) by roster URL and makes sure only one fetch per URL is
+in flight:
+
+1. **In this worker** — a process-wide registry of in-flight fetches.
+   Later callers for the same URL, from any task / thread / event loop,
+   await the leader's future instead of fetching.
+2. **Across workers** (when Redis is configured) — a finished result is
+   published under ``shared_roster:v1:<sha>`` for ``ttl_s``; the fetching
+   worker holds ``SET NX`` lock ``...:lock`` meanwhile, and other workers
+   poll for the published result rather than fetching themselves (one
+   ``MGET`` of result + lock per poll, backing off from ``poll_s`` to
+   ``max_poll_s``). A lock that expires or a wait that times out falls
+   back to a local fetch.
+
+Only non-empty results are published to Redis; failed fetches are shared
+with in-process waiters (they were in flight together) but not cached.
+Redis is reached through the shared ``redis.asyncio`` client
+(``redis_client.async_redis``), so waiting workers never block the event
+loop. Redis errors are logged and degrade to the in-process behavior.
+
+Configuration:
+- ``SHARED_EVIDENCE_URL`` (falls back to ``REDIS_URL``); unset → in-process only.
+- ``DEEP_RESEARCH_SHARED_EVIDENCE=0`` disables the layer.
+- ``DEEP_RESEARCH_SHARED_EVIDENCE_TTL_S`` — published-result TTL (default 1 h).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .redis_client import async_redis
+from .types import MatchedRoster
+
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "shared_roster:v1:"
+DEFAULT_TTL_S = 3600
+# A roster + stats fetch (with the stats retry) takes well under a minute;
+# the lock outliving a crashed worker by a little is harmless.
+DEFAULT_LOCK_TTL_S = 90
+
+
+@dataclass
+class SharedEvidenceStats:
+    """Per-run counts; ``deduplicated`` is the number of fetches saved."""
+    fetched: int = 0
+    local_waits: int = 0
+    remote_waits: int = 0
+    redis_hits: int = 0
+    errors: int = 0
+
+    @property
+    def deduplicated(self) -> int:
+        return self.local_waits + self.remote_waits + self.redis_hits
+
+
+def roster_key(roster_url: str) -> str:
+    normalized = roster_url.strip().rstrip("/").lower()
+    return KEY_PREFIX + hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+
+def _encode(roster: MatchedRoster) -> str:
+    from backend.database.school_evidence_cache import serialize_matched_players
+
+    return json.dumps({
+        "matched_players": serialize_matched_players(roster.matched_players),
+        "roster_url": roster.roster_url,
+        "stats_available": roster.stats_available,
+    }, separators=(",", ":"))
+
+
+def _decode(raw: Any) -> MatchedRoster:
+    from backend.database.school_evidence_cache import deserialize_matched_players
+
+    data = json.loads(raw)
+    return MatchedRoster(
+        matched_players=deserialize_matched_players(data.get("matched_players")),
+        roster_url=data.get("roster_url") or "",
+        stats_available=bool(data.get("stats_available")),
+    )
+
+
+def _text(value: Any) -> Optional[str]:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class SharedEvidence:
+    """Coalesces live roster fetches by URL. ``redis_client`` may be None or
+    any object with async ``get`` / ``mget`` / ``set(name, value, ex=..., nx=...)``
+    / ``delete``."""
+
+    def __init__(
+        self,
+        redis_client: Any = None,
+        ttl_s: int = DEFAULT_TTL_S,
+        lock_ttl_s: int = DEFAULT_LOCK_TTL_S,
+        poll_s: float = 0.5,
+        max_poll_s: float = 2.0,
+    ):
+        self.redis = redis_client
+        self.ttl_s = ttl_s
+        self.lock_ttl_s = lock_ttl_s
+        self.poll_s = poll_s
+        self.max_poll_s = max(poll_s, max_poll_s)
+        self._in_flight: Dict[str, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+
+    async def get_or_fetch(
+        self,
+        roster_url: str,
+        fetch: Callable[[], Awaitable[MatchedRoster]],
+        stats: Optional[SharedEvidenceStats] = None,
+    ) -> MatchedRoster:
+        stats = stats if stats is not None else SharedEvidenceStats()
+        key = roster_key(roster_url)
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = concurrent.futures.Future()
+                self._in_flight[key] = future
+        if not leader:
+            stats.local_waits += 1
+            try:
+                return await asyncio.wrap_future(future)
+            except Exception as exc:
+                # The leader's fetch raised or its task was torn down;
+                # don't inherit that, fetch for ourselves.
+                logger.info("[SHARED_EVIDENCE] leader failed key=%s: %s", key[-12:], exc)
+                stats.local_waits -= 1
+                stats.fetched += 1
+                return await fetch()
+
+        try:
+            result = await self._fetch_once(key, fetch, stats)
+        except BaseException as exc:
+            future.set_exception(
+                exc if isinstance(exc, Exception) else RuntimeError("shared roster fetch cancelled")
+            )
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    async def _fetch_once(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[MatchedRoster]],
+        stats: SharedEvidenceStats,
+    ) -> MatchedRoster:
+        if self.redis is None:
+            stats.fetched += 1
+            return await fetch()
+
+        cached = await self._get(key, stats)
+        if cached is not None:
+            stats.redis_hits += 1
+            return cached
+
+        token = uuid.uuid4().hex
+        if not await self._acquire(key, token, stats):
+            published = await self._wait_for_other_worker(key, stats)
+            if published is not None:
+                stats.remote_waits += 1
+                return published
+            token = None
+
+        try:
+            stats.fetched += 1
+            result = await fetch()
+            if result.matched_players:
+                await self._publish(key, result, stats)
+            return result
+        finally:
+            if token is not None:
+                await self._release(key, token, stats)
+
+    async def _wait_for_other_worker(self, key: str, stats: SharedEvidenceStats) -> Optional[MatchedRoster]:
+        deadline = time.monotonic() + self.lock_ttl_s
+        delay = self.poll_s
+        while time.monotonic() < deadline:
+            await asyncio.sleep(delay)
+            delay = min(self.max_poll_s, delay * 1.5)
+            try:
+                raw, lock = await self.redis.mget(key, key + ":lock")
+            except Exception as exc:
+                self._error("poll", key, exc, stats)
+                return None
+            if raw:
+                try:
+                    return _decode(raw)
+                except Exception as exc:
+                    self._error("decode", key, exc, stats)
+                    return None
+            if lock is None:
+                # Holder finished without publishing (empty/failed
+                # fetch) or died; fetch ourselves.
+                return None
+        return None
+
+    async def _get(self, key: str, stats: SharedEvidenceStats) -> Optional[MatchedRoster]:
+        try:
+            raw = await self.redis.get(key)
+            return _decode(raw) if raw else None
+        except Exception as exc:
+            self._error("get", key, exc, stats)
+            return None
+
+    async def _acquire(self, key: str, token: str, stats: SharedEvidenceStats) -> bool:
+        try:
+            return bool(await self.redis.set(key + ":lock", token, ex=self.lock_ttl_s, nx=True))
+        except Exception as exc:
+            # Can't coordinate; behave as the only worker.
+            self._error("lock", key, exc, stats)
+            return True
+
+    async def _publish(self, key: str, result: MatchedRoster, stats: SharedEvidenceStats) -> None:
+        try:
+            await self.redis.set(key, _encode(result), ex=self.ttl_s)
+        except Exception as exc:
+            self._error("publish", key, exc, stats)
+
+    async def _release(self, key: str, token: str, stats: SharedEvidenceStats) -> None:
+        try:
+            if _text(await self.redis.get(key + ":lock")) == token:
+                await self.redis.delete(key + ":lock")
+        except Exception as exc:
+            self._error("unlock", key, exc, stats)
+
+    @staticmethod
+    def _error(op: str, key: str, exc: Exception, stats: SharedEvidenceStats) -> None:
+        logger.warning("[SHARED_EVIDENCE] %s failed key=%s: %s", op, key[-12:], exc)
+        stats.errors += 1
+
+
+def get_shared_evidence() -> Optional[SharedEvidence]:
+    """Process-wide instance from the environment, or None when disabled.
+
+    One instance per process is what makes in-worker single-flight work
+    across Celery tasks.
+    """
+    if os.getenv("DEEP_RESEARCH_SHARED_EVIDENCE", "1").strip().lower() in ("0", "false", "off"):
+        return None
+    url = os.getenv("SHARED_EVIDENCE_URL") or os.getenv("REDIS_URL") or ""
+    return _shared_for_url(url, int(os.getenv("DEEP_RESEARCH_SHARED_EVIDENCE_TTL_S", str(DEFAULT_TTL_S))))
+
+
+@lru_cache(maxsize=4)
+def _shared_for_url(url: str, ttl_s: int) -> SharedEvidence:
+    if not url:
+        return SharedEvidence(None, ttl_s=ttl_s)
+    client = async_redis(url)
+    if client is None:
+        logger.warning("[SHARED_EVIDENCE] redis package not installed; in-process only")
+    return SharedEvidence(client, ttl_s=ttl_s)
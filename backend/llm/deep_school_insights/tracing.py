@@ -0,0 +1,353 @@
+"""Span tracing for the research pipeline.
+
+Every stage of a research run opens a span — ``research_run`` at the top,
+``research_school`` per school, and under it ``cache_load``,
+``fetch.roster`` / ``fetch.stats``, ``parse.roster`` / ``parse.stats``,
+``match``, ``evidence``, ``talking_points``, ``llm_review``, then
+``rerank`` and ``db_write`` for the run. Spans carry the attributes that
+explain their latency: ``school`` / ``school_id``, ``bytes``, token counts,
+``cache_hit``, statuses.
+
+Tracing is off unless a destination is configured; with no active
+tracer ``span()`` hands back a shared no-op span, so instrumented code
+pays one context-variable lookup per stage.
+
+Destinations (both may be set):
+- ``DEEP_RESEARCH_TRACE_FILE`` — appends one OTLP/JSON
+  ``{"resourceSpans": ...}`` line per run, followed by a
+  ``{"resourceMetrics": ...}`` line with per-stage latency histograms.
+  ``backend/scripts/trace_report.py`` turns it into a waterfall and
+  stage percentiles; any OTLP/JSON consumer can read it too.
+- ``DEEP_RESEARCH_TRACE_ENDPOINT`` — an OTLP/HTTP collector base URL;
+  the same payloads are POSTed to ``/v1/traces`` and ``/v1/metrics``.
+
+Export happens once, when the run's root span closes. Export errors are
+logged and never fail the run.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TypeVar
+
+logger = logging.getLogger(__name__)
+
+SCOPE_NAME = "backend.llm.deep_school_insights"
+SERVICE_NAME = "deep_school_research"
+# Latency histogram bucket upper bounds, milliseconds.
+HISTOGRAM_BOUNDS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+# A 50-school run produces ~500 spans; this only guards against a runaway loop.
+MAX_SPANS_PER_RUN = 20000
+
+_STATUS_UNSET, _STATUS_OK, _STATUS_ERROR = 0, 1, 2
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "status", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.status = _STATUS_UNSET
+        self.error: Optional[str] = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or self.start_ns) - self.start_ns) / 1e6
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class StageHistogram:
+    """Fixed-bucket latency histogram (OTLP explicit-bucket layout)."""
+
+    def __init__(self, bounds: Sequence[float] = HISTOGRAM_BOUNDS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def record(self, value_ms: float) -> None:
+        i = 0
+        while i < len(self.bounds) and value_ms > self.bounds[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.total += value_ms
+        self.min = min(self.min, value_ms)
+        self.max = max(self.max, value_ms)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th value (max for the last)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return float(self.bounds[i]) if i < len(self.bounds) else self.max
+        return self.max
+
+
+class Tracer:
+    """Collects one run's spans and stage histograms; exports when it ends."""
+
+    def __init__(self, file_path: Optional[str] = None, endpoint: Optional[str] = None):
+        self.file_path = file_path
+        self.endpoint = endpoint.rstrip("/") if endpoint else None
+        self.spans: List[Span] = []
+        self.histograms: Dict[str, StageHistogram] = {}
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            if len(self.spans) >= MAX_SPANS_PER_RUN:
+                self.dropped += 1
+                return
+            self.spans.append(span)
+            self.histograms.setdefault(span.name, StageHistogram()).record(span.duration_ms)
+
+    # -- OTLP/JSON ---------------------------------------------------------
+
+    def _resource(self) -> Dict[str, Any]:
+        return {"attributes": _attributes({
+            "service.name": SERVICE_NAME,
+            "deployment.environment": os.getenv("ENVIRONMENT", "development"),
+        })}
+
+    def otlp_spans(self) -> Dict[str, Any]:
+        spans = []
+        for s in self.spans:
+            item: Dict[str, Any] = {
+                "traceId": s.trace_id,
+                "spanId": s.span_id,
+                "name": s.name,
+                "kind": 1,  # INTERNAL
+                "startTimeUnixNano": str(s.start_ns),
+                "endTimeUnixNano": str(s.end_ns or s.start_ns),
+                "attributes": _attributes(s.attributes),
+                "status": {"code": s.status, **({"message": s.error} if s.error else {})},
+            }
+            if s.parent_id:
+                item["parentSpanId"] = s.parent_id
+            spans.append(item)
+        return {"resourceSpans": [{
+            "resource": self._resource(),
+            "scopeSpans": [{"scope": {"name": SCOPE_NAME}, "spans": spans}],
+        }]}
+
+    def otlp_metrics(self) -> Dict[str, Any]:
+        now = str(time.time_ns())
+        start = str(min((s.start_ns for s in self.spans), default=time.time_ns()))
+        points = [
+            {
+                "attributes": _attributes({"stage": name}),
+                "startTimeUnixNano": start,
+                "timeUnixNano": now,
+                "count": str(h.count),
+                "sum": h.total,
+                "min": h.min,
+                "max": h.max,
+                "bucketCounts": [str(c) for c in h.counts],
+                "explicitBounds": list(map(float, h.bounds)),
+            }
+            for name, h in sorted(self.histograms.items())
+        ]
+        return {"resourceMetrics": [{
+            "resource": self._resource(),
+            "scopeMetrics": [{"scope": {"name": SCOPE_NAME}, "metrics": [{
+                "name": "research.stage.duration",
+                "unit": "ms",
+                "histogram": {"dataPoints": points, "aggregationTemporality": 2},  # CUMULATIVE
+            }]}],
+        }]}
+
+    def export(self) -> None:
+        if not self.spans:
+            return
+        traces, metrics = self.otlp_spans(), self.otlp_metrics()
+        if self.file_path:
+            try:
+                directory = os.path.dirname(self.file_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.file_path, "a") as f:
+                    f.write(json.dumps(traces, default=str) + "\n")
+                    f.write(json.dumps(metrics, default=str) + "\n")
+            except Exception as exc:
+                logger.warning("[TRACE] could not write %s: %s", self.file_path, exc)
+        if self.endpoint:
+            try:
+                import httpx
+
+                with httpx.Client(timeout=2.0) as client:
+                    client.post(f"{self.endpoint}/v1/traces", json=traces).raise_for_status()
+                    client.post(f"{self.endpoint}/v1/metrics", json=metrics).raise_for_status()
+            except Exception as exc:
+                logger.warning("[TRACE] could not export to %s: %s", self.endpoint, exc)
+
+    def summary(self) -> str:
+        return " ".join(
+            f"{name}:n={h.count},p50={h.quantile(0.5):g}ms,p95={h.quantile(0.95):g}ms"
+            for name, h in sorted(self.histograms.items())
+        )
+
+
+def _attr_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {"key": key, "value": _attr_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+_tracer: contextvars.ContextVar[Optional[Tracer]] = contextvars.ContextVar("research_tracer", default=None)
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("research_span", default=None)
+
+
+def tracer_from_env() -> Optional[Tracer]:
+    file_path = os.getenv("DEEP_RESEARCH_TRACE_FILE") or None
+    endpoint = os.getenv("DEEP_RESEARCH_TRACE_ENDPOINT") or None
+    if not file_path and not endpoint:
+        return None
+    return Tracer(file_path=file_path, endpoint=endpoint)
+
+
+def active_tracer() -> Optional[Tracer]:
+    return _tracer.get()
+
+
+def current_span() -> Any:
+    """The innermost open span, or the no-op span when not tracing."""
+    return _current.get() or NOOP_SPAN
+
+
+@contextlib.contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """Open a child of the current span. No-op without an active tracer.
+
+    Works around ``await``: asyncio tasks copy the context when created,
+    so spans opened in gathered coroutines nest under the span that was
+    current when they were scheduled.
+    """
+    tracer = _tracer.get()
+    if tracer is None:
+        yield NOOP_SPAN
+        return
+    parent = _current.get()
+    s = Span(
+        name,
+        parent.trace_id if parent is not None else secrets.token_hex(16),
+        parent.span_id if parent is not None else None,
+        {k: v for k, v in attributes.items() if v is not None},
+    )
+    token = _current.set(s)
+    try:
+        yield s
+        s.status = _STATUS_OK
+    except BaseException as exc:
+        s.status = _STATUS_ERROR
+        s.error = f"{type(exc).__name__}: {exc}"[:500]
+        raise
+    finally:
+        s.end_ns = time.time_ns()
+        _current.reset(token)
+        tracer._finish(s)
+
+
+def traced(
+    name: str, result_attributes: Optional[Callable[[Any], Dict[str, Any]]] = None,
+) -> Callable[[F], F]:
+    """Decorator: run the whole function (sync or async) inside ``span(name)``.
+
+    The function can add attributes with ``current_span().set(...)``;
+    ``result_attributes(result)`` adds more from the return value.
+    """
+    def _finish(s: Any, result: Any) -> Any:
+        if result_attributes is not None and s is not NOOP_SPAN:
+            s.set(**result_attributes(result))
+        return result
+
+    def decorate(fn: F) -> F:
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(name) as s:
+                    return _finish(s, await fn(*args, **kwargs))
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name) as s:
+                return _finish(s, fn(*args, **kwargs))
+        return wrapper  # type: ignore[return-value]
+    return decorate
+
+
+@contextlib.contextmanager
+def trace_run(name: str = "research_run", **attributes: Any) -> Iterator[Any]:
+    """Root span for a research run; exports the run's trace when it closes.
+
+    Nested inside an already-traced run (the Celery task wraps the
+    service call) it is an ordinary child span.
+    """
+    if _tracer.get() is not None:
+        with span(name, **attributes) as s:
+            yield s
+        return
+    tracer = tracer_from_env()
+    if tracer is None:
+        yield NOOP_SPAN
+        return
+    token = _tracer.set(tracer)
+    try:
+        with span(name, **attributes) as root:
+            yield root
+    finally:
+        _tracer.reset(token)
+        logger.info(
+            "[TRACE] trace_id=%s spans=%d dropped=%d %s",
+            root.trace_id, len(tracer.spans), tracer.dropped, tracer.summary(),
+        )
+        tracer.export()
@@ -3,11 +3,18 @@
 Pydantic models describe the evidence/review payloads exchanged with the LLM.
 Dataclasses describe intermediate roster/stats parsing results that never cross
 the network boundary.
+
+``ParsedPlayer`` / ``ParsedStatLine`` / ``MatchedPlayer`` exist by the
+thousand per run (every roster player of every school, held through
+review and caching), so they are slotted and intern their small-vocabulary
+strings — positions, class years, jersey numbers, stat types — into one
+shared object per distinct value. Counts stay plain ints.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field
@@ -100,7 +107,14 @@ class DeepSchoolInsight:
     research_status: str
 
 
-@dataclass
+def _intern(value: Optional[str]) -> Optional[str]:
+    if type(value) is str:
+        return sys.intern(value)
+    # sys.intern rejects str subclasses such as bs4's NavigableString.
+    return sys.intern(str(value)) if isinstance(value, str) else value
+
+
+@dataclass(slots=True)
 class ParsedPlayer:
     name: str
     jersey_number: Optional[str] = None
@@ -114,8 +128,15 @@ class ParsedPlayer:
     previous_school: Optional[str] = None
     hometown: Optional[str] = None
 
+    def __post_init__(self) -> None:
+        self.jersey_number = _intern(self.jersey_number)
+        self.position_raw = _intern(self.position_raw)
+        self.position_normalized = _intern(self.position_normalized)
+        self.position_family = _intern(self.position_family)
+        self.class_year_raw = _intern(self.class_year_raw)
 
-@dataclass
+
+@dataclass(slots=True)
 class ParsedStatLine:
     jersey_number: Optional[str] = None
     player_name: str = ""
@@ -123,14 +144,98 @@ class ParsedStatLine:
     games_played: int = 0
     games_started: int = 0
 
+    def __post_init__(self) -> None:
+        self.jersey_number = _intern(self.jersey_number)
+        self.stat_type = _intern(self.stat_type)
 
-@dataclass
+
+@dataclass(slots=True)
 class MatchedPlayer:
     player: ParsedPlayer
     batting_stats: Optional[ParsedStatLine] = None
     pitching_stats: Optional[ParsedStatLine] = None
 
 
+@dataclass
+class MatchedRoster:
+    """Position-agnostic live-fetch result for one school.
+
+    Everything gather_evidence learns from the network before the per-user
+    ``compute_evidence`` step, so it can be shared across runs.
+    """
+    matched_players: List[MatchedPlayer]
+    roster_url: str = ""
+    stats_available: bool = False
+
+
+@dataclass
+class PageValidators:
+    """HTTP validators + body hash recorded for one fetched page.
+
+    ``parser_version`` is the ``html_stream.PARSER_VERSION`` that produced
+    the cached items (None for rows written before it was recorded).
+    ``parser`` / ``parser_variant`` / ``layout`` persist the
+    ``parse_strategy.ParserStrategy`` learned for the page's host.
+    """
+    url: str = ""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    parser_version: Optional[int] = None
+    parser: Optional[str] = None
+    parser_variant: Optional[str] = None
+    layout: Optional[str] = None
+
+
+@dataclass
+class CachedPage:
+    """A previously fetched page: its validators and what it parsed into."""
+    validators: PageValidators
+    items: list = field(default_factory=list)
+
+
+@dataclass
+class PageFetch:
+    """Outcome of one conditional page fetch.
+
+    status: ``parsed`` (new body parsed), ``not_modified`` (304),
+    ``unchanged`` (200 with the same content hash), ``failed`` or
+    ``unavailable`` (no URL / 404). ``items`` holds ParsedPlayer or
+    ParsedStatLine records — reused from the cache when skipped.
+    """
+    items: list
+    url: Optional[str]
+    status: str
+    validators: Optional[PageValidators] = None
+
+    @property
+    def skipped(self) -> bool:
+        return self.status in ("not_modified", "unchanged")
+
+
+@dataclass
+class PageFetchStats:
+    """Per-run counts of pages fetched vs. skipped (304 or unchanged hash)."""
+    fetched: int = 0
+    not_modified: int = 0
+    unchanged: int = 0
+
+    @property
+    def skipped(self) -> int:
+        return self.not_modified + self.unchanged
+
+    @property
+    def skipped_pct(self) -> float:
+        return 100.0 * self.skipped / self.fetched if self.fetched else 0.0
+
+    def record(self, status: str) -> None:
+        self.fetched += 1
+        if status == "not_modified":
+            self.not_modified += 1
+        elif status == "unchanged":
+            self.unchanged += 1
+
+
 HIGH_USAGE_GS_THRESHOLD = 10
 PITCHER_HIGH_USAGE_GS_THRESHOLD = 5
 PITCHER_HIGH_USAGE_GP_THRESHOLD = 15
@@ -0,0 +1,183 @@
+"""Message contract for the ``generate_deep_school_research`` task.
+
+The legacy message carried the full ranked school dicts (metric
+comparisons, location, grades, tuition, ...) for the whole
+consideration pool — tens of kilobytes per paid evaluation, held in
+Redis until a worker acks it and deserialized again on every redelivery.
+
+Version 2 stores the pool once on the run row
+(``prediction_runs.research_input``) and the message carries only:
+
+* ``run_id`` and ``payload_version``;
+* ``school_refs`` — one ``{"school_name": ..., "pool_index": i}`` per
+  school, in ranked order (the pool the worker researches); ``pool_index``
+  is the school's position in the stored pool, so schools that share a
+  name still resolve to their own dict;
+* the small per-run inputs research needs (``player_stats``,
+  ``baseball_assessment``, ``academic_score``, ``final_limit``,
+  ``ranking_priority``).
+
+The worker rehydrates the full dicts from ``research_input``
+(``resolve_schools``). Once the run reaches a terminal status the task
+clears ``research_input`` again, so the pool is not kept on every run
+row. Messages without ``payload_version`` are the legacy format and are
+used as-is, so in-flight messages enqueued before a deploy still run. Deploy workers before the web service;
+``DEEP_RESEARCH_SLIM_PAYLOAD=0`` keeps enqueueing the legacy format.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PAYLOAD_VERSION = 2
+SCHOOL_REF_FIELDS = ("school_name",)
+
+
+class ResearchInputMissing(RuntimeError):
+    """A slim message's run has no stored research_input to rehydrate from."""
+
+
+def slim_payload_enabled() -> bool:
+    return os.getenv("DEEP_RESEARCH_SLIM_PAYLOAD", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def message_bytes(payload: Dict[str, Any]) -> int:
+    """Size of ``payload`` as Celery's default JSON serializer sends it."""
+    return len(json.dumps(payload, default=str).encode("utf-8"))
+
+
+def _common_fields(
+    run_id: str,
+    player_stats: Dict[str, Any],
+    baseball_assessment: Dict[str, Any],
+    academic_score: Dict[str, Any],
+    final_limit: Optional[int],
+    ranking_priority: Optional[str],
+) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {
+        "run_id": run_id,
+        "player_stats": player_stats,
+        "baseball_assessment": baseball_assessment,
+        "academic_score": academic_score,
+    }
+    if final_limit is not None:
+        payload["final_limit"] = final_limit
+    if ranking_priority is not None:
+        payload["ranking_priority"] = ranking_priority
+    return payload
+
+
+def build_legacy_payload(
+    *,
+    run_id: str,
+    schools: List[Dict[str, Any]],
+    player_stats: Dict[str, Any],
+    baseball_assessment: Dict[str, Any],
+    academic_score: Dict[str, Any],
+    final_limit: Optional[int] = None,
+    ranking_priority: Optional[str] = None,
+) -> Dict[str, Any]:
+    payload = _common_fields(
+        run_id, player_stats, baseball_assessment, academic_score, final_limit, ranking_priority,
+    )
+    payload["schools"] = schools
+    return payload
+
+
+def build_slim_payload(
+    *,
+    run_id: str,
+    schools: List[Dict[str, Any]],
+    player_stats: Dict[str, Any],
+    baseball_assessment: Dict[str, Any],
+    academic_score: Dict[str, Any],
+    final_limit: Optional[int] = None,
+    ranking_priority: Optional[str] = None,
+) -> Dict[str, Any]:
+    payload = _common_fields(
+        run_id, player_stats, baseball_assessment, academic_score, final_limit, ranking_priority,
+    )
+    payload["payload_version"] = PAYLOAD_VERSION
+    payload["school_refs"] = [
+        {**{k: school.get(k) for k in SCHOOL_REF_FIELDS}, "pool_index": i}
+        for i, school in enumerate(schools)
+    ]
+    return payload
+
+
+def store_research_input(supabase: Any, run_id: str, schools: List[Dict[str, Any]]) -> bool:
+    """Persist the full pool on the run row; False if it couldn't be written."""
+    try:
+        supabase.table("prediction_runs").update(
+            {"research_input": {"version": PAYLOAD_VERSION, "schools": schools}}
+        ).eq("id", run_id).execute()
+        return True
+    except Exception as exc:
+        logger.warning("Failed to store research_input for run %s: %s", run_id, exc)
+        return False
+
+
+def load_research_input(supabase: Any, run_id: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+    if not run_id:
+        return None
+    resp = (
+        supabase.table("prediction_runs")
+        .select("research_input")
+        .eq("id", run_id)
+        .limit(1)
+        .execute()
+    )
+    if not resp.data:
+        return None
+    stored = resp.data[0].get("research_input") or {}
+    schools = stored.get("schools")
+    return schools if isinstance(schools, list) else None
+
+
+def rehydrate_schools(
+    refs: List[Dict[str, Any]], stored: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """Full school dicts for ``refs``, in ref order.
+
+    Refs resolve by ``pool_index`` (checked against the name); refs
+    without one fall back to the name. Refs missing from the stored pool
+    are dropped (and logged): the pool was written by the same enqueue
+    call, so this only happens if the row was edited in between.
+    """
+    by_name = {s.get("school_name"): s for s in stored}
+    schools: List[Dict[str, Any]] = []
+    missing: List[str] = []
+    for ref in refs:
+        name = ref.get("school_name")
+        index = ref.get("pool_index")
+        if index is None:
+            school = by_name.get(name)
+        elif 0 <= index < len(stored) and stored[index].get("school_name") == name:
+            school = stored[index]
+        else:
+            school = None
+        if school is None:
+            missing.append(str(name))
+            continue
+        schools.append({**school, **{k: ref[k] for k in SCHOOL_REF_FIELDS if k in ref}})
+    if missing:
+        logger.warning("research_input is missing %d referenced schools: %s", len(missing), missing[:5])
+    return schools
+
+
+def resolve_schools(supabase: Any, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """The research pool for ``payload``, whichever message format it is."""
+    if payload.get("payload_version") is None:
+        return payload.get("schools") or []
+    refs = payload.get("school_refs") or []
+    if not refs:
+        return []
+    stored = load_research_input(supabase, payload.get("run_id"))
+    if stored is None:
+        raise ResearchInputMissing(f"prediction_run {payload.get('run_id')} has no research_input")
+    return rehydrate_schools(refs, stored)
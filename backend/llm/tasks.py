@@ -2,18 +2,29 @@
 Celery tasks for deep school research.
 """
 
-import asyncio
 import os
 import logging
 import time
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
 import sentry_sdk
-from celery import Celery
+from celery import Celery, chord
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown, worker_shutdown
 
 from backend.observability import init_sentry
 from backend.llm.deep_school_insights import DeepSchoolInsightService
+from backend.llm.deep_school_insights.progress import ResearchProgress
+from backend.llm.deep_school_insights.tracing import current_span, span, trace_run, traced
+from backend.llm.research_payload import ResearchInputMissing, resolve_schools
+from backend.llm.worker_runtime import (
+    active_runtime,
+    get_runtime,
+    mark_worker_process,
+    persistent_loop_enabled,
+    run_async,
+    shutdown_runtime,
+)
 from backend.api.clients.supabase import get_supabase_admin_client
 
 
@@ -108,6 +119,40 @@ celery_app.conf.task_acks_late = True
 celery_app.conf.task_reject_on_worker_lost = True
 
 
+# One event loop + warm OpenAI / HTTP / Supabase clients per worker
+# process (worker_runtime.py) instead of asyncio.run per task. Prefork
+# children start it as soon as they're forked; solo/threads pools start it
+# lazily on the first task. Never started in the prefork parent: the loop
+# thread wouldn't survive the fork.
+@worker_init.connect
+def _mark_worker(**_kwargs) -> None:
+    mark_worker_process()
+
+
+@worker_process_init.connect
+def _start_runtime(**_kwargs) -> None:
+    mark_worker_process()
+    if persistent_loop_enabled():
+        try:
+            get_runtime()
+        except Exception as exc:
+            logger.warning("[RUNTIME] start failed; tasks fall back to asyncio.run: %s", exc)
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _stop_runtime(**_kwargs) -> None:
+    shutdown_runtime()
+
+
+def _new_service() -> DeepSchoolInsightService:
+    """Per-task service; shares the runtime's OpenAI client when there is one."""
+    runtime = active_runtime()
+    if runtime is not None and runtime.openai_client is not None:
+        return DeepSchoolInsightService(client=runtime.openai_client)
+    return DeepSchoolInsightService()
+
+
 # Statuses that indicate the task already finished successfully (or was
 # intentionally skipped). A retry firing against a run in any of these
 # states would clobber the persisted result — return early instead.
@@ -120,13 +165,145 @@ def _top_schools_snapshot(schools: list[dict[str, Any]], limit: int = 3) -> list
     ]
 
 
+def _progress_writer(supabase: Any, run_id: Optional[str]):
+    """on_progress callback: store the latest snapshot on the run row.
+
+    /evaluations/result serves ``research_progress`` while the run is
+    still processing, so finished schools show up before the whole
+    research pass is done.
+    """
+    def _write(snapshot: Dict[str, Any]) -> None:
+        if not run_id:
+            return
+        with span("db_write", table="prediction_runs", column="research_progress"):
+            supabase.table("prediction_runs").update(
+                {"research_progress": snapshot}
+            ).eq("id", run_id).execute()
+
+    return _write
+
+
+def _stored_progress_version(supabase: Any, run_id: Optional[str]) -> int:
+    """research_progress.version already on the run row (0 if none).
+
+    A retried task continues from it, so its snapshots keep increasing.
+    """
+    if not run_id:
+        return 0
+    try:
+        existing = (
+            supabase.table("prediction_runs")
+            .select("research_progress")
+            .eq("id", run_id)
+            .limit(1)
+            .execute()
+        )
+        progress = (existing.data or [{}])[0].get("research_progress") or {}
+        return int(progress.get("version") or 0)
+    except Exception as exc:
+        logger.warning("[PROGRESS] could not read stored version run_id=%s: %s", run_id, exc)
+        return 0
+
+
+def _terminal_status(supabase: Any, run_id: Optional[str]) -> Optional[str]:
+    """llm_reasoning_status if the run already finished, else None."""
+    if not run_id:
+        return None
+    existing = (
+        supabase.table("prediction_runs")
+        .select("llm_reasoning_status")
+        .eq("id", run_id)
+        .limit(1)
+        .execute()
+    )
+    if existing.data:
+        current_status = existing.data[0].get("llm_reasoning_status")
+        if current_status in _TERMINAL_LLM_STATUSES:
+            return current_status
+    return None
+
+
+@traced("db_write")
+def _persist_enriched_schools(
+    supabase: Any, run_id: Optional[str], enriched_schools: List[Dict[str, Any]],
+) -> Tuple[str, int]:
+    """Write the final school list onto the run. Returns (llm_status, succeeded)."""
+    current_span().set(table="prediction_runs", column="preferences_response", schools=len(enriched_schools))
+    current_run = (
+        supabase.table("prediction_runs")
+        .select("preferences_response")
+        .eq("id", run_id)
+        .limit(1)
+        .execute()
+    )
+    if not current_run.data:
+        raise RuntimeError(f"prediction_run {run_id} not found")
+
+    preferences_response = current_run.data[0].get("preferences_response") or {}
+    preferences_response["schools"] = enriched_schools
+
+    # Compute honest completion status from per-school outcomes
+    total = len(enriched_schools)
+    succeeded = sum(
+        1 for s in enriched_schools
+        if s.get("research_status") in ("completed", "partial")
+    )
+    if total == 0:
+        llm_status = "skipped"
+    elif succeeded == 0:
+        llm_status = "failed"
+    else:
+        llm_status = "completed"
+
+    supabase.table("prediction_runs").update(
+        {
+            "preferences_response": preferences_response,
+            "top_schools_snapshot": _top_schools_snapshot(enriched_schools),
+            "llm_reasoning_status": llm_status,
+            # Terminal: the stored pool (research_payload.py) is no longer read.
+            "research_input": None,
+        }
+    ).eq("id", run_id).execute()
+    return llm_status, succeeded
+
+
+def _mark_failed(supabase: Any, run_id: Optional[str], exc: Exception) -> Dict[str, Any]:
+    supabase.table("prediction_runs").update(
+        {"llm_reasoning_status": "failed", "research_input": None}
+    ).eq("id", run_id).execute()
+    return {
+        "status": "failed",
+        "run_id": run_id,
+        "error": str(exc),
+        "completed_at": datetime.now().isoformat(),
+    }
+
+
+def _fanout_group_size() -> int:
+    """Schools per research subtask; 0 (default) keeps the single-task path.
+
+    With DEEP_RESEARCH_FANOUT_GROUP_SIZE=N the run is split into groups of
+    N schools that any worker can pick up (a Celery chord), so adding
+    workers makes an individual run faster. Each worker still holds only
+    one group's fetch buffers, keeping the 512 MB budget.
+    """
+    try:
+        return max(0, int(os.getenv("DEEP_RESEARCH_FANOUT_GROUP_SIZE", "0")))
+    except ValueError:
+        return 0
+
+
 @celery_app.task(
     name="generate_deep_school_research",
     rate_limit=os.getenv("DEEP_SCHOOL_TASK_RATE_LIMIT", "12/m"),
 )
 def generate_deep_school_research(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Research a run's consideration pool and persist the ranked list.
+
+    Accepts both message formats (research_payload.py): slim messages
+    reference the pool stored on the run row, legacy ones carry it.
+    """
     run_id = payload.get("run_id")
-    schools = payload.get("schools") or []
     player_stats = payload.get("player_stats") or {}
     baseball_assessment = payload.get("baseball_assessment") or {}
     academic_score = payload.get("academic_score") or {}
@@ -143,110 +320,215 @@ def generate_deep_school_research(payload: Dict[str, Any]) -> Dict[str, Any]:
     # network failures — but our task does ~30+ LLM calls per run, so a
     # retry that overwrites a fresh result is both expensive and risks
     # clobbering data the user has already started reading.
-    if run_id:
-        existing = (
-            supabase.table("prediction_runs")
-            .select("llm_reasoning_status")
-            .eq("id", run_id)
-            .limit(1)
-            .execute()
+    current_status = _terminal_status(supabase, run_id)
+    if current_status is not None:
+        logger.info(
+            "Deep school research already %s for run %s — "
+            "skipping retry (idempotency guard)",
+            current_status, run_id,
         )
-        if existing.data:
-            current_status = existing.data[0].get("llm_reasoning_status")
-            if current_status in _TERMINAL_LLM_STATUSES:
-                logger.info(
-                    "Deep school research already %s for run %s — "
-                    "skipping retry (idempotency guard)",
-                    current_status, run_id,
-                )
-                return {
-                    "status": "skipped",
-                    "run_id": run_id,
-                    "reason": "already_terminal",
-                    "previous_status": current_status,
-                }
-
-    service = DeepSchoolInsightService()
+        return {
+            "status": "skipped",
+            "run_id": run_id,
+            "reason": "already_terminal",
+            "previous_status": current_status,
+        }
+
+    t_setup = time.monotonic()
+    try:
+        schools = resolve_schools(supabase, payload)
+    except ResearchInputMissing as exc:
+        logger.error("Deep school research cannot rehydrate run %s: %s", run_id, exc)
+        return _mark_failed(supabase, run_id, exc)
+    t_resolved = time.monotonic()
+
+    service = _new_service()
     if not service.enabled:
         supabase.table("prediction_runs").update(
             {"llm_reasoning_status": "skipped"}
         ).eq("id", run_id).execute()
         return {"status": "skipped", "run_id": run_id}
 
+    group_size = _fanout_group_size()
+    if group_size and schools:
+        dispatched = _dispatch_fanout(service, {**payload, "schools": schools}, group_size)
+        if dispatched is not None:
+            return dispatched
+
     t_task_start = time.monotonic()
     logger.info(
-        "[TIMING] deep_school_task start run_id=%s schools=%d final_limit=%s",
+        "[TIMING] deep_school_task start run_id=%s schools=%d final_limit=%s "
+        "runtime=%s payload=%s rehydrate=%.3fs service_setup=%.3fs",
         run_id, len(schools), final_limit,
+        "persistent" if active_runtime() is not None else "asyncio_run",
+        "slim" if payload.get("payload_version") else "legacy",
+        t_resolved - t_setup, t_task_start - t_resolved,
     )
-    try:
-        enriched_schools = asyncio.run(
-            service.enrich_and_rerank(
-                schools=schools,
-                player_stats=player_stats,
-                baseball_assessment=baseball_assessment,
-                academic_score=academic_score,
-                final_limit=final_limit,
-                ranking_priority=ranking_priority,
+    with trace_run("research_task", run_id=run_id, schools=len(schools)):
+        try:
+            enriched_schools = run_async(
+                service.enrich_and_rerank(
+                    schools=schools,
+                    player_stats=player_stats,
+                    baseball_assessment=baseball_assessment,
+                    academic_score=academic_score,
+                    final_limit=final_limit,
+                    ranking_priority=ranking_priority,
+                    on_progress=_progress_writer(supabase, run_id),
+                    progress_version=_stored_progress_version(supabase, run_id),
+                )
+            )
+            logger.info(
+                "[TIMING] deep_school_task enrich_done run_id=%s elapsed=%.2fs",
+                run_id, time.monotonic() - t_task_start,
             )
-        )
-        logger.info(
-            "[TIMING] deep_school_task enrich_done run_id=%s elapsed=%.2fs",
-            run_id, time.monotonic() - t_task_start,
-        )
 
-        current_run = (
-            supabase.table("prediction_runs")
-            .select("preferences_response")
-            .eq("id", run_id)
-            .limit(1)
-            .execute()
-        )
-        if not current_run.data:
-            raise RuntimeError(f"prediction_run {run_id} not found")
+            llm_status, succeeded = _persist_enriched_schools(supabase, run_id, enriched_schools)
+
+            logger.info(
+                "[TIMING] deep_school_task done run_id=%s status=%s total=%.2fs",
+                run_id, llm_status, time.monotonic() - t_task_start,
+            )
+            return {
+                "status": llm_status,
+                "run_id": run_id,
+                "school_count": len(enriched_schools),
+                "schools_enriched": succeeded,
+                "completed_at": datetime.now().isoformat(),
+            }
+        except Exception as exc:
+            logger.exception("Deep school research task failed for run %s: %s", run_id, exc)
+            return _mark_failed(supabase, run_id, exc)
 
-        preferences_response = current_run.data[0].get("preferences_response") or {}
-        preferences_response["schools"] = enriched_schools
 
-        # Compute honest completion status from per-school outcomes
-        total = len(enriched_schools)
-        succeeded = sum(
-            1 for s in enriched_schools
-            if s.get("research_status") in ("completed", "partial")
-        )
-        if total == 0:
-            llm_status = "skipped"
-        elif succeeded == 0:
-            llm_status = "failed"
-        else:
-            llm_status = "completed"
+def _dispatch_fanout(
+    service: DeepSchoolInsightService, payload: Dict[str, Any], group_size: int,
+) -> Optional[Dict[str, Any]]:
+    """Split the run into research_school_group subtasks + one aggregation.
 
-        supabase.table("prediction_runs").update(
-            {
-                "preferences_response": preferences_response,
-                "top_schools_snapshot": _top_schools_snapshot(enriched_schools),
-                "llm_reasoning_status": llm_status,
-            }
-        ).eq("id", run_id).execute()
+    Returns None when the run needs the rank-aware batched path (only a
+    subset of the pool is researched and later batches depend on earlier
+    results), which can't be split up front.
+    """
+    run_id = payload.get("run_id")
+    prepared, research_limit = service.prepare_schools(
+        payload.get("schools") or [],
+        final_limit=payload.get("final_limit"),
+        ranking_priority=payload.get("ranking_priority"),
+    )
+    if research_limit < len(prepared):
+        return None
 
-        logger.info(
-            "[TIMING] deep_school_task done run_id=%s status=%s total=%.2fs",
-            run_id, llm_status, time.monotonic() - t_task_start,
-        )
-        return {
-            "status": llm_status,
-            "run_id": run_id,
-            "school_count": total,
-            "schools_enriched": succeeded,
-            "completed_at": datetime.now().isoformat(),
-        }
+    shared = {
+        "run_id": run_id,
+        "player_stats": payload.get("player_stats") or {},
+        "baseball_assessment": payload.get("baseball_assessment") or {},
+        "academic_score": payload.get("academic_score") or {},
+        "ranking_priority": payload.get("ranking_priority"),
+    }
+    groups = [prepared[i:i + group_size] for i in range(0, len(prepared), group_size)]
+    logger.info(
+        "[TIMING] deep_school_task fanout run_id=%s schools=%d groups=%d group_size=%d",
+        run_id, len(prepared), len(groups), group_size,
+    )
+    chord(
+        research_school_group.s({**shared, "schools": group}) for group in groups
+    )(aggregate_deep_school_research.s({**shared, "final_limit": payload.get("final_limit")}))
+    return {"status": "dispatched", "run_id": run_id, "groups": len(groups)}
+
+
+@celery_app.task(name="research_school_group")
+def research_school_group(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Research one group of prepared schools; never raises.
+
+    Returns the group's school dicts with insights applied. Any failure
+    marks the group's unfinished schools ``failed`` so the chord still
+    reaches the aggregation step (partial results beat none).
+    """
+    run_id = payload.get("run_id")
+    schools = payload.get("schools") or []
+    supabase = get_supabase_admin_client()
+    if supabase is not None and _terminal_status(supabase, run_id) is not None:
+        return schools
+
+    t_start = time.monotonic()
+    try:
+        service = _new_service()
+        with trace_run("research_group", run_id=run_id, schools=len(schools)):
+            run_async(
+                service.research_schools(
+                    schools,
+                    player_stats=payload.get("player_stats") or {},
+                    baseball_assessment=payload.get("baseball_assessment") or {},
+                    academic_score=payload.get("academic_score") or {},
+                    ranking_priority=payload.get("ranking_priority"),
+                )
+            )
     except Exception as exc:
-        logger.exception("Deep school research task failed for run %s: %s", run_id, exc)
-        supabase.table("prediction_runs").update(
-            {"llm_reasoning_status": "failed"}
-        ).eq("id", run_id).execute()
+        logger.exception("Research group failed for run %s: %s", run_id, exc)
+        for school in schools:
+            if school.get("research_status") not in ("completed", "partial"):
+                school["research_status"] = "failed"
+    logger.info(
+        "[TIMING] research_school_group run_id=%s schools=%d elapsed=%.2fs",
+        run_id, len(schools), time.monotonic() - t_start,
+    )
+    return schools
+
+
+@celery_app.task(name="aggregate_deep_school_research")
+def aggregate_deep_school_research(
+    group_results: List[List[Dict[str, Any]]], payload: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Chord body: cross-school rerank + category caps, then persist."""
+    run_id = payload.get("run_id")
+    supabase = get_supabase_admin_client()
+    if supabase is None:
+        logger.error("Deep school research cannot run without Supabase admin client")
+        return {"status": "failed", "error": "supabase_not_configured", "run_id": run_id}
+
+    current_status = _terminal_status(supabase, run_id)
+    if current_status is not None:
         return {
-            "status": "failed",
+            "status": "skipped",
             "run_id": run_id,
-            "error": str(exc),
-            "completed_at": datetime.now().isoformat(),
+            "reason": "already_terminal",
+            "previous_status": current_status,
         }
+
+    with trace_run("research_aggregate", run_id=run_id, groups=len(group_results or [])):
+        try:
+            schools = sorted(
+                (school for group in group_results or [] for school in group),
+                key=lambda s: int(s.get("_research_id") or 0),
+            )
+            service = _new_service()
+            enriched_schools = service.finalize_ranking(
+                schools,
+                academic_score=payload.get("academic_score") or {},
+                final_limit=payload.get("final_limit"),
+                ranking_priority=payload.get("ranking_priority"),
+            )
+            # Fan-out subtasks don't publish per-school progress (they'd race on
+            # the version counter); the final snapshot still lands here.
+            run_async(
+                ResearchProgress(
+                    len(schools), _progress_writer(supabase, run_id),
+                    start_version=_stored_progress_version(supabase, run_id),
+                ).finished(enriched_schools)
+            )
+            llm_status, succeeded = _persist_enriched_schools(supabase, run_id, enriched_schools)
+            logger.info(
+                "[TIMING] aggregate_deep_school_research run_id=%s status=%s schools=%d",
+                run_id, llm_status, len(enriched_schools),
+            )
+            return {
+                "status": llm_status,
+                "run_id": run_id,
+                "school_count": len(enriched_schools),
+                "schools_enriched": succeeded,
+                "completed_at": datetime.now().isoformat(),
+            }
+        except Exception as exc:
+            logger.exception("Deep school research aggregation failed for run %s: %s", run_id, exc)
+            return _mark_failed(supabase, run_id, exc)
@@ -0,0 +1,201 @@
+"""Worker-lifetime asyncio runtime for the Celery research tasks.
+
+Every task used to call ``asyncio.run``: a new event loop, a new
+``AsyncOpenAI`` client and new HTTP connection pools per invocation, all
+torn down at the end — so every run paid client construction and TLS
+handshakes to OpenAI and the athletics sites again.
+
+``WorkerRuntime`` keeps one event loop per worker process on a daemon
+thread, plus the dependencies that are safe to share across tasks:
+
+* an ``AsyncOpenAI`` client (when OPENAI_API_KEY is set);
+* a pooled ``httpx.AsyncClient`` installed as the fetch layer's client
+  for that loop (``fetch.set_pooled_http_client``);
+* the process-cached Supabase admin client, warmed at start.
+
+Tasks call ``run_async(coro)``; inside a worker that submits the
+coroutine to the runtime loop and blocks for the result, anywhere else
+(eager tests, scripts) it falls back to ``asyncio.run``. Per-run state
+stays per task: each task still builds its own DeepSchoolInsightService,
+just around the shared ``openai_client``.
+
+tasks.py starts the runtime from Celery's ``worker_process_init`` signal
+(prefork children) or lazily on the first task (solo/threads pools) and
+shuts it down on worker exit. ``DEEP_RESEARCH_PERSISTENT_LOOP=0`` restores
+the per-task ``asyncio.run`` behavior.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import contextvars
+import logging
+import os
+import threading
+import time
+from typing import Any, Awaitable, Optional, TypeVar
+
+import httpx
+
+from backend.llm.deep_school_insights.fetch import make_httpx_client, set_pooled_http_client
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Enough for the fan-out's fetch permits (roster + stats each) with room
+# for the adaptive limiter to grow; idle connections are kept for reuse.
+POOL_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=60.0)
+
+
+class WorkerRuntime:
+    """One event loop thread plus shared clients for a worker process."""
+
+    def __init__(self, openai_api_key: Optional[str] = None):
+        self.openai_api_key = openai_api_key
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.openai_client: Any = None
+        self.http_client: Optional[httpx.AsyncClient] = None
+        self.pid = os.getpid()
+        self.tasks_run = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self.loop is not None and self.loop.is_running()
+
+    def start(self) -> "WorkerRuntime":
+        t0 = time.monotonic()
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def _run() -> None:
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        self._thread = threading.Thread(target=_run, name="research-loop", daemon=True)
+        self._thread.start()
+        ready.wait()
+        self.loop = loop
+        asyncio.run_coroutine_threadsafe(self._open(), loop).result()
+        logger.info(
+            "[RUNTIME] started pid=%d openai=%s elapsed=%.3fs",
+            self.pid, self.openai_client is not None, time.monotonic() - t0,
+        )
+        return self
+
+    async def _open(self) -> None:
+        self.http_client = make_httpx_client(POOL_LIMITS)
+        set_pooled_http_client(self.http_client)
+        if self.openai_api_key:
+            from openai import AsyncOpenAI
+
+            self.openai_client = AsyncOpenAI(api_key=self.openai_api_key, max_retries=0)
+        try:
+            from backend.api.clients.supabase import get_supabase_admin_client
+
+            get_supabase_admin_client()
+        except Exception as exc:
+            logger.warning("[RUNTIME] supabase warm-up failed: %s", exc)
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """Run ``coro`` on the runtime loop and wait for its result.
+
+        The coroutine runs in a copy of the caller's context (as it would
+        under ``asyncio.run``), so context variables such as the task's
+        active tracer carry over to the loop thread.
+        """
+        if not self.running:
+            raise RuntimeError("worker runtime is not running")
+        self.tasks_run += 1
+        return asyncio.run_coroutine_threadsafe(
+            _in_context(contextvars.copy_context(), coro), self.loop,
+        ).result(timeout)
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        if not self.running:
+            return
+        loop = self.loop
+        try:
+            asyncio.run_coroutine_threadsafe(self._close(), loop).result(timeout)
+        except Exception as exc:
+            logger.warning("[RUNTIME] clean shutdown failed: %s", exc)
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout)
+        loop.close()
+        self.loop = None
+        logger.info("[RUNTIME] stopped pid=%d tasks_run=%d", self.pid, self.tasks_run)
+
+    async def _close(self) -> None:
+        current = asyncio.current_task()
+        pending = [t for t in asyncio.all_tasks() if t is not current]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        set_pooled_http_client(None)
+        if self.http_client is not None:
+            await self.http_client.aclose()
+        if self.openai_client is not None:
+            await self.openai_client.close()
+
+
+_runtime: Optional[WorkerRuntime] = None
+_runtime_lock = threading.Lock()
+_in_worker = False
+
+
+def persistent_loop_enabled() -> bool:
+    return os.getenv("DEEP_RESEARCH_PERSISTENT_LOOP", "1").strip().lower() not in ("0", "false", "off")
+
+
+def mark_worker_process() -> None:
+    """Called from Celery worker signals: tasks here may use the runtime."""
+    global _in_worker
+    _in_worker = True
+
+
+def get_runtime(start: bool = True) -> Optional[WorkerRuntime]:
+    """This process's runtime; a forked child never reuses its parent's."""
+    global _runtime
+    with _runtime_lock:
+        if _runtime is not None and (_runtime.pid != os.getpid() or not _runtime.running):
+            _runtime = None
+        if _runtime is None and start:
+            _runtime = WorkerRuntime(openai_api_key=os.getenv("OPENAI_API_KEY")).start()
+        return _runtime
+
+
+def shutdown_runtime() -> None:
+    global _runtime
+    with _runtime_lock:
+        runtime, _runtime = _runtime, None
+    if runtime is not None and runtime.pid == os.getpid():
+        runtime.shutdown()
+
+
+def active_runtime() -> Optional[WorkerRuntime]:
+    """The runtime tasks should use, or None for the asyncio.run fallback."""
+    if not (_in_worker and persistent_loop_enabled()):
+        return None
+    try:
+        return get_runtime()
+    except Exception as exc:
+        logger.warning("[RUNTIME] unavailable, using asyncio.run: %s", exc)
+        return None
+
+
+async def _in_context(ctx: contextvars.Context, coro: Awaitable[T]) -> T:
+    return await asyncio.get_running_loop().create_task(coro, context=ctx)
+
+
+def run_async(coro: Awaitable[T]) -> T:
+    runtime = active_runtime()
+    if runtime is None:
+        return asyncio.run(coro)
+    return runtime.run(coro)
+
+
+atexit.register(shutdown_runtime)
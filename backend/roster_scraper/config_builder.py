@@ -17,6 +17,8 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+from backend.database.batch_writer import BatchUpsertWriter
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
@@ -154,23 +156,8 @@ class RosterConfigBuilder:
 
     def _upsert_configs(self, configs: List[Dict]) -> int:
         """Batch upsert configs into roster_scrape_config"""
-        batch_size = 50
-        total = 0
-
-        for i in range(0, len(configs), batch_size):
-            batch = configs[i:i + batch_size]
-            try:
-                response = self.supabase.table('roster_scrape_config').upsert(
-                    batch,
-                    on_conflict='school_name'
-                ).execute()
-                if response.data:
-                    total += len(response.data)
-                    logger.info(f"Upserted batch of {len(batch)} configs")
-            except Exception as e:
-                logger.error(f"Error upserting batch: {e}")
-
-        return total
+        writer = BatchUpsertWriter(self.supabase, 'roster_scrape_config', on_conflict='school_name')
+        return writer.write(configs).rows_written
 
 
 def main():
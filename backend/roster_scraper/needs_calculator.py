@@ -24,6 +24,7 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+from backend.database.batch_writer import BatchUpsertWriter
 from backend.roster_scraper.roster_parser import get_position_credits, ALL_POSITIONS
 
 load_dotenv()
@@ -277,18 +278,8 @@ class PositionNeedsCalculator:
 
     def _upsert_needs(self, records: List[Dict]):
         """Batch upsert position needs records"""
-        batch_size = 50
-        for i in range(0, len(records), batch_size):
-            batch = records[i:i + batch_size]
-            try:
-                response = self.supabase.table('roster_position_needs').upsert(
-                    batch,
-                    on_conflict='school_name,season'
-                ).execute()
-                if response.data:
-                    logger.info(f"Upserted {len(batch)} position needs records")
-            except Exception as e:
-                logger.error(f"Error upserting needs batch: {e}")
+        writer = BatchUpsertWriter(self.supabase, 'roster_position_needs', on_conflict='school_name,season')
+        writer.write(records)
 
 
 def main():
@@ -24,6 +24,7 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+from backend.database.batch_writer import BatchUpsertWriter
 from backend.roster_scraper.sidearm_scraper import SidearmRosterScraper
 from backend.roster_scraper.roster_parser import normalize_player
 from backend.roster_scraper.needs_calculator import PositionNeedsCalculator
@@ -175,16 +176,10 @@ class RosterScrapeRunner:
 
     def _upsert_players(self, players: List[Dict]):
         """Batch upsert player records"""
-        batch_size = 50
-        for i in range(0, len(players), batch_size):
-            batch = players[i:i + batch_size]
-            try:
-                self.supabase.table('roster_players').upsert(
-                    batch,
-                    on_conflict='school_name,season,player_name,position'
-                ).execute()
-            except Exception as e:
-                logger.error(f"Error upserting player batch: {e}")
+        writer = BatchUpsertWriter(
+            self.supabase, 'roster_players', on_conflict='school_name,season,player_name,position'
+        )
+        writer.write(players)
 
     def _update_config_status(self, school_name: str, status: str,
                                player_count: int):
@@ -5,6 +5,8 @@ Database Schema:
 - school_data_general: Main school data (school_name, school_state, tuition, etc.)
 - school_baseball_ranking_name_mapping: Maps school_name → team_name
 - baseball_rankings_data: Has division_group and baseball rankings by team_name
+- school_baseball_enriched: Materialized result of the two joins above plus SCI
+  (refreshed by backend/scripts/refresh_school_enriched_dataset.py)
 """
 
 import os
@@ -18,6 +20,11 @@ from supabase import Client
 
 from .async_connection import AsyncSupabaseConnection
 from ..exceptions import SchoolDataError
+from backend.database.school_enriched_dataset import (
+    YEARLY_RANKINGS_COLUMN,
+    load_enriched_rows,
+    payload_from_row,
+)
 from backend.evaluation.competitiveness import (
     DEFAULT_DIVISION_MAX_RANKS,
     compute_school_sci_from_rankings,
@@ -165,248 +172,292 @@ class AsyncSchoolDataQueries:
         except Exception:
             return None
 
-    async def _load_division_group_cache(self) -> None:
-        """Load baseball enrichment mappings from baseball_rankings_data via name mapping."""
-        if self._cache_loaded:
-            return
+    def build_enrichment_payloads(
+        self,
+        client: Client,
+        include_yearly_rankings: bool = False,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Run the mapping + rankings join and SCI math, keyed by school_name.
+
+        This is the expensive path that ``school_baseball_enriched`` caches.
+        ``include_yearly_rankings`` adds the per-year ranking rows under
+        ``baseball_rankings_by_year`` for the materialized table; the live
+        API path leaves it off so it never lands on school dicts.
+        """
+        payloads: Dict[str, Dict[str, Any]] = {}
 
-        async def _load_cache_query(client: Client) -> Dict[str, Dict[str, Any]]:
-            logger.info("Loading division_group + baseball metrics cache from database...")
-            result_cache: Dict[str, Dict[str, Any]] = {}
+        # Include all mappings that have a team_name.
+        # The verified column has no false values; all rows are NULL or TRUE.
+        mapping_rows: List[Dict[str, Any]] = []
+        try:
+            mapping_response = (
+                client.table("school_baseball_ranking_name_mapping")
+                .select("school_name, team_name, verified")
+                .not_.is_("team_name", "null")
+                .execute()
+            )
+            mapping_rows = mapping_response.data or []
+        except Exception as exc:
+            logger.warning("Non-false mapping query failed, falling back: %s", exc)
 
-            # Include all mappings that have a team_name.
-            # The verified column has no false values; all rows are NULL or TRUE.
-            mapping_rows: List[Dict[str, Any]] = []
+        if not mapping_rows:
+            logger.warning("No non-false mappings found; falling back to any non-null team_name mapping")
             try:
-                mapping_response = (
+                fallback_any_response = (
                     client.table("school_baseball_ranking_name_mapping")
                     .select("school_name, team_name, verified")
                     .not_.is_("team_name", "null")
                     .execute()
                 )
-                mapping_rows = mapping_response.data or []
+                mapping_rows = fallback_any_response.data or []
             except Exception as exc:
-                logger.warning("Non-false mapping query failed, falling back: %s", exc)
-
-            if not mapping_rows:
-                logger.warning("No non-false mappings found; falling back to any non-null team_name mapping")
-                try:
-                    fallback_any_response = (
-                        client.table("school_baseball_ranking_name_mapping")
-                        .select("school_name, team_name, verified")
-                        .not_.is_("team_name", "null")
-                        .execute()
+                logger.warning("Mapping query with verified column failed, retrying without verified: %s", exc)
+                fallback_no_verified_response = (
+                    client.table("school_baseball_ranking_name_mapping")
+                    .select("school_name, team_name")
+                    .not_.is_("team_name", "null")
+                    .execute()
+                )
+                mapping_rows = fallback_no_verified_response.data or []
+
+        if not mapping_rows:
+            logger.warning("No name mappings found in school_baseball_ranking_name_mapping")
+            return payloads
+
+        # Create team_name → [school_name, ...] reverse mapping
+        team_to_school: Dict[str, List[str]] = {}
+        for row in mapping_rows:
+            team_name = (row.get("team_name") or "").strip()
+            school_name = (row.get("school_name") or "").strip()
+            if not team_name or not school_name:
+                continue
+            if team_name not in team_to_school:
+                team_to_school[team_name] = []
+            team_to_school[team_name].append(school_name)
+
+        if not team_to_school:
+            logger.warning("Name mapping query returned rows, but none had usable team_name + school_name")
+            return payloads
+
+        team_names = list(team_to_school.keys())
+        target_years = {"2023", "2024", "2025"}
+        rows_by_team_year: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        max_rank_by_year_div_metric: Dict[Tuple[str, str, str], float] = {}
+
+        for team_chunk in self._chunk_list(team_names):
+            try:
+                rankings_response = (
+                    client.table("baseball_rankings_data")
+                    .select(
+                        "team_name, year, division, division_group, "
+                        "overall_rating, offensive_rating, defensive_rating, "
+                        "power_rating, strength_of_schedule, "
+                        "record, wins, losses"
                     )
-                    mapping_rows = fallback_any_response.data or []
-                except Exception as exc:
-                    logger.warning("Mapping query with verified column failed, retrying without verified: %s", exc)
-                    fallback_no_verified_response = (
-                        client.table("school_baseball_ranking_name_mapping")
-                        .select("school_name, team_name")
-                        .not_.is_("team_name", "null")
-                        .execute()
+                    .in_("team_name", team_chunk)
+                    .order("year", desc=True)
+                    .execute()
+                )
+            except Exception as e:
+                logger.warning(f"Failed ordering rankings by year for chunk; retrying without order: {e}")
+                rankings_response = (
+                    client.table("baseball_rankings_data")
+                    .select(
+                        "team_name, year, division, division_group, "
+                        "overall_rating, offensive_rating, defensive_rating, "
+                        "power_rating, strength_of_schedule, "
+                        "record, wins, losses"
                     )
-                    mapping_rows = fallback_no_verified_response.data or []
-
-            if not mapping_rows:
-                logger.warning("No name mappings found in school_baseball_ranking_name_mapping")
-                return result_cache
+                    .in_("team_name", team_chunk)
+                    .execute()
+                )
 
-            # Create team_name → [school_name, ...] reverse mapping
-            team_to_school: Dict[str, List[str]] = {}
-            for row in mapping_rows:
+            for row in rankings_response.data or []:
                 team_name = (row.get("team_name") or "").strip()
-                school_name = (row.get("school_name") or "").strip()
-                if not team_name or not school_name:
+                year_val = row.get("year")
+                if not team_name or year_val is None:
                     continue
-                if team_name not in team_to_school:
-                    team_to_school[team_name] = []
-                team_to_school[team_name].append(school_name)
 
-            if not team_to_school:
-                logger.warning("Name mapping query returned rows, but none had usable team_name + school_name")
-                return result_cache
+                try:
+                    year_key = str(int(year_val))
+                except (TypeError, ValueError):
+                    continue
 
-            team_names = list(team_to_school.keys())
-            target_years = {"2023", "2024", "2025"}
-            rows_by_team_year: Dict[str, Dict[str, Dict[str, Any]]] = {}
-            max_rank_by_year_div_metric: Dict[Tuple[str, str, str], float] = {}
+                if year_key not in target_years:
+                    continue
 
-            for team_chunk in self._chunk_list(team_names):
-                try:
-                    rankings_response = (
-                        client.table("baseball_rankings_data")
-                        .select(
-                            "team_name, year, division, division_group, "
-                            "overall_rating, offensive_rating, defensive_rating, "
-                            "power_rating, strength_of_schedule, "
-                            "record, wins, losses"
-                        )
-                        .in_("team_name", team_chunk)
-                        .order("year", desc=True)
-                        .execute()
-                    )
-                except Exception as e:
-                    logger.warning(f"Failed ordering rankings by year for chunk; retrying without order: {e}")
-                    rankings_response = (
-                        client.table("baseball_rankings_data")
-                        .select(
-                            "team_name, year, division, division_group, "
-                            "overall_rating, offensive_rating, defensive_rating, "
-                            "power_rating, strength_of_schedule, "
-                            "record, wins, losses"
-                        )
-                        .in_("team_name", team_chunk)
-                        .execute()
-                    )
+                per_team_year = rows_by_team_year.setdefault(team_name, {})
+                existing_year_row = per_team_year.get(year_key)
+                if (
+                    existing_year_row is None
+                    or (not existing_year_row.get("division_group") and row.get("division_group"))
+                ):
+                    per_team_year[year_key] = row
 
-                for row in rankings_response.data or []:
-                    team_name = (row.get("team_name") or "").strip()
-                    year_val = row.get("year")
-                    if not team_name or year_val is None:
-                        continue
+                division_num = self._coerce_division_number(row.get("division"))
+                if division_num not in (1, 2, 3):
+                    continue
 
+                division_key = str(division_num)
+                for metric in (
+                    "overall_rating",
+                    "offensive_rating",
+                    "defensive_rating",
+                    "power_rating",
+                ):
+                    metric_value = row.get(metric)
+                    if metric_value is None:
+                        continue
                     try:
-                        year_key = str(int(year_val))
+                        metric_float = float(metric_value)
                     except (TypeError, ValueError):
                         continue
+                    cache_key = (year_key, division_key, metric)
+                    max_rank_by_year_div_metric[cache_key] = max(
+                        metric_float,
+                        max_rank_by_year_div_metric.get(cache_key, 0.0),
+                    )
 
-                    if year_key not in target_years:
-                        continue
-
-                    per_team_year = rows_by_team_year.setdefault(team_name, {})
-                    existing_year_row = per_team_year.get(year_key)
-                    if (
-                        existing_year_row is None
-                        or (not existing_year_row.get("division_group") and row.get("division_group"))
-                    ):
-                        per_team_year[year_key] = row
+        if not rows_by_team_year:
+            logger.warning("No rankings rows found for mapped team names")
+            return payloads
+
+        latest_by_team: Dict[str, Dict[str, Any]] = {}
+        for team_name, by_year in rows_by_team_year.items():
+            if not by_year:
+                continue
+            latest_row = max(
+                by_year.values(),
+                key=lambda entry: int(entry.get("year") or 0),
+            )
+            latest_by_team[team_name] = latest_row
 
-                    division_num = self._coerce_division_number(row.get("division"))
-                    if division_num not in (1, 2, 3):
-                        continue
+        for team_name, row in latest_by_team.items():
+            schools = team_to_school.get(team_name) or []
+            if not schools:
+                continue
 
-                    division_key = str(division_num)
-                    for metric in (
-                        "overall_rating",
-                        "offensive_rating",
-                        "defensive_rating",
-                        "power_rating",
-                    ):
-                        metric_value = row.get(metric)
-                        if metric_value is None:
-                            continue
-                        try:
-                            metric_float = float(metric_value)
-                        except (TypeError, ValueError):
-                            continue
-                        cache_key = (year_key, division_key, metric)
-                        max_rank_by_year_div_metric[cache_key] = max(
-                            metric_float,
-                            max_rank_by_year_div_metric.get(cache_key, 0.0),
-                        )
-
-            if not rows_by_team_year:
-                logger.warning("No rankings rows found for mapped team names")
-                return result_cache
-
-            latest_by_team: Dict[str, Dict[str, Any]] = {}
-            for team_name, by_year in rows_by_team_year.items():
-                if not by_year:
-                    continue
-                latest_row = max(
-                    by_year.values(),
-                    key=lambda entry: int(entry.get("year") or 0),
-                )
-                latest_by_team[team_name] = latest_row
+            division_group = self._derive_division_group(
+                row.get("division_group"),
+                row.get("division")
+            )
+            year = row.get("year")
+            division = self._coerce_division_number(row.get("division"))
+            overall_rating = row.get("overall_rating")
+            year_key = str(int(year)) if year is not None else None
+            max_rank = None
+            if year_key and division in (1, 2, 3):
+                max_rank = max_rank_by_year_div_metric.get((year_key, str(division), "overall_rating"))
+                if not max_rank or max_rank <= 1:
+                    max_rank = DEFAULT_DIVISION_MAX_RANKS.get(str(division))
+            division_percentile = rank_to_percentile(overall_rating, max_rank) if max_rank else None
+            if division_percentile is not None:
+                division_percentile = round(division_percentile, 1)
+
+            school_sci = compute_school_sci_from_rankings(
+                rows_by_team_year.get(team_name, {}),
+                max_ranks_by_year_div_metric=max_rank_by_year_div_metric,
+            )
+            yearly_overall = school_sci.get("yearly_overall_national") or {}
+            rounded_yearly_overall = {
+                year_key: (round(value, 2) if value is not None else None)
+                for year_key, value in yearly_overall.items()
+            }
 
-            for team_name, row in latest_by_team.items():
-                schools = team_to_school.get(team_name) or []
-                if not schools:
-                    continue
+            enrichment_payload = {
+                "division_group": division_group,
+                "baseball_team_name": team_name,
+                "baseball_rankings_year": year,
+                "baseball_division": division,
+                "baseball_record": row.get("record"),
+                "baseball_wins": row.get("wins"),
+                "baseball_losses": row.get("losses"),
+                "baseball_overall_rating": overall_rating,
+                "baseball_offensive_rating": row.get("offensive_rating"),
+                "baseball_defensive_rating": row.get("defensive_rating"),
+                "baseball_power_rating": row.get("power_rating"),
+                "baseball_strength_of_schedule": row.get("strength_of_schedule"),
+                "baseball_division_percentile": division_percentile,
+                "baseball_sci_hitter": (
+                    round(school_sci["sci_hitter"], 2)
+                    if school_sci.get("sci_hitter") is not None
+                    else None
+                ),
+                "baseball_sci_pitcher": (
+                    round(school_sci["sci_pitcher"], 2)
+                    if school_sci.get("sci_pitcher") is not None
+                    else None
+                ),
+                "baseball_trend_bonus": round(float(school_sci.get("trend_bonus") or 0.0), 2),
+                "baseball_sci_overall_weighted": (
+                    round(school_sci["overall_weighted"], 2)
+                    if school_sci.get("overall_weighted") is not None
+                    else None
+                ),
+                "baseball_sci_offensive_weighted": (
+                    round(school_sci["offensive_weighted"], 2)
+                    if school_sci.get("offensive_weighted") is not None
+                    else None
+                ),
+                "baseball_sci_defensive_weighted": (
+                    round(school_sci["defensive_weighted"], 2)
+                    if school_sci.get("defensive_weighted") is not None
+                    else None
+                ),
+                "baseball_sci_power_weighted": (
+                    round(school_sci["power_weighted"], 2)
+                    if school_sci.get("power_weighted") is not None
+                    else None
+                ),
+                "baseball_sci_yearly_overall": rounded_yearly_overall,
+            }
 
-                division_group = self._derive_division_group(
-                    row.get("division_group"),
-                    row.get("division")
-                )
-                year = row.get("year")
-                division = self._coerce_division_number(row.get("division"))
-                overall_rating = row.get("overall_rating")
-                year_key = str(int(year)) if year is not None else None
-                max_rank = None
-                if year_key and division in (1, 2, 3):
-                    max_rank = max_rank_by_year_div_metric.get((year_key, str(division), "overall_rating"))
-                    if not max_rank or max_rank <= 1:
-                        max_rank = DEFAULT_DIVISION_MAX_RANKS.get(str(division))
-                division_percentile = rank_to_percentile(overall_rating, max_rank) if max_rank else None
-                if division_percentile is not None:
-                    division_percentile = round(division_percentile, 1)
-
-                school_sci = compute_school_sci_from_rankings(
-                    rows_by_team_year.get(team_name, {}),
-                    max_ranks_by_year_div_metric=max_rank_by_year_div_metric,
-                )
-                yearly_overall = school_sci.get("yearly_overall_national") or {}
-                rounded_yearly_overall = {
-                    year_key: (round(value, 2) if value is not None else None)
-                    for year_key, value in yearly_overall.items()
+            if include_yearly_rankings:
+                enrichment_payload[YEARLY_RANKINGS_COLUMN] = {
+                    year_key: {
+                        key: value
+                        for key, value in year_row.items()
+                        if key not in ("team_name", "year")
+                    }
+                    for year_key, year_row in sorted(rows_by_team_year.get(team_name, {}).items())
                 }
 
-                enrichment_payload = {
-                    "division_group": division_group,
-                    "baseball_team_name": team_name,
-                    "baseball_rankings_year": year,
-                    "baseball_division": division,
-                    "baseball_record": row.get("record"),
-                    "baseball_wins": row.get("wins"),
-                    "baseball_losses": row.get("losses"),
-                    "baseball_overall_rating": overall_rating,
-                    "baseball_offensive_rating": row.get("offensive_rating"),
-                    "baseball_defensive_rating": row.get("defensive_rating"),
-                    "baseball_power_rating": row.get("power_rating"),
-                    "baseball_strength_of_schedule": row.get("strength_of_schedule"),
-                    "baseball_division_percentile": division_percentile,
-                    "baseball_sci_hitter": (
-                        round(school_sci["sci_hitter"], 2)
-                        if school_sci.get("sci_hitter") is not None
-                        else None
-                    ),
-                    "baseball_sci_pitcher": (
-                        round(school_sci["sci_pitcher"], 2)
-                        if school_sci.get("sci_pitcher") is not None
-                        else None
-                    ),
-                    "baseball_trend_bonus": round(float(school_sci.get("trend_bonus") or 0.0), 2),
-                    "baseball_sci_overall_weighted": (
-                        round(school_sci["overall_weighted"], 2)
-                        if school_sci.get("overall_weighted") is not None
-                        else None
-                    ),
-                    "baseball_sci_offensive_weighted": (
-                        round(school_sci["offensive_weighted"], 2)
-                        if school_sci.get("offensive_weighted") is not None
-                        else None
-                    ),
-                    "baseball_sci_defensive_weighted": (
-                        round(school_sci["defensive_weighted"], 2)
-                        if school_sci.get("defensive_weighted") is not None
-                        else None
-                    ),
-                    "baseball_sci_power_weighted": (
-                        round(school_sci["power_weighted"], 2)
-                        if school_sci.get("power_weighted") is not None
-                        else None
-                    ),
-                    "baseball_sci_yearly_overall": rounded_yearly_overall,
-                }
+            for school_name in schools:
+                payloads[school_name] = enrichment_payload
 
-                for school_name in schools:
-                    result_cache[school_name] = enrichment_payload
-                    normalized_key = self._normalize_school_name(school_name)
-                    if normalized_key:
-                        result_cache[normalized_key] = enrichment_payload
+        return payloads
+
+    def _index_enrichment_payloads(self, payloads: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Key payloads by both the raw and the normalized school name."""
+        result_cache: Dict[str, Dict[str, Any]] = {}
+        for school_name, enrichment_payload in payloads.items():
+            result_cache[school_name] = enrichment_payload
+            normalized_key = self._normalize_school_name(school_name)
+            if normalized_key:
+                result_cache[normalized_key] = enrichment_payload
+        return result_cache
+
+    async def _load_division_group_cache(self) -> None:
+        """Load baseball enrichment mappings, preferring the materialized table.
+
+        ``school_baseball_enriched`` is one narrow read; when it is missing or
+        empty (fresh environment, refresh never run) the full join is rebuilt.
+        """
+        if self._cache_loaded:
+            return
+
+        async def _load_cache_query(client: Client) -> Dict[str, Dict[str, Any]]:
+            materialized_rows = load_enriched_rows(client)
+            if materialized_rows:
+                payloads = {row["school_name"]: payload_from_row(row) for row in materialized_rows}
+                source = "school_baseball_enriched"
+            else:
+                logger.info("Loading division_group + baseball metrics cache from database...")
+                payloads = self.build_enrichment_payloads(client)
+                source = "live join"
 
-            logger.info(f"Loaded {len(result_cache)} school enrichment mappings into cache")
+            result_cache = self._index_enrichment_payloads(payloads)
+            logger.info(f"Loaded {len(result_cache)} school enrichment mappings into cache ({source})")
             return result_cache
 
         try:
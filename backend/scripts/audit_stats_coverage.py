@@ -45,6 +45,7 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from backend.llm.deep_school_insights import (  # noqa: E402
+    PARSER_STRATEGIES,
     fetch_and_parse_roster,
     fetch_and_parse_stats,
     match_players_to_stats,
@@ -311,6 +312,7 @@ async def main() -> None:
 
     print(f"\nElapsed: {time.monotonic() - t0:.1f}s")
     _summarize(results)
+    print(f"\nParser memory: {PARSER_STRATEGIES.summary()}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,217 @@
+"""Memory and encode/decode time of parsed evidence, compact vs. the old layout.
+
+Builds synthetic schools of matched players the way the parsers do (every
+string a fresh object, as lxml / BeautifulSoup hand them out) and
+compares two layouts:
+
+* ``legacy``  — plain ``__dict__`` dataclasses with the same fields, no
+  interning, ``asdict`` encoding and a per-record field-set decode (the
+  types and school_evidence_cache.py helpers before they were compacted);
+* ``compact`` — the current slotted, interning types and the
+  default-omitting ``serialize_matched_players`` /
+  ``deserialize_matched_players``.
+
+Reports retained bytes per school (tracemalloc, averaged over
+``--schools`` schools held at once, as a research run holds them), the
+stored JSON size, and the median encode / decode time per school.
+
+Usage:
+    python -m backend.scripts.bench_evidence_memory
+    python -m backend.scripts.bench_evidence_memory --schools 50 --players 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import gc
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+_project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+from backend.database.school_evidence_cache import (
+    deserialize_matched_players,
+    serialize_matched_players,
+)
+from backend.llm.deep_school_insights.types import (
+    MatchedPlayer,
+    ParsedPlayer,
+    ParsedStatLine,
+)
+
+logger = logging.getLogger("bench_evidence_memory")
+
+_POSITIONS = [("RHP", "P", "pitcher"), ("LHP", "P", "pitcher"), ("C", "C", "catcher"),
+              ("INF", "IF", "infield"), ("SS", "SS", "infield"), ("OF", "OF", "outfield"),
+              ("UTL", "UT", "infield")]
+_YEARS = [("Fr.", 1, False), ("R-Fr.", 1, True), ("So.", 2, False), ("Jr.", 3, False),
+          ("R-Jr.", 3, True), ("Sr.", 4, False), ("Gr.", 5, False)]
+
+
+def _legacy_type(cls: type) -> type:
+    """Same fields and defaults as ``cls``, as a plain (unslotted) dataclass."""
+    return dataclasses.make_dataclass(
+        "Legacy" + cls.__name__,
+        [(f.name, f.type, f) for f in dataclasses.fields(cls)],
+    )
+
+
+LegacyPlayer = _legacy_type(ParsedPlayer)
+LegacyStatLine = _legacy_type(ParsedStatLine)
+LegacyMatched = dataclasses.make_dataclass(
+    "LegacyMatched", [("player", Any), ("batting_stats", Any, None), ("pitching_stats", Any, None)],
+)
+
+
+def _fresh(value: Any) -> Any:
+    # A new str object per record, as a parser produces.
+    return "".join(list(value)) if isinstance(value, str) else value
+
+
+def _school_rows(rng: random.Random, players: int) -> List[Dict[str, Any]]:
+    rows = []
+    for i in range(players):
+        pos_raw, pos_norm, family = rng.choice(_POSITIONS)
+        year_raw, year, redshirt = rng.choice(_YEARS)
+        row = {
+            "player": {
+                "name": f"Player {rng.randrange(10**6)}", "jersey_number": str(rng.randrange(1, 60)),
+                "position_raw": pos_raw, "position_normalized": pos_norm, "position_family": family,
+                "class_year_raw": year_raw, "normalized_class_year": year, "is_redshirt": redshirt,
+                "high_school": f"High School {rng.randrange(500)}" if rng.random() < 0.7 else None,
+                "previous_school": f"College {rng.randrange(200)}" if rng.random() < 0.2 else None,
+                "hometown": f"Town {rng.randrange(1000)}, ST",
+            },
+        }
+        for stat_type, share in (("batting", 0.7), ("pitching", 0.35 if family == "pitcher" else 0.02)):
+            if rng.random() < share:
+                row[f"{stat_type}_stats"] = {
+                    "jersey_number": row["player"]["jersey_number"], "player_name": row["player"]["name"],
+                    "stat_type": stat_type, "games_played": rng.randrange(60), "games_started": rng.randrange(40),
+                }
+        rows.append(row)
+    return rows
+
+
+def _build(rows: List[Dict[str, Any]], matched_cls: type, player_cls: type, stat_cls: type) -> List[Any]:
+    def _stat(d):
+        return stat_cls(**{k: _fresh(v) for k, v in d.items()}) if d else None
+
+    return [
+        matched_cls(
+            player=player_cls(**{k: _fresh(v) for k, v in row["player"].items()}),
+            batting_stats=_stat(row.get("batting_stats")),
+            pitching_stats=_stat(row.get("pitching_stats")),
+        )
+        for row in rows
+    ]
+
+
+def _legacy_decode(blob: List[Dict[str, Any]]) -> List[Any]:
+    def _to(data, cls):
+        names = {f for f in cls.__dataclass_fields__}
+        return cls(**{k: v for k, v in data.items() if k in names})
+
+    return [
+        LegacyMatched(
+            player=_to(e.get("player") or {}, LegacyPlayer),
+            batting_stats=_to(e["batting_stats"], LegacyStatLine) if e.get("batting_stats") else None,
+            pitching_stats=_to(e["pitching_stats"], LegacyStatLine) if e.get("pitching_stats") else None,
+        )
+        for e in blob
+    ]
+
+
+LAYOUTS: Dict[str, Dict[str, Any]] = {
+    "legacy": {
+        "build": lambda rows: _build(rows, LegacyMatched, LegacyPlayer, LegacyStatLine),
+        "encode": lambda matched: json.dumps([dataclasses.asdict(m) for m in matched]),
+        "decode": lambda text: _legacy_decode(json.loads(text)),
+    },
+    "compact": {
+        "build": lambda rows: _build(rows, MatchedPlayer, ParsedPlayer, ParsedStatLine),
+        "encode": lambda matched: json.dumps(serialize_matched_players(matched)),
+        "decode": lambda text: deserialize_matched_players(json.loads(text)),
+    },
+}
+
+
+def retained_bytes(build: Callable[[List[Dict[str, Any]]], List[Any]], schools: List[List[Dict[str, Any]]]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        held = [build(rows) for rows in schools]
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del held
+    return after - before
+
+
+def median_ms(fn: Callable[[Any], Any], args: List[Any], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for a in args:
+            fn(a)
+        times.append((time.perf_counter() - t0) / len(args))
+    return statistics.median(times) * 1000
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    p = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    p.add_argument("--schools", type=int, default=30, help="schools held at once (default 30)")
+    p.add_argument("--players", type=int, default=45, help="roster size per school (default 45)")
+    p.add_argument("--repeat", type=int, default=20)
+    p.add_argument("--seed", type=int, default=7)
+    args = p.parse_args()
+
+    rng = random.Random(args.seed)
+    schools = [_school_rows(rng, args.players) for _ in range(args.schools)]
+    logger.info(f"{args.schools} schools x {args.players} players")
+
+    results: Dict[str, Dict[str, float]] = {}
+    decoded: Dict[str, List[Any]] = {}
+    for name, layout in LAYOUTS.items():
+        built = [layout["build"](rows) for rows in schools]
+        encoded = [layout["encode"](m) for m in built]
+        decoded[name] = [layout["decode"](text) for text in encoded]
+        results[name] = {
+            "bytes": retained_bytes(layout["build"], schools) / args.schools,
+            "json": statistics.mean(len(text) for text in encoded),
+            "encode_ms": median_ms(layout["encode"], built, args.repeat),
+            "decode_ms": median_ms(layout["decode"], encoded, args.repeat),
+        }
+        logger.info(
+            f"  {name:8s} {results[name]['bytes'] / 1024:8.1f} KB/school  json {results[name]['json'] / 1024:6.1f} KB  "
+            f"encode {results[name]['encode_ms']:6.3f} ms  decode {results[name]['decode_ms']:6.3f} ms"
+        )
+
+    same = all(
+        [dataclasses.asdict(m) for m in old] == [dataclasses.asdict(m) for m in new]
+        for old, new in zip(decoded["legacy"], decoded["compact"])
+    )
+    legacy, compact = results["legacy"], results["compact"]
+    logger.info(
+        f"compact: {legacy['bytes'] / max(compact['bytes'], 1):.2f}x less memory, "
+        f"{legacy['json'] / max(compact['json'], 1):.2f}x smaller JSON, "
+        f"encode {legacy['encode_ms'] / max(compact['encode_ms'], 1e-9):.2f}x, "
+        f"decode {legacy['decode_ms'] / max(compact['decode_ms'], 1e-9):.2f}x faster; identical={same}"
+    )
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""Memory and throughput benchmark for the roster/stats HTML engines.
+
+Runs ``parse_roster_html`` and ``parse_stats_html`` over saved pages with
+both engines (``soup``: full BeautifulSoup tree, ``stream``: lxml streaming
+extraction) and reports, per page and engine:
+
+- parse time per page and MB/s of HTML
+- peak Python heap during the parse (tracemalloc)
+- peak RSS growth, measured in a fresh child process so one engine's
+  allocations don't hide the other's (includes lxml's C-side memory)
+- whether both engines returned identical records
+
+Pages: ``stats_osu_example.html`` (Nuxt stats page) by default, any extra
+paths given on the command line, and a generated legacy Sidearm stats page
+with batting/pitching tables plus navigation chrome (``--no-synthetic`` to
+skip).
+
+Usage:
+    python -m backend.scripts.bench_html_extraction
+    python -m backend.scripts.bench_html_extraction saved_roster.html --repeat 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List, Tuple
+
+_project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+from backend.llm.deep_school_insights.html_stream import (
+    lxml_available,
+    parse_roster_html,
+    parse_stats_html,
+)
+
+logger = logging.getLogger("bench_html_extraction")
+
+DEFAULT_FIXTURE = os.path.join(
+    _project_root, "backend", "llm", "deep_school_insights", "stats_osu_example.html"
+)
+ENGINES = ("soup", "stream")
+
+
+def synthetic_legacy_stats_page(n_players: int = 40, chrome_kb: int = 1500) -> str:
+    """Legacy Sidearm-style stats page: two stat tables buried in page chrome."""
+    nav = "".join(f'<li><a href="/sports/s{i}">Sport {i}</a></li>' for i in range(400))
+    filler = "<p>" + ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 20) + "</p>"
+    chrome = filler * max(1, (chrome_kb * 1024) // len(filler))
+
+    def table(kind: str) -> str:
+        if kind == "batting":
+            head = "<tr><th>#</th><th>Player</th><th>AVG</th><th>GP-GS</th><th>AB</th></tr>"
+            row = "<tr><td>{n}</td><td><a href='/p/{n}'>Player{n}, Test</a></td><td>.300</td><td>{gp}-{gs}</td><td>120</td></tr>"
+        else:
+            head = "<tr><th>#</th><th>Player</th><th>ERA</th><th>APP-GS</th><th>IP</th></tr>"
+            row = "<tr><td>{n}</td><td><a href='/p/{n}'>Pitcher{n}, Test</a></td><td>3.10</td><td>{gp}-{gs}</td><td>40.1</td></tr>"
+        body = "".join(row.format(n=i, gp=20 + i % 30, gs=i % 20) for i in range(n_players))
+        totals = "<tr><td></td><td>Totals</td><td>.280</td><td>56-56</td><td>2000</td></tr>"
+        return f"<table class='sidearm-table'><thead>{head}</thead><tbody>{body}{totals}</tbody></table>"
+
+    return (
+        "<!DOCTYPE html><html><head><title>Stats</title>"
+        f"<script>{'var x = 1;' * 20000}</script><style>{'.a{color:red}' * 5000}</style></head><body>"
+        f"<header><nav><ul>{nav}</ul></nav></header><!-- page chrome -->{chrome}"
+        f"<section id='batting'>{table('batting')}</section>"
+        f"<section id='pitching'>{table('pitching')}</section>"
+        f"{chrome}<footer><table><tr><th>AVG</th><th>AB</th></tr><tr><td>1</td><td>2</td><td>3</td></tr>"
+        "<tr><td>1</td><td>2</td><td>3</td></tr></table></footer></body></html>"
+    )
+
+
+def _parse(engine: str, html: str) -> Tuple[Any, Any]:
+    return parse_roster_html(html, engine=engine), parse_stats_html(html, engine=engine)
+
+
+def _measure_in_child(args: Tuple[str, str, int]) -> Dict[str, Any]:
+    """Run in a fresh process: RSS growth, heap peak and time for one engine."""
+    engine, path, repeat = args
+    with open(path, encoding="utf-8") as f:
+        html = f.read()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        result = _parse(engine, html)
+    elapsed = (time.perf_counter() - t0) / repeat
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    tracemalloc.start()
+    _parse(engine, html)
+    _current, heap_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    (players, roster_source), (records, stats_source) = result
+    return {
+        "engine": engine,
+        "bytes": len(html.encode("utf-8")),
+        "seconds": elapsed,
+        "heap_peak_mb": heap_peak / 1e6,
+        # ru_maxrss is KiB on Linux
+        "rss_growth_mb": (rss_after - rss_before) / 1024,
+        "players": players,
+        "records": records,
+        "sources": (roster_source, stats_source),
+    }
+
+
+def run(paths: List[str], repeat: int) -> List[Dict[str, Any]]:
+    ctx = multiprocessing.get_context("spawn")
+    rows = []
+    for path in paths:
+        measured = {}
+        for engine in ENGINES:
+            with ctx.Pool(1) as pool:
+                measured[engine] = pool.apply(_measure_in_child, ((engine, path, repeat),))
+        soup, stream = measured["soup"], measured["stream"]
+        rows.append({
+            "page": os.path.basename(path),
+            "soup": soup,
+            "stream": stream,
+            "identical": (soup["players"], soup["records"]) == (stream["players"], stream["records"]),
+        })
+    return rows
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    p = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    p.add_argument("pages", nargs="*", help="Saved roster/stats HTML pages (default: OSU stats fixture).")
+    p.add_argument("--repeat", type=int, default=5, help="Parses per engine for the timing average.")
+    p.add_argument("--no-synthetic", action="store_true", help="Skip the generated legacy stats page.")
+    args = p.parse_args()
+
+    if not lxml_available():
+        logger.error("lxml is not installed; the streaming engine is unavailable.")
+        return 2
+
+    paths = list(args.pages) or [DEFAULT_FIXTURE]
+    tmp_path = None
+    if not args.no_synthetic:
+        fd, tmp_path = tempfile.mkstemp(prefix="legacy_stats_", suffix=".html")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(synthetic_legacy_stats_page())
+        paths.append(tmp_path)
+
+    try:
+        rows = run(paths, max(1, args.repeat))
+    finally:
+        if tmp_path:
+            os.remove(tmp_path)
+
+    all_identical = True
+    for row in rows:
+        logger.info(f"\n{row['page']} ({row['soup']['bytes'] / 1e6:.2f} MB)")
+        for engine in ENGINES:
+            m = row[engine]
+            logger.info(
+                f"  {engine:6s} {m['seconds'] * 1000:8.1f} ms/page "
+                f"{m['bytes'] / 1e6 / m['seconds']:6.1f} MB/s  "
+                f"heap peak {m['heap_peak_mb']:7.1f} MB  RSS +{m['rss_growth_mb']:6.1f} MB  "
+                f"players={len(m['players'])} stats={len(m['records'])} sources={m['sources']}"
+            )
+        logger.info(f"  identical output: {row['identical']}")
+        all_identical = all_identical and row["identical"]
+    return 0 if all_identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""Benchmark fuzzy school-name matching with and without the candidate index.
+
+Builds a synthetic catalog at full size (default 2,000 school names against
+1,000 team names, roughly what school_data_general and
+baseball_rankings_data hold), then runs SchoolNameMatcher's exact + fuzzy
+step for every school twice: scoring every team name (the old behaviour)
+and scoring only the NameCandidateIndex.ratio_candidate_ids names (every
+team that can reach the threshold). Reports wall time for both, the
+average number of names scored per lookup and how often the two return the
+same match (always, by construction).
+
+Usage:
+    python -m backend.scripts.bench_name_matching
+    python -m backend.scripts.bench_name_matching --schools 4000 --teams 1500
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from typing import List, Optional, Tuple
+
+_project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+from rapidfuzz import fuzz, process
+
+from backend.database.name_matching.candidate_index import NameCandidateIndex
+
+logger = logging.getLogger("bench_name_matching")
+
+_PLACES = [
+    "Arizona", "Alabama", "Boston", "California", "Carolina", "Dakota", "Dayton", "Delaware",
+    "Florida", "Georgia", "Houston", "Idaho", "Illinois", "Indiana", "Iowa", "Kansas", "Kent",
+    "Kentucky", "Louisiana", "Maine", "Maryland", "Memphis", "Miami", "Michigan", "Minnesota",
+    "Missouri", "Montana", "Nebraska", "Nevada", "Ohio", "Oklahoma", "Oregon", "Pacific",
+    "Richmond", "Rutgers", "San Diego", "San Jose", "Stanford", "Tennessee", "Texas", "Toledo",
+    "Tulane", "Utah", "Vermont", "Virginia", "Washington", "Wichita", "Wisconsin", "Wyoming",
+]
+_QUALIFIERS = [
+    "", "Northern", "Southern", "Eastern", "Western", "Central", "North", "South", "East",
+    "West", "Upper", "Lower", "Coastal", "Valley", "Lake", "Mount", "Saint", "Fort",
+]
+_SUFFIXES = ["", "St", "Tech", "A&M", "Christian", "Baptist", "Poly", "Wesleyan", "Lutheran"]
+
+
+def build_catalog(n_schools: int, n_teams: int, seed: int = 13) -> Tuple[List[str], List[str]]:
+    """Synthetic (normalized school names, team names) with realistic overlap and typos"""
+    rng = random.Random(seed)
+    teams: List[str] = []
+    seen = set()
+    while len(teams) < n_teams:
+        name = " ".join(
+            part for part in (rng.choice(_QUALIFIERS), rng.choice(_PLACES), rng.choice(_SUFFIXES), str(rng.randint(1, 40)))
+            if part
+        )
+        if name not in seen:
+            seen.add(name)
+            teams.append(name)
+
+    schools: List[str] = []
+    for i in range(n_schools):
+        roll = rng.random()
+        if roll < 0.4:
+            schools.append(rng.choice(teams))
+        elif roll < 0.7:
+            name = list(rng.choice(teams))
+            del name[rng.randrange(len(name))]
+            schools.append("".join(name))
+        else:
+            schools.append(f"{rng.choice(_QUALIFIERS)} {rng.choice(_PLACES)} College {i}".strip())
+    return schools, teams
+
+
+def _brute_force(name: str, teams: List[str], threshold: float) -> Optional[str]:
+    lower = name.lower()
+    for team in teams:
+        if team.lower() == lower:
+            return team
+    result = process.extractOne(name, teams, scorer=fuzz.ratio)
+    return result[0] if result and result[1] >= threshold else None
+
+
+def _indexed(name: str, index: NameCandidateIndex, threshold: float) -> Optional[str]:
+    exact = index.exact(name)
+    if exact is not None:
+        return exact
+    ids = index.ratio_candidate_ids(name, threshold)
+    choices = index.names if ids is None else [index.names[i] for i in ids]
+    if not choices:
+        return None
+    result = process.extractOne(name, choices, scorer=fuzz.ratio, score_cutoff=threshold)
+    return result[0] if result else None
+
+
+def run(n_schools: int, n_teams: int, threshold: float = 90.0) -> dict:
+    schools, teams = build_catalog(n_schools, n_teams)
+
+    t0 = time.perf_counter()
+    brute = [_brute_force(name, teams, threshold) for name in schools]
+    brute_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    index = NameCandidateIndex(teams)
+    build_s = time.perf_counter() - t0
+    indexed = [_indexed(name, index, threshold) for name in schools]
+    indexed_s = time.perf_counter() - t0
+
+    scored = sum(
+        len(index.names) if ids is None else len(ids)
+        for ids in (index.ratio_candidate_ids(name, threshold) for name in schools if index.exact(name) is None)
+    )
+    fuzzy_lookups = sum(1 for name in schools if index.exact(name) is None)
+
+    agree = sum(1 for a, b in zip(brute, indexed) if a == b)
+    return {
+        "schools": n_schools,
+        "teams": n_teams,
+        "brute_s": brute_s,
+        "index_build_s": build_s,
+        "indexed_s": indexed_s,
+        "speedup": brute_s / indexed_s if indexed_s else float("inf"),
+        "agreement": agree / n_schools if n_schools else 1.0,
+        "scored_per_lookup": scored / fuzzy_lookups if fuzzy_lookups else 0.0,
+        "matched": sum(1 for m in brute if m),
+    }
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    p = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    p.add_argument("--schools", type=int, default=2000)
+    p.add_argument("--teams", type=int, default=1000)
+    p.add_argument("--threshold", type=float, default=90.0)
+    args = p.parse_args()
+
+    r = run(args.schools, args.teams, args.threshold)
+    logger.info(f"Catalog: {r['schools']} schools × {r['teams']} teams ({r['matched']} matched)")
+    logger.info(f"Brute force:  {r['brute_s'] * 1000:8.1f} ms")
+    logger.info(
+        f"Indexed:      {r['indexed_s'] * 1000:8.1f} ms "
+        f"(index build {r['index_build_s'] * 1000:.1f} ms) → {r['speedup']:.1f}x"
+    )
+    logger.info(f"Scored:       {r['scored_per_lookup']:.1f} of {r['teams']} team names per fuzzy lookup")
+    logger.info(f"Agreement:    {r['agreement'] * 100:.2f}%")
+    return 0 if r["agreement"] == 1.0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""CPU and allocations: full ``json.loads`` vs. the indexed Nuxt payload decoder.
+
+For each page, extracts the ``__NUXT_DATA__`` island and runs the stat
+and roster record extraction two ways:
+
+* ``full``    — ``json.loads`` of the whole array, then a scan of every
+  element (what the parsers did before nuxt_payload.py);
+* ``indexed`` — ``NuxtPayload.parse`` plus the lazy record lookup.
+
+Reports the median wall time over ``--iterations`` runs and the
+tracemalloc peak of one run, and checks both paths return identical
+records. Defaults to the Oregon State stats fixture.
+
+Usage:
+    python -m backend.scripts.bench_nuxt_payload
+    python -m backend.scripts.bench_nuxt_payload saved/clemson_stats.html saved/odu_roster.html
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+_project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+from backend.llm.deep_school_insights.nuxt_payload import NuxtPayload
+from backend.llm.deep_school_insights.parsers import (
+    nuxt_island_text,
+    nuxt_roster_players_from_data,
+    nuxt_roster_players_from_payload,
+    nuxt_stats_records_from_data,
+    nuxt_stats_records_from_payload,
+)
+
+logger = logging.getLogger("bench_nuxt_payload")
+
+DEFAULT_PAGE = os.path.join(
+    _project_root, "backend", "llm", "deep_school_insights", "stats_osu_example.html",
+)
+
+
+def _full(payload: str) -> Dict[str, List[Any]]:
+    data = json.loads(payload)
+    return {
+        "stats": nuxt_stats_records_from_data(data),
+        "roster": nuxt_roster_players_from_data(data),
+    }
+
+
+def _indexed(payload: str) -> Dict[str, List[Any]]:
+    nuxt = NuxtPayload.parse(payload)
+    return {
+        "stats": nuxt_stats_records_from_payload(nuxt),
+        "roster": nuxt_roster_players_from_payload(nuxt),
+    }
+
+
+def measure(fn: Callable[[str], Any], payload: str, iterations: int) -> Dict[str, float]:
+    times = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn(payload)
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        fn(payload)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"ms": statistics.median(times) * 1000, "peak_kb": peak / 1024}
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    p = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    p.add_argument("pages", nargs="*", default=[DEFAULT_PAGE], help="saved HTML pages")
+    p.add_argument("--iterations", type=int, default=20)
+    args = p.parse_args()
+
+    status = 0
+    for path in args.pages:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            payload = nuxt_island_text(f.read())
+        if payload is None:
+            logger.info(f"{os.path.basename(path)}: no __NUXT_DATA__ island")
+            continue
+        nuxt = NuxtPayload.parse(payload)
+        if nuxt is None:
+            logger.info(f"{os.path.basename(path)}: island is not a JSON array")
+            continue
+        same = _full(payload) == _indexed(payload)
+        full = measure(_full, payload, args.iterations)
+        indexed = measure(_indexed, payload, args.iterations)
+        logger.info(
+            f"{os.path.basename(path)}: {len(payload) / 1024:,.0f} KB island, {len(nuxt):,d} elements, "
+            f"indexed={nuxt.indexed} identical={same}"
+        )
+        for name, r in (("full", full), ("indexed", indexed)):
+            logger.info(f"  {name:8s} {r['ms']:7.1f} ms  peak {r['peak_kb']:8,.0f} KB")
+        logger.info(
+            f"  indexed: {full['ms'] / max(indexed['ms'], 1e-6):.2f}x faster, "
+            f"{full['peak_kb'] / max(indexed['peak_kb'], 1e-6):.1f}x less peak memory"
+        )
+        if not same:
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""Micro-benchmark: roster-to-stats matching, indexed vs. the old nested scan.
+
+``match_players_to_stats`` used to re-normalize every stat line's name for
+every roster player (O(P×S) with regex work in the inner loop). It now
+normalizes each name once and resolves players through hash indexes. This
+script times both on synthetic combined stats pages and checks that they
+return identical ``MatchedPlayer`` lists.
+
+Usage:
+    python -m backend.scripts.bench_player_matching
+    python -m backend.scripts.bench_player_matching --players 120 --stat-lines 400 --repeat 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from typing import List, Optional, Tuple
+
+_project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+from backend.llm.deep_school_insights.parsers import (
+    _normalize_name_parts,
+    match_players_to_stats,
+)
+from backend.llm.deep_school_insights.types import (
+    MatchedPlayer,
+    ParsedPlayer,
+    ParsedStatLine,
+)
+
+logger = logging.getLogger("bench_player_matching")
+
+_FIRST = ["Aaron", "Alex", "Ben", "Brady", "Carter", "Cole", "Drew", "Eli", "Jack", "Jake", "Luke", "Max", "Nate", "Owen", "Ryan", "Tyler"]
+_LAST = ["Smith", "Johnson", "Graves", "Miller", "Davis", "Garcia", "Wilson", "Moore", "Taylor", "Clark", "Lewis", "Walker", "Young", "King"]
+_SUFFIXES = ["", "", "", "", " Jr.", " II", " III"]
+
+
+def legacy_match_players_to_stats(
+    players: List[ParsedPlayer],
+    stats: List[ParsedStatLine],
+) -> List[MatchedPlayer]:
+    """The pre-index implementation, kept here as the reference."""
+    import dataclasses
+
+    batting = [s for s in stats if s.stat_type == "batting"]
+    pitching = [s for s in stats if s.stat_type == "pitching"]
+
+    def _find_match(player: ParsedPlayer, stat_lines: List[ParsedStatLine]) -> Optional[ParsedStatLine]:
+        p_first, p_last = _normalize_name_parts(player.name)
+        for stat in stat_lines:
+            s_first, s_last = _normalize_name_parts(stat.player_name)
+            if player.jersey_number and stat.jersey_number:
+                if player.jersey_number == stat.jersey_number and p_last == s_last:
+                    return stat
+            if p_last == s_last and p_first and s_first and p_first[0] == s_first[0]:
+                return stat
+        return None
+
+    matched: List[MatchedPlayer] = []
+    for player in players:
+        bat = _find_match(player, batting)
+        pitch = _find_match(player, pitching)
+        if pitch is not None and bat is None and player.position_family is None:
+            player = dataclasses.replace(
+                player,
+                position_family="P",
+                position_normalized=player.position_normalized or "P",
+            )
+        matched.append(MatchedPlayer(player=player, batting_stats=bat, pitching_stats=pitch))
+    return matched
+
+
+def synthetic_team(
+    n_players: int, n_stat_lines: int, seed: int = 7,
+) -> Tuple[List[ParsedPlayer], List[ParsedStatLine]]:
+    """Roster in "First Last" form; stats in "Last, First" form with noise.
+
+    Includes generational suffixes, shared last names, missing jerseys and
+    stat lines for players not on the roster (transfers, typos).
+    """
+    rng = random.Random(seed)
+    players: List[ParsedPlayer] = []
+    for i in range(n_players):
+        first, last = rng.choice(_FIRST), f"{rng.choice(_LAST)}{'' if rng.random() < 0.7 else i}"
+        suffix = rng.choice(_SUFFIXES)
+        jersey = str(rng.randint(0, 99)) if rng.random() < 0.9 else None
+        players.append(ParsedPlayer(name=f"{first} {last}{suffix}", jersey_number=jersey))
+
+    stats: List[ParsedStatLine] = []
+    for i in range(n_stat_lines):
+        if players and rng.random() < 0.75:
+            p = rng.choice(players)
+            first, last = _normalize_name_parts(p.name)
+            name = f"{last.title()}, {first.title()}"
+            jersey = p.jersey_number if rng.random() < 0.8 else str(rng.randint(0, 99))
+        else:
+            name = f"{rng.choice(_LAST)}, {rng.choice(_FIRST)}"
+            jersey = str(rng.randint(0, 99)) if rng.random() < 0.9 else None
+        stats.append(ParsedStatLine(
+            jersey_number=jersey,
+            player_name=name,
+            stat_type="batting" if rng.random() < 0.6 else "pitching",
+            games_played=rng.randint(0, 60),
+        ))
+    return players, stats
+
+
+def _time(fn, players, stats, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn(players, stats)
+    return (time.perf_counter() - t0) / repeat
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    p = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    p.add_argument("--players", type=int, nargs="*", default=[40, 120, 400])
+    p.add_argument("--stat-lines", type=int, nargs="*", default=[60, 400, 1500])
+    p.add_argument("--repeat", type=int, default=20)
+    args = p.parse_args()
+
+    all_identical = True
+    for n_players, n_stats in zip(args.players, args.stat_lines):
+        players, stats = synthetic_team(n_players, n_stats)
+        identical = legacy_match_players_to_stats(players, stats) == match_players_to_stats(players, stats)
+        legacy = _time(legacy_match_players_to_stats, players, stats, args.repeat)
+        indexed = _time(match_players_to_stats, players, stats, args.repeat)
+        logger.info(
+            f"players={n_players:4d} stat_lines={n_stats:5d}  legacy {legacy * 1000:8.2f} ms  "
+            f"indexed {indexed * 1000:7.2f} ms  speedup {legacy / indexed:6.1f}x  identical={identical}"
+        )
+        all_identical = all_identical and identical
+    return 0 if all_identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""Celery message size and enqueue latency: legacy vs. slim research payload.
+
+Builds a consideration pool shaped like ``match_and_rank_schools`` output
+(or loads one: a JSON file holding a list of school dicts, a
+``{"schools": [...]}`` object, or a recorded planner run) and, for both
+message formats (backend/llm/research_payload.py), measures:
+
+* the serialized message body (Celery's JSON serializer);
+* enqueue latency — serialize + publish through a kombu producer to
+  ``--broker`` (in-process ``memory://`` by default; pass a redis URL to
+  include the network round trip);
+* worker-side decode time.
+
+The slim path also pays one ``research_input`` write at enqueue and one
+read in the worker; those are Supabase round trips and are reported in
+the ``[TIMING]`` logs in production rather than simulated here.
+
+Usage:
+    python -m backend.scripts.bench_research_payload
+    python -m backend.scripts.bench_research_payload --schools 50 --broker redis://localhost:6379/15
+    python -m backend.scripts.bench_research_payload --pool run.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+
+_project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+from kombu import Connection, Exchange, Queue
+from kombu.serialization import dumps, loads
+
+from backend.llm.research_payload import build_legacy_payload, build_slim_payload
+
+logger = logging.getLogger("bench_research_payload")
+
+_PLAYER_STATS = {
+    "primary_position": "SS", "height": 72, "weight": 180, "exit_velo_max": 94.0,
+    "sixty_time": 6.9, "inf_velo": 85.0, "player_region": "South", "graduation_year": 2027,
+}
+_ASSESSMENT = {"predicted_tier": "Non-P4 D1", "within_tier_percentile": 61.0, "d1_probability": 0.62}
+_ACADEMIC = {"effective": 6.1, "gpa": 3.7}
+_FIT_LABELS = ("Fit", "Safety", "Reach", "Strong Safety", "Strong Reach")
+
+
+def synthetic_pool(n: int, rng: random.Random) -> List[Dict[str, Any]]:
+    """School dicts with the fields and value shapes school_matching emits."""
+    schools = []
+    for i in range(n):
+        state = rng.choice(["VA", "NC", "TX", "FL", "OH", "CA", "PA"])
+        delta = round(rng.uniform(-12, 12), 2)
+        schools.append({
+            "school_name": f"University of Somewhere {i}",
+            "display_school_name": f"Somewhere {i}",
+            "school_logo_image": f"https://cdn.example.com/logos/school-{i}.png",
+            "conference": "Colonial Athletic Association",
+            "division_group": "Non-P4 D1",
+            "baseball_division": 1,
+            "division_label": "Division 1",
+            "location": {"state": state, "region": "South", "latitude": 37.43, "longitude": -78.66},
+            "baseball_fit": rng.choice(_FIT_LABELS),
+            "fit_label": rng.choice(_FIT_LABELS),
+            "academic_fit": rng.choice(_FIT_LABELS),
+            "academic_selectivity_score": round(rng.uniform(2, 9), 2),
+            "estimated_annual_cost": rng.randint(12000, 60000),
+            "metric_comparisons": [
+                {"metric": "Exit Velocity", "player_value": 94.0, "division_avg": 92.4, "unit": "mph"},
+                {"metric": "60-Yard Dash", "player_value": 6.9, "division_avg": 6.95, "unit": "sec"},
+                {"metric": "Infield Velocity", "player_value": 85.0, "division_avg": 84.1, "unit": "mph"},
+            ],
+            "delta": delta,
+            "sci": round(rng.uniform(30, 90), 2),
+            "trend": f"{rng.uniform(-1, 1):+.2f}",
+            "trend_bonus": round(rng.uniform(-1, 1), 2),
+            "academic_delta": round(rng.uniform(-4, 4), 2),
+            "school_city": "Harrisonburg",
+            "undergrad_enrollment": rng.randint(1500, 40000),
+            "overall_grade": "A-",
+            "academics_grade": "B+",
+            "campus_life_grade": "A",
+            "student_life_grade": "A-",
+            "baseball_record": "35-20",
+            "baseball_wins": 35,
+            "baseball_losses": 20,
+            "rank": i + 1,
+            "roster_url": f"https://athletics.example.edu/sports/baseball/roster-{i}",
+        })
+    return schools
+
+
+def load_pool(path: str) -> List[Dict[str, Any]]:
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("schools") or (data.get("research_input") or {}).get("schools") or []
+    return list(data)
+
+
+def _payloads(schools: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    kwargs = dict(
+        run_id="00000000-0000-0000-0000-000000000000",
+        schools=schools,
+        player_stats=_PLAYER_STATS,
+        baseball_assessment=_ASSESSMENT,
+        academic_score=_ACADEMIC,
+        final_limit=25,
+        ranking_priority="balanced",
+    )
+    return {"legacy": build_legacy_payload(**kwargs), "slim": build_slim_payload(**kwargs)}
+
+
+def measure(payload: Dict[str, Any], broker: str, iterations: int) -> Dict[str, float]:
+    # Celery wraps the task args as [args, kwargs, embed] in the body.
+    body = [[payload], {}, {"callbacks": None, "errbacks": None, "chain": None, "chord": None}]
+    _, _, encoded = dumps(body, serializer="json")
+    size = len(encoded.encode("utf-8") if isinstance(encoded, str) else encoded)
+
+    exchange = Exchange("bench_research_payload", type="direct")
+    queue = Queue("bench_research_payload", exchange, routing_key="bench")
+    enqueue, decode = [], []
+    with Connection(broker) as conn:
+        producer = conn.Producer(serializer="json")
+        queue(conn.default_channel).declare()
+        for _ in range(iterations):
+            t0 = time.perf_counter()
+            producer.publish(body, exchange=exchange, routing_key="bench", declare=[queue])
+            enqueue.append(time.perf_counter() - t0)
+        simple = conn.SimpleQueue(queue)
+        for _ in range(iterations):
+            message = simple.get(timeout=5)
+            t0 = time.perf_counter()
+            loads(message.body, message.content_type, message.content_encoding)
+            decode.append(time.perf_counter() - t0)
+            message.ack()
+        simple.close()
+    return {
+        "bytes": size,
+        "enqueue_ms": statistics.median(enqueue) * 1000,
+        "decode_ms": statistics.median(decode) * 1000,
+    }
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    p = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    p.add_argument("--schools", type=int, default=50)
+    p.add_argument("--pool", help="JSON file with the school dicts to enqueue")
+    p.add_argument("--broker", default="memory://")
+    p.add_argument("--iterations", type=int, default=200)
+    p.add_argument("--seed", type=int, default=7)
+    args = p.parse_args()
+
+    schools = load_pool(args.pool) if args.pool else synthetic_pool(args.schools, random.Random(args.seed))
+    results = {
+        name: measure(payload, args.broker, args.iterations)
+        for name, payload in _payloads(schools).items()
+    }
+    legacy, slim = results["legacy"], results["slim"]
+    logger.info(f"schools={len(schools)} broker={args.broker} iterations={args.iterations}")
+    for name, r in results.items():
+        logger.info(
+            f"{name:7s}: {r['bytes']:8,d} bytes  enqueue {r['enqueue_ms']:6.3f} ms  "
+            f"decode {r['decode_ms']:6.3f} ms"
+        )
+    logger.info(
+        f"slim is {legacy['bytes'] / slim['bytes']:.1f}x smaller, enqueue "
+        f"{legacy['enqueue_ms'] / max(slim['enqueue_ms'], 1e-6):.1f}x faster"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
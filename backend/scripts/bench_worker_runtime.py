@@ -0,0 +1,117 @@
+"""Per-task overhead: asyncio.run + fresh clients vs. the worker runtime.
+
+Simulates the fixed cost a research task pays before doing real work:
+the old path builds an event loop, an AsyncOpenAI client and an httpx
+client per task and opens new connections; the runtime path reuses one
+loop and pooled clients (backend/llm/worker_runtime.py). Each "task"
+makes ``--requests`` GETs to a local keep-alive HTTP server, so the
+numbers cover loop + client construction and connection setup (no TLS
+locally — real athletics sites and OpenAI add a handshake per new
+connection on top).
+
+Usage:
+    python -m backend.scripts.bench_worker_runtime
+    python -m backend.scripts.bench_worker_runtime --tasks 50 --requests 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+from backend.llm.deep_school_insights.fetch import http_client, make_httpx_client
+from backend.llm.worker_runtime import WorkerRuntime
+
+logger = logging.getLogger("bench_worker_runtime")
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def setup(self):
+        type(self).connections += 1
+        # Headers and body go out in separate writes; without NODELAY,
+        # Nagle + delayed ACK adds ~40 ms per keep-alive response.
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        super().setup()
+
+    def do_GET(self):
+        body = b"<html>ok</html>"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/"
+
+
+async def _cold_task(url: str, requests: int) -> None:
+    from openai import AsyncOpenAI
+
+    openai_client = AsyncOpenAI(api_key="bench", max_retries=0)
+    async with make_httpx_client() as client:
+        for _ in range(requests):
+            (await client.get(url)).raise_for_status()
+    await openai_client.close()
+
+
+async def _warm_task(url: str, requests: int) -> None:
+    async with http_client() as client:
+        for _ in range(requests):
+            (await client.get(url)).raise_for_status()
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    p = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    p.add_argument("--tasks", type=int, default=30)
+    p.add_argument("--requests", type=int, default=2)
+    args = p.parse_args()
+
+    server, url = start_server()
+    try:
+        _KeepAliveHandler.connections = 0
+        t0 = time.perf_counter()
+        for _ in range(args.tasks):
+            asyncio.run(_cold_task(url, args.requests))
+        cold = (time.perf_counter() - t0) / args.tasks
+        cold_conns = _KeepAliveHandler.connections
+
+        runtime = WorkerRuntime(openai_api_key="bench").start()
+        _KeepAliveHandler.connections = 0
+        t0 = time.perf_counter()
+        for _ in range(args.tasks):
+            runtime.run(_warm_task(url, args.requests))
+        warm = (time.perf_counter() - t0) / args.tasks
+        warm_conns = _KeepAliveHandler.connections
+        runtime.shutdown()
+    finally:
+        server.shutdown()
+
+    logger.info(f"asyncio.run per task : {cold * 1000:7.2f} ms/task  connections={cold_conns}")
+    logger.info(f"worker runtime       : {warm * 1000:7.2f} ms/task  connections={warm_conns}")
+    logger.info(f"overhead saved       : {(cold - warm) * 1000:7.2f} ms/task ({cold / warm:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
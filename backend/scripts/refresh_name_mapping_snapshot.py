@@ -0,0 +1,97 @@
+"""Write the on-disk school↔team name-mapping snapshot.
+
+Reads school_baseball_ranking_name_mapping once and writes the compact
+SQLite snapshot that SchoolNameResolver loads at process start (see
+backend/database/name_matching/mapping_snapshot.py). Run it on deploy
+and after the name matcher uploads new mappings.
+
+Usage:
+    python -m backend.scripts.refresh_name_mapping_snapshot
+    python -m backend.scripts.refresh_name_mapping_snapshot --check
+    python -m backend.scripts.refresh_name_mapping_snapshot --path /tmp/mapping.sqlite3
+
+``--check`` only compares the existing snapshot with the table and exits
+1 when it is stale or missing, so it can gate a deploy step.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+from dotenv import load_dotenv
+
+_project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+from backend.api.clients.supabase import require_supabase_admin_client
+from backend.database.name_matching.mapping_snapshot import (
+    fetch_mapping_rows,
+    load_snapshot,
+    mapping_fingerprint,
+    snapshot_path,
+    write_snapshot,
+)
+
+load_dotenv()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+logger = logging.getLogger("refresh_name_mapping_snapshot")
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    p.add_argument(
+        "--path", default=None,
+        help="Snapshot file (default: NAME_MAPPING_SNAPSHOT_PATH or backend/data/).",
+    )
+    p.add_argument(
+        "--check", action="store_true",
+        help="Report whether the snapshot is stale without rewriting it.",
+    )
+    return p.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    path = args.path or snapshot_path()
+    client = require_supabase_admin_client()
+
+    t_start = time.monotonic()
+    rows = fetch_mapping_rows(client)
+    db_version = mapping_fingerprint(rows)
+    existing = load_snapshot(path)
+
+    if args.check:
+        stale = existing is None or existing.db_version != db_version
+        logger.info(
+            "Snapshot %s: db_version=%s snapshot_version=%s stale=%s",
+            path, db_version, existing.db_version if existing else None, stale,
+        )
+        return 1 if stale else 0
+
+    if existing is not None and existing.db_version == db_version:
+        logger.info("Snapshot %s already matches db_version %s — nothing to do.", path, db_version)
+        return 0
+
+    if not rows:
+        logger.error("Mapping table returned no rows — refusing to write an empty snapshot.")
+        return 2
+
+    meta = write_snapshot(rows, path)
+    logger.info(
+        "Snapshot refreshed: rows=%s db_version=%s elapsed=%.2fs",
+        meta["row_count"], meta["db_version"], time.monotonic() - t_start,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
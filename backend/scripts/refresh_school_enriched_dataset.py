@@ -0,0 +1,126 @@
+"""Rebuild the school_baseball_enriched table after a rankings scrape.
+
+Runs the same mapping + rankings join and SCI math the API used to do at
+startup (``AsyncSchoolDataQueries.build_enrichment_payloads``) and upserts
+one row per school. API processes then load that narrow table instead of
+three queries plus the SCI computation.
+
+Usage:
+    python -m backend.scripts.refresh_school_enriched_dataset
+    python -m backend.scripts.refresh_school_enriched_dataset --dry-run
+    python -m backend.scripts.refresh_school_enriched_dataset --prune
+    python -m backend.scripts.refresh_school_enriched_dataset --sqlite /tmp/enriched.db
+
+Run it whenever ``baseball_rankings_data`` or the name-mapping table
+changes — ``selenium_massey_scraper.main`` calls ``refresh`` at the end of
+a full scrape. Until it has run once, the API keeps using the live join.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import time
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+_project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+from backend.database.school_enriched_dataset import (
+    delete_rows_except,
+    rows_from_payloads,
+    upsert_enriched_rows,
+    write_sqlite,
+)
+from backend.school_filtering.database.async_queries import AsyncSchoolDataQueries
+
+load_dotenv()
+
+logger = logging.getLogger("refresh_school_enriched_dataset")
+
+
+def refresh(
+    *,
+    dry_run: bool = False,
+    prune: bool = False,
+    sqlite_path: Optional[str] = None,
+    queries: Optional[AsyncSchoolDataQueries] = None,
+) -> Dict[str, Any]:
+    """Rebuild and write the dataset. Returns a summary dict for logging."""
+    queries = queries or AsyncSchoolDataQueries()
+    client = queries.connection.client
+
+    t_start = time.monotonic()
+    payloads = queries.build_enrichment_payloads(client, include_yearly_rankings=True)
+    rows = rows_from_payloads(payloads)
+    build_s = time.monotonic() - t_start
+
+    summary: Dict[str, Any] = {
+        "rows": len(rows),
+        "written": 0,
+        "pruned": 0,
+        "sqlite_rows": 0,
+        "build_s": round(build_s, 2),
+        "dry_run": dry_run,
+    }
+    if not rows:
+        logger.warning("Join produced zero rows — leaving school_baseball_enriched untouched.")
+        return summary
+
+    if sqlite_path:
+        conn = sqlite3.connect(sqlite_path)
+        try:
+            summary["sqlite_rows"] = write_sqlite(conn, rows)
+        finally:
+            conn.close()
+
+    if not dry_run:
+        summary["written"] = upsert_enriched_rows(client, rows)
+        if prune:
+            summary["pruned"] = delete_rows_except(client, [r["school_name"] for r in rows])
+
+    summary["elapsed_s"] = round(time.monotonic() - t_start, 2)
+    logger.info(
+        "Enriched dataset refresh: rows=%d written=%d pruned=%d sqlite_rows=%d "
+        "build=%.2fs elapsed=%.2fs dry_run=%s",
+        summary["rows"], summary["written"], summary["pruned"],
+        summary["sqlite_rows"], summary["build_s"], summary["elapsed_s"], dry_run,
+    )
+    return summary
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    p.add_argument(
+        "--dry-run", action="store_true",
+        help="Build the rows but skip the Supabase upsert.",
+    )
+    p.add_argument(
+        "--prune", action="store_true",
+        help="Delete rows for schools that no longer resolve to a ranked team.",
+    )
+    p.add_argument(
+        "--sqlite", dest="sqlite_path", default=None,
+        help="Also write the rows to this SQLite file (local/test copy).",
+    )
+    return p.parse_args()
+
+
+def main() -> int:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    args = _parse_args()
+    summary = refresh(dry_run=args.dry_run, prune=args.prune, sqlite_path=args.sqlite_path)
+    return 0 if summary["rows"] else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,11 +6,25 @@ today, then upsert the position-agnostic MatchedPlayer list into
 school_evidence_cache. The worker reads from this table to skip live
 fetching during user evaluations.
 
+Each row also stores the ETag / Last-Modified / content hash of the roster
+and stats pages with their parsed records. The next run sends conditional
+requests; a 304 or an identical body reuses the stored records without
+re-parsing. The final summary reports the share of pages skipped.
+
+Schools are refreshed in research-demand order (school_evidence_demand.py):
+the schools paid evaluations look up most, closest to the 14-day TTL,
+go first. ``--budget-minutes`` stops the run before it overruns, so a
+shorter, more frequent schedule keeps the hot schools warm; the logs
+report the measured research hit ratio and the expected one for the
+next interval. ``--order name`` restores the alphabetical sweep. Demand
+rows older than the window it reads are deleted (not on ``--dry-run``).
+
 Usage:
     python -m backend.scripts.refresh_school_evidence_cache
     python -m backend.scripts.refresh_school_evidence_cache --school "Stanford University"
     python -m backend.scripts.refresh_school_evidence_cache --max 10
     python -m backend.scripts.refresh_school_evidence_cache --max 5 --dry-run
+    python -m backend.scripts.refresh_school_evidence_cache --budget-minutes 45
 
 Designed to run on Render Cron weekly (e.g. ``0 4 * * 0`` for Sunday
 04:00 UTC). Estimated runtime ~70 min for ~300 schools at ~7 s/school
@@ -41,13 +55,25 @@ if _project_root not in sys.path:
 from backend.api.clients.supabase import require_supabase_admin_client
 from backend.database.school_evidence_cache import (
     TABLE,
+    load_previous_pages,
     serialize_matched_players,
+    serialize_pages,
+)
+from backend.database.school_evidence_demand import (
+    DEMAND_WINDOW_DAYS,
+    WarmingPlan,
+    load_cache_freshness,
+    load_demand,
+    plan_warming,
+    prune_demand,
 )
 from backend.llm.deep_school_insights.fetch import (
-    fetch_and_parse_roster,
-    fetch_and_parse_stats,
+    fetch_roster_page,
+    fetch_stats_page,
 )
+from backend.llm.deep_school_insights.parse_strategy import PARSER_STRATEGIES
 from backend.llm.deep_school_insights.parsers import match_players_to_stats
+from backend.llm.deep_school_insights.types import CachedPage, PageFetchStats
 
 load_dotenv()
 
@@ -62,6 +88,10 @@ logger = logging.getLogger("refresh_school_evidence_cache")
 # and the Sidearm scraper's anti-bot conventions.
 DEFAULT_SLEEP_S = 7.0
 
+# Fetch + parse + match time per school before any has been measured
+# (the politeness sleep comes on top); used to fit the --budget-minutes.
+ESTIMATED_FETCH_S = 7.0
+
 # Exit non-zero if the failure rate goes above this — we'd rather a noisy
 # alert than a silent partial cache.
 MAX_FAILURE_RATIO = 0.25
@@ -148,9 +178,16 @@ def _load_school_universe(
     return rows
 
 
-async def _refresh_one_school(school: Dict[str, Any]) -> Dict[str, Any]:
+async def _refresh_one_school(
+    school: Dict[str, Any],
+    previous_pages: Optional[Dict[str, CachedPage]] = None,
+    page_stats: Optional[PageFetchStats] = None,
+) -> Dict[str, Any]:
     """Fetch + parse + match for one school. Returns an upsert payload.
 
+    ``previous_pages`` are the validators + parsed records stored on the
+    school's last row; they make both fetches conditional.
+
     Failure modes:
     - Roster fetch fails → source_status='failed'
     - Roster parses but stats fail → source_status='roster_only'
@@ -166,11 +203,13 @@ async def _refresh_one_school(school: Dict[str, Any]) -> Dict[str, Any]:
         "updated_at": datetime.now(timezone.utc).isoformat(),
     }
 
+    previous_pages = previous_pages or {}
     try:
         # Run roster + stats fetches concurrently per school (same as worker).
-        roster_coro = fetch_and_parse_roster(school)
-        stats_coro = fetch_and_parse_stats(school)
-        (players, _resolved_url), stats = await asyncio.gather(roster_coro, stats_coro)
+        roster_page, stats_page = await asyncio.gather(
+            fetch_roster_page(school, previous_pages.get("roster")),
+            fetch_stats_page(school, previous_pages.get("stats")),
+        )
     except Exception as exc:
         payload["matched_players"] = []
         payload["stats_available"] = False
@@ -178,6 +217,13 @@ async def _refresh_one_school(school: Dict[str, Any]) -> Dict[str, Any]:
         payload["error_message"] = f"{type(exc).__name__}: {exc}"[:500]
         return payload
 
+    if page_stats is not None:
+        for page in (roster_page, stats_page):
+            if page.validators is not None:
+                page_stats.record(page.status)
+    payload.update(serialize_pages(roster_page, stats_page))
+
+    players, stats = roster_page.items, stats_page.items
     if not players:
         payload["matched_players"] = []
         payload["stats_available"] = False
@@ -192,6 +238,31 @@ async def _refresh_one_school(school: Dict[str, Any]) -> Dict[str, Any]:
     return payload
 
 
+def _pct(ratio: Optional[float]) -> str:
+    return f"{ratio * 100:.1f}%" if ratio is not None else "n/a"
+
+
+def _plan_by_demand(schools: List[Dict[str, Any]], window_days: float) -> WarmingPlan:
+    """Order ``schools`` by research demand and cache expiry; log hit ratios."""
+    demand = load_demand(window_days)
+    freshness = load_cache_freshness([s["school_name"] for s in schools])
+    plan = plan_warming(schools, demand, freshness)
+    at_risk = sum(1 for c in plan.candidates if c.priority > 0)
+    logger.info(
+        "Research demand (last %.0fd): lookups=%d schools=%d measured_hit_ratio=%s; "
+        "%d demanded schools expire or are missing within %.0fd",
+        window_days, demand.total_lookups, len(demand.lookups),
+        _pct(demand.measured_hit_ratio), at_risk, plan.interval_days,
+    )
+    for c in plan.candidates[:10]:
+        logger.info(
+            "  priority=%.2f %s lookups/day=%.2f age=%s",
+            c.priority, c.school["school_name"], c.rate_per_day,
+            f"{c.age_days:.1f}d" if c.age_days is not None else "none",
+        )
+    return plan
+
+
 def _upsert(payload: Dict[str, Any]) -> None:
     client = require_supabase_admin_client()
     client.table(TABLE).upsert(payload, on_conflict="school_name").execute()
@@ -204,24 +275,68 @@ async def _run(
     cap: Optional[int],
     sleep_s: float,
     dry_run: bool,
+    order: str = "demand",
+    budget_minutes: Optional[float] = None,
+    demand_window_days: float = DEMAND_WINDOW_DAYS,
 ) -> int:
-    schools = _load_school_universe(division, single_school, cap)
+    schools = _load_school_universe(division, single_school, cap if order == "name" else None)
     if not schools:
         logger.warning("No schools matched the filters — nothing to do.")
         return 0
 
+    plan: Optional[WarmingPlan] = None
+    if order == "demand" and not single_school:
+        plan = _plan_by_demand(schools, demand_window_days)
+        schools = plan.schools()
+        if cap is not None:
+            schools = schools[:cap]
+    budget_s = budget_minutes * 60 if budget_minutes else None
+    if plan is not None:
+        per_school_s = ESTIMATED_FETCH_S + sleep_s
+        planned = len(schools) if budget_s is None else min(len(schools), int(budget_s // per_school_s) + 1)
+        logger.info(
+            "Expected research hit ratio over the next %.0fd: %s without refresh, %s with the "
+            "first %d schools refreshed",
+            plan.interval_days, _pct(plan.expected_hit_ratio()),
+            _pct(plan.expected_hit_ratio(plan.head(planned))), planned,
+        )
+
     logger.info(
-        "Refresh starting: %d schools (division=%s single=%s cap=%s dry_run=%s sleep=%.1fs)",
-        len(schools), division, single_school, cap, dry_run, sleep_s,
+        "Refresh starting: %d schools (division=%s single=%s cap=%s order=%s budget=%s dry_run=%s sleep=%.1fs)",
+        len(schools), division, single_school, cap, order,
+        f"{budget_minutes:g}m" if budget_minutes else "none", dry_run, sleep_s,
     )
 
+    if not dry_run:
+        # Never delete history a longer --demand-window-days still reads.
+        pruned = prune_demand(max(DEMAND_WINDOW_DAYS, demand_window_days))
+        if pruned is not None:
+            logger.info("Pruned %d research demand rows older than the demand window", pruned)
+
+    previous = load_previous_pages([s["school_name"] for s in schools])
+    logger.info("Stored page validators for %d/%d schools", len(previous), len(schools))
+
     counts = {"ok": 0, "roster_only": 0, "failed": 0}
+    page_stats = PageFetchStats()
+    refreshed: List[str] = []
+    fetch_s_total = 0.0
     t_start = time.monotonic()
 
     for i, school in enumerate(schools, start=1):
+        if budget_s is not None and i > 1:
+            # Stop before a school that wouldn't finish inside the budget.
+            per_school_s = fetch_s_total / (i - 1) + sleep_s
+            if time.monotonic() - t_start + per_school_s > budget_s:
+                logger.info(
+                    "Time budget reached after %d/%d schools; %d left for the next run",
+                    i - 1, len(schools), len(schools) - i + 1,
+                )
+                break
         t_school_start = time.monotonic()
         try:
-            payload = await _refresh_one_school(school)
+            payload = await _refresh_one_school(
+                school, previous.get(school["school_name"]), page_stats
+            )
         except Exception as exc:
             # Defensive: refresh_one_school should never raise (it traps
             # exceptions and returns a 'failed' payload), but if something
@@ -231,6 +346,7 @@ async def _run(
                 i, len(schools), school["school_name"], exc,
             )
             counts["failed"] += 1
+            fetch_s_total += time.monotonic() - t_school_start
             await asyncio.sleep(sleep_s)
             continue
 
@@ -238,6 +354,7 @@ async def _run(
         counts[status] = counts.get(status, 0) + 1
         n_players = len(payload.get("matched_players", []))
         elapsed = time.monotonic() - t_school_start
+        fetch_s_total += elapsed
 
         if not dry_run:
             try:
@@ -248,6 +365,9 @@ async def _run(
                     i, len(schools), school["school_name"], status, n_players, exc,
                 )
                 counts["failed"] = counts.get("failed", 0) + 1
+                status = "failed"
+        if status != "failed":
+            refreshed.append(school["school_name"])
 
         logger.info(
             "[%d/%d] %s: status=%s players=%d elapsed=%.2fs",
@@ -267,6 +387,17 @@ async def _run(
         total, counts.get("ok", 0), counts.get("roster_only", 0),
         counts.get("failed", 0), failure_ratio, total_elapsed, dry_run,
     )
+    logger.info(
+        "Pages skipped (304 or unchanged hash): %d/%d (%.1f%%) not_modified=%d unchanged=%d",
+        page_stats.skipped, page_stats.fetched, page_stats.skipped_pct,
+        page_stats.not_modified, page_stats.unchanged,
+    )
+    logger.info("Parser memory: %s", PARSER_STRATEGIES.summary())
+    if plan is not None and not dry_run:
+        logger.info(
+            "Expected research hit ratio over the next %.0fd after this run: %s (%d schools refreshed)",
+            plan.interval_days, _pct(plan.expected_hit_ratio(refreshed)), len(refreshed),
+        )
 
     if failure_ratio > MAX_FAILURE_RATIO:
         logger.error(
@@ -295,6 +426,18 @@ def _parse_args() -> argparse.Namespace:
         "--sleep", type=float, default=DEFAULT_SLEEP_S,
         help=f"Seconds to sleep between schools (default {DEFAULT_SLEEP_S}).",
     )
+    p.add_argument(
+        "--order", choices=["demand", "name"], default="demand",
+        help="demand (default): most researched schools closest to expiry first; name: alphabetical.",
+    )
+    p.add_argument(
+        "--budget-minutes", type=float, default=None,
+        help="Stop before the school that would overrun this wall-clock budget.",
+    )
+    p.add_argument(
+        "--demand-window-days", type=float, default=DEMAND_WINDOW_DAYS,
+        help=f"Research demand history to weigh schools by (default {DEMAND_WINDOW_DAYS}).",
+    )
     p.add_argument(
         "--dry-run", action="store_true",
         help="Fetch + parse but skip the upsert. Useful for verifying scraping works.",
@@ -311,6 +454,9 @@ def main() -> int:
             cap=args.cap,
             sleep_s=args.sleep,
             dry_run=args.dry_run,
+            order=args.order,
+            budget_minutes=args.budget_minutes,
+            demand_window_days=args.demand_window_days,
         )
     )
 
@@ -0,0 +1,327 @@
+"""Offline replay: LLM reviews saved by the research planner vs. ranking changes.
+
+Replays recorded research runs (written by the service when
+``DEEP_RESEARCH_RECORD_DIR`` is set: the researched pool before the final
+rerank) through ``ResearchPlanner`` and compares the planned final list
+with the one produced by researching every school.
+
+Research is simulated in planner order, ``--concurrency`` schools at a
+time: every school in a wave is checked before the fetch, gets its
+recorded evidence, is checked again before the review, and only then do
+the wave's recorded results tighten the bounds for the next wave.
+Schools a recorded run did not research (skipped / not requested) replay
+as unresearched.
+
+Without recorded runs, ``--synthetic N`` generates pools with random fit
+deltas, academic fields and research outcomes.
+
+Usage:
+    python -m backend.scripts.replay_research_planner --synthetic 200
+    python -m backend.scripts.replay_research_planner runs/ --mode statistical --adj-range 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import logging
+import os
+import random
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+_project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+from backend.evaluation.competitiveness import classify_fit
+from backend.llm.deep_school_insights.planner import (
+    DEFAULT_STATISTICAL_ADJ_RANGE,
+    ResearchPlanner,
+)
+from backend.llm.deep_school_insights.ranking import (
+    MAX_RERANK_ADJUSTMENT,
+    RESEARCH_QUALITY_BONUS,
+    compute_ranking_adjustment,
+    compute_ranking_score,
+)
+from backend.llm.deep_school_insights.service import (
+    DeepSchoolInsightService,
+    _player_academic_score,
+)
+from backend.llm.deep_school_insights.types import (
+    DeepSchoolReview,
+    GatheredEvidence,
+    OpportunityContext,
+    RecruitingContext,
+    RosterContext,
+)
+
+logger = logging.getLogger("replay_research_planner")
+
+# Fields research writes onto a school; stripped to get the pre-research pool.
+OUTCOME_FIELDS = (
+    "research_status",
+    "ranking_adjustment",
+    "ranking_score",
+    "research_packet",
+    "research_confidence",
+    "roster_label",
+    "opportunity_fit",
+    "overall_school_view",
+    "review_adjustment_from_base",
+)
+UNRESEARCHED = ("skipped", "not_requested", "queued", "attempted")
+
+_FINALIZER = DeepSchoolInsightService.__new__(DeepSchoolInsightService)
+
+
+@dataclass
+class ReplayResult:
+    schools: int
+    final_limit: int
+    llm_calls_full: int
+    llm_calls_planned: int
+    membership_changes: int
+    rank_changes: int
+    max_rank_shift: int
+    # Skipped schools that the full run put on the final list; always 0 in
+    # safe mode. Other membership changes are swaps at the cut-off caused
+    # by normalizing opportunity z-scores over fewer researched schools.
+    skipped_in_full_list: int = 0
+
+    @property
+    def llm_calls_saved(self) -> int:
+        return self.llm_calls_full - self.llm_calls_planned
+
+
+def load_runs(paths: List[str]) -> List[Dict[str, Any]]:
+    files: List[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.json"))))
+        else:
+            files.append(path)
+    runs = []
+    for path in files:
+        with open(path) as f:
+            runs.append(json.load(f))
+    return runs
+
+
+def _pre_research(school: Dict[str, Any], ranking_priority: Optional[str]) -> Dict[str, Any]:
+    pool_entry = {k: v for k, v in school.items() if k not in OUTCOME_FIELDS}
+    pool_entry["ranking_score"] = compute_ranking_score(
+        float(school.get("delta") or 0.0), 0.0, ranking_priority,
+    )
+    pool_entry["ranking_adjustment"] = 0.0
+    pool_entry["research_status"] = "queued"
+    return pool_entry
+
+
+def _apply_outcome(school: Dict[str, Any], recorded: Dict[str, Any]) -> bool:
+    """Copy recorded research results onto ``school``; True if it cost a review."""
+    if recorded.get("research_status") in UNRESEARCHED:
+        return False
+    for key in OUTCOME_FIELDS:
+        if key in recorded:
+            school[key] = recorded[key]
+    return True
+
+
+def _finalize(schools: List[Dict[str, Any]], run: Dict[str, Any]) -> List[str]:
+    ranked = _FINALIZER.finalize_ranking(
+        schools,
+        academic_score=run.get("academic_score") or {},
+        final_limit=run.get("final_limit"),
+        ranking_priority=run.get("ranking_priority"),
+    )
+    return [s.get("school_name") for s in ranked]
+
+
+def replay(
+    run: Dict[str, Any],
+    adjustment_range: float = MAX_RERANK_ADJUSTMENT,
+    concurrency: int = 10,
+) -> ReplayResult:
+    priority = run.get("ranking_priority")
+    final_limit = int(run["final_limit"])
+    recorded = {int(s["_research_id"]): s for s in run["schools"]}
+
+    full = [_pre_research(s, priority) for s in run["schools"]]
+    full_calls = sum(_apply_outcome(s, recorded[int(s["_research_id"])]) for s in full)
+    full_list = _finalize(full, run)
+
+    pool = [_pre_research(s, priority) for s in run["schools"]]
+    planner = ResearchPlanner(
+        pool, final_limit, priority,
+        _player_academic_score(run.get("academic_score") or {}),
+        adjustment_range,
+    )
+    order = planner.order(pool)
+    planned_calls = 0
+    for start in range(0, len(order), max(1, concurrency)):
+        wave = [s for s in order[start:start + concurrency] if planner.should_research(s, "fetch")]
+        for school in wave:
+            packet = recorded[int(school["_research_id"])].get("research_packet")
+            planner.note_evidence(
+                school, GatheredEvidence.model_validate(packet) if packet else GatheredEvidence(),
+            )
+        reviewed = [s for s in wave if planner.should_research(s, "review")]
+        for school in reviewed:
+            rec = recorded[int(school["_research_id"])]
+            planned_calls += _apply_outcome(school, rec)
+            planner.note_result(
+                school, float(school.get("ranking_adjustment") or 0.0), school.get("research_status") or "",
+            )
+    skipped = {s.get("school_name") for s in pool if planner.was_skipped(s)}
+    planned_list = _finalize(pool, run)
+
+    full_rank = {name: i for i, name in enumerate(full_list)}
+    planned_rank = {name: i for i, name in enumerate(planned_list)}
+    common = set(full_rank) & set(planned_rank)
+    shifts = [abs(full_rank[n] - planned_rank[n]) for n in common]
+    return ReplayResult(
+        schools=len(pool),
+        final_limit=final_limit,
+        llm_calls_full=full_calls,
+        llm_calls_planned=planned_calls,
+        membership_changes=len(set(full_rank) - set(planned_rank)),
+        rank_changes=sum(1 for s in shifts if s),
+        max_rank_shift=max(shifts, default=0),
+        skipped_in_full_list=len(skipped & set(full_rank)),
+    )
+
+
+_LEVELS = ("high", "medium", "low", "unknown")
+_ACADEMIC_FITS = ("Fit", "Fit", "Safety", "Reach", "Strong Safety", "Strong Reach")
+
+
+def synthetic_run(
+    rng: random.Random,
+    pool_size: int = 40,
+    final_limit: int = 15,
+    ranking_priority: Optional[str] = None,
+) -> Dict[str, Any]:
+    """A recorded-run-shaped pool with random research outcomes."""
+    schools = []
+    for idx in range(pool_size):
+        delta = round(rng.gauss(0.0, 4.0), 2)
+        school: Dict[str, Any] = {
+            "school_name": f"School {idx}",
+            "delta": delta,
+            "fit_label": classify_fit(delta),
+            "academic_fit": rng.choice(_ACADEMIC_FITS),
+            "academic_delta": round(rng.gauss(0.0, 1.2), 2),
+            "academic_selectivity_score": round(rng.uniform(2.0, 8.0), 2),
+            "sci": round(rng.uniform(20.0, 90.0), 1),
+            "_research_id": idx,
+        }
+        roll = rng.random()
+        if roll < 0.05:
+            school.update(research_status="failed", ranking_adjustment=0.0,
+                          ranking_score=compute_ranking_score(delta, 0.0, ranking_priority))
+            schools.append(school)
+            continue
+        if roll < 0.2:
+            evidence = GatheredEvidence()
+            status, adjustment = "metadata_only", 0.0
+        else:
+            evidence = GatheredEvidence(
+                roster_context=RosterContext(
+                    position_data_quality=rng.choice(("exact", "mixed", "family_only")),
+                    same_family_count=rng.randint(3, 15),
+                    likely_departures_same_family=rng.randint(0, 5),
+                    starter_opening_estimate_same_family=rng.choice(_LEVELS),
+                    starter_opening_estimate_exact_position=rng.choice(_LEVELS),
+                ),
+                recruiting_context=RecruitingContext(
+                    incoming_same_family_transfers=rng.randint(0, 3),
+                    impact_additions_same_family=rng.randint(0, 3),
+                ),
+                opportunity_context=OpportunityContext(
+                    competition_level=rng.choice(_LEVELS),
+                    opportunity_level=rng.choice(_LEVELS),
+                ),
+            )
+            review = DeepSchoolReview(
+                adjustment_from_base=rng.choice(("none", "none", "up_one", "down_one")),
+                confidence=rng.choice(("high", "medium", "low")),
+            )
+            bonus = RESEARCH_QUALITY_BONUS if roll > 0.3 else RESEARCH_QUALITY_BONUS * 0.5
+            status = "completed" if roll > 0.3 else "partial"
+            adjustment = round(min(compute_ranking_adjustment(evidence, review) + bonus, MAX_RERANK_ADJUSTMENT), 2)
+        school.update(
+            research_status=status,
+            ranking_adjustment=adjustment,
+            ranking_score=compute_ranking_score(delta, adjustment, ranking_priority),
+            research_packet=evidence.model_dump(),
+        )
+        schools.append(school)
+    return {
+        "final_limit": final_limit,
+        "ranking_priority": ranking_priority,
+        "academic_score": {"effective": round(rng.uniform(3.0, 8.0), 2)},
+        "schools": schools,
+    }
+
+
+def summarize(results: List[ReplayResult]) -> Dict[str, float]:
+    full = sum(r.llm_calls_full for r in results)
+    saved = sum(r.llm_calls_saved for r in results)
+    return {
+        "runs": len(results),
+        "llm_calls_full": full,
+        "llm_calls_saved": saved,
+        "saved_pct": 100.0 * saved / full if full else 0.0,
+        "runs_with_membership_change": sum(1 for r in results if r.membership_changes),
+        "membership_changes": sum(r.membership_changes for r in results),
+        "runs_with_rank_change": sum(1 for r in results if r.rank_changes),
+        "max_rank_shift": max((r.max_rank_shift for r in results), default=0),
+        "skipped_in_full_list": sum(r.skipped_in_full_list for r in results),
+    }
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("backend.llm.deep_school_insights.planner").setLevel(logging.WARNING)
+    p = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    p.add_argument("paths", nargs="*", help="recorded run JSON files or directories")
+    p.add_argument("--synthetic", type=int, default=0, help="generate N synthetic runs")
+    p.add_argument("--pool", type=int, default=40)
+    p.add_argument("--final-limit", type=int, default=15)
+    p.add_argument("--priority", choices=("balanced", "baseball_fit", "academics"), default="balanced")
+    p.add_argument("--mode", choices=("safe", "statistical", "both"), default="both")
+    p.add_argument("--adj-range", type=float, default=DEFAULT_STATISTICAL_ADJ_RANGE)
+    p.add_argument("--concurrency", type=int, default=10)
+    p.add_argument("--seed", type=int, default=7)
+    args = p.parse_args()
+
+    runs = load_runs(args.paths)
+    rng = random.Random(args.seed)
+    priority = None if args.priority == "balanced" else args.priority
+    runs.extend(synthetic_run(rng, args.pool, args.final_limit, priority) for _ in range(args.synthetic))
+    if not runs:
+        logger.error("no runs: pass recorded run files/directories or --synthetic N")
+        return 1
+
+    modes = {"safe": MAX_RERANK_ADJUSTMENT, "statistical": args.adj_range}
+    if args.mode != "both":
+        modes = {args.mode: modes[args.mode]}
+    for mode, adj_range in modes.items():
+        results = [replay(run, adj_range, args.concurrency) for run in runs]
+        s = summarize(results)
+        logger.info(
+            f"{mode:<12} runs={s['runs']} llm_calls={s['llm_calls_full']} "
+            f"saved={s['llm_calls_saved']} ({s['saved_pct']:.1f}%) "
+            f"membership_changes={s['membership_changes']} (runs={s['runs_with_membership_change']}) "
+            f"rank_changes_runs={s['runs_with_rank_change']} max_rank_shift={s['max_rank_shift']} "
+            f"skipped_in_full_list={s['skipped_in_full_list']}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
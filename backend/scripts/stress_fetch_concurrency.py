@@ -0,0 +1,172 @@
+"""Stress test: adaptive fetch permits vs. the fixed RESEARCH_FETCH_CONCURRENCY.
+
+Feeds synthetic roster/stats pages of varying size through the same
+acquire → note_document → parse → release cycle the research fan-out
+uses, once with a fixed semaphore and once with ``AdaptiveLimiter``, and
+reports throughput and peak RSS against the budget.
+
+By default memory is simulated (baseline + held parse buffers), which is
+deterministic. ``--real`` allocates the parse buffers for real and samples
+this process's RSS from /proc.
+
+Usage:
+    python -m backend.scripts.stress_fetch_concurrency
+    python -m backend.scripts.stress_fetch_concurrency --real --budget-mb 400 --pages 120
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+_project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+from backend.llm.deep_school_insights.concurrency import (
+    AdaptiveLimiter,
+    current_rss_bytes,
+    note_document,
+)
+
+logger = logging.getLogger("stress_fetch_concurrency")
+
+MB = 1024 * 1024
+
+
+class SimulatedMemory:
+    """RSS = baseline + bytes currently held by in-flight parses."""
+
+    def __init__(self, baseline_bytes: int):
+        self.baseline = baseline_bytes
+        self.held = 0
+        self.peak = baseline_bytes
+
+    def rss(self) -> int:
+        return self.baseline + self.held
+
+    def hold(self, nbytes: int) -> object:
+        self.held += nbytes
+        self.peak = max(self.peak, self.rss())
+        return nbytes
+
+    def release(self, handle: object) -> None:
+        self.held -= handle
+
+
+class RealMemory:
+    """Allocates the parse buffers and samples RSS after each one."""
+
+    def __init__(self):
+        self.peak = current_rss_bytes() or 0
+
+    def rss(self) -> int:
+        return current_rss_bytes() or 0
+
+    def hold(self, nbytes: int) -> object:
+        buf = bytearray(nbytes)
+        buf[::4096] = b"x" * len(buf[::4096])  # touch every page
+        self.peak = max(self.peak, self.rss())
+        return buf
+
+    def release(self, handle: object) -> None:
+        del handle
+
+
+@dataclass
+class StressResult:
+    elapsed_s: float
+    pages: int
+    peak_rss: int
+
+    @property
+    def pages_per_s(self) -> float:
+        return self.pages / self.elapsed_s if self.elapsed_s else 0.0
+
+
+def synthetic_page_sizes(n: int, small_kb: int = 80, large_kb: int = 2500, seed: int = 3) -> List[int]:
+    """Mostly small legacy pages with a tail of large Nuxt payloads."""
+    rng = random.Random(seed)
+    return [
+        int(rng.uniform(large_kb * 0.5, large_kb) * 1024) if rng.random() < 0.15
+        else int(rng.uniform(small_kb * 0.5, small_kb) * 1024)
+        for _ in range(n)
+    ]
+
+
+async def run_workload(
+    limiter,
+    page_sizes: List[int],
+    memory,
+    *,
+    latency_s: float = 0.02,
+    amplification: float = 8.0,
+) -> StressResult:
+    """One task per page: wait for a permit, 'download', parse, release."""
+
+    async def _one(size: int) -> None:
+        async with limiter:
+            await asyncio.sleep(latency_s)  # network
+            note_document(size)
+            handle = memory.hold(int(size * amplification))  # parse tree
+            await asyncio.sleep(latency_s / 2)
+            memory.release(handle)
+
+    t0 = time.monotonic()
+    await asyncio.gather(*(_one(size) for size in page_sizes))
+    return StressResult(time.monotonic() - t0, len(page_sizes), memory.peak)
+
+
+def adaptive_limiter(budget_bytes: int, sampler: Callable[[], Optional[int]], *,
+                     initial: int = 3, max_permits: int = 24, amplification: float = 8.0) -> AdaptiveLimiter:
+    return AdaptiveLimiter(
+        min_permits=1,
+        max_permits=max_permits,
+        memory_budget_bytes=budget_bytes,
+        initial=initial,
+        parse_amplification=amplification,
+        rss_sampler=sampler,
+    )
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    p = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    p.add_argument("--pages", type=int, default=80)
+    p.add_argument("--budget-mb", type=int, default=300)
+    p.add_argument("--baseline-mb", type=int, default=180)
+    p.add_argument("--fixed", type=int, default=3)
+    p.add_argument("--latency-ms", type=float, default=20.0)
+    p.add_argument("--real", action="store_true")
+    args = p.parse_args()
+
+    sizes = synthetic_page_sizes(args.pages)
+    budget = args.budget_mb * MB
+
+    def _memory():
+        return RealMemory() if args.real else SimulatedMemory(args.baseline_mb * MB)
+
+    mem = _memory()
+    fixed = asyncio.run(run_workload(asyncio.Semaphore(args.fixed), sizes, mem, latency_s=args.latency_ms / 1000))
+    mem = _memory()
+    limiter = adaptive_limiter(budget, mem.rss)
+    adaptive = asyncio.run(run_workload(limiter, sizes, mem, latency_s=args.latency_ms / 1000))
+
+    for label, r in (("fixed", fixed), ("adaptive", adaptive)):
+        logger.info(
+            f"{label:9s} {r.pages_per_s:7.1f} pages/s  peak_rss {r.peak_rss / MB:7.1f} MB  "
+            f"budget {args.budget_mb} MB  {'OK' if r.peak_rss <= budget else 'OVER'}"
+        )
+    logger.info(f"limiter metrics: {limiter.metrics.as_dict()}")
+    return 0 if adaptive.peak_rss <= budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+"""Waterfall and stage percentiles for research-run traces.
+
+Reads the OTLP/JSON lines written with ``DEEP_RESEARCH_TRACE_FILE`` (see
+backend/llm/deep_school_insights/tracing.py) and prints, for one trace,
+a waterfall of its spans (offset, duration, nesting, key attributes) and,
+for the selected traces, per-stage latency percentiles.
+
+By default the most recent trace is shown; ``--run-id`` picks the traces
+of one prediction run (the task, fan-out groups and aggregation each
+export their own trace tagged with ``run_id``), ``--trace`` a trace id
+prefix, ``--all`` aggregates percentiles over every trace in the files.
+
+Usage:
+    python -m backend.scripts.trace_report traces.jsonl
+    python -m backend.scripts.trace_report traces.jsonl --run-id 1b2c... --min-ms 50
+    python -m backend.scripts.trace_report traces/*.jsonl --all --no-waterfall
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sys
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+_project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+logger = logging.getLogger("trace_report")
+
+# Attributes worth showing next to a span in the waterfall, in order.
+_WATERFALL_ATTRIBUTES = (
+    "school", "status", "research_status", "cache_hit", "review_cache_hit", "bytes",
+    "records", "input_tokens", "usage.output_tokens", "usage.cached_tokens", "hits", "schools",
+)
+
+
+def _attr_value(value: Dict[str, Any]) -> Any:
+    if "intValue" in value:
+        return int(value["intValue"])
+    if "doubleValue" in value:
+        return float(value["doubleValue"])
+    if "boolValue" in value:
+        return bool(value["boolValue"])
+    return value.get("stringValue")
+
+
+def _span_record(raw: Dict[str, Any]) -> Dict[str, Any]:
+    start, end = int(raw["startTimeUnixNano"]), int(raw["endTimeUnixNano"])
+    return {
+        "trace_id": raw["traceId"],
+        "span_id": raw["spanId"],
+        "parent_id": raw.get("parentSpanId"),
+        "name": raw["name"],
+        "start_ns": start,
+        "duration_ms": (end - start) / 1e6,
+        "error": (raw.get("status") or {}).get("code") == 2,
+        "attributes": {a["key"]: _attr_value(a["value"]) for a in raw.get("attributes", [])},
+    }
+
+
+def load_traces(paths: Iterable[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """``{trace_id: [span, ...]}`` from OTLP/JSON lines; metrics lines are ignored."""
+    traces: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                data = json.loads(line)
+                for resource in data.get("resourceSpans", []):
+                    for scope in resource.get("scopeSpans", []):
+                        for raw in scope.get("spans", []):
+                            span = _span_record(raw)
+                            traces[span["trace_id"]].append(span)
+    return dict(traces)
+
+
+def _root(spans: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    ids = {s["span_id"] for s in spans}
+    roots = [s for s in spans if not s["parent_id"] or s["parent_id"] not in ids]
+    return min(roots, key=lambda s: s["start_ns"]) if roots else None
+
+
+def select_traces(
+    traces: Dict[str, List[Dict[str, Any]]],
+    trace_prefix: Optional[str] = None,
+    run_id: Optional[str] = None,
+) -> List[List[Dict[str, Any]]]:
+    """Matching traces, oldest first."""
+    selected = []
+    for trace_id, spans in traces.items():
+        if trace_prefix and not trace_id.startswith(trace_prefix):
+            continue
+        root = _root(spans)
+        if run_id and (root is None or root["attributes"].get("run_id") != run_id):
+            continue
+        selected.append(spans)
+    return sorted(selected, key=lambda spans: min(s["start_ns"] for s in spans))
+
+
+def waterfall(
+    spans: List[Dict[str, Any]],
+    width: int = 50,
+    min_ms: float = 0.0,
+    max_depth: Optional[int] = None,
+) -> List[str]:
+    """One line per span, depth-first in start order, with a timeline bar."""
+    if not spans:
+        return []
+    children: Dict[Optional[str], List[Dict[str, Any]]] = defaultdict(list)
+    ids = {s["span_id"] for s in spans}
+    for s in spans:
+        parent = s["parent_id"] if s["parent_id"] in ids else None
+        children[parent].append(s)
+    for group in children.values():
+        group.sort(key=lambda s: s["start_ns"])
+
+    t0 = min(s["start_ns"] for s in spans)
+    total_ms = max(
+        max((s["start_ns"] - t0) / 1e6 + s["duration_ms"] for s in spans), 1e-6,
+    )
+    lines: List[str] = []
+
+    def visit(span: Dict[str, Any], depth: int) -> None:
+        if max_depth is not None and depth > max_depth:
+            return
+        offset = (span["start_ns"] - t0) / 1e6
+        if span["duration_ms"] >= min_ms or depth == 0:
+            lo = int(offset / total_ms * width)
+            hi = max(lo + 1, int((offset + span["duration_ms"]) / total_ms * width))
+            bar = " " * lo + "#" * (hi - lo)
+            attrs = " ".join(
+                f"{k}={span['attributes'][k]}"
+                for k in _WATERFALL_ATTRIBUTES if span["attributes"].get(k) is not None
+            )
+            name = "  " * depth + span["name"] + (" !" if span["error"] else "")
+            lines.append(
+                f"{offset:9.1f} {span['duration_ms']:9.1f}  |{bar:<{width}}|  {name:<34} {attrs}".rstrip()
+            )
+        for child in children.get(span["span_id"], []):
+            visit(child, depth + 1)
+
+    for root in children[None]:
+        visit(root, 0)
+    return lines
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def stage_percentiles(spans: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Per-stage count / p50 / p90 / p99 / max / total ms, by total descending."""
+    by_stage: Dict[str, List[float]] = defaultdict(list)
+    for s in spans:
+        by_stage[s["name"]].append(s["duration_ms"])
+    rows = [
+        {
+            "stage": name,
+            "count": len(values),
+            "p50": _percentile(values, 0.50),
+            "p90": _percentile(values, 0.90),
+            "p99": _percentile(values, 0.99),
+            "max": max(values),
+            "total": sum(values),
+        }
+        for name, values in by_stage.items()
+    ]
+    return sorted(rows, key=lambda r: r["total"], reverse=True)
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    p = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    p.add_argument("paths", nargs="+", help="trace files (DEEP_RESEARCH_TRACE_FILE)")
+    p.add_argument("--trace", help="trace id prefix")
+    p.add_argument("--run-id", help="prediction run id")
+    p.add_argument("--all", action="store_true", help="percentiles over every selected trace")
+    p.add_argument("--min-ms", type=float, default=0.0, help="hide spans shorter than this")
+    p.add_argument("--max-depth", type=int, default=None)
+    p.add_argument("--width", type=int, default=50)
+    p.add_argument("--no-waterfall", action="store_true")
+    args = p.parse_args()
+
+    selected = select_traces(load_traces(args.paths), args.trace, args.run_id)
+    if not selected:
+        logger.error("no matching traces")
+        return 1
+    shown = selected if (args.all or args.run_id) else selected[-1:]
+
+    if not args.no_waterfall:
+        for spans in shown:
+            root = _root(spans)
+            logger.info(
+                f"\ntrace {spans[0]['trace_id']}  {root['name'] if root else '?'}  "
+                f"spans={len(spans)}  run_id={(root or {}).get('attributes', {}).get('run_id', '-')}"
+            )
+            logger.info(f"{'start_ms':>9} {'dur_ms':>9}")
+            for line in waterfall(spans, args.width, args.min_ms, args.max_depth):
+                logger.info(line)
+
+    rows = stage_percentiles(s for spans in shown for s in spans)
+    logger.info(f"\nstage percentiles over {len(shown)} trace(s), ms")
+    logger.info(f"{'stage':<18} {'count':>6} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9} {'total':>10}")
+    for r in rows:
+        logger.info(
+            f"{r['stage']:<18} {r['count']:>6} {r['p50']:>9.1f} {r['p90']:>9.1f} "
+            f"{r['p99']:>9.1f} {r['max']:>9.1f} {r['total']:>10.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Shared fixtures for the deep-research tests."""
+
+from __future__ import annotations
+
+import pytest
+
+from backend.llm.deep_school_insights import admission
+from backend.llm.deep_school_insights.parse_strategy import PARSER_STRATEGIES
+
+
+def _admission_window(redis, keys, args):
+    """admission.WINDOW_SCRIPT, run against the fake's store."""
+    cost, token_cap, request_cap, _ttl = (int(a) for a in args)
+    tokens, requests = (int(redis.store.get(k, 0)) for k in keys)
+    if tokens > 0 and (tokens + cost > token_cap or requests + 1 > request_cap):
+        return 0
+    redis.store[keys[0]] = tokens + cost
+    redis.store[keys[1]] = requests + 1
+    return 1
+
+
+class FakeRedis:
+    """In-memory stand-in for the ``redis.asyncio`` client.
+
+    Values are stored as given (str values as bytes, like redis-py
+    returns them); ``fail=True`` makes every command raise the way an
+    unreachable server does. ``commands`` counts round trips. ``eval``
+    runs the Python equivalent of the Lua scripts in ``SCRIPTS``.
+    """
+
+    SCRIPTS = {admission.WINDOW_SCRIPT: _admission_window}
+
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+        self.fail = False
+        self.commands = 0
+
+    def _call(self):
+        self.commands += 1
+        if self.fail:
+            raise ConnectionError("redis down")
+
+    async def get(self, key):
+        self._call()
+        return self.store.get(key)
+
+    async def mget(self, *keys):
+        self._call()
+        return [self.store.get(key) for key in keys]
+
+    async def set(self, key, value, ex=None, nx=False):
+        self._call()
+        if nx and key in self.store:
+            return None
+        self.store[key] = value.encode() if isinstance(value, str) else value
+        self.ttls[key] = ex
+        return True
+
+    async def delete(self, key):
+        self._call()
+        self.store.pop(key, None)
+        self.ttls.pop(key, None)
+
+    async def eval(self, script, numkeys, *keys_and_args):
+        self._call()
+        keys, args = keys_and_args[:numkeys], keys_and_args[numkeys:]
+        return self.SCRIPTS[script](self, keys, args)
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_parser_strategies():
+    """Parser memory is process-wide; no test sees another test's sites."""
+    PARSER_STRATEGIES.clear()
+    yield
+    PARSER_STRATEGIES.clear()
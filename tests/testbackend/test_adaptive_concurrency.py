@@ -0,0 +1,87 @@
+"""AdaptiveLimiter (concurrency.py) under the synthetic page stress workload."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from backend.llm.deep_school_insights.concurrency import AdaptiveLimiter, fetch_limiter_from_env
+from backend.scripts.stress_fetch_concurrency import (
+    MB,
+    SimulatedMemory,
+    adaptive_limiter,
+    run_workload,
+    synthetic_page_sizes,
+)
+
+
+@pytest.mark.asyncio
+async def test_adaptive_beats_fixed_and_stays_under_budget():
+    sizes = synthetic_page_sizes(60)
+    budget = 300 * MB
+
+    fixed_mem = SimulatedMemory(180 * MB)
+    fixed = await run_workload(asyncio.Semaphore(3), sizes, fixed_mem, latency_s=0.01)
+    mem = SimulatedMemory(180 * MB)
+    limiter = adaptive_limiter(budget, mem.rss)
+    adaptive = await run_workload(limiter, sizes, mem, latency_s=0.01)
+
+    assert adaptive.peak_rss <= budget
+    assert adaptive.pages_per_s > 1.5 * fixed.pages_per_s
+    assert limiter.metrics.grows > 0
+    assert limiter.metrics.documents == len(sizes)
+    assert limiter.in_flight == 0 and limiter.in_flight_doc_bytes == 0
+
+
+@pytest.mark.asyncio
+async def test_huge_pages_hold_below_the_fixed_setting():
+    # Each 6 MB page parses to ~48 MB: three at once would blow a 120 MB
+    # headroom, which is exactly what the fixed setting does.
+    sizes = [6 * MB] * 12
+    budget = 300 * MB
+
+    fixed_mem = SimulatedMemory(180 * MB)
+    await run_workload(asyncio.Semaphore(3), sizes, fixed_mem, latency_s=0.005)
+    mem = SimulatedMemory(180 * MB)
+    limiter = adaptive_limiter(budget, mem.rss, initial=1)
+    await run_workload(limiter, sizes, mem, latency_s=0.005)
+
+    assert fixed_mem.peak > budget
+    assert mem.peak <= budget
+    assert limiter.metrics.peak_limit < 3
+
+
+@pytest.mark.asyncio
+async def test_over_budget_rss_halves_limit_but_keeps_minimum():
+    rss = {"value": 100 * MB}
+    limiter = AdaptiveLimiter(
+        min_permits=2, max_permits=8, initial=8,
+        memory_budget_bytes=200 * MB, rss_sampler=lambda: rss["value"],
+    )
+    rss["value"] = 250 * MB
+    async with limiter:
+        pass
+    assert limiter.limit == 4
+    async with limiter:
+        pass
+    async with limiter:
+        pass
+    assert limiter.limit == 2
+    assert limiter.metrics.shrinks == 2
+
+    # Minimum permits are granted even while over budget, so runs can't stall.
+    async with limiter:
+        async with limiter:
+            assert limiter.in_flight == 2
+
+
+def test_limiter_is_opt_in(monkeypatch):
+    monkeypatch.delenv("RESEARCH_MEMORY_BUDGET_MB", raising=False)
+    assert fetch_limiter_from_env(3) is None
+
+    monkeypatch.setenv("RESEARCH_MEMORY_BUDGET_MB", "400")
+    monkeypatch.setenv("RESEARCH_FETCH_CONCURRENCY_MAX", "10")
+    limiter = fetch_limiter_from_env(3)
+    assert (limiter.min_permits, limiter.limit, limiter.max_permits) == (1, 3, 10)
+    assert limiter.memory_budget_bytes == 400 * MB
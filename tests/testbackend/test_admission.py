@@ -0,0 +1,257 @@
+"""Token-bucket admission in front of the Responses API (admission.py).
+
+The fake Responses API enforces a TPM/RPM budget the way OpenAI does
+and answers 429 + ``retry-after`` when it is exceeded. Time runs 60x
+faster for both sides (one virtual minute per real second) so the
+budgets refill within a test.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from backend.llm.deep_school_insights import admission as admission_mod
+from backend.llm.deep_school_insights.admission import (
+    AdmissionController,
+    TokenBucket,
+    estimate_tokens,
+    get_admission_controller,
+    parse_reset,
+)
+from backend.llm.deep_school_insights.service import DeepSchoolInsightService
+
+SPEEDUP = 60.0
+_real_sleep = asyncio.sleep
+
+
+def _now():
+    return time.monotonic() * SPEEDUP
+
+
+@pytest.fixture(autouse=True)
+def fast_clock(monkeypatch):
+    monkeypatch.setattr(admission_mod, "time", SimpleNamespace(monotonic=_now, time=_now))
+    monkeypatch.setattr(
+        admission_mod, "asyncio", SimpleNamespace(sleep=lambda s: _real_sleep(s / SPEEDUP)),
+    )
+
+
+class _RateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after: float):
+        super().__init__("rate limited")
+        self.response = SimpleNamespace(headers={"retry-after": f"{retry_after:.3f}"})
+
+
+class _FakeResponses:
+    """Continuously replenished TPM/RPM budget, like the real API."""
+
+    def __init__(self, tpm: int, rpm: int, output_tokens: int = 50):
+        self.tpm, self.rpm, self.output_tokens = tpm, rpm, output_tokens
+        self.tokens, self.requests = float(tpm), float(rpm)
+        self.updated = _now()
+        self.calls = 0
+        self.rejections = 0
+        self.with_raw_response = SimpleNamespace(parse=self._raw_parse)
+
+    def spend(self, tokens: float) -> None:
+        self.tokens -= tokens
+
+    def _admit(self, kw):
+        now = _now()
+        elapsed, self.updated = now - self.updated, now
+        self.tokens = min(self.tpm, self.tokens + elapsed * self.tpm / 60)
+        self.requests = min(self.rpm, self.requests + elapsed * self.rpm / 60)
+        prompt = (len(kw["input"]) + len(kw["instructions"])) // 4
+        charged = prompt + kw["max_output_tokens"]
+        self.calls += 1
+        if charged > self.tokens or self.requests < 1:
+            self.rejections += 1
+            raise _RateLimitError(retry_after=(charged - self.tokens) * 60 / self.tpm)
+        self.tokens -= charged
+        self.requests -= 1
+        headers = {
+            "x-ratelimit-limit-tokens": str(self.tpm),
+            "x-ratelimit-remaining-tokens": str(int(self.tokens)),
+            "x-ratelimit-limit-requests": str(self.rpm),
+            "x-ratelimit-remaining-requests": str(int(self.requests)),
+        }
+        result = SimpleNamespace(output_parsed="ok", usage=SimpleNamespace(total_tokens=prompt + self.output_tokens))
+        return headers, result
+
+    async def parse(self, **kw):
+        await _real_sleep(0.001)
+        return self._admit(kw)[1]
+
+    async def _raw_parse(self, **kw):
+        await _real_sleep(0.001)
+        headers, result = self._admit(kw)
+        return SimpleNamespace(headers=headers, parse=lambda: result)
+
+
+def _service(responses, admission):
+    service = DeepSchoolInsightService(client=SimpleNamespace(responses=responses), llm_timeout_s=10.0)
+    service.admission = admission
+    return service
+
+
+async def _burst(service, n):
+    async def _one(i):
+        try:
+            return await service._responses_parse(
+                model="gpt-test",
+                input_text="x" * 400,
+                instructions="review this school",
+                text_format=None,
+                max_output_tokens=900,
+            )
+        except Exception as exc:
+            return exc
+
+    return await asyncio.gather(*(_one(i) for i in range(n)))
+
+
+@pytest.mark.asyncio
+async def test_burst_without_admission_hits_429s(monkeypatch):
+    monkeypatch.delenv("OPENAI_TPM_LIMIT", raising=False)
+    monkeypatch.delenv("OPENAI_RPM_LIMIT", raising=False)
+    api = _FakeResponses(tpm=10_000, rpm=100)
+    results = await _burst(_service(api, None), 20)
+
+    failures = [r for r in results if isinstance(r, Exception)]
+    assert len(failures) >= 9  # ~1000 tokens each: only ~10 fit the budget
+
+
+@pytest.mark.asyncio
+async def test_admission_queues_the_burst_instead_of_failing():
+    api = _FakeResponses(tpm=10_000, rpm=100)
+    controller = AdmissionController(tokens_per_minute=10_000, requests_per_minute=100)
+    t0 = time.monotonic()
+    results = await _burst(_service(api, controller), 20)
+    elapsed = time.monotonic() - t0
+
+    assert all(getattr(r, "output_parsed", None) == "ok" for r in results)
+    assert api.rejections <= 2
+    assert controller.stats.queued >= 9
+    assert controller.stats.used_tokens < controller.stats.estimated_tokens
+    assert 0.5 < elapsed < 5  # ~one virtual minute of refill
+
+
+@pytest.mark.asyncio
+async def test_429_pauses_admissions_and_requeues():
+    api = _FakeResponses(tpm=10_000, rpm=100)
+    api.spend(10_000)  # budget already spent by another client
+    controller = AdmissionController(tokens_per_minute=10_000, requests_per_minute=100)
+
+    results = await _burst(_service(api, controller), 3)
+
+    assert all(getattr(r, "output_parsed", None) == "ok" for r in results)
+    assert controller.stats.rate_limited >= 1
+    assert api.rejections == controller.stats.rate_limited
+
+
+@pytest.mark.asyncio
+async def test_headers_shrink_an_optimistic_budget():
+    api = _FakeResponses(tpm=5_000, rpm=100)
+    controller = AdmissionController(tokens_per_minute=100_000, requests_per_minute=1_000)
+
+    results = await _burst(_service(api, controller), 12)
+
+    assert all(getattr(r, "output_parsed", None) == "ok" for r in results)
+    assert controller.tokens.capacity == 5_000
+    assert controller.requests.capacity == 100
+
+
+def test_usage_refund_credits_the_bucket():
+    controller = AdmissionController(tokens_per_minute=6_000, requests_per_minute=60)
+    now = _now()
+    controller.tokens.reserve(3_000, now)
+    controller.observe(None, estimated=3_000, used=1_000)
+
+    assert controller.tokens.tokens == pytest.approx(5_000, abs=5)
+    assert controller.stats.used_tokens == 1_000
+
+
+def test_token_bucket_debt_and_refill():
+    bucket = TokenBucket(600)  # 10/s
+    now = 1000.0
+    bucket._updated = now
+    assert bucket.reserve(600, now) == 0
+    assert bucket.reserve(100, now) == pytest.approx(10.0)
+    bucket._refill(now + 10)
+    assert bucket.tokens == pytest.approx(0.0)
+
+
+def test_parse_reset_and_estimate():
+    assert parse_reset("2") == 2.0
+    assert parse_reset("1m30s") == 90.0
+    assert parse_reset("20ms") == pytest.approx(0.02)
+    assert parse_reset("6m0.5s") == pytest.approx(360.5)
+    assert parse_reset(None) is None
+    assert parse_reset("soon") is None
+    assert estimate_tokens("a" * 350, None, max_output_tokens=500) == 601
+
+
+@pytest.mark.asyncio
+async def test_shared_window_holds_back_a_second_worker(fake_redis):
+    redis = fake_redis
+    # Each worker alone would admit three 1000-token calls immediately.
+    workers = [AdmissionController(3_000, 100, redis_client=redis) for _ in range(2)]
+
+    await asyncio.gather(*(w.acquire(1_000) for w in workers for _ in range(3)))
+
+    assert sum(w.stats.window_waits for w in workers) >= 3
+    window_totals = [v for k, v in redis.store.items() if k.endswith(":tokens")]
+    assert max(window_totals) <= 3_000
+    # One script call per admission attempt: no incr-then-decrement.
+    assert redis.commands == 6 + sum(w.stats.window_waits for w in workers)
+
+
+@pytest.mark.asyncio
+async def test_shared_window_errors_admit_the_request(fake_redis):
+    fake_redis.fail = True
+    controller = AdmissionController(3_000, 100, redis_client=fake_redis)
+    waited = await controller.acquire(1_000)
+    assert waited < 1.0
+
+
+@pytest.mark.asyncio
+async def test_oversized_request_is_admitted_into_an_empty_window(fake_redis):
+    controller = AdmissionController(1_000, 100, redis_client=fake_redis)
+
+    await controller._acquire_window(5_000)
+
+    assert controller.stats.window_waits == 0
+    assert [v for k, v in fake_redis.store.items() if k.endswith(":tokens")] == [5_000]
+
+
+@pytest.mark.asyncio
+async def test_stats_since_reports_one_run_of_a_shared_controller():
+    controller = AdmissionController(100_000, 100)
+    await controller.acquire(1_000)
+    start = controller.stats.copy()
+
+    await controller.acquire(2_000)
+    await controller.acquire(3_000)
+    run = controller.stats.since(start)
+
+    assert (run.admitted, run.estimated_tokens) == (2, 5_000)
+    assert (controller.stats.admitted, controller.stats.estimated_tokens) == (3, 6_000)
+
+
+def test_controller_is_off_unless_a_limit_is_configured(monkeypatch):
+    monkeypatch.delenv("OPENAI_TPM_LIMIT", raising=False)
+    monkeypatch.delenv("OPENAI_RPM_LIMIT", raising=False)
+    assert get_admission_controller() is None
+
+    monkeypatch.setenv("OPENAI_TPM_LIMIT", "30000")
+    monkeypatch.setenv("OPENAI_ADMISSION_URL", "")
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    controller = get_admission_controller()
+    assert controller.tokens.capacity == 30_000
+    assert controller is get_admission_controller()
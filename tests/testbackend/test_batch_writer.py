@@ -0,0 +1,230 @@
+"""Tests for backend/database/batch_writer.py."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from postgrest.exceptions import APIError
+
+from backend.database.batch_writer import BatchUpsertWriter, is_transient_error
+from backend.database.name_matching import school_name_matcher
+from backend.database.name_matching.school_name_matcher import SchoolNameMatcher
+
+
+class _FakeQuery:
+    def __init__(self, client, name):
+        self._client = client
+        self._name = name
+        self._op = "select"
+        self._payload = None
+        self._in = None
+
+    def select(self, *_args, **_kwargs):
+        return self
+
+    def in_(self, column, values):
+        self._in = (column, set(values))
+        return self
+
+    def upsert(self, rows, on_conflict=None):
+        self._op = "upsert"
+        self._payload = (rows, on_conflict)
+        return self
+
+    def insert(self, rows):
+        self._op = "insert"
+        self._payload = (rows, self._client.insert_key)
+        return self
+
+    def execute(self):
+        table = self._client.tables.setdefault(self._name, {})
+        if self._op == "select":
+            self._client.selects += 1
+            rows = list(table.values())
+            if self._in:
+                column, values = self._in
+                rows = [r for r in rows if r.get(column) in values]
+            return SimpleNamespace(data=[dict(r) for r in rows])
+
+        rows, on_conflict = self._payload
+        self._client.upsert_calls.append(len(rows))
+        if self._client.failures:
+            self._client.failures -= 1
+            raise APIError({"message": "JSON could not be generated", "code": 503, "details": "upstream timeout"})
+        if any(row.get("bad") for row in rows):
+            raise APIError({"message": "invalid input syntax for type integer", "code": "22P02"})
+        keys = on_conflict.split(",")
+        if self._op == "insert" and any(tuple(row[k] for k in keys) in table for row in rows):
+            raise APIError({"message": "duplicate key value violates unique constraint", "code": "23505"})
+        for row in rows:
+            key = tuple(row[k] for k in keys)
+            table[key] = {**table.get(key, {}), **row}
+        return SimpleNamespace(data=rows)
+
+
+class _FakeClient:
+    def __init__(self, tables=None, failures=0):
+        self.tables = tables or {}
+        self.failures = failures
+        self.selects = 0
+        self.upsert_calls = []
+        self.insert_key = "school_name"
+
+    def table(self, name):
+        return _FakeQuery(self, name)
+
+
+def _mapping_table(n):
+    return {
+        (f"School {i}",): {
+            "school_name": f"School {i}",
+            "team_name": None,
+            "match_type": "no_match",
+            "confidence_score": None,
+            "normalized_school_name": f"School {i}",
+            "verified": None,
+        }
+        for i in range(n)
+    }
+
+
+def test_chunks_and_retries_failed_chunk():
+    client = _FakeClient(failures=1)
+    sleeps = []
+    writer = BatchUpsertWriter(client, "t", on_conflict="k", chunk_size=4, backoff_s=0.5, sleep=sleeps.append)
+
+    result = writer.write([{"k": i, "v": i} for i in range(10)])
+
+    assert client.upsert_calls == [4, 4, 4, 2]
+    assert sleeps == [0.5]
+    assert result.retries == 1
+    assert result.chunks == 3
+    assert result.rows_written == 10
+    assert result.rows_failed == 0
+    assert len(client.tables["t"]) == 10
+    assert result.rows_per_second > 0
+
+
+def test_chunk_failing_every_attempt_is_reported_not_raised():
+    client = _FakeClient(failures=100)
+    writer = BatchUpsertWriter(client, "t", on_conflict="k", chunk_size=3, max_retries=2, sleep=lambda _s: None)
+
+    result = writer.write([{"k": i} for i in range(4)])
+
+    assert result.rows_written == 0
+    assert result.rows_failed == 4
+    assert result.failed_keys == [(0,), (1,), (2,), (3,)]
+    assert len(client.upsert_calls) == 6
+
+
+@pytest.mark.parametrize("error, transient", [
+    (APIError({"message": "upstream", "code": 503}), True),
+    (APIError({"message": "too many requests", "code": "429"}), True),
+    (APIError({"message": "deadlock detected", "code": "40P01"}), True),
+    (APIError({"message": "canceling statement due to statement timeout", "code": "57014"}), True),
+    (APIError({"message": "connection pool timeout", "code": "PGRST003"}), True),
+    (httpx.ReadTimeout("timed out"), True),
+    (httpx.ConnectError("refused"), True),
+    (APIError({"message": "duplicate key", "code": "23505"}), False),
+    (APIError({"message": "column does not exist", "code": "PGRST204"}), False),
+    (APIError({"message": "bad request", "code": 400}), False),
+    (ValueError("boom"), False),
+])
+def test_only_transient_errors_are_retried(error, transient):
+    assert is_transient_error(error) is transient
+
+
+def test_rejected_chunk_is_bisected_to_the_bad_rows():
+    client = _FakeClient()
+    sleeps = []
+    writer = BatchUpsertWriter(client, "t", on_conflict="k", chunk_size=8, sleep=sleeps.append)
+    rows = [{"k": i, "bad": i in (2, 5)} for i in range(10)]
+
+    result = writer.write(rows)
+
+    assert result.rows_written == 8
+    assert result.rows_failed == 2
+    assert result.failed_keys == [(2,), (5,)]
+    assert sorted(k for (k,) in client.tables["t"]) == [0, 1, 3, 4, 6, 7, 8, 9]
+    assert result.retries == 0 and sleeps == []
+    assert result.splits > 0
+
+
+def test_insert_mode_rejects_existing_keys_without_overwriting():
+    client = _FakeClient(tables={"t": {(1,): {"k": 1, "v": "old"}}})
+    client.insert_key = "k"
+    writer = BatchUpsertWriter(client, "t", on_conflict="k", mode="insert")
+
+    result = writer.write([{"k": i, "v": "new"} for i in range(4)])
+
+    assert result.rows_written == 3
+    assert result.failed_keys == [(1,)]
+    assert client.tables["t"][(1,)]["v"] == "old"
+    with pytest.raises(ValueError):
+        BatchUpsertWriter(client, "t", on_conflict="k", mode="merge")
+
+
+def test_only_changed_skips_identical_rows_and_ignores_columns():
+    client = _FakeClient(tables={"t": {
+        (1, 2025): {"school": 1, "season": 2025, "need": 0.5, "updated_at": "old"},
+        (2, 2025): {"school": 2, "season": 2025, "need": 0.1, "updated_at": "old"},
+    }})
+    writer = BatchUpsertWriter(client, "t", on_conflict="school,season")
+
+    rows = [
+        {"school": 1, "season": 2025, "need": 0.5, "updated_at": "new"},
+        {"school": 2, "season": 2025, "need": 0.9, "updated_at": "new"},
+        {"school": 3, "season": 2025, "need": 0.2, "updated_at": "new"},
+    ]
+    result = writer.write(rows, only_changed=True, ignore_columns=["updated_at"])
+
+    assert result.rows_unchanged == 1
+    assert result.changed_keys == [(2, 2025), (3, 2025)]
+    assert client.upsert_calls == [2]
+
+
+def test_upload_to_database_dry_run_diff_then_write(monkeypatch):
+    monkeypatch.setenv("SUPABASE_URL", "https://example.invalid")
+    monkeypatch.setenv("SUPABASE_SERVICE_KEY", "key")
+    client = _FakeClient(tables={"school_baseball_ranking_name_mapping": _mapping_table(1200)})
+    monkeypatch.setattr(school_name_matcher, "create_client", lambda url, key: client)
+    matcher = SchoolNameMatcher()
+
+    results = [matcher.match_school_to_team(f"School {i}", ["Team A"]) for i in range(1200)]
+    results[7] = {**results[7], "team_name": "Team A", "match_type": "fuzzy", "confidence_score": 0.93}
+    results.append({**results[0], "school_name": "Not In Table"})
+
+    dry = matcher.upload_to_database(results, dry_run=True)
+    assert dry.changed_keys == [("School 7",)]
+    assert dry.rows_missing == 1
+    assert client.upsert_calls == []
+
+    written = matcher.upload_to_database(results)
+    assert written.rows_written == 1
+    assert client.upsert_calls == [1]
+    stored = client.tables["school_baseball_ranking_name_mapping"][("School 7",)]
+    assert stored["team_name"] == "Team A"
+    assert ("Not In Table",) not in client.tables["school_baseball_ranking_name_mapping"]
+    # Diff reads stay batched: 1,201 keys in chunks of 500
+    assert client.selects == 6
+
+
+def test_upload_to_database_insert_mode_keeps_insert_semantics(monkeypatch):
+    monkeypatch.setenv("SUPABASE_URL", "https://example.invalid")
+    monkeypatch.setenv("SUPABASE_SERVICE_KEY", "key")
+    client = _FakeClient(tables={"school_baseball_ranking_name_mapping": _mapping_table(2)})
+    monkeypatch.setattr(school_name_matcher, "create_client", lambda url, key: client)
+    matcher = SchoolNameMatcher()
+
+    results = [matcher.match_school_to_team(name, ["Team A"]) for name in ("School 0", "Team A", "New School")]
+    results[0] = {**results[0], "match_type": "fuzzy"}
+
+    written = matcher.upload_to_database(results, use_update=False)
+
+    table = client.tables["school_baseball_ranking_name_mapping"]
+    assert written.rows_written == 2
+    assert written.failed_keys == [("School 0",)]
+    assert table[("School 0",)]["match_type"] == "no_match"
+    assert ("Team A",) in table and ("New School",) in table
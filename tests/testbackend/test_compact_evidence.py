@@ -0,0 +1,93 @@
+"""Slotted, interning evidence types and their compact cache encoding."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+
+import pytest
+from bs4 import BeautifulSoup
+
+from backend.database import school_evidence_cache as cache_mod
+from backend.llm.deep_school_insights.types import (
+    MatchedPlayer,
+    PageFetch,
+    PageValidators,
+    ParsedPlayer,
+    ParsedStatLine,
+)
+
+
+def _fresh(value: str) -> str:
+    return "".join(list(value))
+
+
+def _matched():
+    return [
+        MatchedPlayer(
+            player=ParsedPlayer(
+                name="Jane Doe", jersey_number="12", position_raw="RHP", position_normalized="P",
+                position_family="pitcher", class_year_raw="R-So.", normalized_class_year=2,
+                is_redshirt=True, hometown="Austin, Texas",
+            ),
+            pitching_stats=ParsedStatLine(
+                jersey_number="12", player_name="Jane Doe", stat_type="pitching",
+                games_played=14, games_started=9,
+            ),
+        ),
+        MatchedPlayer(player=ParsedPlayer(name="Sam Roe")),
+    ]
+
+
+def test_types_are_slotted_and_intern_repeated_strings():
+    a = ParsedPlayer(name="A", position_raw=_fresh("INF"), class_year_raw=_fresh("Jr."))
+    b = ParsedPlayer(name="B", position_raw=_fresh("INF"), class_year_raw=_fresh("Jr."))
+
+    assert a.position_raw is b.position_raw and a.class_year_raw is b.class_year_raw
+    assert ParsedStatLine(stat_type=_fresh("batting")).stat_type is ParsedStatLine(stat_type=_fresh("batting")).stat_type
+    for obj in (a, ParsedStatLine(), MatchedPlayer(player=a)):
+        assert not hasattr(obj, "__dict__")
+        with pytest.raises(AttributeError):
+            obj.unknown_field = 1
+
+
+def test_soup_strings_are_stored_as_plain_str():
+    cell = BeautifulSoup("<td>C</td>", "html.parser").td.string
+
+    player = ParsedPlayer(name="A", position_raw=cell)
+
+    assert type(player.position_raw) is str and player.position_raw == "C"
+
+
+def test_matched_players_round_trip_without_default_fields():
+    matched = _matched()
+
+    blob = cache_mod.serialize_matched_players(matched)
+
+    assert blob[1] == {"player": {"name": "Sam Roe"}}
+    assert "high_school" not in blob[0]["player"] and "batting_stats" not in blob[0]
+    assert cache_mod.deserialize_matched_players(blob) == matched
+
+
+def test_rows_written_with_full_dicts_still_decode():
+    matched = _matched()
+    legacy_blob = [asdict(m) for m in matched]
+    legacy_blob[0]["player"]["retired_field"] = "x"
+
+    assert cache_mod.deserialize_matched_players(legacy_blob) == matched
+
+
+def test_page_items_round_trip_through_a_row():
+    players = [m.player for m in _matched()]
+    stats = [ParsedStatLine(jersey_number="4", player_name="Sam Roe", stat_type="batting", games_played=3)]
+    roster = PageFetch(items=players, url="https://x.edu/roster", status="parsed",
+                       validators=PageValidators(url="https://x.edu/roster", etag='"a"'))
+    stats_page = PageFetch(items=stats, url="https://x.edu/stats", status="parsed",
+                           validators=PageValidators(url="https://x.edu/stats", content_hash="h"))
+
+    row = cache_mod.serialize_pages(roster, stats_page)
+    pages = cache_mod.previous_pages_from_row(row)
+
+    assert row["parsed_stats"] == [{"jersey_number": "4", "player_name": "Sam Roe",
+                                    "stat_type": "batting", "games_played": 3}]
+    assert pages["roster"].items == players and pages["stats"].items == stats
+    assert pages["roster"].validators == roster.validators
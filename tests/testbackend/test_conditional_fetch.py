@@ -0,0 +1,171 @@
+"""Tests for conditional roster/stats re-fetch with stored validators.
+
+Serves pages from an httpx.MockTransport so the fetch code runs end to
+end without network.
+"""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from backend.database import school_evidence_cache as cache_mod
+from backend.llm.deep_school_insights import fetch as fetch_mod
+from backend.llm.deep_school_insights.types import (
+    CachedPage,
+    PageFetchStats,
+    PageValidators,
+    ParsedPlayer,
+    ParsedStatLine,
+)
+
+
+ROSTER_URL = "https://example.edu/sports/baseball/roster"
+STATS_URL = "https://example.edu/sports/baseball/stats"
+SCHOOL = {"school_name": "Example U", "roster_url": ROSTER_URL}
+
+ROSTER_HTML = b"""
+<html><body><table class="sidearm-table">
+  <thead><tr><th>#</th><th>Name</th><th>Pos.</th><th>Yr.</th></tr></thead>
+  <tbody><tr><td>4</td><td>Jane Doe</td><td>SS</td><td>Jr.</td></tr></tbody>
+</table></body></html>
+"""
+
+
+def _serve(monkeypatch, handler):
+    seen = []
+
+    def _handler(request):
+        seen.append(request)
+        return handler(request)
+
+    monkeypatch.setattr(
+        fetch_mod, "make_httpx_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(_handler)),
+    )
+    return seen
+
+
+def _previous(url, items, *, etag=None, body=None, parser_version=fetch_mod.PARSER_VERSION):
+    return CachedPage(
+        validators=PageValidators(
+            url=url,
+            etag=etag,
+            last_modified="Sun, 01 Jun 2026 04:00:00 GMT",
+            content_hash=fetch_mod.content_hash(body) if body is not None else None,
+            parser_version=parser_version,
+        ),
+        items=items,
+    )
+
+
+def _fail_parse(*_args, **_kwargs):
+    raise AssertionError("page should not have been parsed")
+
+
+@pytest.mark.asyncio
+async def test_304_reuses_stored_players_without_parsing(monkeypatch):
+    seen = _serve(monkeypatch, lambda r: httpx.Response(304, headers={"ETag": '"v2"'}))
+    monkeypatch.setattr(fetch_mod, "parse_roster_html", _fail_parse)
+    stored = [ParsedPlayer(name="Jane Doe", jersey_number="4")]
+
+    page = await fetch_mod.fetch_roster_page(SCHOOL, _previous(ROSTER_URL, stored, etag='"v1"'))
+
+    assert seen[0].headers["If-None-Match"] == '"v1"'
+    assert seen[0].headers["If-Modified-Since"] == "Sun, 01 Jun 2026 04:00:00 GMT"
+    assert page.status == "not_modified"
+    assert page.skipped
+    assert page.items == stored
+    assert page.validators.etag == '"v2"'
+
+
+@pytest.mark.asyncio
+async def test_unchanged_body_hash_skips_parsing(monkeypatch):
+    _serve(monkeypatch, lambda r: httpx.Response(200, content=ROSTER_HTML))
+    monkeypatch.setattr(fetch_mod, "parse_roster_html", _fail_parse)
+    stored = [ParsedPlayer(name="Jane Doe", jersey_number="4")]
+
+    page = await fetch_mod.fetch_roster_page(SCHOOL, _previous(ROSTER_URL, stored, body=ROSTER_HTML))
+
+    assert page.status == "unchanged"
+    assert page.items == stored
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("parser_version", [None, fetch_mod.PARSER_VERSION - 1])
+async def test_items_from_another_parser_version_are_reparsed(monkeypatch, parser_version):
+    seen = _serve(monkeypatch, lambda r: httpx.Response(200, content=ROSTER_HTML))
+    previous = _previous(
+        ROSTER_URL, [ParsedPlayer(name="Old Parse")], etag='"v1"', body=ROSTER_HTML,
+        parser_version=parser_version,
+    )
+
+    page = await fetch_mod.fetch_roster_page(SCHOOL, previous)
+
+    assert "If-None-Match" not in seen[0].headers
+    assert page.status == "parsed"
+    assert [p.name for p in page.items] == ["Jane Doe"]
+    assert page.validators.parser_version == fetch_mod.PARSER_VERSION
+
+
+@pytest.mark.asyncio
+async def test_changed_body_is_parsed_and_validators_recorded(monkeypatch):
+    _serve(monkeypatch, lambda r: httpx.Response(200, content=ROSTER_HTML, headers={"ETag": '"v3"'}))
+    previous = _previous(ROSTER_URL, [ParsedPlayer(name="Old Player")], body=b"<html>old</html>")
+
+    page = await fetch_mod.fetch_roster_page(SCHOOL, previous)
+
+    assert page.status == "parsed"
+    assert [p.name for p in page.items] == ["Jane Doe"]
+    assert page.validators.etag == '"v3"'
+    assert page.validators.content_hash == fetch_mod.content_hash(ROSTER_HTML)
+
+
+@pytest.mark.asyncio
+async def test_validators_for_another_url_are_not_sent(monkeypatch):
+    seen = _serve(monkeypatch, lambda r: httpx.Response(200, content=ROSTER_HTML))
+    previous = _previous("https://old.example.edu/roster", [], etag='"v1"', body=ROSTER_HTML)
+
+    page = await fetch_mod.fetch_roster_page(SCHOOL, previous)
+
+    assert "If-None-Match" not in seen[0].headers
+    assert page.status == "parsed"
+
+
+@pytest.mark.asyncio
+async def test_gather_evidence_counts_skipped_pages(monkeypatch):
+    def handler(request):
+        if str(request.url) == STATS_URL:
+            return httpx.Response(304)
+        return httpx.Response(200, content=ROSTER_HTML)
+
+    _serve(monkeypatch, handler)
+    stats = [ParsedStatLine(jersey_number="4", player_name="Doe, Jane", stat_type="batting", games_played=30)]
+    previous = {
+        "roster": _previous(ROSTER_URL, [], body=b"<html>old</html>"),
+        "stats": _previous(STATS_URL, stats, etag='"s1"'),
+    }
+    page_stats = PageFetchStats()
+
+    await fetch_mod.gather_evidence(SCHOOL, {"primary_position": "SS"}, [], previous, page_stats)
+
+    assert (page_stats.fetched, page_stats.not_modified, page_stats.unchanged) == (2, 1, 0)
+    assert page_stats.skipped_pct == 50.0
+
+
+def test_pages_round_trip_through_cache_row():
+    players = [ParsedPlayer(name="Jane Doe", jersey_number="4", position_family="IF")]
+    stats = [ParsedStatLine(jersey_number="4", player_name="Doe, Jane", stat_type="batting")]
+    roster = fetch_mod.PageFetch(
+        items=players, url=ROSTER_URL, status="parsed",
+        validators=PageValidators(url=ROSTER_URL, etag='"v1"', content_hash="abc"),
+    )
+    failed_stats = fetch_mod.PageFetch(items=stats, url=STATS_URL, status="failed")
+
+    row = {"school_name": "Example U", **cache_mod.serialize_pages(roster, failed_stats)}
+    pages = cache_mod.previous_pages_from_row(row)
+
+    assert set(pages) == {"roster"}
+    assert pages["roster"].items == players
+    assert pages["roster"].validators == roster.validators
+    assert row["parsed_stats"] == []
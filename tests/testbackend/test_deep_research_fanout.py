@@ -0,0 +1,250 @@
+"""Fan-out of deep research over Celery subtasks + the aggregation step."""
+
+from __future__ import annotations
+
+import copy
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+
+from backend.database import school_evidence_cache as cache_mod
+from backend.llm import tasks
+from backend.llm.deep_school_insights.service import DeepSchoolInsightService
+from backend.llm.deep_school_insights.types import (
+    DeepSchoolReview,
+    GatheredEvidence,
+    OpportunityContext,
+    RecruitingContext,
+    RosterContext,
+)
+
+
+class _FakeQuery:
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.payload = None
+
+    def select(self, *_args):
+        return self
+
+    def eq(self, *_args):
+        return self
+
+    def limit(self, *_args):
+        return self
+
+    def update(self, payload):
+        self.payload = payload
+        return self
+
+    def execute(self):
+        row = self.db.rows[self.table]
+        if self.payload is not None:
+            self.db.updates.append(copy.deepcopy(self.payload))
+            row.update(self.payload)
+            return SimpleNamespace(data=[row])
+        return SimpleNamespace(data=[copy.deepcopy(row)])
+
+
+class _FakeSupabase:
+    def __init__(self, status="processing"):
+        self.rows = {"prediction_runs": {"llm_reasoning_status": status, "preferences_response": {}}}
+        self.updates: List[Dict[str, Any]] = []
+
+    def table(self, name):
+        return _FakeQuery(self, name)
+
+
+class _StubService(DeepSchoolInsightService):
+    """Evidence is instant; 'Broken' fails alone, 'Crash' takes down its group."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(client=object(), llm_timeout_s=10.0)
+        self.has_responses_parse = True
+
+    async def research_schools(self, eligible, *args, **kwargs):
+        if any(s["school_name"] == "Crash" for s in eligible):
+            raise MemoryError("worker ran out of memory")
+        await super().research_schools(eligible, *args, **kwargs)
+
+    async def _gather_evidence(self, school, player_stats, trusted_domains, previous_pages=None, page_stats=None):
+        if school["school_name"] == "Broken":
+            raise RuntimeError("fetch exploded")
+        return GatheredEvidence(
+            roster_context=RosterContext(position_data_quality="exact"),
+            recruiting_context=RecruitingContext(),
+            opportunity_context=OpportunityContext(competition_level="medium", opportunity_level="medium"),
+        )
+
+    async def _review_school(self, school, player_stats, baseball_assessment, academic_score,
+                             evidence, talking_points):
+        return DeepSchoolReview(
+            base_athletic_fit="Fit",
+            opportunity_fit="Fit",
+            final_school_view="Fit",
+            adjustment_from_base="none",
+            confidence="medium",
+            why_this_school=f"Why {school['school_name']}",
+        )
+
+
+@pytest.fixture
+def eager(monkeypatch):
+    monkeypatch.setattr(cache_mod, "load_cache_batch", lambda names: {})
+    monkeypatch.setattr(cache_mod, "load_previous_pages", lambda names: {})
+    monkeypatch.setattr(tasks, "DeepSchoolInsightService", _StubService)
+    monkeypatch.setitem(tasks.celery_app.conf, "task_always_eager", True)
+    monkeypatch.setitem(tasks.celery_app.conf, "task_eager_propagates", True)
+    db = _FakeSupabase()
+    monkeypatch.setattr(tasks, "get_supabase_admin_client", lambda: db)
+    return db
+
+
+def _payload(names, final_limit=None):
+    return {
+        "run_id": "run-1",
+        "schools": [
+            {"school_name": n, "delta": float(len(names) - i), "fit_label": "Fit"}
+            for i, n in enumerate(names)
+        ],
+        "player_stats": {"primary_position": "SS"},
+        "baseball_assessment": {"predicted_tier": "Non-D1"},
+        "academic_score": {},
+        "final_limit": final_limit,
+    }
+
+
+def test_fanout_groups_aggregate_into_one_ranked_list(eager, monkeypatch):
+    monkeypatch.setenv("DEEP_RESEARCH_FANOUT_GROUP_SIZE", "2")
+    names = ["A", "B", "Broken", "C", "Crash", "D"]
+
+    result = tasks.generate_deep_school_research(_payload(names, final_limit=6))
+
+    assert result == {"status": "dispatched", "run_id": "run-1", "groups": 3}
+    final = eager.updates[-1]
+    assert final["llm_reasoning_status"] == "completed"
+    schools = final["preferences_response"]["schools"]
+    assert sorted(s["school_name"] for s in schools) == sorted(names)
+    assert [s["rank"] for s in schools] == [1, 2, 3, 4, 5, 6]
+    by_name = {s["school_name"]: s for s in schools}
+    assert by_name["Broken"]["research_status"] == "failed"
+    assert by_name["C"]["research_status"] == "completed"
+    # Crash's subtask died: its whole group is failed but the chord finished.
+    assert by_name["Crash"]["research_status"] == "failed"
+    assert by_name["D"]["research_status"] == "failed"
+    assert by_name["A"]["why_this_school"] == "Why A"
+    assert all("_research_id" not in s for s in schools)
+    progress = next(u["research_progress"] for u in eager.updates if "research_progress" in u)
+    assert progress["final"] is True
+    assert [s["school_name"] for s in progress["schools"]] == [s["school_name"] for s in schools]
+
+
+def test_fanout_matches_single_task_ranking(eager, monkeypatch):
+    names = ["A", "B", "C", "D"]
+    monkeypatch.delenv("DEEP_RESEARCH_FANOUT_GROUP_SIZE", raising=False)
+    tasks.generate_deep_school_research(_payload(names, final_limit=4))
+    single = eager.updates[-1]["preferences_response"]["schools"]
+
+    monkeypatch.setenv("DEEP_RESEARCH_FANOUT_GROUP_SIZE", "3")
+    eager.rows["prediction_runs"]["llm_reasoning_status"] = "processing"
+    tasks.generate_deep_school_research(_payload(names, final_limit=4))
+    fanned = eager.updates[-1]["preferences_response"]["schools"]
+
+    assert [(s["school_name"], s["rank"]) for s in fanned] == [(s["school_name"], s["rank"]) for s in single]
+
+
+@pytest.mark.parametrize("group_size", ["0", "2"])
+def test_retried_task_keeps_progress_versions_increasing(eager, monkeypatch, group_size):
+    monkeypatch.setenv("DEEP_RESEARCH_FANOUT_GROUP_SIZE", group_size)
+    names = ["A", "B", "C"]
+
+    def _versions():
+        return [u["research_progress"]["version"] for u in eager.updates if "research_progress" in u]
+
+    tasks.generate_deep_school_research(_payload(names, final_limit=3))
+    first_attempt = _versions()
+    # Celery retry of the same run: the row still holds the last snapshot.
+    eager.rows["prediction_runs"]["llm_reasoning_status"] = "processing"
+    tasks.generate_deep_school_research(_payload(names, final_limit=3))
+    versions = _versions()
+
+    assert len(versions) > len(first_attempt)
+    assert versions == sorted(set(versions))
+    assert eager.rows["prediction_runs"]["research_progress"]["version"] == versions[-1]
+
+
+def test_aggregation_skips_when_run_already_terminal(eager):
+    eager.rows["prediction_runs"]["llm_reasoning_status"] = "completed"
+
+    result = tasks.aggregate_deep_school_research([[{"school_name": "A"}]], {"run_id": "run-1"})
+
+    assert result["status"] == "skipped"
+    assert eager.updates == []
+
+
+def _slim_payload(names, final_limit=None):
+    from backend.llm.research_payload import build_slim_payload
+
+    legacy = _payload(names, final_limit)
+    return build_slim_payload(
+        run_id=legacy["run_id"],
+        schools=legacy["schools"],
+        player_stats=legacy["player_stats"],
+        baseball_assessment=legacy["baseball_assessment"],
+        academic_score=legacy["academic_score"],
+        final_limit=final_limit,
+    )
+
+
+@pytest.mark.parametrize("group_size", ["0", "2"])
+def test_slim_message_rehydrates_pool_from_run_row(eager, monkeypatch, group_size):
+    monkeypatch.setenv("DEEP_RESEARCH_FANOUT_GROUP_SIZE", group_size)
+    names = ["A", "B", "C"]
+    tasks.generate_deep_school_research(_payload(names, final_limit=3))
+    legacy = eager.updates[-1]["preferences_response"]["schools"]
+
+    eager.rows["prediction_runs"]["llm_reasoning_status"] = "processing"
+    eager.rows["prediction_runs"]["research_input"] = {
+        "version": 2,
+        "schools": [
+            {**s, "metric_comparisons": [{"metric": "Exit Velocity"}]}
+            for s in _payload(names)["schools"]
+        ],
+    }
+    tasks.generate_deep_school_research(_slim_payload(names, final_limit=3))
+    final = eager.updates[-1]
+
+    assert final["llm_reasoning_status"] == "completed"
+    assert final["research_input"] is None
+    schools = final["preferences_response"]["schools"]
+    assert [s["school_name"] for s in schools] == [s["school_name"] for s in legacy]
+    assert all(s["metric_comparisons"] == [{"metric": "Exit Velocity"}] for s in schools)
+
+
+def test_slim_message_without_stored_pool_fails_the_run(eager):
+    result = tasks.generate_deep_school_research(_slim_payload(["A", "B"]))
+
+    assert result["status"] == "failed"
+    assert eager.updates[-1] == {"llm_reasoning_status": "failed", "research_input": None}
+
+
+def test_refs_resolve_schools_that_share_a_name():
+    from backend.llm.research_payload import build_slim_payload, rehydrate_schools
+
+    pool = [
+        {"school_name": "Saint Mary's College", "state": "CA"},
+        {"school_name": "Saint Mary's College", "state": "IN"},
+        {"school_name": "Other U", "state": "TX"},
+    ]
+    refs = build_slim_payload(
+        run_id="run-1", schools=pool, player_stats={}, baseball_assessment={}, academic_score={},
+    )["school_refs"]
+
+    assert rehydrate_schools(refs, pool) == pool
+    assert rehydrate_schools(refs[::-1], pool) == pool[::-1]
+    # A ref whose slot no longer holds that school is dropped, not mismatched.
+    assert rehydrate_schools(refs, pool[2:]) == []
+    # Refs enqueued before pool_index existed still resolve by name.
+    assert rehydrate_schools([{"school_name": "Other U"}], pool) == [pool[2]]
@@ -487,7 +487,7 @@ class _ReviewFailureStub(DeepSchoolInsightService):
             llm_timeout_s=1.0,
         )
 
-    async def _gather_evidence(self, school, player_stats, trusted_domains):
+    async def _gather_evidence(self, school, player_stats, trusted_domains, previous_pages=None, page_stats=None):
         return GatheredEvidence(
             roster_context=RosterContext(
                 position_data_quality="exact",
@@ -16,10 +16,12 @@ import pytest
 from backend.database import school_evidence_cache as cache_mod
 from backend.llm.deep_school_insights.service import DeepSchoolInsightService
 from backend.llm.deep_school_insights.types import (
+    CachedPage,
     DeepSchoolReview,
     GatheredEvidence,
     MatchedPlayer,
     OpportunityContext,
+    PageValidators,
     ParsedPlayer,
     ParsedStatLine,
     RecruitingContext,
@@ -58,9 +60,11 @@ class _CacheTrackingService(DeepSchoolInsightService):
         self.has_responses_parse = True
         self.live_fetch_count = 0
         self.live_fetched_schools: List[str] = []
+        self.gather_kwargs: Dict[str, Dict[str, Any]] = {}
 
-    async def _gather_evidence(self, school, player_stats, trusted_domains):
+    async def _gather_evidence(self, school, player_stats, trusted_domains, **kwargs):
         self.live_fetch_count += 1
+        self.gather_kwargs[school.get("school_name", "")] = kwargs
         self.live_fetched_schools.append(school.get("school_name", ""))
         return GatheredEvidence(
             roster_context=RosterContext(position_data_quality="exact"),
@@ -117,6 +121,11 @@ def _cache_row(school_name: str) -> Dict[str, Any]:
     }
 
 
+@pytest.fixture(autouse=True)
+def _no_stored_validators(monkeypatch):
+    monkeypatch.setattr(cache_mod, "load_previous_pages", lambda names: {})
+
+
 def _schools(names: List[str]) -> List[Dict[str, Any]]:
     return [
         {"school_name": name, "delta": 10.0 - i, "fit_label": "Fit"}
@@ -240,3 +249,71 @@ async def test_cache_hit_uses_player_position_filter(monkeypatch):
     # Both completed.
     assert ranked_inf[0]["research_status"] in ("completed", "metadata_only")
     assert ranked_p[0]["research_status"] in ("completed", "metadata_only")
+
+
+@pytest.mark.asyncio
+async def test_miss_with_stored_validators_fetches_conditionally(monkeypatch):
+    service = _CacheTrackingService()
+    pages = {
+        "roster": CachedPage(
+            validators=PageValidators(url="https://b.example.edu/roster", etag='"v1"'),
+            items=[ParsedPlayer(name="B player")],
+        )
+    }
+    requested = []
+
+    def _previous_pages(names):
+        requested.append(sorted(names))
+        return {"B": pages}
+
+    monkeypatch.setattr(cache_mod, "load_cache_batch", lambda names: {"A": _cache_row("A")})
+    monkeypatch.setattr(cache_mod, "load_previous_pages", _previous_pages)
+
+    await service.enrich_and_rerank(
+        schools=_schools(["A", "B", "C"]),
+        player_stats={"primary_position": "SS"},
+        baseball_assessment={"predicted_tier": "Non-D1"},
+        academic_score={},
+        final_limit=3,
+    )
+
+    # Only misses are looked up; only B has validators to send.
+    assert requested == [["B", "C"]]
+    assert service.gather_kwargs["B"]["previous_pages"] is pages
+    assert service.gather_kwargs["C"]["previous_pages"] is None
+
+
+@pytest.mark.asyncio
+async def test_demand_recording_does_not_hold_up_research(monkeypatch, caplog):
+    import threading
+
+    from backend.database import school_evidence_demand as demand_mod
+
+    service = _CacheTrackingService()
+    monkeypatch.setattr(cache_mod, "load_cache_batch", lambda names: {"A": _cache_row("A")})
+    release, recorded = threading.Event(), []
+
+    def _slow_record(school_names, hits):
+        release.wait(5)
+        recorded.append((school_names, hits))
+        raise RuntimeError("supabase unreachable")
+
+    monkeypatch.setattr(demand_mod, "record_lookup", _slow_record)
+    caplog.set_level("WARNING")
+
+    ranked = await service.enrich_and_rerank(
+        schools=_schools(["A", "B"]),
+        player_stats={"primary_position": "SS"},
+        baseball_assessment={"predicted_tier": "Non-D1"},
+        academic_score={},
+        final_limit=2,
+    )
+
+    assert len(ranked) == 2 and recorded == []
+    release.set()
+    for _ in range(100):
+        if any("school_evidence_demand record failed" in r.message for r in caplog.records):
+            break
+        await asyncio.sleep(0.01)
+    assert recorded == [(["A", "B"], ["A"])]
+    assert any("school_evidence_demand record failed" in r.message for r in caplog.records)
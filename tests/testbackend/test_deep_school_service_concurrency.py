@@ -81,7 +81,7 @@ class _CountingService(DeepSchoolInsightService):
         self.llm_peak = 0
         self._lock = asyncio.Lock()
 
-    async def _gather_evidence(self, school, player_stats, trusted_domains):
+    async def _gather_evidence(self, school, player_stats, trusted_domains, previous_pages=None, page_stats=None):
         async with self._lock:
             self.fetch_in_flight += 1
             self.fetch_peak = max(self.fetch_peak, self.fetch_in_flight)
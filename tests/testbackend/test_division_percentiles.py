@@ -0,0 +1,177 @@
+"""Tests for backend/baseball_rankings_scraper/division_percentiles.py."""
+
+from __future__ import annotations
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from backend.baseball_rankings_scraper.division_percentiles import DivisionPercentileTables
+from backend.baseball_rankings_scraper.rankings_integration import BaseballRankingsIntegration
+
+
+class _FakeQuery:
+    def __init__(self, client):
+        self._client = client
+        self._orders = []
+        self._not_null = []
+        self._range = None
+        self._limit = None
+
+    def select(self, *_args, **_kwargs):
+        return self
+
+    def order(self, key, desc=False):
+        self._orders.append((key, desc))
+        return self
+
+    @property
+    def not_(self):
+        return SimpleNamespace(is_=lambda key, value: self._not_null.append(key) or self)
+
+    def range(self, start, end):
+        self._range = (start, end)
+        return self
+
+    def limit(self, n):
+        self._limit = n
+        return self
+
+    def execute(self):
+        self._client.queries += 1
+        rows = [r for r in self._client.rows if all(r.get(k) is not None for k in self._not_null)]
+        for key, desc in reversed(self._orders):
+            # Postgres puts NULLs first in a descending order.
+            rows.sort(key=lambda r: (r.get(key) is None, r.get(key) or ""), reverse=desc)
+        if self._range:
+            rows = rows[self._range[0]:self._range[1] + 1]
+        if self._limit is not None:
+            rows = rows[:self._limit]
+        return SimpleNamespace(data=rows)
+
+
+class _FakeClient:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    def table(self, _name):
+        return _FakeQuery(self)
+
+
+def _rows(n_teams=40, years=(2023, 2024, 2025), scraped_at="2025-06-01T00:00:00"):
+    rng = random.Random(7)
+    rows = []
+    next_id = 1
+    for year in years:
+        for division in (1, 2, 3):
+            for t in range(n_teams):
+                rows.append({
+                    "id": next_id,
+                    "team_name": f"Team {division}-{t}",
+                    "year": year,
+                    "division": division,
+                    "overall_rating": round(rng.uniform(1, 300), 2) if t % 11 else None,
+                    "power_rating": 10.0,
+                    "offensive_rating": 10.0,
+                    "defensive_rating": 10.0,
+                    "win_percentage": 0.5,
+                    "record": "30-30",
+                    "scraped_at": scraped_at,
+                })
+                next_id += 1
+    return rows
+
+
+def _brute_force_percentile(rows, rating, year, division):
+    ratings = [
+        r["overall_rating"] for r in rows
+        if r["year"] == year and r["division"] == division and r["overall_rating"] is not None
+    ]
+    position = sum(1 for r in ratings if r > rating)
+    return round((position / len(ratings)) * 100, 1)
+
+
+def test_percentile_matches_linear_scan_and_pages_through_table():
+    rows = _rows()
+    client = _FakeClient(rows)
+    tables = DivisionPercentileTables(client, page_size=100)
+
+    for row in rows:
+        if row["overall_rating"] is None:
+            continue
+        assert tables.percentile(row["overall_rating"], row["year"], row["division"]) == (
+            _brute_force_percentile(rows, row["overall_rating"], row["year"], row["division"])
+        )
+
+    # ceil(360 / 100) pages, each read once for every lookup above.
+    assert client.queries == 4
+    assert tables.percentile(None, 2025, 1) is None
+    assert tables.percentile(50.0, 2019, 1) is None
+
+
+def test_new_scrape_triggers_reload():
+    rows = _rows(n_teams=5)
+    client = _FakeClient(rows)
+    tables = DivisionPercentileTables(client, staleness_check_interval_s=0)
+    tables.ensure_fresh()
+    assert not tables.is_stale()
+
+    client.rows = rows + [{
+        "id": 10_000,
+        "team_name": "Team 1-0",
+        "year": 2026,
+        "division": 1,
+        "overall_rating": 5.0,
+        "scraped_at": "2026-06-01T00:00:00",
+    }]
+    assert tables.is_stale()
+    assert tables.rows_for_team("Team 1-0")[0]["year"] == 2026
+
+
+def test_rows_without_scraped_at_do_not_hide_a_new_scrape():
+    rows = _rows(n_teams=5)
+    for row in rows:
+        row.pop("id")
+    rows[0]["scraped_at"] = None
+    client = _FakeClient(rows)
+    tables = DivisionPercentileTables(client, staleness_check_interval_s=0)
+    tables.ensure_fresh()
+
+    client.rows = rows + [{
+        "team_name": "Team 1-0", "year": 2026, "division": 1,
+        "overall_rating": 5.0, "scraped_at": "2026-06-01T00:00:00",
+    }]
+
+    assert tables.is_stale()
+    tables.ensure_fresh()
+    assert tables.rows_for_team("Team 1-0")[0]["year"] == 2026
+
+
+def test_compare_schools_strength_uses_no_queries_after_load():
+    rows = _rows()
+    client = _FakeClient(rows)
+    integration = BaseballRankingsIntegration.__new__(BaseballRankingsIntegration)
+    integration.supabase = client
+    integration.rankings_table = "baseball_rankings_data"
+    integration.name_resolver = SimpleNamespace(
+        get_team_name=lambda school_name, verified_only=True: school_name.replace(" University", "")
+    )
+    integration.percentile_tables = DivisionPercentileTables(client)
+
+    schools = [f"Team 1-{t} University" for t in range(1, 10)]
+    integration.percentile_tables.ensure_fresh()
+    queries_after_load = client.queries
+
+    comparison = integration.compare_schools_strength(schools)
+
+    assert client.queries == queries_after_load
+    assert comparison["comparison_summary"]["strongest_program"] in schools
+    profile = comparison["schools"]["Team 1-1 University"]
+    assert profile["years_with_data"] == [2025, 2024, 2023]
+    assert profile["division_percentile"] == _brute_force_percentile(
+        rows, profile["current_season"]["overall_rating"], 2025, 1
+    )
+    top = integration.get_division_rankings(2024, 1, limit=3)
+    assert [r["overall_rating"] for r in top] == sorted(r["overall_rating"] for r in top)
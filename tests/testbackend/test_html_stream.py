@@ -0,0 +1,124 @@
+"""Parity tests for backend/llm/deep_school_insights/html_stream.py.
+
+The streaming engine must return exactly what the full-soup path returns.
+"""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+pytest.importorskip("lxml")
+
+from backend.llm.deep_school_insights.html_stream import (
+    extract_page,
+    html_engine,
+    parse_roster_html,
+    parse_stats_html,
+)
+
+
+OSU_FIXTURE = os.path.join(
+    os.path.dirname(__file__),
+    "..", "..", "backend", "llm", "deep_school_insights",
+    "stats_osu_example.html",
+)
+
+ROSTER_CARDS_AND_TABLE = """
+<!DOCTYPE html>
+<html><head><script>window.x = "<table><tr><th>Name</th><th>Pos</th></tr></table>";</script>
+<style>.s-person-card { color: red }</style></head>
+<body>
+  <header><nav><table><tr><th>Name</th><th>Pos</th></tr><tr><td>Nav Guy</td><td>P</td></tr></table></nav></header>
+  <!-- <div class="s-person-card"><h3>Commented Out</h3></div> -->
+  <div class="roster">
+    <div class="s-person-card">
+      <h3><a>Alex Espaillat</a></h3>
+      <div class="s-stamp">Jersey Number 1</div>
+      <div>OF 6'0" 180 lbs R/R 1 Alex Espaillat So. Seminole, Fla. Seminole HS Full Bio</div>
+      <script>trackCard(1)</script>
+    </div>
+    <div class="s-person-card">
+      <h3><a>Breydon Divine</a></h3>
+      <div class="s-stamp">2</div>
+      <div>Position</div><div>RHP</div>
+      <div>Academic Year</div><div>R-Jr.</div>
+      <div>Previous School</div><div>Dodge City Community College</div>
+    </div>
+  </div>
+  <table class="sidearm-table">
+    <thead><tr><th>#</th><th>Name</th><th>Pos.</th><th>Yr.</th></tr></thead>
+    <tbody>
+      <tr><td>1</td><td><a>Alex Espaillat</a></td><td>OF</td><td>So.</td></tr>
+      <tr><td>2</td><td><a>Breydon Divine</a></td><td>RHP</td><td>Jr.</td></tr>
+    </tbody>
+  </table>
+  <footer><div class="s-person-card"><h3>Footer Person</h3></div></footer>
+</body></html>
+"""
+
+LEGACY_STATS = """
+<html><body>
+  <nav><ul><li>Home</li></ul></nav>
+  <table><tr><th>Pos</th></tr><tr><td>a</td></tr></table>
+  <section>
+    <table>
+      <thead><tr><th>#</th><th>Player</th><th>AVG</th><th>GP-GS</th><th>AB</th></tr></thead>
+      <tbody>
+        <tr><td>7</td><td><a href="/p/7">Graves II, Aaron</a></td><td>.310</td><td>40-38</td><td>150</td></tr>
+        <tr><td>12</td><td>Smith, John</td><td>.250</td><td>20-5</td><td>60</td></tr>
+        <tr><td></td><td>Totals</td><td>.280</td><td>56-56</td><td>2000</td></tr>
+      </tbody>
+    </table>
+    <table>
+      <thead><tr><th>#</th><th>Player</th><th>ERA</th><th>W-L</th><th>APP-GS</th><th>IP</th></tr></thead>
+      <tbody>
+        <tr><td>24</td><td>Herrenbruck, Pierce</td><td>2.10</td><td>5-1</td><td>11-11</td><td>60.0</td></tr>
+        <tr><td>30</td><td>Edrington, Andrew</td><td>3.40</td><td>2-0</td><td>16-0</td><td>22.1</td></tr>
+      </tbody>
+    </table>
+  </section>
+  <footer><table><tr><th>AVG</th><th>AB</th></tr><tr><td>1</td><td>2</td><td>3</td></tr><tr><td>x</td><td>y</td><td>z</td></tr></table></footer>
+</body></html>
+"""
+
+
+@pytest.mark.parametrize("html", [ROSTER_CARDS_AND_TABLE, LEGACY_STATS], ids=["roster", "legacy_stats"])
+def test_stream_engine_matches_soup_engine(html):
+    assert parse_roster_html(html, engine="stream") == parse_roster_html(html, engine="soup")
+    assert parse_stats_html(html, engine="stream") == parse_stats_html(html, engine="soup")
+
+
+def test_stream_engine_matches_soup_engine_on_osu_fixture():
+    with open(OSU_FIXTURE) as f:
+        html = f.read()
+
+    stream_records, source = parse_stats_html(html, engine="stream")
+    assert source == "nuxt"
+    assert (stream_records, source) == parse_stats_html(html, engine="soup")
+    assert len(stream_records) == 33
+    assert parse_roster_html(html, engine="stream") == parse_roster_html(html, engine="soup")
+
+
+def test_extract_page_keeps_only_relevant_fragments():
+    page = extract_page(ROSTER_CARDS_AND_TABLE, chunk_chars=97)
+
+    assert len(page.fragments) == 3
+    kept = "".join(page.fragments)
+    assert "Nav Guy" not in kept
+    assert "Footer Person" not in kept
+    assert "Commented Out" not in kept
+    assert "trackCard" not in kept
+    assert page.nuxt_payload is None
+
+    players, source = parse_roster_html(ROSTER_CARDS_AND_TABLE, engine="stream")
+    assert source == "html"
+    assert [p.name for p in players] == ["Alex Espaillat", "Breydon Divine"]
+
+
+def test_html_engine_env_override(monkeypatch):
+    monkeypatch.delenv("DEEP_RESEARCH_HTML_ENGINE", raising=False)
+    assert html_engine() == "stream"
+    monkeypatch.setenv("DEEP_RESEARCH_HTML_ENGINE", "soup")
+    assert html_engine() == "soup"
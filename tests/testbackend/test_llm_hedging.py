@@ -0,0 +1,205 @@
+"""Adaptive deadlines and hedged duplicates for Responses calls (hedging.py).
+
+The fake Responses API answers in ``FAST_S`` except for the calls its
+``slow`` set names, which stall for ``SLOW_S`` — the injected tail.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from backend.llm.deep_school_insights import hedging
+from backend.llm.deep_school_insights.hedging import HedgedCaller, HedgePolicy, LatencyTracker
+from backend.llm.deep_school_insights.service import DeepSchoolInsightService
+
+FAST_S = 0.01
+SLOW_S = 2.0
+MODEL = "gpt-test"
+
+
+class _SlowResponses:
+    def __init__(self, slow=(), slow_s=SLOW_S):
+        self.slow = set(slow)
+        self.slow_s = slow_s
+        self.calls = 0
+        self.cancelled = 0
+
+    async def parse(self, **kw):
+        self.calls += 1
+        n = self.calls
+        try:
+            await asyncio.sleep(self.slow_s if n in self.slow else FAST_S)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return SimpleNamespace(output_parsed=f"review {n}", usage=None)
+
+
+def _policy(**overrides):
+    values = dict(
+        timeout_s=10.0, min_samples=5, min_timeout_s=0.05, timeout_multiplier=3.0,
+        hedge_percentile=0.9,
+    )
+    values.update(overrides)
+    return HedgePolicy(**values)
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    tracker = LatencyTracker()
+    monkeypatch.setattr(hedging, "LATENCY", tracker)
+    return tracker
+
+
+def _service(responses, policy):
+    service = DeepSchoolInsightService(client=SimpleNamespace(responses=responses), llm_timeout_s=policy.timeout_s)
+    service.admission = None
+    service.llm_calls = HedgedCaller(policy)
+    return service
+
+
+async def _parse(service):
+    return await service._responses_parse(
+        model=MODEL, input_text="x" * 400, instructions="review this school",
+        text_format=None, max_output_tokens=900,
+    )
+
+
+async def _warm_up(service, n=5):
+    for _ in range(n):
+        await _parse(service)
+
+
+def test_env_policy_defaults_to_no_hedging(monkeypatch):
+    for name in ("OPENAI_HEDGE_BUDGET", "OPENAI_ADAPTIVE_TIMEOUT", "OPENAI_MIN_TIMEOUT_S"):
+        monkeypatch.delenv(name, raising=False)
+    policy = HedgePolicy.from_env(90.0)
+    assert policy.adaptive and policy.hedge_budget == 0.0 and policy.timeout_s == 90.0
+
+    monkeypatch.setenv("OPENAI_HEDGE_BUDGET", "0.05")
+    monkeypatch.setenv("OPENAI_ADAPTIVE_TIMEOUT", "off")
+    policy = HedgePolicy.from_env(90.0)
+    assert not policy.adaptive and policy.hedge_budget == 0.05
+
+
+def test_deadline_follows_the_latency_tail(tracker):
+    caller = HedgedCaller(_policy(min_timeout_s=1.0))
+    assert caller.deadline(MODEL) == 10.0  # too few samples: flat timeout
+
+    for latency in (0.5, 0.6, 0.7, 0.8, 0.9):
+        tracker.observe(MODEL, latency)
+    assert caller.deadline(MODEL) == pytest.approx(2.7)
+
+    tracker.observe(MODEL, 9.0)
+    assert caller.deadline(MODEL) == 10.0  # never above llm_timeout_s
+    assert HedgedCaller(_policy(adaptive=False)).deadline(MODEL) == 10.0
+
+
+@pytest.mark.asyncio
+async def test_stalled_call_fails_at_the_adaptive_deadline(tracker):
+    api = _SlowResponses(slow={6})
+    service = _service(api, _policy())
+    await _warm_up(service)
+
+    t0 = time.monotonic()
+    with pytest.raises(asyncio.TimeoutError):
+        await _parse(service)
+
+    assert time.monotonic() - t0 < SLOW_S / 2
+    assert service.llm_calls.stats.timeouts == 1 and api.cancelled == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_call_is_hedged_and_the_duplicate_wins(tracker):
+    api = _SlowResponses(slow={6})
+    service = _service(api, _policy(hedge_budget=0.5, min_timeout_s=5.0))
+    await _warm_up(service)
+
+    t0 = time.monotonic()
+    result = await _parse(service)
+
+    assert time.monotonic() - t0 < SLOW_S / 2
+    assert result.output_parsed == "review 7"
+    assert api.calls == 7 and api.cancelled == 1
+    stats = service.llm_calls.stats
+    assert (stats.hedged, stats.hedge_wins, stats.timeouts) == (1, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_primary_is_kept_when_it_beats_the_hedge(tracker):
+    caller = HedgedCaller(_policy(hedge_budget=1.0, hedge_percentile=0.0, min_timeout_s=5.0))
+    for _ in range(5):
+        tracker.observe(MODEL, FAST_S)
+    api = _SlowResponses(slow={1})
+
+    async def _primary():
+        await asyncio.sleep(FAST_S * 5)
+        return "primary"
+
+    assert await caller.call(MODEL, _primary, hedge_factory=api.parse) == "primary"
+    assert caller.stats.hedged == 1 and caller.stats.hedge_wins == 0
+    assert api.cancelled == 1
+
+
+@pytest.mark.asyncio
+async def test_hedges_never_exceed_the_budget(tracker):
+    api = _SlowResponses(slow=set(range(6, 100, 2)), slow_s=0.1)
+    policy = _policy(hedge_budget=0.25, hedge_percentile=0.0, min_timeout_s=5.0)
+    service = _service(api, policy)
+    await _warm_up(service)
+
+    for _ in range(15):
+        await _parse(service)
+
+    stats = service.llm_calls.stats
+    assert stats.calls == 20
+    assert 0 < stats.hedged <= policy.hedge_budget * stats.calls
+    assert stats.over_budget > 0
+    assert api.calls == stats.calls + stats.hedged
+
+
+@pytest.mark.asyncio
+async def test_failed_primary_falls_back_to_the_hedge(tracker):
+    caller = HedgedCaller(_policy(hedge_budget=1.0, hedge_percentile=0.0, min_timeout_s=5.0))
+    for _ in range(5):
+        tracker.observe(MODEL, FAST_S)
+    attempts = []
+
+    async def _request():
+        attempts.append(len(attempts))
+        if len(attempts) == 1:
+            await asyncio.sleep(FAST_S * 2)
+            raise RuntimeError("502 from upstream")
+        await asyncio.sleep(FAST_S * 3)
+        return "second"
+
+    assert await caller.call(MODEL, _request) == "second"
+    assert caller.stats.hedge_wins == 1
+
+    async def _always_fails():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await caller.call(MODEL, _always_fails)
+
+
+@pytest.mark.asyncio
+async def test_hedged_duplicate_is_admitted_against_the_token_budget(tracker):
+    api = _SlowResponses(slow={6})
+    service = _service(api, _policy(hedge_budget=0.5, min_timeout_s=5.0))
+    acquired, observed = [], []
+    service.admission = SimpleNamespace(
+        max_requeues=0,
+        acquire=lambda cost: asyncio.sleep(0, acquired.append(cost)),
+        observe=lambda headers, cost, used: observed.append(cost),
+    )
+    await _warm_up(service)
+
+    result = await _parse(service)
+
+    assert result.output_parsed == "review 7"
+    assert len(acquired) == 7 and len(observed) == 6
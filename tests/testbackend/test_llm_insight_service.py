@@ -137,3 +137,81 @@ def test_enqueue_returns_failed_when_celery_raises(monkeypatch):
 
     assert status == "failed"
     assert job_id is None
+
+
+class _RecordingSupabase:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.updates: List[Dict[str, Any]] = []
+
+    def table(self, _name):
+        return self
+
+    def update(self, payload):
+        self.updates.append(payload)
+        return self
+
+    def eq(self, *_args):
+        return self
+
+    def execute(self):
+        if self.fail:
+            raise RuntimeError("column research_input does not exist")
+        return SimpleNamespace(data=[])
+
+
+def _enqueue_capturing(monkeypatch, supabase):
+    monkeypatch.setattr(llm_insight_service, "_has_openai", True)
+    monkeypatch.setattr(llm_insight_service, "attach_roster_urls", lambda _schools: None)
+    monkeypatch.setattr(llm_insight_service, "require_supabase_admin_client", lambda: supabase)
+    captured: List[Dict[str, Any]] = []
+    monkeypatch.setattr(
+        llm_insight_service,
+        "generate_deep_school_research",
+        SimpleNamespace(delay=lambda payload: captured.append(payload) or SimpleNamespace(id="job-1")),
+    )
+    schools = [
+        {**s, "metric_comparisons": [{"metric": "Exit Velocity", "player_value": 94.0}]}
+        for s in _SCHOOLS
+    ]
+    status, _ = enqueue_deep_school_research(
+        run_id="run-7",
+        schools=schools,
+        player_stats=_PLAYER_STATS,
+        baseball_assessment=_BASEBALL_ASSESSMENT,
+        academic_score=_ACADEMIC_SCORE,
+        final_limit=25,
+    )
+    assert status == "processing"
+    return captured[0], schools
+
+
+def test_enqueue_stores_pool_on_run_and_sends_school_refs(monkeypatch):
+    monkeypatch.delenv("DEEP_RESEARCH_SLIM_PAYLOAD", raising=False)
+    supabase = _RecordingSupabase()
+
+    payload, schools = _enqueue_capturing(monkeypatch, supabase)
+
+    assert supabase.updates == [{"research_input": {"version": 2, "schools": schools}}]
+    assert payload["payload_version"] == 2
+    assert "schools" not in payload
+    assert payload["school_refs"] == [
+        {"school_name": "Alpha University", "pool_index": 0},
+        {"school_name": "Beta College", "pool_index": 1},
+    ]
+    assert payload["final_limit"] == 25
+    assert payload["player_stats"] == _PLAYER_STATS
+
+
+def test_enqueue_sends_legacy_message_when_pool_cannot_be_stored(monkeypatch):
+    monkeypatch.delenv("DEEP_RESEARCH_SLIM_PAYLOAD", raising=False)
+
+    payload, schools = _enqueue_capturing(monkeypatch, _RecordingSupabase(fail=True))
+
+    assert "payload_version" not in payload
+    assert payload["schools"] == schools
+
+    monkeypatch.setenv("DEEP_RESEARCH_SLIM_PAYLOAD", "0")
+    supabase = _RecordingSupabase()
+    payload, _ = _enqueue_capturing(monkeypatch, supabase)
+    assert supabase.updates == [] and "schools" in payload
@@ -0,0 +1,186 @@
+"""Tests for backend/database/name_matching/candidate_index.py."""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+from difflib import SequenceMatcher
+
+import pytest
+from rapidfuzz import fuzz, process
+
+from backend.database.name_matching import school_name_matcher
+from backend.database.name_matching.candidate_index import NameCandidateIndex
+from backend.database.name_matching.school_name_matcher import SchoolNameMatcher
+from backend.school_info_scraper.college_scoreboard_retrieval import CollegeScorecardRetriever
+
+
+# Rankings-site school slugs, the team names the mapping table is built from
+SCHOOL_CACHE = os.path.join(
+    os.path.dirname(__file__), "..", "..", "backend", "data", "rescraped", "school_cache.json"
+)
+
+TEAM_NAMES = [
+    "Arizona St", "Arizona", "Stanford", "California", "Boston", "Texas", "Texas A&M",
+    "Texas Tech", "Texas St", "Florida", "Florida St", "Florida Atlantic", "Miami FL",
+    "Miami OH", "North Carolina", "NC State", "South Carolina", "Louisiana St",
+    "Mississippi St", "Ole Miss", "Oregon", "Oregon St", "Washington", "Washington St",
+    "Georgia", "Georgia Tech", "Georgia Southern", "Kent St", "Kennesaw St", "UCLA",
+    "Cal Poly", "Cal St Fullerton", "Long Beach St", "San Diego", "San Diego St",
+    "Saint Mary's", "St Johns", "Notre Dame", "Vanderbilt", "Wake Forest",
+]
+
+# normalized school name → expected match (None = nothing above the 90 threshold)
+LABELLED_QUERIES = {
+    "Arizona St": "Arizona St",
+    "arizona st": "Arizona St",
+    "Stanford": "Stanford",
+    "Texas A&M": "Texas A&M",
+    "Oregon State": None,
+    "Washingon St": "Washington St",
+    "Georgia Southrn": "Georgia Southern",
+    "Kennesaw St.": "Kennesaw St",
+    "Florida Atlantc": "Florida Atlantic",
+    "Vanderbilt": "Vanderbilt",
+    "Yale": None,
+    "Harvard": None,
+}
+
+
+@pytest.fixture
+def matcher(monkeypatch):
+    monkeypatch.setenv("SUPABASE_URL", "https://example.invalid")
+    monkeypatch.setenv("SUPABASE_SERVICE_KEY", "key")
+    monkeypatch.setattr(school_name_matcher, "create_client", lambda url, key: object())
+    return SchoolNameMatcher()
+
+
+def _brute_force_fuzzy(name, team_names, threshold=90.0):
+    result = process.extractOne(name, team_names, scorer=fuzz.ratio)
+    if result and result[1] >= threshold:
+        return result[0], result[1] / 100.0
+    return None
+
+
+def test_exact_and_candidates_keep_first_occurrence_order():
+    index = NameCandidateIndex(["Texas", "TEXAS", "Texas Tech", "Rice"])
+    assert index.exact("texas") == "Texas"
+    assert index.exact_id("TEXAS") == 0
+    assert index.exact("Baylor") is None
+    assert index.candidates("Texas Tech") == ["Texas", "TEXAS", "Texas Tech"]
+    assert index.candidates("zzzz") == []
+
+
+def test_matcher_agrees_with_brute_force_and_labels(matcher):
+    for query, expected in LABELLED_QUERIES.items():
+        exact = matcher.find_exact_match(query, TEAM_NAMES)
+        fuzzy = matcher.find_fuzzy_match(query, TEAM_NAMES)
+        brute = _brute_force_fuzzy(query, TEAM_NAMES)
+
+        assert fuzzy == brute, query
+        assert (exact or (fuzzy[0] if fuzzy else None)) == expected, query
+
+    # Index is built once per team list
+    first_index = matcher._team_index
+    matcher.find_fuzzy_match("Stanford", TEAM_NAMES)
+    assert matcher._team_index is first_index
+
+
+def _perturb(name, rng):
+    i = rng.randrange(len(name))
+    return rng.choice([
+        name[:i] + name[i + 1:],
+        name[:i] + rng.choice("aeiourst") + name[i + 1:],
+        name[:i] + rng.choice("aeiourst") + name[i:],
+        name + " St",
+        name.upper(),
+    ])
+
+
+def test_matcher_agrees_with_exhaustive_scorer_on_the_real_team_list(matcher):
+    with open(SCHOOL_CACHE) as fh:
+        team_names = sorted(
+            slug.split("/", 1)[-1].replace("-", " ").title() for slug in json.load(fh)
+        )
+    rng = random.Random(29)
+    queries = [_perturb(name, rng) for name in rng.sample(team_names, 400)]
+    queries += ["State", "Saint", "Tech", "College", "A&M", "Univ Of Cal"]
+
+    for query in queries:
+        assert matcher.find_fuzzy_match(query, team_names) == _brute_force_fuzzy(query, team_names), query
+        for threshold in (80.0, 60.0):
+            assert matcher.find_fuzzy_match(query, team_names, threshold) == (
+                _brute_force_fuzzy(query, team_names, threshold)
+            ), (query, threshold)
+
+
+def test_scorecard_fuzzy_match_agrees_with_linear_scan(monkeypatch):
+    monkeypatch.setenv("COLLEGE_SCORECARD_API_KEY", "key")
+    retriever = CollegeScorecardRetriever()
+
+    schools = [
+        {"school.name": name, "latest.student.size": size}
+        for name, size in [
+            ("Georgia Institute of Technology-Main Campus", 30000),
+            ("University of Georgia", 38000),
+            ("Georgia Southern University", 26000),
+            ("Texas A & M University-College Station", 70000),
+            ("Texas Tech University", 40000),
+            ("Stanford University", 17000),
+            ("Saint Mary's College of California", 3500),
+            ("Tiny Bible College", 120),
+            ("University of California-Los Angeles", 46000),
+        ]
+    ]
+
+    def linear(search_name):
+        search_lower = search_name.lower()
+        for school in schools:
+            if school["school.name"].lower() == search_lower:
+                return school
+        best_score, best_match = 0, None
+        for school in schools:
+            school_name = school["school.name"].lower()
+            if (school.get("latest.student.size", 0) or 0) < 500:
+                continue
+            score = max(
+                SequenceMatcher(None, search_lower, school_name).ratio(),
+                retriever._word_similarity(search_lower, school_name),
+                retriever._acronym_similarity(search_lower, school_name),
+            )
+            if score > best_score and score > 0.4:
+                best_score, best_match = score, school
+        return best_match
+
+    labelled = {
+        "Georgia Tech": "Georgia Institute of Technology-Main Campus",
+        "Georgia Southern": "Georgia Southern University",
+        "Texas A&M": "Texas A & M University-College Station",
+        "Texas Tech": "Texas Tech University",
+        "stanford university": "Stanford University",
+        "Tiny Bible": None,
+        "Zzyzx": None,
+    }
+    for query, expected in labelled.items():
+        match = retriever._find_best_fuzzy_match(query, schools)
+        assert match is linear(query), query
+        assert (match["school.name"] if match else None) == expected, query
+
+    # Every school is scored, acronym hits from short words included.
+    assert retriever._find_best_fuzzy_match("Saint Mary's", schools) is linear("Saint Mary's")
+
+
+def test_fuzzy_match_scores_every_name_that_can_reach_the_threshold(matcher):
+    # Many near-identical names outrank the best match on trigram overlap;
+    # the ratio bound still keeps it.
+    team_names = [f"saint john fisher {c}{c}" for c in "abcdefghijklmnopqrstuvwxyz"] + ["saint jon fisher"]
+
+    result = matcher.find_fuzzy_match("saint john fisher", team_names, 85.0)
+
+    assert result == _brute_force_fuzzy("saint john fisher", team_names, 85.0)
+    assert result[0] == "saint jon fisher"
+    ids = matcher._team_index.ratio_candidate_ids("saint john fisher", 85.0)
+    assert ids is not None and 26 in ids
+    # Too short for the bound to rule anything out: every name is scored.
+    assert NameCandidateIndex(["Abc", "Abd", "Xyz"]).ratio_candidate_ids("abx", 60.0) is None
@@ -0,0 +1,159 @@
+"""Tests for the on-disk name-mapping snapshot and SchoolNameResolver's use of it."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from backend.database.name_matching import mapping_snapshot
+from backend.database.name_matching import school_name_resolver as resolver_mod
+
+
+_ROWS = [
+    {"school_name": "Stanford University, Stanford, CA", "team_name": "Stanford", "verified": True},
+    {"school_name": "Arizona State University, Tempe, AZ", "team_name": "Arizona St", "verified": True},
+    {"school_name": "Tufts University, Medford, MA", "team_name": "Tufts", "verified": None},
+]
+
+
+class _FakeQuery:
+    def __init__(self, client):
+        self._client = client
+        self._in = None
+
+    def select(self, *_args, **_kwargs):
+        return self
+
+    @property
+    def not_(self):
+        return self
+
+    def is_(self, *_args):
+        return self
+
+    def eq(self, *_args):
+        return self
+
+    def neq(self, *_args):
+        return self
+
+    def limit(self, *_args):
+        return self
+
+    def in_(self, _column, values):
+        self._in = set(values)
+        return self
+
+    def execute(self):
+        self._client.queries += 1
+        rows = self._client.rows
+        if self._in is not None:
+            rows = [r for r in rows if r["school_name"] in self._in]
+        return SimpleNamespace(data=list(rows))
+
+
+class _FakeClient:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    def table(self, _name):
+        return _FakeQuery(self)
+
+
+@pytest.fixture
+def snapshot_file(tmp_path, monkeypatch):
+    path = tmp_path / "mapping.sqlite3"
+    monkeypatch.setenv("NAME_MAPPING_SNAPSHOT_PATH", str(path))
+    return path
+
+
+def _resolver(monkeypatch, client, **kwargs):
+    monkeypatch.setenv("SUPABASE_URL", "https://ci-placeholder.invalid")
+    monkeypatch.setenv("SUPABASE_SERVICE_KEY", "placeholder")
+    monkeypatch.setattr(resolver_mod, "create_client", lambda _url, _key: client)
+    return resolver_mod.SchoolNameResolver(**kwargs)
+
+
+def test_snapshot_round_trip_and_version(snapshot_file):
+    meta = mapping_snapshot.write_snapshot(_ROWS)
+    snapshot = mapping_snapshot.load_snapshot()
+
+    assert snapshot.db_version == meta["db_version"]
+    assert snapshot.db_version == mapping_snapshot.mapping_fingerprint(list(reversed(_ROWS)))
+    assert not mapping_snapshot.is_snapshot_stale(_FakeClient(_ROWS), snapshot)
+    changed = _ROWS[:2] + [dict(_ROWS[2], verified=True)]
+    assert mapping_snapshot.is_snapshot_stale(_FakeClient(changed), snapshot)
+
+
+def test_resolver_cold_start_from_snapshot_issues_no_queries(snapshot_file, monkeypatch):
+    mapping_snapshot.write_snapshot(_ROWS)
+    client = _FakeClient(_ROWS)
+    resolver = _resolver(monkeypatch, client)
+
+    assert resolver.get_team_name("stanford university,  stanford, ca") == "Stanford"
+    assert resolver.get_school_name("Arizona St") == "Arizona State University, Tempe, AZ"
+    # Verified rows exist, so the unverified Tufts mapping is excluded — same as the DB chain.
+    assert resolver.get_team_name("Tufts University, Medford, MA") is None
+    assert resolver.get_cache_stats()["cache_source"] == "snapshot"
+    assert client.queries == 0
+
+
+def test_snapshot_matches_database_fallback_chain(snapshot_file, monkeypatch):
+    mapping_snapshot.write_snapshot(_ROWS)
+    from_snapshot = _resolver(monkeypatch, _FakeClient(_ROWS))
+    from_snapshot._load_cache()
+
+    verified_rows = [r for r in _ROWS if r["verified"] is True]
+    from_database = _resolver(monkeypatch, _FakeClient(verified_rows), use_snapshot=False)
+    from_database._load_cache()
+
+    assert from_snapshot._mapping_cache == from_database._mapping_cache
+    assert from_snapshot._reverse_cache == from_database._reverse_cache
+
+
+def test_resolve_many_batches_misses_into_one_query(snapshot_file, monkeypatch):
+    mapping_snapshot.write_snapshot(_ROWS)
+    client = _FakeClient(_ROWS)
+    resolver = _resolver(monkeypatch, client)
+
+    names = [r["school_name"] for r in _ROWS] + ["Nowhere College, Nowhere, KS"]
+    assert resolver.resolve_many(names) == {
+        names[0]: "Stanford",
+        names[1]: "Arizona St",
+        names[2]: None,
+        names[3]: None,
+    }
+    assert client.queries == 0
+
+    resolved = resolver.resolve_many(names, verified_only=False)
+    assert resolved[names[2]] == "Tufts"
+    assert resolved[names[3]] is None
+    # The snapshot holds the unverified rows too.
+    assert resolver.get_team_name(names[2], verified_only=False) == "Tufts"
+    assert resolver.get_school_name("Tufts", verified_only=False) == names[2]
+    assert client.queries == 0
+
+
+def test_reload_cache_rereads_the_database_not_the_snapshot(snapshot_file, monkeypatch):
+    mapping_snapshot.write_snapshot(_ROWS)
+    updated = [dict(_ROWS[0], team_name="Stanford Cardinal")] + _ROWS[1:]
+    client = _FakeClient(updated)
+    resolver = _resolver(monkeypatch, client)
+    assert resolver.get_team_name(_ROWS[0]["school_name"]) == "Stanford"
+
+    resolver.reload_cache()
+
+    assert resolver.get_team_name(_ROWS[0]["school_name"]) == "Stanford Cardinal"
+    assert resolver.get_cache_stats()["cache_source"] == "database"
+    assert client.queries == 1
+
+
+def test_missing_snapshot_falls_back_to_database(snapshot_file, monkeypatch):
+    client = _FakeClient(_ROWS)
+    resolver = _resolver(monkeypatch, client)
+
+    assert resolver.get_team_name("Stanford University, Stanford, CA") == "Stanford"
+    assert resolver.get_cache_stats()["cache_source"] == "database"
+    assert client.queries >= 1
@@ -0,0 +1,111 @@
+"""Tests for backend/llm/deep_school_insights/nuxt_payload.py.
+
+The indexed decoder must see exactly what ``json.loads`` of the whole
+island sees, and the Nuxt parsers must return the same records through it.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+
+import pytest
+
+from backend.llm.deep_school_insights.nuxt_payload import NuxtPayload, index_elements
+from backend.llm.deep_school_insights.parsers import (
+    nuxt_island_text,
+    nuxt_roster_players_from_data,
+    nuxt_roster_players_from_payload,
+    nuxt_stats_records_from_data,
+    nuxt_stats_records_from_payload,
+    parse_nuxt_roster_players,
+)
+
+
+OSU_FIXTURE = os.path.join(
+    os.path.dirname(__file__),
+    "..", "..", "backend", "llm", "deep_school_insights",
+    "stats_osu_example.html",
+)
+
+# Devalue layout: every dict value is an index into the array.
+ROSTER_PAYLOAD = json.dumps([
+    ["ShallowReactive", 1],
+    {"players": 2},
+    [3, 9],
+    {"first_name": 4, "last_name": 5, "jersey_number": 6, "hometown": 7, "high_school": 8},
+    "Jane", "Doe", "12", "Austin, Texas", "Westlake HS",
+    {"first_name": 10, "last_name": 11, "staff_member_id": 12},
+    "Coach", "Smith", 44,
+    "last_name",  # a string element that matches the key search
+    "a \"quoted\" last_name, with [brackets] and {braces}",
+], separators=(",", ":"))
+
+
+@pytest.fixture(scope="module")
+def osu_island():
+    with open(OSU_FIXTURE) as f:
+        return nuxt_island_text(f.read())
+
+
+def test_index_matches_a_full_decode_on_the_osu_fixture(osu_island):
+    data = json.loads(osu_island)
+    payload = NuxtPayload.parse(osu_island)
+
+    assert payload.indexed and len(payload) == len(data)
+    assert all(payload.element(i) == data[i] for i in range(len(data)))
+    assert nuxt_stats_records_from_payload(NuxtPayload.parse(osu_island)) == nuxt_stats_records_from_data(data)
+    assert nuxt_roster_players_from_payload(NuxtPayload.parse(osu_island)) == nuxt_roster_players_from_data(data)
+
+
+def test_records_decode_only_matching_elements_and_memoize(osu_island):
+    payload = NuxtPayload.parse(osu_island)
+    records = nuxt_stats_records_from_payload(payload)
+
+    assert len(records) == 33
+    assert len(payload._cache) < len(payload) // 10
+    index = next(iter(payload._cache))
+    assert payload.element(index) is payload.element(index)
+
+
+def test_missing_key_skips_indexing():
+    payload = NuxtPayload.parse(ROSTER_PAYLOAD)
+
+    assert list(payload.records("playerName")) == []
+    assert payload._ends is None and payload._data is None
+
+
+@pytest.mark.parametrize("text", [
+    ROSTER_PAYLOAD,
+    json.dumps(json.loads(ROSTER_PAYLOAD), indent=1),  # whitespace between elements
+    ROSTER_PAYLOAD[:-1] + ',{"a":{"b":1}},[[1],[2]]]',  # nesting devalue never emits
+])
+def test_roster_players_match_a_full_decode(text):
+    data = json.loads(text)
+    players = nuxt_roster_players_from_payload(NuxtPayload.parse(text))
+
+    assert players == nuxt_roster_players_from_data(data)
+    assert [(p.name, p.jersey_number, p.hometown, p.high_school) for p in players] == [
+        ("Jane Doe", "12", "Austin, Texas", "Westlake HS"),
+    ]
+    assert NuxtPayload.parse(text).indexed is (text == ROSTER_PAYLOAD)
+
+
+@pytest.mark.parametrize("text", ["[]", "[1, 2", '{"a": 1}', "not json", '["unterminated]'])
+def test_malformed_islands_yield_no_records(text):
+    html = f'<script type="application/json" id="__NUXT_DATA__">{text}</script>'
+    assert parse_nuxt_roster_players(html) == []
+    if text.startswith("["):
+        assert index_elements(text) is None or text == "[]"
+
+
+@pytest.mark.parametrize("html", [
+    '<html><script type="application/json" data-ssr="true" id="__NUXT_DATA__">[1,"a"]</script></html>',
+    '<div id="__NUXT_DATA__">decoy</div><script id="__NUXT_DATA__">[2]</script>',
+    "<p>no island</p>",
+    '<script id="__NUXT_DATA__">[3]',
+])
+def test_island_text_matches_the_script_regex(html):
+    m = re.search(r'<script[^>]*id="__NUXT_DATA__"[^>]*>(.*?)</script>', html, re.DOTALL)
+    assert nuxt_island_text(html) == (m.group(1) if m else None)
@@ -0,0 +1,205 @@
+"""Per-site parser strategy memory (parse_strategy.py) through html_stream."""
+
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+
+from backend.llm.deep_school_insights import fetch as fetch_mod
+from backend.llm.deep_school_insights import html_stream
+from backend.llm.deep_school_insights.parse_strategy import ParserStrategyRegistry, layout_fingerprint
+
+ROSTER_URL = "https://gonextgen.example.edu/sports/baseball/roster"
+
+NUXT_ROSTER = """
+<html><body><div id="__nuxt"></div>
+<script type="application/json" id="__NUXT_DATA__">{}</script>
+</body></html>
+""".format(json.dumps([
+    ["ShallowReactive", 1],
+    {"players": 2},
+    [3],
+    {"first_name": 4, "last_name": 5, "jersey_number": 6},
+    "Jane", "Doe", "12",
+], separators=(",", ":")))
+
+TABLE_ROSTER = """
+<html><body><table class="sidearm-table">
+  <thead><tr><th>#</th><th>Name</th><th>Pos.</th><th>Yr.</th></tr></thead>
+  <tbody>
+    <tr><td>4</td><td>Sam Roe</td><td>SS</td><td>Sr.</td></tr>
+    <tr><td>7</td><td>Lee Poe</td><td>2B</td><td>Jr.</td></tr>
+  </tbody>
+</table></body></html>
+"""
+
+STATS_TABLE = """
+<html><body><table>
+  <thead><tr><th>#</th><th>Player</th><th>AVG</th><th>GP-GS</th><th>AB</th></tr></thead>
+  <tbody>
+    <tr><td>4</td><td>Sam Roe</td><td>.310</td><td>40-38</td><td>150</td></tr>
+    <tr><td>7</td><td>Lee Poe</td><td>.280</td><td>35-30</td><td>120</td></tr>
+  </tbody>
+</table>
+<script type="application/json" id="__NUXT_DATA__">[{"route":1},"/stats"]</script>
+</body></html>
+"""
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = ParserStrategyRegistry()
+    monkeypatch.setattr(html_stream, "PARSER_STRATEGIES", registry)
+    monkeypatch.delenv("DEEP_RESEARCH_PARSER_MEMORY", raising=False)
+    return registry
+
+
+@pytest.fixture
+def layout_calls(monkeypatch):
+    calls = []
+    original = html_stream.parse_roster_layout
+
+    def _counting(soup, layouts=html_stream.ROSTER_LAYOUTS):
+        calls.append(tuple(layouts))
+        return original(soup, layouts)
+
+    monkeypatch.setattr(html_stream, "parse_roster_layout", _counting)
+    return calls
+
+
+@pytest.fixture
+def html_passes(monkeypatch):
+    """Names of the full-document HTML passes (lxml stream or soup) made."""
+    calls = []
+    for name in ("extract_page", "clean_soup"):
+        original = getattr(html_stream, name)
+        monkeypatch.setattr(
+            html_stream, name,
+            lambda html, _original=original, _name=name: calls.append(_name) or _original(html),
+        )
+    return calls
+
+
+@pytest.mark.parametrize("engine", ["stream", "soup"])
+def test_nuxt_roster_site_skips_the_html_parse_once_learned(registry, html_passes, engine):
+    expected = html_stream.parse_roster_html(NUXT_ROSTER, engine=engine)
+    assert [p.name for p in expected[0]] == ["Jane Doe"] and expected[1] == "nuxt"
+
+    html_passes.clear()
+    assert html_stream.parse_roster_html(NUXT_ROSTER, engine=engine, url=ROSTER_URL) == expected
+    assert len(html_passes) == 1
+    assert registry.get("gonextgen.example.edu", "roster").parser == "nuxt"
+
+    html_passes.clear()
+    assert html_stream.parse_roster_html(NUXT_ROSTER, engine=engine, url=ROSTER_URL) == expected
+    assert html_passes == []
+    assert registry.stats.hits == 1 and registry.stats.double_parses_avoided == 1
+
+
+def test_html_roster_remembers_the_winning_layout(registry, layout_calls):
+    expected = html_stream.parse_roster_html(TABLE_ROSTER)
+    html_stream.parse_roster_html(TABLE_ROSTER, url=ROSTER_URL)
+    strategy = registry.get("gonextgen.example.edu", "roster")
+    assert strategy.parser == "html" and strategy.variant in html_stream.ROSTER_LAYOUTS
+
+    layout_calls.clear()
+    assert html_stream.parse_roster_html(TABLE_ROSTER, url=ROSTER_URL) == expected
+    assert layout_calls == [(strategy.variant,)]
+    assert registry.stats.double_parses_avoided == 0
+
+
+def test_redesigned_site_invalidates_and_relearns(registry):
+    html_stream.parse_roster_html(NUXT_ROSTER, url=ROSTER_URL)
+
+    players, source = html_stream.parse_roster_html(TABLE_ROSTER, url=ROSTER_URL)
+
+    assert (len(players), source) == (2, "html")
+    assert registry.stats.invalidated == 1
+    assert registry.get("gonextgen.example.edu", "roster").fingerprint == layout_fingerprint(TABLE_ROSTER)
+
+
+def test_strategy_that_stops_yielding_rows_is_dropped(registry):
+    html_stream.parse_roster_html(NUXT_ROSTER, url=ROSTER_URL)
+    # Same layout markers, but the island no longer holds a roster.
+    empty = NUXT_ROSTER.replace('"last_name"', '"surname"')
+    assert layout_fingerprint(empty) == layout_fingerprint(NUXT_ROSTER)
+
+    assert html_stream.parse_roster_html(empty, url=ROSTER_URL) == html_stream.parse_roster_html(empty)
+    assert registry.stats.invalidated == 1
+    assert registry.get("gonextgen.example.edu", "roster") is None
+
+
+def test_table_stats_site_skips_the_nuxt_decode(registry, monkeypatch):
+    url = ROSTER_URL.replace("/roster", "/stats")
+    expected = html_stream.parse_stats_html(STATS_TABLE)
+    assert expected[1] == "html" and len(expected[0]) == 2
+    html_stream.parse_stats_html(STATS_TABLE, url=url)
+
+    monkeypatch.setattr(
+        html_stream, "nuxt_stats_records_from_payload",
+        lambda payload: pytest.fail("remembered html strategy decoded the island"),
+    )
+    assert html_stream.parse_stats_html(STATS_TABLE, url=url) == expected
+    assert registry.stats.double_parses_avoided == 1
+
+
+def test_memory_can_be_turned_off(registry, monkeypatch):
+    monkeypatch.setenv("DEEP_RESEARCH_PARSER_MEMORY", "0")
+    html_stream.parse_roster_html(NUXT_ROSTER, url=ROSTER_URL)
+    assert len(registry) == 0 and registry.stats.misses == 0
+
+
+@pytest.mark.asyncio
+async def test_fetch_shares_the_registry_across_calls(registry, monkeypatch):
+    monkeypatch.setattr(
+        fetch_mod, "make_httpx_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, text=NUXT_ROSTER),
+        )),
+    )
+    school = {"school_name": "Nextgen U", "roster_url": ROSTER_URL}
+
+    first = await fetch_mod.fetch_roster_page(school)
+    second = await fetch_mod.fetch_roster_page(school)
+
+    assert first.items == second.items and len(first.items) == 1
+    assert registry.stats.learned == 1 and registry.stats.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_strategy_survives_a_new_process_through_the_cache_row(html_passes, monkeypatch):
+    from dataclasses import replace
+
+    from backend.database import school_evidence_cache as cache_mod
+    from backend.llm.deep_school_insights.parse_strategy import PARSER_STRATEGIES
+
+    monkeypatch.delenv("DEEP_RESEARCH_PARSER_MEMORY", raising=False)
+    monkeypatch.setattr(
+        fetch_mod, "make_httpx_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, text=NUXT_ROSTER),
+        )),
+    )
+    school = {"school_name": "Nextgen U", "roster_url": ROSTER_URL}
+    # Refresh cron: learns the strategy and writes it with the validators.
+    roster = await fetch_mod.fetch_roster_page(school)
+    unavailable = fetch_mod.PageFetch(items=[], url=None, status="unavailable")
+    row = {"school_name": "Nextgen U", **cache_mod.serialize_pages(roster, unavailable)}
+    assert row["page_validators"]["roster"]["parser"] == "nuxt"
+
+    # Research worker: empty registry, seeded from the row.
+    PARSER_STRATEGIES.clear()
+    pages = cache_mod.previous_pages_from_row(row)
+    assert cache_mod.seed_parser_strategies(pages) == 1
+    html_passes.clear()
+    again = await fetch_mod.fetch_roster_page(school)
+
+    assert again.items == roster.items and html_passes == []
+    assert PARSER_STRATEGIES.stats.seeded == 1 and PARSER_STRATEGIES.stats.hits == 1
+
+    # Strategies recorded by another parser version are not adopted.
+    PARSER_STRATEGIES.clear()
+    pages["roster"].validators = replace(pages["roster"].validators, parser_version=0)
+    assert cache_mod.seed_parser_strategies(pages) == 0 and len(PARSER_STRATEGIES) == 0
@@ -0,0 +1,55 @@
+"""Indexed match_players_to_stats must agree with the old nested scan."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from backend.llm.deep_school_insights.parsers import match_players_to_stats, parse_nuxt_stats_records
+from backend.llm.deep_school_insights.types import ParsedPlayer, ParsedStatLine
+from backend.scripts.bench_player_matching import legacy_match_players_to_stats, synthetic_team
+
+
+OSU_FIXTURE = os.path.join(
+    os.path.dirname(__file__),
+    "..", "..", "backend", "llm", "deep_school_insights",
+    "stats_osu_example.html",
+)
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_matches_legacy_on_synthetic_teams(seed):
+    players, stats = synthetic_team(60, 180, seed=seed)
+    assert match_players_to_stats(players, stats) == legacy_match_players_to_stats(players, stats)
+
+
+def test_matches_legacy_on_osu_fixture():
+    with open(OSU_FIXTURE) as f:
+        stats = parse_nuxt_stats_records(f.read())
+    # Roster side in "First Last" form, some jerseys missing or wrong.
+    players = []
+    for i, s in enumerate(stats):
+        last, _, first = s.player_name.partition(",")
+        jersey = None if i % 5 == 0 else ("99" if i % 7 == 0 else s.jersey_number)
+        players.append(ParsedPlayer(name=f"{first.strip()} {last.strip()}", jersey_number=jersey))
+    players.append(ParsedPlayer(name="Not On Stats", jersey_number="1"))
+
+    matched = match_players_to_stats(players, stats)
+    assert matched == legacy_match_players_to_stats(players, stats)
+    assert sum(1 for m in matched if m.batting_stats or m.pitching_stats) >= len(stats) - 1
+
+
+def test_earliest_line_wins_across_jersey_and_initial_rules():
+    stats = [
+        ParsedStatLine(jersey_number="9", player_name="Smith, Ben", stat_type="batting"),
+        ParsedStatLine(jersey_number="4", player_name="Smith, Adam", stat_type="batting"),
+        ParsedStatLine(jersey_number="4", player_name="Smith", stat_type="batting"),
+    ]
+    # Jersey rule hits line 1, initial rule hits line 0 → line 0, as the scan did.
+    player = ParsedPlayer(name="Brady Smith", jersey_number="4")
+
+    matched = match_players_to_stats([player], stats)
+
+    assert matched[0].batting_stats is stats[0]
+    assert matched == legacy_match_players_to_stats([player], stats)
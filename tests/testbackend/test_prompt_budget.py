@@ -0,0 +1,181 @@
+"""Reviewer prompt assembly: stable prefix + per-school input budget."""
+
+from __future__ import annotations
+
+import json
+import random
+
+import pytest
+
+from backend.llm.deep_school_insights import prompt_budget
+from backend.llm.deep_school_insights.llm_review import (
+    REVIEW_INPUT_PREAMBLE,
+    build_review_prompt,
+    review_input,
+    review_instructions,
+)
+from backend.llm.deep_school_insights.prompt_budget import (
+    MIN_INPUT_BUDGET,
+    count_tokens,
+    fit_payload,
+    input_budget,
+)
+from backend.llm.deep_school_insights.talking_points import TalkingPoint
+
+PLAYER = {
+    "primary_position": "RHP",
+    "height": 73,
+    "weight": 185,
+    "player_region": "Northeast",
+    "fastball_velo_max": 91,
+    "fastball_velo_range": "88-91",
+    "slider_spin": 2210,
+}
+
+KINDS = ("metric_standout", "roster_opportunity", "academic_angle", "level_descriptor")
+
+
+def _school(name="James Madison", **extra):
+    school = {
+        "school_name": name,
+        "fit_label": "Fit",
+        "academic_fit": "Fit",
+        "division_group": "Non-P4 D1",
+        "baseball_division": 1,
+        "location": {"state": "VA"},
+        "school_city": "Harrisonburg",
+        "undergrad_enrollment": 20000,
+        "overall_grade": "A-",
+        "academics_grade": "B+",
+        "campus_life_grade": "A",
+        "student_life_grade": "A-",
+        "baseball_record": "35-20",
+        "baseball_wins": 35,
+        "baseball_losses": 20,
+        "trend": 0.8,
+    }
+    school.update(extra)
+    return school
+
+
+def _points(n=4, fact_len=120, seed=0):
+    rng = random.Random(seed)
+    return [
+        TalkingPoint(
+            kind=KINDS[i % len(KINDS)],
+            priority=i + 1,
+            fact=" ".join(rng.choice(["arm", "roster", "spin", "campus", "opening"]) for _ in range(fact_len // 6)),
+        )
+        for i in range(n)
+    ]
+
+
+def _prompt(school=None, points=None, budget=None):
+    return build_review_prompt(
+        school or _school(), PLAYER, {}, {}, None, points if points is not None else _points(), budget=budget,
+    )
+
+
+def test_instructions_are_a_byte_stable_cacheable_prefix():
+    first = _prompt(_school("James Madison"))
+    second = _prompt(_school("Florida Southern", location={"state": "FL"}))
+
+    assert first.instructions == second.instructions == review_instructions()
+    assert "James Madison" not in first.instructions
+    # Provider prefix caching starts at 1024 tokens.
+    assert count_tokens(first.instructions) >= 1024
+    # The per-run constant (player profile) leads the input.
+    assert first.input_text.startswith(REVIEW_INPUT_PREAMBLE + '{"player": ')
+    assert first.input_text.split('"school"')[0] == second.input_text.split('"school"')[0]
+
+
+def test_small_payload_is_untouched():
+    prompt = _prompt(budget=2000)
+
+    assert prompt.breakdown.trimmed == []
+    assert prompt.input_text == review_input(_school(), PLAYER, {}, {}, None, _points())
+    assert prompt.breakdown.input == count_tokens(prompt.input_text)
+    assert set(prompt.breakdown.sections) == {"player", "school", "talking_points", "roster_facts"}
+
+
+def test_trims_lowest_value_content_first():
+    full = _prompt(budget=5000)
+    prompt = _prompt(budget=full.breakdown.input - 5)
+
+    assert prompt.breakdown.trimmed == ["school.baseball_wins_losses"]
+    assert prompt.payload["school"]["baseball_record"] == "35-20"
+
+    tighter = _prompt(budget=full.breakdown.input - 40)
+    assert tighter.breakdown.trimmed[:2] == ["school.baseball_wins_losses", "talking_point:level_descriptor"]
+    kept = [tp["priority"] for tp in tighter.payload["talking_points"]]
+    assert kept == sorted(kept) and kept[0] == 1
+
+
+def test_trimming_is_deterministic():
+    budgets = [MIN_INPUT_BUDGET, 450, 500]
+    for budget in budgets:
+        a = _prompt(points=_points(fact_len=400), budget=budget)
+        b = _prompt(points=_points(fact_len=400), budget=budget)
+        assert a.input_text == b.input_text
+        assert a.breakdown.trimmed == b.breakdown.trimmed
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_budget_is_never_exceeded(seed):
+    rng = random.Random(seed)
+    budget = rng.randint(MIN_INPUT_BUDGET, 900)
+    school = _school(
+        name="University " + "X" * rng.randint(5, 400),
+        school_city="C" * rng.randint(1, 300),
+    )
+    points = _points(n=rng.randint(0, 4), fact_len=rng.randint(10, 3000), seed=seed)
+
+    prompt = _prompt(school, points, budget=budget)
+
+    assert count_tokens(prompt.input_text) <= budget
+    assert prompt.breakdown.input <= budget
+    # Never trimmed: player profile, identity and flags.
+    assert prompt.payload["player"]["fastball_velo_max"] == 91
+    assert "roster_data_unavailable" in prompt.payload
+    assert json.loads(prompt.input_text[len(REVIEW_INPUT_PREAMBLE):]) == prompt.payload
+
+
+def test_fit_payload_does_not_mutate_the_input():
+    payload = {"school": {"city": "x" * 2000, "school_name": "A"}, "talking_points": []}
+    fitted, trimmed = fit_payload(payload, json.dumps, 50)
+
+    assert trimmed == ["school.city"]
+    assert payload["school"]["city"] == "x" * 2000
+
+
+def test_input_budget_from_env(monkeypatch):
+    monkeypatch.setenv("REVIEW_INPUT_TOKEN_BUDGET", "700")
+    assert input_budget() == 700
+    monkeypatch.setenv("REVIEW_INPUT_TOKEN_BUDGET", "10")
+    assert input_budget() == MIN_INPUT_BUDGET
+    monkeypatch.setenv("REVIEW_INPUT_TOKEN_BUDGET", "lots")
+    assert input_budget() == prompt_budget.DEFAULT_INPUT_BUDGET
+
+
+@pytest.mark.asyncio
+async def test_review_school_sends_the_budgeted_prompt_and_logs_it(monkeypatch, caplog):
+    from types import SimpleNamespace
+
+    from backend.llm.deep_school_insights.llm_review import review_school
+
+    monkeypatch.setenv("REVIEW_INPUT_TOKEN_BUDGET", str(MIN_INPUT_BUDGET))
+    sent = {}
+
+    async def _parse(**kw):
+        sent.update(kw)
+        return SimpleNamespace(output_parsed=None)
+
+    caplog.set_level("INFO")
+    await review_school(
+        _school(), PLAYER, {}, {}, None, _points(fact_len=2000),
+        responses_parse=_parse, review_model="gpt-test",
+    )
+
+    assert count_tokens(sent["input_text"]) <= MIN_INPUT_BUDGET
+    assert sent["instructions"] == review_instructions()
+    assert any("[PROMPT]" in r.message and "trimmed=" in r.message for r in caplog.records)
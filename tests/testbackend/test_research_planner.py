@@ -0,0 +1,157 @@
+"""Research budget planner (planner.py) and its offline replay harness."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from typing import Any, Dict, List
+
+import pytest
+
+from backend.database import school_evidence_cache as cache_mod
+from backend.llm.deep_school_insights.planner import ResearchPlanner, planner_from_env
+from backend.llm.deep_school_insights.service import DeepSchoolInsightService
+from backend.llm.deep_school_insights.types import (
+    DeepSchoolReview,
+    GatheredEvidence,
+    OpportunityContext,
+    RecruitingContext,
+    RosterContext,
+)
+from backend.scripts.replay_research_planner import load_runs, replay, summarize, synthetic_run
+
+
+class _CountingService(DeepSchoolInsightService):
+    def __init__(self):
+        super().__init__(client=object(), llm_timeout_s=10.0)
+        self.has_responses_parse = True
+        self.fetched: List[str] = []
+        self.reviewed: List[str] = []
+
+    async def _gather_evidence(self, school, player_stats, trusted_domains, previous_pages=None, page_stats=None):
+        self.fetched.append(school["school_name"])
+        await asyncio.sleep(0)
+        return GatheredEvidence(
+            roster_context=RosterContext(position_data_quality="exact", starter_opening_estimate_same_family="high"),
+            recruiting_context=RecruitingContext(),
+            opportunity_context=OpportunityContext(competition_level="low", opportunity_level="high"),
+        )
+
+    async def _review_school(self, school, player_stats, baseball_assessment, academic_score,
+                             evidence, talking_points):
+        self.reviewed.append(school["school_name"])
+        return DeepSchoolReview(adjustment_from_base="up_one", confidence="high", why_this_school="ok")
+
+
+@pytest.fixture(autouse=True)
+def _no_evidence_cache(monkeypatch):
+    monkeypatch.setattr(cache_mod, "load_cache_batch", lambda names: {})
+    monkeypatch.setattr(cache_mod, "load_previous_pages", lambda names: {})
+
+
+def _pool(n_fit: int, n_far: int) -> List[Dict[str, Any]]:
+    fits = [
+        {"school_name": f"Fit {i}", "delta": 0.1 * i, "fit_label": "Fit", "academic_fit": "Fit"}
+        for i in range(n_fit)
+    ]
+    # Far-off safeties with an academic Strong Reach: a composite gap
+    # research can't close.
+    far = [
+        {"school_name": f"Far {i}", "delta": 9.0 + i, "fit_label": "Safety", "academic_fit": "Strong Reach",
+         "academic_delta": -3.5}
+        for i in range(n_far)
+    ]
+    return fits + far
+
+
+async def _run(service, schools, final_limit):
+    return await service.enrich_and_rerank(
+        schools=schools,
+        player_stats={"primary_position": "SS"},
+        baseball_assessment={},
+        academic_score={"effective": 6.0},
+        final_limit=final_limit,
+    )
+
+
+@pytest.mark.asyncio
+async def test_safe_planner_skips_unreachable_schools_without_changing_the_list(monkeypatch):
+    baseline = _CountingService()
+    full = await _run(baseline, _pool(6, 6), final_limit=5)
+
+    monkeypatch.setenv("DEEP_RESEARCH_PLANNER", "safe")
+    planned_service = _CountingService()
+    planned = await _run(planned_service, _pool(6, 6), final_limit=5)
+
+    assert [s["school_name"] for s in planned] == [s["school_name"] for s in full]
+    assert len(baseline.reviewed) == 12
+    assert not any(name.startswith("Far") for name in planned_service.reviewed)
+    assert planned_service.planner_stats.llm_calls_saved == 6
+    # Most promising first.
+    assert planned_service.fetched[0] == "Fit 0"
+
+
+@pytest.mark.asyncio
+async def test_planner_is_off_by_default_and_without_final_limit(monkeypatch):
+    monkeypatch.delenv("DEEP_RESEARCH_PLANNER", raising=False)
+    service = _CountingService()
+    await _run(service, _pool(3, 3), final_limit=2)
+    assert len(service.reviewed) == 6 and service.planner_stats is None
+
+    monkeypatch.setenv("DEEP_RESEARCH_PLANNER", "safe")
+    assert planner_from_env(_pool(3, 3), None) is None
+    assert planner_from_env(_pool(3, 3), 10) is None  # pool fits the list
+
+
+def _with_ids(schools):
+    return [{**s, "_research_id": i, "ranking_score": 0.0} for i, s in enumerate(schools)]
+
+
+def test_priority_guarantee_pool_is_never_skipped():
+    schools = _with_ids(_pool(12, 4))
+    for school in schools:
+        school["academic_selectivity_score"] = 6.0 if school["fit_label"] == "Fit" else 3.0
+    # A far-off school with the best selectivity may be injected by the
+    # academics guarantee, however low its composite.
+    schools[-1]["academic_selectivity_score"] = 9.5
+    planner = ResearchPlanner(schools, final_limit=5, ranking_priority="academics")
+
+    assert planner.should_research(schools[-1])
+    assert not planner.should_research(schools[-2])
+    assert schools[-2]["research_status"] == "skipped"
+
+
+@pytest.mark.parametrize("academic_fit, skipped", [("Fit", True), ("Strong Safety", False)])
+def test_capped_categories_never_count_as_dominators(academic_fit, skipped):
+    leaders = [
+        {"school_name": f"Lead {i}", "delta": 0.0, "fit_label": "Fit", "academic_fit": academic_fit}
+        for i in range(6)
+    ]
+    far = [{"school_name": "Far", "delta": 30.0, "fit_label": "Safety", "academic_fit": "Fit"}]
+    schools = _with_ids(leaders + far)
+    planner = ResearchPlanner(schools, final_limit=3)
+
+    # Academic Strong Safeties may be cut by the category cap, so they
+    # can't prove anything about the schools below them.
+    assert planner.should_research(schools[-1]) is not skipped
+
+
+@pytest.mark.parametrize("priority", [None, "baseball_fit", "academics"])
+def test_safe_replay_never_skips_a_school_that_would_make_the_list(priority):
+    rng = random.Random(11)
+    results = [replay(synthetic_run(rng, ranking_priority=priority)) for _ in range(30)]
+    summary = summarize(results)
+
+    assert summary["skipped_in_full_list"] == 0
+    assert summary["llm_calls_saved"] > 0
+
+
+def test_recorded_runs_replay(tmp_path, monkeypatch):
+    from backend.llm.deep_school_insights.planner import record_run
+
+    run = synthetic_run(random.Random(3))
+    path = record_run(str(tmp_path), run["schools"], run["final_limit"], None, run["academic_score"])
+
+    loaded = load_runs([str(tmp_path)])
+    assert len(loaded) == 1 and path.endswith(".json")
+    assert replay(loaded[0]).llm_calls_full == replay(run).llm_calls_full
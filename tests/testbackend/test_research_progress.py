@@ -0,0 +1,123 @@
+"""Incremental per-school publishing from enrich_and_rerank (progress.py)."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Dict, List
+
+import pytest
+
+from backend.database import school_evidence_cache as cache_mod
+from backend.llm.deep_school_insights.progress import ResearchProgress
+from backend.llm.deep_school_insights.service import DeepSchoolInsightService
+from backend.llm.deep_school_insights.types import (
+    DeepSchoolReview,
+    GatheredEvidence,
+    OpportunityContext,
+    RecruitingContext,
+    RosterContext,
+)
+
+
+class _SlowSchoolService(DeepSchoolInsightService):
+    """Each school's evidence takes ``delays[name]`` seconds; reviews are instant."""
+
+    def __init__(self, delays: Dict[str, float], **kwargs):
+        super().__init__(client=object(), llm_timeout_s=10.0, **kwargs)
+        self.has_responses_parse = True
+        self.delays = delays
+
+    async def _gather_evidence(self, school, player_stats, trusted_domains, previous_pages=None, page_stats=None):
+        await asyncio.sleep(self.delays[school["school_name"]])
+        if school["school_name"] == "Broken":
+            raise RuntimeError("fetch exploded")
+        return GatheredEvidence(
+            roster_context=RosterContext(position_data_quality="exact"),
+            recruiting_context=RecruitingContext(),
+            opportunity_context=OpportunityContext(competition_level="medium", opportunity_level="medium"),
+        )
+
+    async def _review_school(self, school, player_stats, baseball_assessment, academic_score,
+                             evidence, talking_points):
+        return DeepSchoolReview(
+            base_athletic_fit="Fit",
+            opportunity_fit="Fit",
+            final_school_view="Fit",
+            adjustment_from_base="none",
+            confidence="medium",
+            why_this_school=f"Why {school['school_name']}",
+        )
+
+
+@pytest.fixture(autouse=True)
+def _no_evidence_cache(monkeypatch):
+    monkeypatch.setattr(cache_mod, "load_cache_batch", lambda names: {})
+    monkeypatch.setattr(cache_mod, "load_previous_pages", lambda names: {})
+
+
+def _schools(names: List[str]) -> List[Dict[str, Any]]:
+    return [{"school_name": n, "delta": float(len(names) - i), "fit_label": "Fit"} for i, n in enumerate(names)]
+
+
+async def _run(service, names, **kwargs):
+    snapshots: List[Dict[str, Any]] = []
+    ranked = await service.enrich_and_rerank(
+        schools=_schools(names),
+        player_stats={"primary_position": "SS"},
+        baseball_assessment={"predicted_tier": "Non-D1"},
+        academic_score={},
+        on_progress=snapshots.append,
+        **kwargs,
+    )
+    return ranked, snapshots
+
+
+@pytest.mark.asyncio
+async def test_fanout_publishes_each_school_as_it_finishes():
+    service = _SlowSchoolService({"Slow": 0.15, "Fast": 0.0, "Broken": 0.05})
+
+    ranked, snapshots = await _run(service, ["Slow", "Fast", "Broken"], final_limit=3)
+
+    assert [s["version"] for s in snapshots] == [1, 2, 3, 4]
+    # Completion order, not input order; failures are published too.
+    first = snapshots[0]
+    assert (first["completed"], first["total"], first["final"]) == (1, 3, False)
+    assert first["schools"][0]["school_name"] == "Fast"
+    assert first["schools"][0]["why_this_school"] == "Why Fast"
+    assert "research_packet" not in first["schools"][0]
+    assert snapshots[1]["schools"][1] == {
+        "school_name": "Broken", "fit_label": "Fit", "research_status": "failed",
+        "ranking_score": snapshots[1]["schools"][1]["ranking_score"], "ranking_adjustment": 0.0,
+    }
+
+    last = snapshots[-1]
+    assert last["final"] is True
+    assert [s["school_name"] for s in last["schools"]] == [s["school_name"] for s in ranked]
+    assert [s["rank"] for s in last["schools"]] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_batched_path_publishes_after_each_batch():
+    service = _SlowSchoolService({"A": 0.0, "B": 0.0, "C": 0.0}, initial_batch_size=1, batch_size=2)
+
+    _ranked, snapshots = await _run(service, ["A", "B", "C"])
+
+    assert [s["completed"] for s in snapshots] == [1, 2, 3, 3]
+    assert [s["final"] for s in snapshots] == [False, False, False, True]
+
+
+@pytest.mark.asyncio
+async def test_publish_errors_do_not_fail_the_run_and_run_off_loop():
+    threads = []
+
+    def _flaky(snapshot):
+        threads.append(threading.current_thread())
+        raise RuntimeError("supabase 503")
+
+    progress = ResearchProgress(total=1, callback=_flaky)
+    await progress.school_done({"school_name": "A", "research_status": "completed"})
+    await progress.finished([{"school_name": "A", "rank": 1}])
+
+    assert progress.version == 2
+    assert all(t is not threading.main_thread() for t in threads)
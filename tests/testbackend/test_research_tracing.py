@@ -0,0 +1,157 @@
+"""Span tracing for the research pipeline (tracing.py) and the trace report."""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from backend.database import school_evidence_cache as cache_mod
+from backend.llm.deep_school_insights import fetch as fetch_mod
+from backend.llm.deep_school_insights import tracing
+from backend.llm.deep_school_insights.service import DeepSchoolInsightService
+from backend.llm.deep_school_insights.types import DeepSchoolReview
+from backend.llm.worker_runtime import WorkerRuntime
+from backend.scripts.trace_report import load_traces, stage_percentiles, waterfall
+
+ROSTER_HTML = b"""
+<html><body><table class="sidearm-table">
+  <thead><tr><th>#</th><th>Name</th><th>Pos.</th><th>Yr.</th></tr></thead>
+  <tbody>
+    <tr><td>4</td><td>Jane Doe</td><td>SS</td><td>Sr.</td></tr>
+    <tr><td>7</td><td>Sam Roe</td><td>2B</td><td>Jr.</td></tr>
+  </tbody>
+</table></body></html>
+"""
+
+
+class _TracedService(DeepSchoolInsightService):
+    def __init__(self):
+        super().__init__(client=object(), llm_timeout_s=10.0)
+        self.has_responses_parse = True
+
+    async def _responses_parse(self, **kwargs):
+        return SimpleNamespace(
+            output_parsed=DeepSchoolReview(adjustment_from_base="none", confidence="medium"),
+            usage=SimpleNamespace(
+                input_tokens=900, output_tokens=120,
+                input_tokens_details=SimpleNamespace(cached_tokens=512),
+            ),
+        )
+
+
+@pytest.fixture
+def served(monkeypatch):
+    def _handler(request):
+        if request.url.path.endswith("/roster"):
+            return httpx.Response(200, content=ROSTER_HTML)
+        return httpx.Response(404)
+
+    monkeypatch.setattr(
+        fetch_mod, "make_httpx_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(_handler)),
+    )
+    monkeypatch.setattr(cache_mod, "load_cache_batch", lambda names: {})
+    monkeypatch.setattr(cache_mod, "load_previous_pages", lambda names: {})
+
+
+def _schools(n):
+    return [
+        {
+            "school_name": f"School {i}",
+            "delta": float(n - i),
+            "fit_label": "Fit",
+            "roster_url": f"https://s{i}.example.edu/sports/baseball/roster",
+        }
+        for i in range(n)
+    ]
+
+
+def test_spans_are_noops_without_a_destination(monkeypatch):
+    monkeypatch.delenv("DEEP_RESEARCH_TRACE_FILE", raising=False)
+    monkeypatch.delenv("DEEP_RESEARCH_TRACE_ENDPOINT", raising=False)
+
+    with tracing.trace_run() as root, tracing.span("fetch.roster") as child:
+        assert root is tracing.NOOP_SPAN and child is tracing.NOOP_SPAN
+        assert tracing.current_span() is tracing.NOOP_SPAN
+        assert tracing.active_tracer() is None
+
+
+@pytest.mark.asyncio
+async def test_run_writes_an_otlp_trace_covering_every_stage(monkeypatch, tmp_path, served):
+    trace_file = tmp_path / "traces.jsonl"
+    monkeypatch.setenv("DEEP_RESEARCH_TRACE_FILE", str(trace_file))
+
+    await _TracedService().enrich_and_rerank(
+        schools=_schools(3),
+        player_stats={"primary_position": "SS"},
+        baseball_assessment={},
+        academic_score={},
+        final_limit=2,
+    )
+
+    lines = [json.loads(line) for line in trace_file.read_text().splitlines()]
+    assert [next(iter(line)) for line in lines] == ["resourceSpans", "resourceMetrics"]
+    traces = load_traces([str(trace_file)])
+    assert len(traces) == 1
+    spans = next(iter(traces.values()))
+    by_id = {s["span_id"]: s for s in spans}
+    names = {s["name"] for s in spans}
+    assert {
+        "research_run", "cache_load", "research_school", "fetch.roster", "fetch.stats",
+        "parse.roster", "match", "evidence", "talking_points", "llm_review", "rerank",
+    } <= names
+
+    roster = next(s for s in spans if s["name"] == "fetch.roster")
+    assert roster["attributes"]["bytes"] == len(ROSTER_HTML)
+    assert roster["attributes"]["status"] == "parsed"
+    assert by_id[roster["parent_id"]]["name"] == "research_school"
+    school = by_id[roster["parent_id"]]
+    assert school["attributes"]["cache_hit"] is False
+    assert school["attributes"]["research_status"] == "completed"
+    review = next(s for s in spans if s["name"] == "llm_review")
+    assert review["attributes"]["usage.output_tokens"] == 120
+    assert review["attributes"]["input_tokens"] > 0
+    assert next(s for s in spans if s["name"] == "fetch.stats")["attributes"]["status"] == "unavailable"
+
+    histograms = lines[1]["resourceMetrics"][0]["scopeMetrics"][0]["metrics"][0]["histogram"]["dataPoints"]
+    stage_counts = {p["attributes"][0]["value"]["stringValue"]: int(p["count"]) for p in histograms}
+    assert stage_counts["research_school"] == 3
+    assert all(sum(map(int, p["bucketCounts"])) == int(p["count"]) for p in histograms)
+
+    assert len(waterfall(spans)) == len(spans)
+    assert {r["stage"]: r["count"] for r in stage_percentiles(spans)}["llm_review"] == 3
+
+
+def test_worker_runtime_tasks_join_the_callers_trace(monkeypatch, tmp_path):
+    monkeypatch.setenv("DEEP_RESEARCH_TRACE_FILE", str(tmp_path / "t.jsonl"))
+
+    async def _work():
+        with tracing.span("fetch.roster", school="A"):
+            return tracing.active_tracer()
+
+    runtime = WorkerRuntime().start()
+    try:
+        with tracing.trace_run("research_task", run_id="run-1") as root:
+            tracer = runtime.run(_work())
+    finally:
+        runtime.shutdown()
+
+    assert tracer is not None
+    spans = next(iter(load_traces([str(tmp_path / "t.jsonl")]).values()))
+    child = next(s for s in spans if s["name"] == "fetch.roster")
+    assert child["parent_id"] == root.span_id
+
+
+def test_failed_span_is_marked_as_error(monkeypatch, tmp_path):
+    monkeypatch.setenv("DEEP_RESEARCH_TRACE_FILE", str(tmp_path / "t.jsonl"))
+
+    with pytest.raises(RuntimeError):
+        with tracing.trace_run("research_task"):
+            with tracing.span("db_write"):
+                raise RuntimeError("supabase down")
+
+    spans = next(iter(load_traces([str(tmp_path / "t.jsonl")]).values()))
+    assert all(s["error"] for s in spans)
@@ -0,0 +1,226 @@
+"""Retry backoff releases the fetch slot (retry.py), against a faulty local server."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend.llm.deep_school_insights import fetch as fetch_mod
+from backend.llm.deep_school_insights import retry as retry_mod
+from backend.llm.deep_school_insights.concurrency import AdaptiveLimiter, note_document
+from backend.llm.deep_school_insights.fetch import fetch_stats_page
+from backend.llm.deep_school_insights.retry import HostHealth, RetryPolicy, Slot, backoff, gather_in_slot
+
+OSU_FIXTURE = os.path.join(
+    os.path.dirname(__file__),
+    "..", "..", "backend", "llm", "deep_school_insights",
+    "stats_osu_example.html",
+)
+
+
+@pytest.fixture(scope="module")
+def faulty_server():
+    """``/healthy*`` serve a real stats page; ``/flaky*`` always answer 503."""
+    with open(OSU_FIXTURE, "rb") as f:
+        body = f.read()
+    hits = {}
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits[self.path] = hits.get(self.path, 0) + 1
+            if self.path.startswith("/flaky"):
+                self.send_response(503)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", hits
+    server.shutdown()
+
+
+@pytest.fixture
+def fresh_health(monkeypatch):
+    health = HostHealth()
+    monkeypatch.setattr(retry_mod, "HOST_HEALTH", health)
+    monkeypatch.setattr(fetch_mod, "HOST_HEALTH", health)
+    return health
+
+
+async def _timed_fetch(sem, school, t0, done):
+    async with Slot(sem):
+        page = await fetch_stats_page(school)
+    done[school["school_name"]] = (time.monotonic() - t0, page.status, len(page.items))
+
+
+@pytest.mark.asyncio
+async def test_healthy_schools_keep_the_permit_while_flaky_host_backs_off(
+    faulty_server, fresh_health, monkeypatch,
+):
+    base_url, hits = faulty_server
+    monkeypatch.setattr(fetch_mod, "STATS_RETRY_POLICY", RetryPolicy(base_s=3.0, max_s=3.0))
+    sem = asyncio.Semaphore(1)  # worst case: a single fetch permit
+    schools = [{"school_name": "Flaky", "roster_url": f"{base_url}/flaky/sports/baseball/roster"}] + [
+        {"school_name": f"Healthy {i}", "roster_url": f"{base_url}/healthy{i}/sports/baseball/roster"}
+        for i in range(3)
+    ]
+    done = {}
+    t0 = time.monotonic()
+
+    await asyncio.gather(*(_timed_fetch(sem, s, t0, done) for s in schools))
+
+    flaky_elapsed, flaky_status, _ = done["Flaky"]
+    assert flaky_status == "failed"
+    assert hits["/flaky/sports/baseball/stats"] == 2
+    assert flaky_elapsed >= 1.5  # equal jitter: at least half the step
+    for i in range(3):
+        elapsed, status, records = done[f"Healthy {i}"]
+        assert (status, records) == ("parsed", 33)
+        # Flaky took the only permit first; the healthy schools still
+        # finished while it was backing off.
+        assert elapsed < 1.5
+
+
+@pytest.mark.asyncio
+async def test_backoff_outside_a_slot_is_a_plain_sleep():
+    t0 = time.monotonic()
+    await backoff(0.01)
+    assert time.monotonic() - t0 >= 0.01
+
+
+@pytest.mark.asyncio
+async def test_slot_is_not_released_twice_when_cancelled_during_backoff():
+    sem = asyncio.Semaphore(1)
+
+    async def _hold_and_back_off():
+        async with Slot(sem):
+            await backoff(10)
+
+    task = asyncio.create_task(_hold_and_back_off())
+    await asyncio.sleep(0.01)
+    assert not sem.locked()  # lent out during backoff
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert sem._value == 1
+
+
+@pytest.mark.asyncio
+async def test_slot_is_kept_while_a_sibling_fetch_is_still_working():
+    sem = asyncio.Semaphore(1)
+    observed = {}
+
+    async def _flaky_page():
+        await backoff(0.1)
+        return "stats"
+
+    async def _slow_page():
+        await asyncio.sleep(0.05)
+        observed["locked_while_sibling_backs_off"] = sem.locked()
+        return "roster"
+
+    async def _school():
+        async with Slot(sem) as slot:
+            pages = await gather_in_slot(_slow_page(), _flaky_page())
+            observed["held_after"] = slot.held
+            return pages
+
+    task = asyncio.create_task(_school())
+    await asyncio.sleep(0.08)
+    # The roster finished; only the stats retry is waiting: lend the permit.
+    observed["locked_once_idle"] = sem.locked()
+
+    assert await task == ["roster", "stats"]
+    assert observed == {
+        "locked_while_sibling_backs_off": True,
+        "locked_once_idle": False,
+        "held_after": True,
+    }
+    assert sem._value == 1
+
+
+@pytest.mark.asyncio
+async def test_sibling_backoff_never_exceeds_the_fetch_limit():
+    limit = 2
+    sem = asyncio.Semaphore(limit)
+    working = {}  # school -> pages currently on the network
+    peak = 0
+
+    async def _page(school, retry):
+        nonlocal peak
+        for attempt in range(2 if retry else 1):
+            if attempt:
+                await backoff(0.02)
+            working[school] = working.get(school, 0) + 1
+            peak = max(peak, sum(1 for n in working.values() if n))
+            await asyncio.sleep(0.03 if retry else 0.06)
+            working[school] -= 1
+
+    async def _school(i):
+        async with Slot(sem):
+            await gather_in_slot(_page(i, retry=False), _page(i, retry=True))
+
+    await asyncio.gather(*(_school(i) for i in range(6)))
+
+    assert peak == limit
+    assert sem._value == limit
+
+
+@pytest.mark.asyncio
+async def test_limiter_doc_bytes_follow_the_slot_across_sibling_backoff():
+    limiter = AdaptiveLimiter(
+        min_permits=1, max_permits=1, memory_budget_bytes=1 << 40, rss_sampler=lambda: None,
+    )
+    seen = []
+
+    async def _page(nbytes, retry):
+        for attempt in range(2 if retry else 1):
+            if attempt:
+                await backoff(0.02)
+            note_document(nbytes)
+            seen.append(limiter.in_flight_doc_bytes)
+            await asyncio.sleep(0.01)
+
+    async with Slot(limiter):
+        note_document(100)
+        await gather_in_slot(_page(30, retry=False), _page(50, retry=True))
+        seen.append(limiter.in_flight_doc_bytes)
+
+    # The stats retry released the hold from its own task (dropping all
+    # 180 bytes) and re-acquired it there; the school's exit releases
+    # that same hold.
+    assert seen == [130, 180, 50, 50]
+    assert (limiter.in_flight, limiter.in_flight_doc_bytes) == (0, 0)
+
+
+def test_repeated_host_failures_stretch_the_delay():
+    health = HostHealth()
+    policy = RetryPolicy(base_s=2.0, max_s=16.0)
+
+    fresh = [policy.delay(0, "flaky.edu", health) for _ in range(50)]
+    for _ in range(3):
+        health.record_failure("flaky.edu")
+    stretched = [policy.delay(0, "flaky.edu", health) for _ in range(50)]
+
+    assert all(1.0 <= d <= 2.0 for d in fresh)
+    assert all(4.0 <= d <= 8.0 for d in stretched)
+    assert len(set(fresh)) > 1  # jittered
+    assert all(d <= 16.0 for d in (policy.delay(9, "flaky.edu", health) for _ in range(20)))
+
+    health.record_success("flaky.edu")
+    assert health.failures("flaky.edu") == 0
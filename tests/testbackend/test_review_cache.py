@@ -0,0 +1,164 @@
+"""Tests for backend/llm/deep_school_insights/review_cache.py."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from backend.llm.deep_school_insights import llm_review as llm_review_mod
+from backend.llm.deep_school_insights import redis_client as redis_client_mod
+from backend.llm.deep_school_insights import review_cache as review_cache_mod
+from backend.llm.deep_school_insights.llm_review import review_payload
+from backend.llm.deep_school_insights.review_cache import (
+    ReviewCache,
+    ReviewCacheStats,
+    review_fingerprint,
+)
+from backend.llm.deep_school_insights import service as service_mod
+from backend.llm.deep_school_insights.service import DeepSchoolInsightService
+from backend.llm.deep_school_insights.types import (
+    DeepSchoolReview,
+    GatheredEvidence,
+    OpportunityContext,
+    RecruitingContext,
+    RosterContext,
+)
+
+
+class _CountingResponses:
+    def __init__(self):
+        self.calls = 0
+
+    async def parse(self, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(output_parsed=DeepSchoolReview(
+            base_athletic_fit="Fit",
+            opportunity_fit="Fit",
+            final_school_view="Fit",
+            adjustment_from_base="none",
+            confidence="medium",
+            why_this_school=f"Review #{self.calls}",
+        ))
+
+
+class _Client:
+    def __init__(self):
+        self.responses = _CountingResponses()
+
+
+def _evidence():
+    return GatheredEvidence(
+        roster_context=RosterContext(position_data_quality="exact", same_family_count=5),
+        recruiting_context=RecruitingContext(),
+        opportunity_context=OpportunityContext(competition_level="low", opportunity_level="high"),
+    )
+
+
+def _service(redis):
+    return DeepSchoolInsightService(client=_Client(), review_cache=ReviewCache(redis, ttl_s=60))
+
+
+async def _review(service, player_stats):
+    school = {"school_name": "Test U", "fit_label": "Fit", "state": "CT"}
+    return await service._review_school(school, player_stats, {}, {}, _evidence(), [])
+
+
+@pytest.mark.asyncio
+async def test_repeat_review_is_served_from_cache(fake_redis):
+    redis = fake_redis
+    service = _service(redis)
+    player = {"primary_position": "SS", "exit_velo_max": 92.0, "sixty_time": "6.80"}
+
+    first = await _review(service, player)
+    # Same numbers in another representation → same prompt → cache hit.
+    second = await _review(service, {"primary_position": "SS", "exit_velo_max": "92", "sixty_time": 6.8})
+
+    assert service.client.responses.calls == 1
+    assert second == first
+    assert list(redis.ttls.values()) == [60]
+    stats = service.review_cache_stats
+    assert (stats.hits, stats.misses, stats.hit_ratio) == (1, 1, 0.5)
+
+
+@pytest.mark.asyncio
+async def test_different_profile_or_model_misses(fake_redis):
+    redis = fake_redis
+    service = _service(redis)
+
+    await _review(service, {"primary_position": "SS", "exit_velo_max": 92})
+    await _review(service, {"primary_position": "SS", "exit_velo_max": 95})
+    service.review_model = "another-model"
+    await _review(service, {"primary_position": "SS", "exit_velo_max": 92})
+
+    assert service.client.responses.calls == 3
+    assert len(redis.store) == 3
+
+
+@pytest.mark.asyncio
+async def test_miss_builds_the_prompt_once(fake_redis, monkeypatch):
+    built, build = [], llm_review_mod.build_review_prompt
+
+    def _build(*args, **kwargs):
+        built.append(args[0]["school_name"])
+        return build(*args, **kwargs)
+
+    monkeypatch.setattr(service_mod, "build_review_prompt", _build)
+    monkeypatch.setattr(llm_review_mod, "build_review_prompt", _build)
+    service = _service(fake_redis)
+
+    await _review(service, {"primary_position": "SS"})
+
+    assert built == ["Test U"]
+    assert service.client.responses.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fall_through_to_llm(fake_redis):
+    fake_redis.fail = True
+    service = _service(fake_redis)
+
+    review = await _review(service, {"primary_position": "SS"})
+
+    assert review is not None
+    assert service.client.responses.calls == 1
+    assert service.review_cache_stats.errors == 2
+
+
+def test_instructions_change_invalidates_fingerprint(monkeypatch):
+    payload = review_payload({"school_name": "Test U"}, {"primary_position": "P"}, {}, {}, None, [])
+    before = review_fingerprint("m", payload)
+
+    review_cache_mod.instructions_version.cache_clear()
+    monkeypatch.setattr(review_cache_mod, "review_instructions", lambda: "new instructions")
+    try:
+        assert review_fingerprint("m", payload) != before
+    finally:
+        review_cache_mod.instructions_version.cache_clear()
+
+
+def test_cache_disabled_without_redis_url(monkeypatch):
+    monkeypatch.delenv("REVIEW_CACHE_URL", raising=False)
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    assert review_cache_mod.get_review_cache() is None
+    assert ReviewCacheStats().hit_ratio == 0.0
+
+
+def test_cache_uses_one_async_client_per_event_loop(monkeypatch):
+    monkeypatch.setenv("REVIEW_CACHE_URL", "redis://cache.invalid:6379/0")
+    review_cache_mod._cache_for_url.cache_clear()
+    redis_client_mod.async_redis.cache_clear()
+    try:
+        cache = review_cache_mod.get_review_cache()
+        assert cache.redis is redis_client_mod.async_redis("redis://cache.invalid:6379/0")
+
+        async def _client():
+            return cache.redis.client()
+
+        first, second = asyncio.run(_client()), asyncio.run(_client())
+        assert first is not second
+        assert first.connection_pool.connection_kwargs["socket_timeout"] == redis_client_mod.SOCKET_TIMEOUT_S
+    finally:
+        review_cache_mod._cache_for_url.cache_clear()
+        redis_client_mod.async_redis.cache_clear()
@@ -0,0 +1,204 @@
+"""Research demand tracking and the demand-ordered cache warming plan."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from backend.database import school_evidence_demand as demand_mod
+from backend.database.school_evidence_demand import DemandSummary, plan_warming
+from backend.scripts import refresh_school_evidence_cache as refresh
+
+NOW = datetime(2026, 10, 18, 4, 0, tzinfo=timezone.utc)
+
+
+def _school(name):
+    return {"school_name": name, "roster_url": f"https://{name.lower()}.example.edu/roster"}
+
+
+def _demand(**lookups):
+    demand = DemandSummary(window_days=28)
+    for name, count in lookups.items():
+        demand.add([name] * count, [])
+    return demand
+
+
+class _FakeQuery:
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.filters = {}
+        self.inserting = False
+        self.deleting = False
+
+    def insert(self, payload):
+        self.db.inserted.append((self.table, payload))
+        self.inserting = True
+        return self
+
+    def delete(self):
+        self.deleting = True
+        return self
+
+    def lt(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def order(self, column):
+        self.filters["order"] = column
+        return self
+
+    def select(self, columns):
+        return self
+
+    def gte(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def range(self, start, end):
+        self.filters["range"] = (start, end)
+        return self
+
+    def execute(self):
+        if self.inserting:
+            return SimpleNamespace(data=[])
+        if self.deleting:
+            cutoff = self.filters["looked_up_at"]
+            deleted = [r for r in self.db.rows if r["looked_up_at"] < cutoff]
+            self.db.rows = [r for r in self.db.rows if r["looked_up_at"] >= cutoff]
+            return SimpleNamespace(data=deleted)
+        start, end = self.filters["range"]
+        self.db.queries.append(dict(self.filters))
+        return SimpleNamespace(data=self.db.rows[start:end + 1])
+
+
+class _FakeSupabase:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.inserted = []
+        self.queries = []
+
+    def table(self, name):
+        return _FakeQuery(self, name)
+
+
+def test_hot_school_about_to_expire_goes_first():
+    schools = [_school(n) for n in ("Alpha", "Bravo", "Charlie", "Delta")]
+    freshness = {
+        "Alpha": (NOW - timedelta(days=1), "ok"),  # fresh through the interval
+        "Bravo": (NOW - timedelta(days=12), "ok"),  # expires in 2 days
+        "Charlie": (NOW - timedelta(days=12), "ok"),
+        # Delta has no row
+    }
+    plan = plan_warming(
+        schools, _demand(Alpha=56, Bravo=56, Charlie=7, Delta=14), freshness, now=NOW,
+    )
+
+    assert plan.head(4) == ["Bravo", "Delta", "Charlie", "Alpha"]
+    by_name = {c.school["school_name"]: c for c in plan.candidates}
+    assert by_name["Bravo"].days_at_risk == pytest.approx(5.0)
+    assert by_name["Delta"].days_at_risk == 7.0 and by_name["Delta"].age_days is None
+    assert by_name["Alpha"].priority == 0.0
+
+
+def test_undemanded_schools_follow_oldest_first():
+    schools = [_school(n) for n in ("Alpha", "Bravo", "Charlie")]
+    freshness = {
+        "Alpha": (NOW - timedelta(days=3), "ok"),
+        "Bravo": (NOW - timedelta(days=10), "failed"),
+        "Charlie": (NOW - timedelta(days=9), "ok"),
+    }
+    plan = plan_warming(schools, _demand(), freshness, now=NOW)
+
+    assert plan.head(3) == ["Bravo", "Charlie", "Alpha"]
+
+
+def test_expected_hit_ratio_weighs_schools_by_demand():
+    schools = [_school(n) for n in ("Alpha", "Bravo")]
+    freshness = {"Alpha": (NOW - timedelta(days=14), "ok"), "Bravo": (NOW, "ok")}
+    plan = plan_warming(schools, _demand(Alpha=84, Bravo=28), freshness, now=NOW)
+
+    # Alpha (3/day) is expired all interval, Bravo (1/day) stays fresh.
+    assert plan.expected_hit_ratio() == pytest.approx(0.25)
+    assert plan.expected_hit_ratio(["Alpha"]) == pytest.approx(1.0)
+    assert plan_warming(schools, _demand(), freshness, now=NOW).expected_hit_ratio() is None
+
+
+def test_record_lookup_and_load_demand_round_trip(monkeypatch):
+    db = _FakeSupabase()
+    monkeypatch.setattr(demand_mod, "get_supabase_admin_client", lambda: db)
+    monkeypatch.delenv("EVIDENCE_DEMAND_TRACKING", raising=False)
+
+    assert demand_mod.record_lookup(["Alpha", "Bravo"], ["Bravo", "Zulu"])
+    assert db.inserted == [("school_evidence_demand", {"schools": ["Alpha", "Bravo"], "hits": ["Bravo"]})]
+
+    db.rows = [{"schools": ["Alpha", "Bravo"], "hits": ["Bravo"]}] * 3 + [{"schools": ["Alpha"], "hits": []}]
+    monkeypatch.setattr(demand_mod, "_PAGE_SIZE", 2)
+    summary = demand_mod.load_demand(window_days=7, now=NOW)
+
+    assert summary.lookups == {"Alpha": 4, "Bravo": 3}
+    assert summary.measured_hit_ratio == pytest.approx(3 / 7)
+    assert summary.rate_per_day("Alpha") == pytest.approx(4 / 7)
+    assert [q["range"] for q in db.queries] == [(0, 1), (2, 3), (4, 5)]
+    # Offset paging needs a stable order or pages can skip / repeat rows.
+    assert all(q["order"] == "id" for q in db.queries)
+    assert db.queries[0]["looked_up_at"] == (NOW - timedelta(days=7)).isoformat()
+
+
+def test_prune_deletes_rows_older_than_the_window(monkeypatch):
+    old, recent = (NOW - timedelta(days=40)).isoformat(), (NOW - timedelta(days=3)).isoformat()
+    db = _FakeSupabase([{"looked_up_at": old}, {"looked_up_at": recent}])
+    monkeypatch.setattr(demand_mod, "get_supabase_admin_client", lambda: db)
+
+    assert demand_mod.prune_demand(now=NOW) == 1
+    assert db.rows == [{"looked_up_at": recent}]
+
+    monkeypatch.setattr(demand_mod, "get_supabase_admin_client", lambda: SimpleNamespace(table=None))
+    assert demand_mod.prune_demand(now=NOW) is None
+
+
+def test_record_lookup_can_be_turned_off(monkeypatch):
+    db = _FakeSupabase()
+    monkeypatch.setattr(demand_mod, "get_supabase_admin_client", lambda: db)
+    monkeypatch.setenv("EVIDENCE_DEMAND_TRACKING", "0")
+
+    assert not demand_mod.record_lookup(["Alpha"], [])
+    assert db.inserted == []
+
+
+def test_refresh_runs_in_priority_order_and_stops_at_the_budget(monkeypatch):
+    clock = SimpleNamespace(now=0.0)
+    refreshed = []
+
+    async def _refresh_one(school, previous=None, page_stats=None):
+        clock.now += 60.0
+        refreshed.append(school["school_name"])
+        return {"school_name": school["school_name"], "source_status": "ok", "matched_players": []}
+
+    async def _sleep(seconds):
+        clock.now += seconds
+
+    names = ["Alpha", "Bravo", "Charlie", "Delta", "Echo"]
+    monkeypatch.setattr(refresh, "_load_school_universe", lambda division, single, cap: [_school(n) for n in names])
+    monkeypatch.setattr(refresh, "load_demand", lambda window_days: _demand(Charlie=20, Echo=10, Alpha=5))
+    monkeypatch.setattr(refresh, "load_cache_freshness", lambda names: {})
+    monkeypatch.setattr(refresh, "load_previous_pages", lambda names: {})
+    pruned = []
+    monkeypatch.setattr(refresh, "prune_demand", lambda window_days: pruned.append(window_days) or 0)
+    monkeypatch.setattr(refresh, "_refresh_one_school", _refresh_one)
+    monkeypatch.setattr(refresh, "_upsert", lambda payload: None)
+    monkeypatch.setattr(refresh, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    monkeypatch.setattr(refresh, "asyncio", SimpleNamespace(sleep=_sleep))
+
+    # 60 s per school, no sleep: a 3.5-minute budget fits three schools.
+    status = asyncio.run(refresh._run(
+        division=None, single_school=None, cap=None, sleep_s=0.0, dry_run=False,
+        budget_minutes=3.5,
+    ))
+
+    assert status == 0
+    assert refreshed == ["Charlie", "Echo", "Alpha"]
+    assert pruned == [demand_mod.DEMAND_WINDOW_DAYS]
@@ -17,6 +17,7 @@ class _FakeTable:
         self._neq_filters = {}
         self._require_not_null = set()
         self._negated = False
+        self._range = None
 
     def select(self, *_args, **_kwargs):
         return self
@@ -46,6 +47,10 @@ class _FakeTable:
     def order(self, *_args, **_kwargs):
         return self
 
+    def range(self, start, end):
+        self._range = (start, end)
+        return self
+
     def execute(self):
         rows = list(self.rows)
         for column, value in self._neq_filters.items():
@@ -54,6 +59,8 @@ class _FakeTable:
             rows = [row for row in rows if row.get(column) is not None]
         for column, values in self._in_filters.items():
             rows = [row for row in rows if row.get(column) in values]
+        if self._range is not None:
+            rows = rows[self._range[0]:self._range[1] + 1]
         return _FakeResponse(rows)
 
 
@@ -124,3 +131,132 @@ async def test_load_division_group_cache_loads_all_mappings_with_team_name():
 
     assert queries._division_group_cache["Kansas State University"]["division_group"] == POWER_4_D1
     assert queries._division_group_cache["Oregon State University"]["division_group"] == POWER_4_D1
+
+
+def _join_tables():
+    return {
+        "school_baseball_ranking_name_mapping": [
+            {"school_name": "Kansas State University", "team_name": "Kansas St", "verified": True},
+            {"school_name": "Tufts University", "team_name": "Tufts", "verified": None},
+        ],
+        "baseball_rankings_data": [
+            {
+                "team_name": "Kansas St",
+                "year": year,
+                "division": 1,
+                "division_group": "Power 4 D1",
+                "overall_rating": rating,
+                "offensive_rating": rating - 2,
+                "defensive_rating": rating + 2,
+                "power_rating": rating + 1,
+                "strength_of_schedule": 75.0,
+                "record": "35-20",
+                "wins": 35,
+                "losses": 20,
+            }
+            for year, rating in ((2023, 60.0), (2024, 50.0), (2025, 40.0))
+        ]
+        + [
+            {
+                "team_name": "Tufts",
+                "year": 2025,
+                "division": 3,
+                "division_group": None,
+                "overall_rating": 12.0,
+                "offensive_rating": 10.0,
+                "defensive_rating": 15.0,
+                "power_rating": 11.0,
+                "strength_of_schedule": 30.0,
+                "record": "30-10",
+                "wins": 30,
+                "losses": 10,
+            }
+        ],
+    }
+
+
+class _RecordingClient(_FakeClient):
+    def __init__(self, tables):
+        super().__init__(tables)
+        self.queried = []
+
+    def table(self, name):
+        self.queried.append(name)
+        return super().table(name)
+
+
+@pytest.mark.asyncio
+async def test_materialized_rows_reproduce_live_join_cache():
+    import sqlite3
+
+    from backend.database.school_enriched_dataset import (
+        TABLE,
+        YEARLY_RANKINGS_COLUMN,
+        read_sqlite,
+        rows_from_payloads,
+        write_sqlite,
+    )
+
+    live = AsyncSchoolDataQueries(connection=_FakeConnection(_FakeClient(_join_tables())))
+    await live._load_division_group_cache()
+
+    payloads = live.build_enrichment_payloads(_FakeClient(_join_tables()), include_yearly_rankings=True)
+    assert set(payloads["Kansas State University"][YEARLY_RANKINGS_COLUMN]) == {"2023", "2024", "2025"}
+
+    conn = sqlite3.connect(":memory:")
+    assert write_sqlite(conn, rows_from_payloads(payloads)) == 2
+    stored_rows = read_sqlite(conn)
+
+    client = _RecordingClient({TABLE: stored_rows})
+    materialized = AsyncSchoolDataQueries(connection=_FakeConnection(client))
+    await materialized._load_division_group_cache()
+
+    assert client.queried == [TABLE]
+    assert materialized._division_group_cache == live._division_group_cache
+    assert YEARLY_RANKINGS_COLUMN not in materialized._division_group_cache["tufts university"]
+
+
+@pytest.mark.asyncio
+async def test_empty_materialized_table_falls_back_to_live_join():
+    client = _RecordingClient(_join_tables())
+    queries = AsyncSchoolDataQueries(connection=_FakeConnection(client))
+
+    await queries._load_division_group_cache()
+
+    assert "baseball_rankings_data" in client.queried
+    assert queries._division_group_cache["Kansas State University"]["baseball_sci_hitter"] is not None
+
+
+class _DeletingClient(_FakeClient):
+    def __init__(self, tables):
+        super().__init__(tables)
+        self.deleted = []
+
+    def table(self, name):
+        table = super().table(name)
+        table.delete = lambda: table
+        original_execute = table.execute
+
+        def _execute():
+            if table._in_filters:
+                self.deleted.extend(sorted(table._in_filters["school_name"]))
+                return _FakeResponse([])
+            return original_execute()
+
+        table.execute = _execute
+        return table
+
+
+def test_full_table_reads_page_past_the_response_cap(monkeypatch):
+    from backend.database import school_enriched_dataset as dataset
+
+    monkeypatch.setattr(dataset, "_PAGE_SIZE", 2)
+    rows = [{"school_name": f"School {i}", "baseball_team_name": f"Team {i}"} for i in range(5)]
+
+    assert [r["school_name"] for r in dataset.load_enriched_rows(_FakeClient({dataset.TABLE: rows}))] == [
+        r["school_name"] for r in rows
+    ]
+
+    client = _DeletingClient({dataset.TABLE: rows})
+    assert dataset.delete_rows_except(client, ["School 0", "School 2"]) == 3
+    assert client.deleted == ["School 1", "School 3", "School 4"]
@@ -0,0 +1,191 @@
+"""Single-flight roster fetches (backend/llm/deep_school_insights/shared_evidence.py)."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from backend.llm.deep_school_insights import fetch as fetch_mod
+from backend.llm.deep_school_insights.fetch import gather_evidence
+from backend.llm.deep_school_insights.shared_evidence import (
+    SharedEvidence,
+    SharedEvidenceStats,
+    roster_key,
+)
+from backend.llm.deep_school_insights.types import MatchedPlayer, MatchedRoster, ParsedPlayer
+
+ROSTER_URL = "https://gopack.example.edu/sports/baseball/roster"
+
+
+class _Fetcher:
+    def __init__(self, delay=0.05, players=2, fail=False):
+        self.calls = 0
+        self.delay = delay
+        self.players = players
+        self.fail = fail
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("roster 503")
+        return MatchedRoster(
+            matched_players=[
+                MatchedPlayer(player=ParsedPlayer(name=f"Player {i}", position_family="IF"))
+                for i in range(self.players)
+            ],
+            roster_url=ROSTER_URL,
+            stats_available=True,
+        )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_fetches_in_one_worker_collapse_to_one():
+    shared = SharedEvidence()
+    fetcher = _Fetcher()
+    stats = SharedEvidenceStats()
+
+    results = await asyncio.gather(*(shared.get_or_fetch(ROSTER_URL, fetcher, stats) for _ in range(5)))
+
+    assert fetcher.calls == 1
+    assert all(r is results[0] for r in results)
+    assert (stats.fetched, stats.local_waits, stats.deduplicated) == (1, 4, 4)
+    # Nothing lingers once the fetch is done.
+    assert shared._in_flight == {}
+
+
+def test_single_flight_spans_event_loops_in_one_process():
+    # Two Celery tasks on a threaded worker each run their own asyncio loop.
+    shared = SharedEvidence()
+    fetcher = _Fetcher(delay=0.2)
+    stats = [SharedEvidenceStats(), SharedEvidenceStats()]
+    results = [None, None]
+
+    def _task(i):
+        results[i] = asyncio.run(shared.get_or_fetch(ROSTER_URL, fetcher, stats[i]))
+
+    threads = [threading.Thread(target=_task, args=(i,)) for i in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert fetcher.calls == 1
+    assert results[0].matched_players == results[1].matched_players
+    assert sum(s.local_waits for s in stats) == 1
+
+
+@pytest.mark.asyncio
+async def test_other_worker_waits_for_published_result(fake_redis):
+    redis = fake_redis
+    worker_a = SharedEvidence(redis, poll_s=0.01)
+    worker_b = SharedEvidence(redis, poll_s=0.01)
+    fetch_a, fetch_b = _Fetcher(delay=0.1), _Fetcher()
+    stats_a, stats_b = SharedEvidenceStats(), SharedEvidenceStats()
+
+    task_a = asyncio.create_task(worker_a.get_or_fetch(ROSTER_URL, fetch_a, stats_a))
+    await asyncio.sleep(0.02)
+    result_b = await worker_b.get_or_fetch(ROSTER_URL, fetch_b, stats_b)
+    result_a = await task_a
+
+    assert (fetch_a.calls, fetch_b.calls) == (1, 0)
+    assert stats_b.remote_waits == 1
+    assert [m.player.name for m in result_b.matched_players] == [m.player.name for m in result_a.matched_players]
+    assert roster_key(ROSTER_URL) + ":lock" not in redis.store
+
+    # A later run hits the published result directly.
+    stats_c = SharedEvidenceStats()
+    await SharedEvidence(redis).get_or_fetch(ROSTER_URL + "/", _Fetcher(), stats_c)
+    assert (stats_c.redis_hits, stats_c.fetched) == (1, 0)
+
+
+@pytest.mark.asyncio
+async def test_empty_results_are_not_published_and_waiters_refetch(fake_redis):
+    redis = fake_redis
+    worker_a, worker_b = SharedEvidence(redis, poll_s=0.01), SharedEvidence(redis, poll_s=0.01)
+    fetch_a, fetch_b = _Fetcher(delay=0.05, players=0), _Fetcher(delay=0.0)
+
+    task_a = asyncio.create_task(worker_a.get_or_fetch(ROSTER_URL, fetch_a))
+    await asyncio.sleep(0.01)
+    result_b = await worker_b.get_or_fetch(ROSTER_URL, fetch_b)
+    await task_a
+
+    # A's empty roster wasn't published, so B fetched once A let go of the lock.
+    assert fetch_b.calls == 1
+    assert len(result_b.matched_players) == 2
+    assert b"Player 1" in redis.store[roster_key(ROSTER_URL)]
+
+
+@pytest.mark.asyncio
+async def test_waiting_worker_polls_with_backoff_without_blocking_the_loop(fake_redis):
+    holder = SharedEvidence(fake_redis, poll_s=0.01, max_poll_s=0.04)
+    waiter = SharedEvidence(fake_redis, poll_s=0.01, max_poll_s=0.04)
+    ticks = 0
+
+    async def _ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    ticker = asyncio.create_task(_ticker())
+    task = asyncio.create_task(holder.get_or_fetch(ROSTER_URL, _Fetcher(delay=0.4)))
+    await asyncio.sleep(0.01)
+    commands_before = fake_redis.commands
+    stats = SharedEvidenceStats()
+    await waiter.get_or_fetch(ROSTER_URL, _Fetcher(), stats)
+    await task
+    ticker.cancel()
+
+    assert stats.remote_waits == 1
+    # Fixed 10 ms polling of result + lock would be ~80 round trips.
+    assert fake_redis.commands - commands_before < 25
+    assert ticks > 40
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fall_back_to_a_local_fetch(fake_redis):
+    fake_redis.fail = True
+    fetcher = _Fetcher()
+    stats = SharedEvidenceStats()
+
+    result = await SharedEvidence(fake_redis).get_or_fetch(ROSTER_URL, fetcher, stats)
+
+    assert fetcher.calls == 1 and len(result.matched_players) == 2
+    assert stats.errors >= 2
+
+
+@pytest.mark.asyncio
+async def test_follower_refetches_when_leader_raises():
+    shared = SharedEvidence()
+    failing, healthy = _Fetcher(fail=True), _Fetcher()
+    stats = SharedEvidenceStats()
+
+    leader = asyncio.create_task(shared.get_or_fetch(ROSTER_URL, failing, stats))
+    await asyncio.sleep(0)
+    follower = await shared.get_or_fetch(ROSTER_URL, healthy, stats)
+
+    with pytest.raises(RuntimeError):
+        await leader
+    assert healthy.calls == 1
+    assert len(follower.matched_players) == 2
+    assert stats.deduplicated == 0
+
+
+@pytest.mark.asyncio
+async def test_gather_evidence_shares_fetch_across_players(monkeypatch):
+    fetcher = _Fetcher()
+    monkeypatch.setattr(fetch_mod, "fetch_matched_roster", lambda school, prev, stats: fetcher())
+    shared, stats = SharedEvidence(), SharedEvidenceStats()
+    school = {"school_name": "NC State", "roster_url": ROSTER_URL}
+
+    a, b = await asyncio.gather(
+        gather_evidence(school, {"primary_position": "SS"}, [], shared=shared, shared_stats=stats),
+        gather_evidence(school, {"primary_position": "RHP"}, [], shared=shared, shared_stats=stats),
+    )
+
+    assert fetcher.calls == 1
+    assert stats.deduplicated == 1
+    assert a.sources[0].url == b.sources[0].url == ROSTER_URL
@@ -0,0 +1,86 @@
+"""Worker-lifetime event loop + pooled clients (backend/llm/worker_runtime.py)."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from backend.llm import tasks
+from backend.llm import worker_runtime
+from backend.llm.deep_school_insights import fetch as fetch_mod
+from backend.llm.deep_school_insights.fetch import http_client
+from backend.llm.worker_runtime import WorkerRuntime
+from backend.scripts.bench_worker_runtime import _KeepAliveHandler, start_server
+
+
+@pytest.fixture
+def server():
+    srv, url = start_server()
+    _KeepAliveHandler.connections = 0
+    yield url
+    srv.shutdown()
+
+
+@pytest.fixture
+def runtime():
+    rt = WorkerRuntime(openai_api_key="test-key").start()
+    yield rt
+    rt.shutdown()
+
+
+async def _get(url):
+    async with http_client() as client:
+        resp = await client.get(url)
+        return resp.status_code, id(client), id(asyncio.get_running_loop())
+
+
+def test_tasks_share_one_loop_and_one_connection(runtime, server):
+    results = [runtime.run(_get(server)) for _ in range(5)]
+
+    assert {status for status, _, _ in results} == {200}
+    assert len({client for _, client, _ in results}) == 1
+    assert len({loop for _, _, loop in results}) == 1
+    assert _KeepAliveHandler.connections == 1
+    assert runtime.openai_client is not None
+    assert runtime.tasks_run == 5
+
+
+def test_asyncio_run_outside_the_runtime_uses_one_off_clients(runtime, server):
+    results = [asyncio.run(_get(server)) for _ in range(3)]
+
+    assert _KeepAliveHandler.connections == 3
+    assert runtime.http_client is not None
+    assert all(client != id(runtime.http_client) for _, client, _ in results)
+
+
+def test_shutdown_closes_clients_and_stops_the_loop(server):
+    rt = WorkerRuntime().start()
+    rt.run(_get(server))
+    thread, http = rt._thread, rt.http_client
+
+    rt.shutdown()
+
+    assert not rt.running
+    assert not thread.is_alive()
+    assert http.is_closed
+    assert fetch_mod._pooled_client is None
+
+
+def test_run_async_uses_runtime_only_inside_a_worker(monkeypatch):
+    async def _loop_id():
+        return id(asyncio.get_running_loop())
+
+    monkeypatch.setattr(worker_runtime, "_in_worker", False)
+    tasks.run_async(_loop_id())
+    assert worker_runtime.get_runtime(start=False) is None
+
+    monkeypatch.setattr(worker_runtime, "_in_worker", True)
+    try:
+        first, second = tasks.run_async(_loop_id()), tasks.run_async(_loop_id())
+        assert first == second == id(worker_runtime.get_runtime(start=False).loop)
+    finally:
+        worker_runtime.shutdown_runtime()
+
+    monkeypatch.setenv("DEEP_RESEARCH_PERSISTENT_LOOP", "0")
+    assert worker_runtime.active_runtime() is None